@@ -0,0 +1,259 @@
+"""Executor de benchmarks do compilador Fortall.
+
+Mede separadamente análise léxica, sintática (em cada front end), semântica e
+execução (em cada backend disponível) dos programas em bench/programas e de programas gerados,
+grava os resultados em JSON e compara com uma linha de base.
+
+Uso:
+    python bench/executar.py                              # roda e mostra a tabela
+    python bench/executar.py -o resultados.json           # grava os resultados
+    python bench/executar.py --salvar-base base.json      # grava a linha de base
+    python bench/executar.py --comparar base.json --limiar 0.10
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(DIRETORIO, "..", "src"))
+
+from lexer import Lexer
+from parser import Parser
+from parser_tabela import ParserTabela
+from compartilhamento import AnalisadorCompartilhado, ParserCompartilhado
+from semantic import analisar_semantica
+from interpreter import Interpretador
+from passagem_unica import ExecucaoPassagemUnica, compilar_passagem_unica
+from assincrono import executar_sessao
+from programa_plano import ProgramaPlano, codificar_programa
+
+from gerador import gerar_programa
+
+# Programas gerados: nome -> (comandos, profundidade, iterações, semente)
+PROGRAMAS_GERADOS = {
+    "gerado_pequeno": (200, 3, 10, 1),
+    "gerado_medio": (2000, 4, 10, 2),
+    "gerado_profundo": (500, 6, 6, 3),
+}
+
+class _Descartar:
+    """Saída que descarta tudo (a escrita no terminal não faz parte da medição)"""
+
+    def write(self, texto: str):
+        return len(texto)
+
+    def flush(self):
+        pass
+
+def _entrada_fixa(prompt: str = "") -> str:
+    return "10"
+
+def executar_arvore(ast) -> None:
+    interpretador = Interpretador(entrada=_entrada_fixa, saida=_Descartar(),
+                                  limite_iteracoes=None)
+    if not interpretador.interpretar(ast):
+        raise RuntimeError("execução falhou")
+
+async def _ler_fixo(prompt: str) -> str:
+    return "10"
+
+async def _descartar(texto: str):
+    pass
+
+# Um event loop para todas as medições (criá-lo não faz parte da execução)
+_laco = asyncio.new_event_loop()
+
+def executar_assincrono(ast) -> None:
+    sessao = executar_sessao(ast, _ler_fixo, _descartar, limite_iteracoes=None)
+    if not _laco.run_until_complete(sessao):
+        raise RuntimeError("execução falhou")
+
+def executar_passagem_unica(programa) -> None:
+    execucao = ExecucaoPassagemUnica(entrada=_entrada_fixa, saida=_Descartar(),
+                                     limite_iteracoes=None)
+    if not execucao.interpretar(programa):
+        raise RuntimeError("execução falhou")
+
+def executar_plano(programa: ProgramaPlano) -> None:
+    if not programa.executar(_entrada_fixa, _Descartar()).sucesso:
+        raise RuntimeError("execução falhou")
+
+def _arvore_verificada(codigo: str, ast):
+    return ast
+
+def _compilar_passagem_unica(codigo: str, ast):
+    programa, _ = compilar_passagem_unica(codigo)
+    return programa
+
+def _codificar_plano(codigo: str, ast) -> ProgramaPlano:
+    return ProgramaPlano(codificar_programa(ast))
+
+# Backends de execução: nome -> (preparação a partir do código e da AST verificada,
+# fora da medição; execução do que foi preparado)
+BACKENDS: Dict[str, Tuple[Callable, Callable]] = {
+    "arvore": (_arvore_verificada, executar_arvore),
+    "assincrono": (_arvore_verificada, executar_assincrono),
+    "passagem_unica": (_compilar_passagem_unica, executar_passagem_unica),
+    "plano": (_codificar_plano, executar_plano),
+}
+
+# Front ends sintáticos: nome -> (fase medida, classe do parser); semântico e
+# execução usam sempre a AST do descendente recursivo
+FRONTENDS: Dict[str, Tuple[str, Callable]] = {
+    "descendente": ("sintatico", Parser),
+    "tabela": ("sintatico_tabela", ParserTabela),
+    "compartilhado": ("sintatico_compartilhado", ParserCompartilhado),
+}
+
+def carregar_programas(filtro: Optional[str] = None) -> Dict[str, str]:
+    programas = {}
+    pasta = os.path.join(DIRETORIO, "programas")
+    for nome_arquivo in sorted(os.listdir(pasta)):
+        if nome_arquivo.endswith(".txt"):
+            with open(os.path.join(pasta, nome_arquivo), encoding="utf-8") as arquivo:
+                programas[nome_arquivo[:-4]] = arquivo.read()
+    for nome, (comandos, profundidade, iteracoes, semente) in PROGRAMAS_GERADOS.items():
+        programas[nome] = gerar_programa(comandos, profundidade, iteracoes, semente, nome)
+    if filtro:
+        programas = {nome: codigo for nome, codigo in programas.items() if filtro in nome}
+    return programas
+
+def _medir(funcao: Callable, repeticoes: int) -> Tuple[Dict[str, float], object]:
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {"min": min(tempos), "mediana": statistics.median(tempos)}, resultado
+
+def _medir_sintatico(classe: Callable, codigo: str, repeticoes: int) -> Tuple[Dict[str, float], object]:
+    def sintatico():
+        parser = classe(codigo)
+        inicio = time.perf_counter()
+        ast = parser.parse()
+        return ast, time.perf_counter() - inicio
+
+    # O Parser tokeniza no construtor; mede-se apenas parse()
+    tempos = [sintatico() for _ in range(repeticoes)]
+    duracoes = [duracao for _, duracao in tempos]
+    return {"min": min(duracoes), "mediana": statistics.median(duracoes)}, tempos[-1][0]
+
+def medir_programa(codigo: str, repeticoes: int, backends: List[str],
+                   frontends: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    fases = {}
+    fases["lexico"], tokens = _medir(lambda: Lexer(codigo).tokenizar(), repeticoes)
+
+    asts = {}
+    for frontend in frontends or list(FRONTENDS):
+        fase, classe = FRONTENDS[frontend]
+        fases[fase], asts[frontend] = _medir_sintatico(classe, codigo, repeticoes)
+    ast = asts.get("descendente") or Parser(codigo).parse()
+
+    fases["semantico"], erros = _medir(lambda: analisar_semantica(ast), repeticoes)
+    if erros:
+        raise ValueError(f"erros semânticos: {erros[0]}")
+    if "compartilhado" in asts:
+        # A árvore compartilhada é verificada uma vez por nó único
+        fases["semantico_compartilhado"], _ = _medir(
+            lambda: AnalisadorCompartilhado().analisar(asts["compartilhado"]), repeticoes)
+
+    for backend in backends:
+        preparar, executar = BACKENDS[backend]
+        preparado = preparar(codigo, ast)
+        fases[f"execucao_{backend}"], _ = _medir(lambda: executar(preparado), repeticoes)
+
+    # Compilação em uma passada (léxico, sintático e semântico juntos)
+    fases["passagem_unica"], _ = _medir(lambda: compilar_passagem_unica(codigo), repeticoes)
+    fases["tokens"] = len(tokens)
+    return fases
+
+def comparar(atual: dict, base: dict, limiar: float) -> List[str]:
+    """Lista as fases cujo menor tempo piorou mais que o limiar em relação à base"""
+    regressoes = []
+    for programa, fases in atual["resultados"].items():
+        fases_base = base.get("resultados", {}).get(programa)
+        if not fases_base:
+            continue
+        for fase, medida in fases.items():
+            if not isinstance(medida, dict) or fase not in fases_base:
+                continue
+            # O mínimo das repetições é menos sensível a ruído que a mediana
+            antes = fases_base[fase]["min"]
+            depois = medida["min"]
+            if antes > 0 and depois > antes * (1 + limiar):
+                regressoes.append(f"{programa}/{fase}: {antes * 1000:.2f} ms -> "
+                                  f"{depois * 1000:.2f} ms (+{100 * (depois / antes - 1):.0f}%)")
+    return regressoes
+
+def imprimir_tabela(resultados: Dict[str, dict]):
+    fases = []
+    for medidas in resultados.values():
+        for fase, medida in medidas.items():
+            if isinstance(medida, dict) and fase not in fases:
+                fases.append(fase)
+    larguras = [max(18, len(fase) + 2) for fase in fases]
+    print(f"{'programa':<18}" + "".join(f"{fase:>{largura}}" for fase, largura in zip(fases, larguras))
+          + "   (mediana, ms)")
+    for programa, medidas in resultados.items():
+        colunas = []
+        for fase, largura in zip(fases, larguras):
+            medida = medidas.get(fase)
+            colunas.append(f"{medida['mediana'] * 1000:>{largura}.3f}" if medida else f"{'-':>{largura}}")
+        print(f"{programa:<18}" + "".join(colunas))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks do compilador Fortall')
+    parser.add_argument('-n', '--repeticoes', type=int, default=5, help='Repetições por fase')
+    parser.add_argument('-f', '--filtro', help='Somente programas cujo nome contém o texto')
+    parser.add_argument('-b', '--backend', action='append', choices=sorted(BACKENDS),
+                        help='Backend de execução (padrão: todos)')
+    parser.add_argument('--frontend', action='append', choices=sorted(FRONTENDS),
+                        help='Front end sintático (padrão: todos)')
+    parser.add_argument('-o', '--saida', help='Gravar resultados em JSON')
+    parser.add_argument('--salvar-base', metavar='ARQUIVO', help='Gravar como linha de base')
+    parser.add_argument('--comparar', metavar='ARQUIVO', help='Comparar com a linha de base')
+    parser.add_argument('--limiar', type=float, default=0.10,
+                        help='Piora relativa tolerada na comparação (padrão: 0.10)')
+    args = parser.parse_args()
+
+    backends = args.backend or list(BACKENDS)
+    resultados = {}
+    for nome, codigo in carregar_programas(args.filtro).items():
+        resultados[nome] = medir_programa(codigo, args.repeticoes, backends, args.frontend)
+
+    documento = {
+        "versao": 1,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeticoes": args.repeticoes,
+        "resultados": resultados,
+    }
+    imprimir_tabela(resultados)
+
+    for destino in (args.saida, args.salvar_base):
+        if destino:
+            with open(destino, 'w', encoding='utf-8') as arquivo:
+                json.dump(documento, arquivo, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            base = json.load(arquivo)
+        regressoes = comparar(documento, base, args.limiar)
+        if regressoes:
+            print(f"\nRegressões acima de {args.limiar:.0%}:")
+            for regressao in regressoes:
+                print(f"   {regressao}")
+            return 1
+        print(f"\nNenhuma regressão acima de {args.limiar:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
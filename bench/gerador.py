@@ -0,0 +1,162 @@
+"""Gerador de programas Fortall sintéticos para benchmarks.
+
+Segue as produções da gramática (programa, declarações, comandos, expressões)
+escolhendo alternativas com pesos, e garante programas válidos e que terminam:
+laços usam contadores próprios, divisões nunca são por zero e valores
+multiplicados são reduzidos para não crescerem sem limite.
+
+Uso:
+    python bench/gerador.py --comandos 500 --profundidade 4 --iteracoes 50 -o prog.txt
+"""
+import argparse
+import random
+import sys
+from typing import List
+
+# Módulo usado para manter os valores pequenos após multiplicações
+MODULO = 9973
+
+class GeradorFortall:
+    def __init__(self, comandos: int = 200, profundidade: int = 3, iteracoes: int = 20,
+                 variaveis: int = 8, prob_laco: float = 0.15, semente: int = 0):
+        self.comandos = comandos
+        self.profundidade = profundidade
+        self.iteracoes = iteracoes
+        self.prob_laco = prob_laco
+        self.rng = random.Random(semente)
+        self.variaveis = [f"v{i}" for i in range(variaveis)]
+        self.contadores: List[str] = []
+        self.restantes = 0
+
+    # programa ::= "programa" ID ";" [declaracoes] "inicio" comandos "fim" "."
+    def programa(self, nome: str = "sintetico") -> str:
+        self.restantes = self.comandos
+        self.contadores = []
+        corpo = []
+        for variavel in self.variaveis:
+            corpo.append(f"{variavel} := {self.rng.randint(0, 100)}")
+        while self.restantes > 0:
+            corpo.append(self.comando(1, 1))
+        corpo.append(self.escrita())
+
+        # Contadores de laço são criados durante a geração dos comandos
+        declaracoes = self.variaveis + self.contadores
+        linhas = [f"/* Programa gerado: {self.comandos} comandos, profundidade "
+                  f"{self.profundidade}, {self.iteracoes} iterações por laço */",
+                  f"programa {nome};",
+                  f"var {', '.join(declaracoes)} : inteiro;",
+                  "inicio",
+                  ";\n".join("    " + comando for comando in corpo),
+                  "fim."]
+        return "\n".join(linhas) + "\n"
+
+    # comando ::= atribuicao | escrita | se | enquanto | bloco
+    def comando(self, nivel: int, recuo: int) -> str:
+        self.restantes -= 1
+        pode_aninhar = nivel < self.profundidade and self.restantes > 0
+        sorteio = self.rng.random()
+        if pode_aninhar and sorteio < self.prob_laco:
+            return self.enquanto(nivel, recuo)
+        if pode_aninhar and sorteio < self.prob_laco + 0.15:
+            return self.se(nivel, recuo)
+        if sorteio < 0.85:
+            return self.atribuicao()
+        return self.escrita()
+
+    def atribuicao(self) -> str:
+        destino = self.rng.choice(self.variaveis)
+        expressao = self.expr_arit(2)
+        if "*" in expressao:
+            expressao = f"({expressao}) - (({expressao}) / {MODULO}) * {MODULO}"
+        return f"{destino} := {expressao}"
+
+    def escrita(self) -> str:
+        variavel = self.rng.choice(self.variaveis)
+        return f'escrever("{variavel} = ", {variavel})'
+
+    def bloco(self, nivel: int, recuo: int, prefixo: List[str] = None,
+              sufixo: List[str] = None) -> str:
+        espaco = "    " * (recuo + 1)
+        quantidade = self.rng.randint(1, 4)
+        comandos = list(prefixo or [])
+        for _ in range(quantidade):
+            if self.restantes <= 0:
+                break
+            comandos.append(self.comando(nivel + 1, recuo + 1))
+        if not comandos:
+            comandos.append(self.atribuicao())
+        comandos.extend(sufixo or [])
+        corpo = ";\n".join(espaco + comando for comando in comandos)
+        return f"inicio\n{corpo}\n{'    ' * recuo}fim"
+
+    def se(self, nivel: int, recuo: int) -> str:
+        condicao = self.expr_relacional()
+        entao = self.bloco(nivel, recuo)
+        if self.rng.random() < 0.5:
+            return f"se {condicao} entao\n{'    ' * recuo}{entao}"
+        senao = self.bloco(nivel, recuo)
+        return f"se {condicao} entao\n{'    ' * recuo}{entao}\n{'    ' * recuo}senao\n{'    ' * recuo}{senao}"
+
+    def enquanto(self, nivel: int, recuo: int) -> str:
+        contador = f"k{len(self.contadores)}"
+        self.contadores.append(contador)
+        corpo = self.bloco(nivel, recuo, sufixo=[f"{contador} := {contador} + 1"])
+        return (f"{contador} := 0;\n{'    ' * recuo}"
+                f"enquanto {contador} < {self.iteracoes} faca\n{'    ' * recuo}{corpo}")
+
+    # expr_relacional ::= expr_arit [ op_rel expr_arit ]
+    def expr_relacional(self) -> str:
+        operador = self.rng.choice(["=", "<>", "<", "<=", ">", ">="])
+        return f"{self.expr_arit(1)} {operador} {self.expr_arit(1)}"
+
+    # expr_arit ::= termo { ("+" | "-") termo }
+    def expr_arit(self, profundidade: int) -> str:
+        termos = [self.termo(profundidade) for _ in range(self.rng.randint(1, 3))]
+        expressao = termos[0]
+        for termo in termos[1:]:
+            expressao += f" {self.rng.choice('+-')} {termo}"
+        return expressao
+
+    # termo ::= fator { ("*" | "/") fator }
+    def termo(self, profundidade: int) -> str:
+        termo = self.fator(profundidade)
+        if self.rng.random() < 0.3:
+            if self.rng.random() < 0.5:
+                termo += f" * {self.fator(profundidade)}"
+            else:
+                # Divisor sempre em [1, 7]
+                variavel = self.rng.choice(self.variaveis)
+                termo += f" / ({variavel} - ({variavel} / 7) * 7 + 1)"
+        return termo
+
+    # fator ::= "(" expr ")" | ID | NUMERO
+    def fator(self, profundidade: int) -> str:
+        sorteio = self.rng.random()
+        if profundidade > 0 and sorteio < 0.15:
+            return f"({self.expr_arit(profundidade - 1)})"
+        if sorteio < 0.6:
+            return self.rng.choice(self.variaveis)
+        return str(self.rng.randint(0, 50))
+
+def gerar_programa(comandos: int = 200, profundidade: int = 3, iteracoes: int = 20,
+                   semente: int = 0, nome: str = "sintetico") -> str:
+    return GeradorFortall(comandos, profundidade, iteracoes, semente=semente).programa(nome)
+
+def main():
+    parser = argparse.ArgumentParser(description='Gerador de programas Fortall sintéticos')
+    parser.add_argument('--comandos', type=int, default=200, help='Quantidade de comandos')
+    parser.add_argument('--profundidade', type=int, default=3, help='Aninhamento máximo')
+    parser.add_argument('--iteracoes', type=int, default=20, help='Iterações de cada laço')
+    parser.add_argument('--semente', type=int, default=0, help='Semente aleatória')
+    parser.add_argument('-o', '--saida', help='Arquivo de saída (padrão: stdout)')
+    args = parser.parse_args()
+
+    codigo = gerar_programa(args.comandos, args.profundidade, args.iteracoes, args.semente)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(codigo)
+    else:
+        sys.stdout.write(codigo)
+
+if __name__ == "__main__":
+    main()
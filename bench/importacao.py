@@ -0,0 +1,100 @@
+"""Benchmark de inicialização do compilador Fortall (python -X importtime).
+
+Executa `main.py` em processos novos no caminho de verificação (sem -e) e
+no caminho de execução, soma o tempo de importação de cada módulo e mede o
+tempo total do processo. Falha se o caminho de verificação importar módulos
+que deveriam ser carregados apenas sob demanda ou se passar do limite.
+
+Uso:
+    python bench/importacao.py                    # mostra a tabela
+    python bench/importacao.py --limite-ms 15     # falha acima de 15 ms de importação
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+MAIN = os.path.join(DIRETORIO, "..", "src", "main.py")
+PROGRAMA = os.path.join(DIRETORIO, "programas", "fatorial.txt")
+
+# Módulos que o caminho de verificação não pode importar
+PROIBIDOS_VERIFICACAO = ("typing", "argparse", "enum", "dataclasses", "re",
+                         "decimal", "interpreter", "pathlib")
+
+CAMINHOS = {
+    "verificacao": [PROGRAMA],
+    "execucao": [PROGRAMA, "-e"],
+}
+
+def importacoes(argumentos: List[str]) -> Dict[str, Tuple[int, int]]:
+    """Módulos importados pelo processo: nome -> (próprio, acumulado) em µs"""
+    processo = subprocess.run([sys.executable, "-X", "importtime"] + argumentos,
+                              capture_output=True, text=True)
+    modulos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        modulos[nome.strip()] = (int(proprio), int(acumulado))
+    return modulos
+
+def tempo_processo(argumentos: List[str], repeticoes: int) -> float:
+    """Mediana do tempo total do processo em ms"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, MAIN] + argumentos, capture_output=True)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+def tempo_python(repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], capture_output=True)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo de inicialização do compilador Fortall')
+    parser.add_argument('-n', '--repeticoes', type=int, default=10, help='Processos medidos por caminho')
+    parser.add_argument('--limite-ms', type=float, default=None,
+                        help='Tempo máximo de importação no caminho de verificação')
+    parser.add_argument('--mostrar', type=int, default=8, help='Módulos mais caros listados')
+    args = parser.parse_args()
+
+    # Na primeira execução os .pyc podem estar desatualizados
+    importacoes([MAIN] + CAMINHOS["verificacao"])
+    # Módulos que o próprio Python importa ao iniciar não entram na conta
+    iniciais = set(importacoes(["-c", "pass"]))
+    problemas = []
+    print(f"python -c pass: {tempo_python(args.repeticoes):.1f} ms")
+    for nome, argumentos in CAMINHOS.items():
+        proprios = {modulo: dados for modulo, dados in importacoes([MAIN] + argumentos).items()
+                    if modulo not in iniciais}
+        total = sum(proprio for proprio, _ in proprios.values()) / 1000
+        print(f"\n{nome}: processo {tempo_processo(argumentos, args.repeticoes):.1f} ms, "
+              f"importações {total:.1f} ms ({len(proprios)} módulos)")
+        for modulo, (proprio, _) in sorted(proprios.items(), key=lambda item: -item[1][0])[:args.mostrar]:
+            print(f"   {modulo:<28} {proprio / 1000:8.2f} ms")
+
+        if nome == "verificacao":
+            proibidos = [modulo for modulo in PROIBIDOS_VERIFICACAO if modulo in proprios]
+            if proibidos:
+                problemas.append(f"verificação importa {', '.join(proibidos)}")
+            if args.limite_ms is not None and total > args.limite_ms:
+                problemas.append(f"importações da verificação: {total:.1f} ms > {args.limite_ms} ms")
+
+    if problemas:
+        print("\nFalhas:")
+        for problema in problemas:
+            print(f"   {problema}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Benchmark da latência de execuções isoladas.
+
+Compara, para o mesmo programa e entradas, a execução no próprio processo
+(compilador.compilar), em um processo Python novo por execução (main.py) e no
+pool de trabalhadores pré-criados (trabalhadores.PoolTrabalhadores), recebendo o
+código-fonte ou o programa plano em memória compartilhada (programa_plano).
+
+Uso:
+    python bench/isolamento.py --execucoes 200 --processos 2
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(DIRETORIO, "..", "src"))
+
+from compilador import compilar
+from programa_plano import codificar_programa, publicar
+from trabalhadores import PoolTrabalhadores
+
+PROGRAMA = os.path.join(DIRETORIO, "..", "exemplos_entrada", "fatorial.txt")
+MAIN = os.path.join(DIRETORIO, "..", "src", "main.py")
+ENTRADAS = ["12"]
+
+def medir(funcao, execucoes: int) -> list:
+    tempos = []
+    for _ in range(execucoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argumentos.add_argument("--execucoes", type=int, default=200)
+    argumentos.add_argument("--processos", type=int, default=2)
+    argumentos.add_argument("--novos", type=int, default=20,
+                            help="Execuções em processo novo (bem mais lentas)")
+    args = argumentos.parse_args()
+
+    with open(PROGRAMA, encoding="utf-8") as arquivo:
+        codigo = arquivo.read()
+    programa = compilar(codigo)
+    esperado = programa.executar(ENTRADAS).saida
+    memoria = publicar(codificar_programa(programa))
+
+    def novo_processo():
+        subprocess.run([sys.executable, MAIN, PROGRAMA, "-e"], input="\n".join(ENTRADAS) + "\n",
+                       capture_output=True, text=True, check=True)
+
+    with PoolTrabalhadores(processos=args.processos) as pool:
+        if (pool.executar(codigo, ENTRADAS).saida != esperado or
+                pool.executar_plano(memoria.name, ENTRADAS).saida != esperado):
+            raise SystemExit("saída do pool difere da execução no processo")
+        resultados = {
+            "compilar+executar": medir(lambda: compilar(codigo).executar(ENTRADAS), args.execucoes),
+            "pool": medir(lambda: pool.executar(codigo, ENTRADAS), args.execucoes),
+            "pool (plano)": medir(lambda: pool.executar_plano(memoria.name, ENTRADAS), args.execucoes),
+            "processo novo": medir(novo_processo, args.novos),
+        }
+    memoria.close()
+    memoria.unlink()
+
+    print(f"{'modo':<20}{'mediana':>12}{'p95':>12}")
+    for modo, tempos in resultados.items():
+        tempos.sort()
+        p95 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))]
+        print(f"{modo:<20}{statistics.median(tempos) * 1e3:>10.3f}ms{p95 * 1e3:>10.3f}ms")
+
+if __name__ == "__main__":
+    main()
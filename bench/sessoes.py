@@ -0,0 +1,84 @@
+"""Benchmark de sessões interativas concorrentes (interpretador assíncrono).
+
+Executa o mesmo programa em muitas sessões locais em um único event loop,
+junto com programas ocupados (laços longos sem E/S), e mede o tempo total e
+a maior pausa do event loop, isto é, quanto um programa ocupado atrasa os demais.
+
+Uso:
+    python bench/sessoes.py --sessoes 5000 --ocupados 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(DIRETORIO, "..", "src"))
+
+from parser import Parser
+from semantic import analisar_semantica
+from assincrono import SessaoLocal, executar_sessao
+
+INTERATIVO = os.path.join(DIRETORIO, "..", "exemplos_entrada", "calculaMedia.txt")
+OCUPADO = os.path.join(DIRETORIO, "programas", "calculaMedia.txt")
+ENTRADAS = ["5", "7", "8", "9", "10", "6"]
+
+def compilar(caminho: str):
+    with open(caminho, encoding="utf-8") as arquivo:
+        ast = Parser(arquivo.read()).parse()
+    erros = analisar_semantica(ast)
+    if erros:
+        raise ValueError(f"erros semânticos: {erros[0]}")
+    return ast
+
+async def medir(sessoes: int, ocupados: int, intervalo_cessao: int, atraso: float):
+    interativo = compilar(INTERATIVO)
+    ocupado = compilar(OCUPADO)
+    maior_pausa = 0.0
+    terminou = False
+
+    async def relogio():
+        nonlocal maior_pausa
+        anterior = time.perf_counter()
+        while not terminou:
+            await asyncio.sleep(0)
+            agora = time.perf_counter()
+            maior_pausa = max(maior_pausa, agora - anterior)
+            anterior = agora
+
+    tarefa_relogio = asyncio.create_task(relogio())
+    locais = ([SessaoLocal(ENTRADAS, atraso) for _ in range(sessoes)] +
+              [SessaoLocal([]) for _ in range(ocupados)])
+    programas = [interativo] * sessoes + [ocupado] * ocupados
+
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(
+        executar_sessao(programa, sessao.ler, sessao.escrever, limite_iteracoes=None,
+                        intervalo_cessao=intervalo_cessao)
+        for programa, sessao in zip(programas, locais)))
+    duracao = time.perf_counter() - inicio
+    terminou = True
+    await tarefa_relogio
+    return duracao, maior_pausa, sum(1 for sucesso in resultados if sucesso)
+
+def main():
+    parser = argparse.ArgumentParser(description='Sessões concorrentes no interpretador assíncrono')
+    parser.add_argument('--sessoes', type=int, default=5000, help='Sessões interativas')
+    parser.add_argument('--ocupados', type=int, default=4, help='Programas com laços longos')
+    parser.add_argument('--atraso', type=float, default=0.0,
+                        help='Espera de cada leitura em segundos, simulando a rede (padrão: 0)')
+    parser.add_argument('--intervalo-cessao', type=int, default=256,
+                        help='Iterações de laço entre cessões ao event loop')
+    args = parser.parse_args()
+
+    duracao, maior_pausa, concluidas = asyncio.run(
+        medir(args.sessoes, args.ocupados, args.intervalo_cessao, args.atraso))
+    total = args.sessoes + args.ocupados
+    print(f"{concluidas}/{total} sessões concluídas em {duracao:.2f} s "
+          f"({args.sessoes / duracao:.0f} sessões interativas/s)")
+    print(f"maior pausa do event loop: {maior_pausa * 1000:.2f} ms")
+    return 0 if concluidas == total else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
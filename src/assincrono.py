@@ -0,0 +1,205 @@
+import asyncio
+import weakref
+from typing import Awaitable, Callable, FrozenSet, Iterable, List, Optional
+
+from ast_nodes import *
+from interpreter import Interpretador, RuntimeError, valor_logico, classe_para_modo
+
+# Fonte de 'ler': recebe o prompt e retorna a linha digitada (EOFError no fim da entrada)
+EntradaAssincrona = Callable[[str], Awaitable[str]]
+# Destino de 'escrever' e das mensagens da execução
+SaidaAssincrona = Callable[[str], Awaitable[None]]
+
+class ExecucaoInterrompida(Exception):
+    """Laço longo não confirmado pelo usuário (KeyboardInterrupt não é usado dentro do event loop)"""
+
+_comandos_com_espera: 'weakref.WeakKeyDictionary[Programa, FrozenSet[int]]' = weakref.WeakKeyDictionary()
+
+def comandos_com_espera(programa: Programa) -> FrozenSet[int]:
+    """ids dos comandos que contêm ler, escrever ou enquanto.
+
+    Somente esses são executados como corrotinas; os demais (atribuições e se/blocos
+    sem E/S nem laços) usam o visitor síncrono. O resultado é guardado por programa,
+    pois a mesma AST costuma ser executada por muitas sessões.
+    """
+    ids = _comandos_com_espera.get(programa)
+    if ids is not None:
+        return ids
+
+    encontrados = set()
+
+    def marcar(no: Comando) -> bool:
+        if isinstance(no, Bloco):
+            filhos = no.comandos
+        elif isinstance(no, Se):
+            filhos = [no.comando_entao] + ([no.comando_senao] if no.comando_senao else [])
+        elif isinstance(no, Enquanto):
+            filhos = [no.comando]
+        else:
+            filhos = []
+        espera = isinstance(no, (Leitura, Escrita, Enquanto))
+        for filho in filhos:
+            if marcar(filho):
+                espera = True
+        if espera:
+            encontrados.add(id(no))
+        return espera
+
+    for comando in programa.comandos:
+        marcar(comando)
+    ids = _comandos_com_espera[programa] = frozenset(encontrados)
+    return ids
+
+class InterpretadorAssincrono(Interpretador):
+    """Interpretador para asyncio: uma sessão por tarefa, muitas sessões por event loop.
+
+    'ler' aguarda a fonte de entrada e 'escrever' aguarda o destino de saída; laços
+    cedem o controle ao event loop a cada `intervalo_cessao` iterações (somadas entre
+    todos os laços), para que um programa ocupado não atrase as demais sessões.
+    """
+
+    def __init__(self, entrada: EntradaAssincrona, saida: SaidaAssincrona,
+                 limite_iteracoes: Optional[int] = 1000, intervalo_cessao: int = 256):
+        super().__init__(limite_iteracoes=limite_iteracoes)
+        self.entrada_assincrona = entrada
+        self.saida_assincrona = saida
+        self.intervalo_cessao = intervalo_cessao
+        self._ate_cessao = intervalo_cessao
+        self._com_espera: FrozenSet[int] = frozenset()
+
+    async def interpretar(self, programa: Programa) -> bool:
+        """Executa o programa; erros de execução são enviados ao destino de saída"""
+        self._com_espera = comandos_com_espera(programa)
+        try:
+            for declaracao in programa.declaracoes:
+                declaracao.aceitar(self)
+            for comando in programa.comandos:
+                await self.executar(comando)
+            return True
+        except RuntimeError as e:
+            await self.saida_assincrona(f"Erro de execução: {e}\n")
+            return False
+        except ExecucaoInterrompida:
+            await self.saida_assincrona("\nExecução interrompida pelo usuário\n")
+            return False
+
+    async def executar(self, no: Comando):
+        if id(no) not in self._com_espera:
+            no.aceitar(self)
+            return
+
+        tipo = type(no)
+        if tipo is Escrita:
+            await self.saida_assincrona(self.texto_escrita(no) + "\n")
+        elif tipo is Leitura:
+            await self.executar_leitura(no)
+        elif tipo is Enquanto:
+            await self.executar_enquanto(no)
+        elif tipo is Bloco:
+            for comando in no.comandos:
+                await self.executar(comando)
+        elif tipo is Se:
+            if valor_logico(no.condicao.aceitar(self)):
+                await self.executar(no.comando_entao)
+            elif no.comando_senao:
+                await self.executar(no.comando_senao)
+
+    async def executar_leitura(self, no: Leitura):
+        for variavel in no.variaveis:
+            try:
+                entrada = await self.entrada_assincrona(f"Digite o valor para {variavel}: ")
+            except EOFError:
+                entrada = None
+            aviso = self.atribuir_leitura(variavel, entrada, no)
+            if aviso:
+                await self.saida_assincrona(aviso + "\n")
+
+    async def executar_enquanto(self, no: Enquanto):
+        iteracao = 0
+
+        while True:
+            iteracao += 1
+
+            if not valor_logico(no.condicao.aceitar(self)):
+                break
+
+            await self.executar(no.comando)
+
+            # Proteção contra loop infinito
+            if self.limite_iteracoes is not None and iteracao > self.limite_iteracoes:
+                await self.confirmar_continuacao_assincrona(iteracao)
+
+            self._ate_cessao -= 1
+            if not self._ate_cessao:
+                self._ate_cessao = self.intervalo_cessao
+                await asyncio.sleep(0)
+
+    async def confirmar_continuacao_assincrona(self, iteracao: int):
+        """Pergunta à sessão se um laço longo deve continuar"""
+        try:
+            resposta = await self.entrada_assincrona(
+                f"\nLoop executou {iteracao} vezes. Continuar? (s/n): ")
+        except EOFError:
+            resposta = ""
+        if resposta.strip().lower() != 's':
+            raise ExecucaoInterrompida()
+
+class SessaoLocal:
+    """Transporte local (para testes e benchmarks) no lugar de um terminal remoto.
+
+    Com `entradas`, as linhas são entregues em ordem e a entrada termina depois
+    delas; sem `entradas`, as linhas chegam por enviar() até fechar(). Com `atraso`
+    (segundos, inclusive 0), cada leitura espera antes de ser entregue, como em uma
+    conexão real. Prompts e saída ficam acumulados em `texto`. Deve ser criada dentro
+    do event loop.
+    """
+
+    def __init__(self, entradas: Optional[Iterable[str]] = None, atraso: Optional[float] = None):
+        self.fila: asyncio.Queue = asyncio.Queue()
+        self.atraso = atraso
+        self.partes: List[str] = []
+        self.sucesso: Optional[bool] = None
+        if entradas is not None:
+            for linha in entradas:
+                self.fila.put_nowait(linha)
+            self.fechar()
+
+    def enviar(self, linha: str):
+        self.fila.put_nowait(linha)
+
+    def fechar(self):
+        self.fila.put_nowait(None)
+
+    async def ler(self, prompt: str) -> str:
+        self.partes.append(prompt)
+        if self.atraso is not None:
+            await asyncio.sleep(self.atraso)
+        linha = await self.fila.get()
+        if linha is None:
+            raise EOFError()
+        return linha
+
+    async def escrever(self, texto: str):
+        self.partes.append(texto)
+
+    @property
+    def texto(self) -> str:
+        return "".join(self.partes)
+
+async def executar_sessao(programa: Programa, entrada: EntradaAssincrona, saida: SaidaAssincrona,
+                          limite_iteracoes: Optional[int] = 1000, intervalo_cessao: int = 256) -> bool:
+    """Executa uma AST verificada em uma sessão, com a semântica de inteiros do programa"""
+    classe = classe_para_modo(InterpretadorAssincrono, programa.modo_inteiro)
+    interpretador = classe(entrada, saida, limite_iteracoes=limite_iteracoes,
+                           intervalo_cessao=intervalo_cessao)
+    return await interpretador.interpretar(programa)
+
+async def executar_sessoes(programa: Programa, entradas: List[List[str]],
+                           **opcoes) -> List[SessaoLocal]:
+    """Executa a mesma AST em várias sessões locais concorrentes no event loop atual"""
+    sessoes = [SessaoLocal(linhas) for linhas in entradas]
+    resultados = await asyncio.gather(*(executar_sessao(programa, sessao.ler, sessao.escrever, **opcoes)
+                                        for sessao in sessoes))
+    for sessao, sucesso in zip(sessoes, resultados):
+        sessao.sucesso = sucesso
+    return sessoes
@@ -1,5 +1,9 @@
+from __future__ import annotations
+import sys
 from abc import ABC, abstractmethod
-from typing import List, Any, Optional
+
+from inteiros import formatar_valor
+from simbolos import Simbolo
 
 class NoAST(ABC):
     """Classe base para todos os nós da árvore sintática"""
@@ -13,18 +17,19 @@ class NoAST(ABC):
         pass
 
 class Programa(NoAST):
-    def __init__(self, nome: str, declaracoes: List['Declaracao'], 
-                 comandos: List['Comando'], linha: int = 0, coluna: int = 0):
+    def __init__(self, nome: str, declaracoes: list[Declaracao], 
+                 comandos: list[Comando], linha: int = 0, coluna: int = 0):
         super().__init__(linha, coluna)
         self.nome = nome
         self.declaracoes = declaracoes
         self.comandos = comandos
+        self.modo_inteiro = None  # Definido pela análise semântica
     
     def aceitar(self, visitor):
         return visitor.visitar_programa(self)
 
 class Declaracao(NoAST):
-    def __init__(self, variaveis: List[str], tipo: str, linha: int = 0, coluna: int = 0):
+    def __init__(self, variaveis: list[Simbolo], tipo: str, linha: int = 0, coluna: int = 0):
         super().__init__(linha, coluna)
         self.variaveis = variaveis
         self.tipo = tipo
@@ -37,7 +42,7 @@ class Comando(NoAST):
     pass
 
 class Atribuicao(Comando):
-    def __init__(self, variavel: str, expressao: 'Expressao', linha: int = 0, coluna: int = 0):
+    def __init__(self, variavel: Simbolo, expressao: 'Expressao', linha: int = 0, coluna: int = 0):
         super().__init__(linha, coluna)
         self.variavel = variavel
         self.expressao = expressao
@@ -46,7 +51,7 @@ class Atribuicao(Comando):
         return visitor.visitar_atribuicao(self)
 
 class Leitura(Comando):
-    def __init__(self, variaveis: List[str], linha: int = 0, coluna: int = 0):
+    def __init__(self, variaveis: list[Simbolo], linha: int = 0, coluna: int = 0):
         super().__init__(linha, coluna)
         self.variaveis = variaveis
     
@@ -54,7 +59,7 @@ class Leitura(Comando):
         return visitor.visitar_leitura(self)
 
 class Escrita(Comando):
-    def __init__(self, expressoes: List['Expressao'], linha: int = 0, coluna: int = 0):
+    def __init__(self, expressoes: list[Expressao], linha: int = 0, coluna: int = 0):
         super().__init__(linha, coluna)
         self.expressoes = expressoes
     
@@ -62,7 +67,7 @@ class Escrita(Comando):
         return visitor.visitar_escrita(self)
 
 class Bloco(Comando):
-    def __init__(self, comandos: List[Comando], linha: int = 0, coluna: int = 0):
+    def __init__(self, comandos: list[Comando], linha: int = 0, coluna: int = 0):
         super().__init__(linha, coluna)
         self.comandos = comandos
     
@@ -71,7 +76,7 @@ class Bloco(Comando):
 
 class Se(Comando):
     def __init__(self, condicao: 'Expressao', comando_entao: Comando,
-                 comando_senao: Optional[Comando] = None, linha: int = 0, coluna: int = 0):
+                 comando_senao: Comando | None = None, linha: int = 0, coluna: int = 0):
         super().__init__(linha, coluna)
         self.condicao = condicao
         self.comando_entao = comando_entao
@@ -116,7 +121,7 @@ class ExpressaoUnaria(Expressao):
         return visitor.visitar_expressao_unaria(self)
 
 class Variavel(Expressao):
-    def __init__(self, nome: str, linha: int = 0, coluna: int = 0):
+    def __init__(self, nome: Simbolo, linha: int = 0, coluna: int = 0):
         super().__init__(linha, coluna)
         self.nome = nome
     
@@ -196,31 +201,57 @@ class VisitorAST(ABC):
         pass
 
 class ImpressorArvore(VisitorAST):
-    """Visitor para imprimir a árvore sintática como uma árvore real no terminal"""
+    """Visitor para imprimir a árvore sintática como uma árvore real no terminal
+    
+    O prefixo de cada nível é guardado já concatenado (custo constante por nó) e as
+    linhas são acumuladas e escritas no destino em blocos.
+    """
     
-    def __init__(self):
+    LINHAS_POR_ESCRITA = 4096
+    
+    def __init__(self, saida=None):
         self.prefixos = []
+        # acumulados[k]: linhas de conexão dos k primeiros níveis de self.prefixos
+        self.acumulados = [""]
+        self.saida = saida if saida is not None else sys.stdout
+        self.linhas = []
+    
+    def _entrar(self, continua: bool):
+        self.acumulados.append(self.acumulados[-1] + ("│   " if continua else "    "))
+        self.prefixos.append(continua)
+    
+    def _sair(self):
+        self.prefixos.pop()
+        self.acumulados.pop()
     
     def _obter_prefixo(self, eh_ultimo=True):
         """Gera o prefixo com linhas de conexão da árvore"""
         if not self.prefixos:
             return ""
         
-        prefixo = ""
-        for i in range(len(self.prefixos) - 1):
-            if self.prefixos[i]:
-                prefixo += "│   "
-            else:
-                prefixo += "    "
+        # Linhas de conexão de todos os níveis exceto o atual
+        prefixo = self.acumulados[-2]
         
         if eh_ultimo:
             return prefixo + "└── "
         else:
             return prefixo + "├── "
     
+    def _escrever(self, linha: str):
+        self.linhas.append(linha)
+        if len(self.linhas) >= self.LINHAS_POR_ESCRITA:
+            self.descarregar()
+    
+    def descarregar(self):
+        """Escreve no destino as linhas acumuladas"""
+        if self.linhas:
+            self.linhas.append("")
+            self.saida.write("\n".join(self.linhas))
+            self.linhas = []
+    
     def _imprimir_no(self, texto, eh_ultimo=True):
         """Imprime um nó com as conexões apropriadas"""
-        print(self._obter_prefixo(eh_ultimo) + texto)
+        self._escrever(self._obter_prefixo(eh_ultimo) + texto)
     
     def _processar_filhos(self, filhos, funcao_processar):
         """Processa uma lista de filhos mantendo a estrutura da árvore"""
@@ -229,12 +260,12 @@ class ImpressorArvore(VisitorAST):
         
         for i, filho in enumerate(filhos):
             eh_ultimo = (i == len(filhos) - 1)
-            self.prefixos.append(not eh_ultimo)
+            self._entrar(not eh_ultimo)
             funcao_processar(filho)
-            self.prefixos.pop()
+            self._sair()
     
     def visitar_programa(self, no: Programa):
-        print(f"Programa: {no.nome}")
+        self._escrever(f"Programa: {no.nome}")
         
         # Coletar todos os filhos em ordem
         filhos = []
@@ -250,24 +281,24 @@ class ImpressorArvore(VisitorAST):
         # Processar filhos
         for i, (tipo, filho) in enumerate(filhos):
             eh_ultimo = (i == len(filhos) - 1)
-            self.prefixos.append(not eh_ultimo)
+            self._entrar(not eh_ultimo)
             filho.aceitar(self)
-            self.prefixos.pop()
+            self._sair()
     
     def visitar_declaracao(self, no: Declaracao):
-        vars_str = ", ".join(no.variaveis)
+        vars_str = ", ".join(map(str, no.variaveis))
         self._imprimir_no(f"Declaracao: {vars_str} : {no.tipo}")
     
     def visitar_atribuicao(self, no: Atribuicao):
         self._imprimir_no(f"Atribuicao: {no.variavel} :=")
         
         # Processar expressão do lado direito
-        self.prefixos.append(False)
+        self._entrar(False)
         no.expressao.aceitar(self)
-        self.prefixos.pop()
+        self._sair()
     
     def visitar_leitura(self, no: Leitura):
-        vars_str = ", ".join(no.variaveis)
+        vars_str = ", ".join(map(str, no.variaveis))
         self._imprimir_no(f"Leitura: {vars_str}")
     
     def visitar_escrita(self, no: Escrita):
@@ -301,82 +332,84 @@ class ImpressorArvore(VisitorAST):
         # Processar cada parte
         for i, (tipo, componente) in enumerate(filhos):
             eh_ultimo = (i == len(filhos) - 1)
-            self.prefixos.append(not eh_ultimo)
+            self._entrar(not eh_ultimo)
             
             if tipo == 'condicao':
                 self._imprimir_no("Condicao")
-                self.prefixos.append(False)
+                self._entrar(False)
                 componente.aceitar(self)
-                self.prefixos.pop()
+                self._sair()
             elif tipo == 'entao':
                 self._imprimir_no("Entao")
-                self.prefixos.append(False)
+                self._entrar(False)
                 componente.aceitar(self)
-                self.prefixos.pop()
+                self._sair()
             elif tipo == 'senao':
                 self._imprimir_no("Senao")
-                self.prefixos.append(False)
+                self._entrar(False)
                 componente.aceitar(self)
-                self.prefixos.pop()
+                self._sair()
             
-            self.prefixos.pop()
+            self._sair()
     
     def visitar_enquanto(self, no: Enquanto):
         self._imprimir_no("Enquanto")
         
         # Condição
-        self.prefixos.append(False)
+        self._entrar(False)
         self._imprimir_no("Condicao")
-        self.prefixos.append(False)
+        self._entrar(False)
         no.condicao.aceitar(self)
-        self.prefixos.pop()
-        self.prefixos.pop()
+        self._sair()
+        self._sair()
         
         # Comando
-        self.prefixos.append(False)
+        self._entrar(False)
         self._imprimir_no("Comando")
-        self.prefixos.append(False)
+        self._entrar(False)
         no.comando.aceitar(self)
-        self.prefixos.pop()
-        self.prefixos.pop()
+        self._sair()
+        self._sair()
     
     def visitar_expressao_binaria(self, no: ExpressaoBinaria):
         self._imprimir_no(f"Op: {no.operador}")
         
         # Operando esquerdo
-        self.prefixos.append(False)
+        self._entrar(False)
         no.esquerda.aceitar(self)
-        self.prefixos.pop()
+        self._sair()
         
         # Operando direito
-        self.prefixos.append(False)
+        self._entrar(False)
         no.direita.aceitar(self)
-        self.prefixos.pop()
+        self._sair()
     
     def visitar_expressao_unaria(self, no: ExpressaoUnaria):
         self._imprimir_no(f"Op: {no.operador} (unario)")
         
         # Operando
-        self.prefixos.append(False)
+        self._entrar(False)
         no.expressao.aceitar(self)
-        self.prefixos.pop()
+        self._sair()
     
     def visitar_variavel(self, no: Variavel):
         self._imprimir_no(f"Var: {no.nome}")
     
     def visitar_numero(self, no: Numero):
-        self._imprimir_no(f"Num: {no.valor}")
+        self._imprimir_no(f"Num: {formatar_valor(no.valor)}")
     
     def visitar_string(self, no: StringLiteral):
         self._imprimir_no(f'String: "{no.valor}"')
 
-def visualizar_ast_grafico(no_raiz: NoAST):
+def visualizar_ast_grafico(no_raiz: NoAST, saida=None):
     """Função para visualizar a AST como uma árvore no terminal"""
-    print("\n" + "="*60)
-    print("                    ÁRVORE SINTÁTICA")
-    print("="*60)
+    saida = saida if saida is not None else sys.stdout
+    saida.write("\n" + "="*60 + "\n")
+    saida.write("                    ÁRVORE SINTÁTICA\n")
+    saida.write("="*60 + "\n")
     
-    impressor = ImpressorArvore()
+    impressor = ImpressorArvore(saida)
     no_raiz.aceitar(impressor)
+    impressor.descarregar()
     
-    print("="*60)
\ No newline at end of file
+    saida.write("="*60 + "\n")
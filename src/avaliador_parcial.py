@@ -0,0 +1,359 @@
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from ast_nodes import *
+from inteiros import MODO_ILIMITADO, MODO_INT64_TRAP, ajustar_int64, cabe_em_int64
+from interpreter import Interpretador, RuntimeError, classe_para_modo, valor_logico
+from simbolos import simbolo
+
+class ResultadoEspecializacao:
+    """Programa residual e quantas das entradas conhecidas foram consumidas na especialização.
+
+    Executar o residual com entradas[entradas_consumidas:] seguidas das entradas
+    desconhecidas produz a mesma saída que o programa original com todas elas.
+    """
+
+    def __init__(self, programa: Programa, entradas_consumidas: int, passos_estaticos: int):
+        self.programa = programa
+        self.entradas_consumidas = entradas_consumidas
+        self.passos_estaticos = passos_estaticos
+
+def _constante(valor, no: NoAST) -> Expressao:
+    if isinstance(valor, str):
+        constante = StringLiteral(valor, no.linha, no.coluna)
+        constante.tipo = 'string'
+    else:
+        constante = Numero(valor, no.linha, no.coluna)
+        constante.tipo = 'inteiro'
+    return constante
+
+def _eh_constante(no: Expressao) -> bool:
+    return type(no) is Numero or type(no) is StringLiteral
+
+def variaveis_atribuidas(comando: Comando, atribuidas: Optional[Set[Simbolo]] = None) -> Set[Simbolo]:
+    """Variáveis que o comando pode alterar (atribuições e 'ler', em qualquer ramo)"""
+    if atribuidas is None:
+        atribuidas = set()
+    pendentes = [comando]
+    while pendentes:
+        comando = pendentes.pop()
+        if isinstance(comando, Atribuicao):
+            atribuidas.add(comando.variavel)
+        elif isinstance(comando, Leitura):
+            atribuidas.update(comando.variaveis)
+        elif isinstance(comando, Bloco):
+            pendentes.extend(comando.comandos)
+        elif isinstance(comando, Se):
+            pendentes.append(comando.comando_entao)
+            if comando.comando_senao:
+                pendentes.append(comando.comando_senao)
+        elif isinstance(comando, Enquanto):
+            pendentes.append(comando.comando)
+    return atribuidas
+
+class AvaliadorParcial(VisitorAST):
+    """Especializa um Programa verificado em relação a um prefixo conhecido das entradas.
+
+    Os comandos cujo efeito só depende de valores conhecidos são executados aqui
+    (com a aritmética do modo de inteiros do programa) e somem do residual, exceto
+    as escritas, que viram 'escrever' do texto já calculado. Laços com condição
+    conhecida são desenrolados; o que depende de entradas desconhecidas é emitido
+    com as constantes propagadas e os ramos mortos removidos.
+
+    Regras que mantêm a saída idêntica à do programa original:
+    - antes de um 'se'/'enquanto' com condição desconhecida, as variáveis que ele
+      pode alterar recebem no residual o valor conhecido até ali e passam a ser
+      desconhecidas;
+    - um erro de execução em código que certamente executa encerra a
+      especialização: o comando que falha é emitido e o restante é descartado;
+    - quando um 'ler' vai para o residual em um ponto em que o número de leituras
+      anteriores não é conhecido, as entradas conhecidas restantes deixam de ser
+      consumidas e são repassadas ao residual;
+    - um laço desenrolado por mais de limite_passos comandos (ou que deixaria mais
+      de limite_desenrolar comandos no residual) continua como laço no residual.
+
+    Os prompts das leituras feitas aqui e as perguntas "Continuar?" de laços
+    longos não são reproduzidos (como em --sem-limite), e os valores finais das
+    variáveis só são preservados com preservar_variaveis=True.
+    """
+
+    def __init__(self, entradas: Sequence[str] = (), modo_inteiro: Optional[str] = None,
+                 limite_passos: int = 1_000_000, limite_desenrolar: int = 10_000,
+                 preservar_variaveis: bool = False):
+        self.entradas = list(entradas)
+        self.modo_inteiro = modo_inteiro
+        self.limite_passos = limite_passos
+        self.limite_desenrolar = limite_desenrolar
+        self.preservar_variaveis = preservar_variaveis
+
+    def especializar(self, programa: Programa) -> ResultadoEspecializacao:
+        modo_inteiro = self.modo_inteiro or programa.modo_inteiro or MODO_ILIMITADO
+        self.modo = modo_inteiro
+        # Operações sobre constantes usam o próprio interpretador (mesma aritmética e erros)
+        self.calculadora = classe_para_modo(Interpretador, modo_inteiro)(limite_iteracoes=None)
+
+        self.ordem: List[Simbolo] = [variavel for declaracao in programa.declaracoes
+                                     for variavel in declaracao.variaveis]
+        # Valores conhecidos; as variáveis ausentes só têm valor no residual
+        self.conhecidas: Dict[Simbolo, Any] = {variavel: 0 for variavel in self.ordem}
+        # Conhecidas cujo valor no residual já é o conhecido (todas começam em 0)
+        self.sincronizadas: Set[Simbolo] = set(self.ordem)
+        self.consumidas = 0
+        # Falso quando o número de leituras já feitas no residual depende da execução
+        self.entrada_estatica = True
+        self.passos = 0
+        self.encerrado = False
+        self.falhou = False
+        self.residuo: List[Comando] = []
+        self.declaracoes = list(programa.declaracoes)
+
+        programa.aceitar(self)
+
+        if self.preservar_variaveis and not self.encerrado:
+            self.materializar(self.ordem, programa)
+        residual = Programa(programa.nome, self.declaracoes, self.residuo or [self.nada(programa)],
+                            programa.linha, programa.coluna)
+        residual.modo_inteiro = modo_inteiro
+        return ResultadoEspecializacao(residual, self.consumidas, self.passos)
+
+    def nada(self, no: NoAST) -> Comando:
+        """Comando sem efeito, para onde a gramática exige um comando"""
+        if not self.ordem:
+            variavel = simbolo("_nada")
+            self.declaracoes.append(Declaracao([variavel], 'inteiro', no.linha, no.coluna))
+            self.ordem.append(variavel)
+        variavel = self.ordem[0]
+        return Atribuicao(variavel, Variavel(variavel, no.linha, no.coluna), no.linha, no.coluna)
+
+    def emitir(self, comando: Comando):
+        self.residuo.append(comando)
+
+    def materializar(self, variaveis, no: NoAST):
+        """Emite o valor conhecido das variáveis e as torna desconhecidas"""
+        for variavel in self.ordem:
+            if variavel in variaveis and variavel in self.conhecidas:
+                valor = self.conhecidas.pop(variavel)
+                if variavel not in self.sincronizadas:
+                    self.emitir(Atribuicao(variavel, _constante(valor, no), no.linha, no.coluna))
+                self.sincronizadas.discard(variavel)
+
+    def executar(self, comando: Comando):
+        if not self.encerrado:
+            self.passos += 1
+            comando.aceitar(self)
+
+    def dobrar(self, expressao: Expressao) -> Expressao:
+        """Expressão com as variáveis conhecidas substituídas e as constantes calculadas.
+
+        Nunca levanta erro: uma operação que falharia continua no residual (e
+        self.falhou indica que isso aconteceu).
+        """
+        return expressao.aceitar(self)
+
+    def dobrar_comando(self, expressao: Expressao) -> Expressao:
+        self.falhou = False
+        return self.dobrar(expressao)
+
+    # Comandos em código que certamente executa (a execução real acontece aqui)
+
+    def visitar_programa(self, no: Programa):
+        for comando in no.comandos:
+            self.executar(comando)
+
+    def visitar_declaracao(self, no: Declaracao):
+        pass
+
+    def visitar_atribuicao(self, no: Atribuicao):
+        expressao = self.dobrar_comando(no.expressao)
+        if _eh_constante(expressao):
+            if self.conhecidas.get(no.variavel) != expressao.valor:
+                self.sincronizadas.discard(no.variavel)
+            self.conhecidas[no.variavel] = expressao.valor
+            return
+        self.conhecidas.pop(no.variavel, None)
+        self.sincronizadas.discard(no.variavel)
+        self.emitir(Atribuicao(no.variavel, expressao, no.linha, no.coluna))
+        if self.falhou:
+            self.encerrado = True
+
+    def visitar_leitura(self, no: Leitura):
+        for indice, variavel in enumerate(no.variaveis):
+            valor = self.valor_conhecido(variavel)
+            if valor is None:
+                # Esta e as próximas leituras do comando ficam para a execução
+                restantes = no.variaveis[indice:]
+                for restante in restantes:
+                    self.conhecidas.pop(restante, None)
+                    self.sincronizadas.discard(restante)
+                self.emitir(Leitura(restantes, no.linha, no.coluna))
+                self.entrada_estatica = False
+                return
+            if self.conhecidas.get(variavel) != valor:
+                self.sincronizadas.discard(variavel)
+            self.conhecidas[variavel] = valor
+
+    def valor_conhecido(self, variavel: Simbolo) -> Optional[int]:
+        """Consome a próxima entrada conhecida para variavel (None se não houver ou se falharia)"""
+        if not self.entrada_estatica or self.consumidas >= len(self.entradas):
+            return None
+        valor, aviso = self.calculadora.valor_leitura(variavel, self.entradas[self.consumidas])
+        if self.modo != MODO_ILIMITADO and not cabe_em_int64(valor):
+            if self.modo == MODO_INT64_TRAP:
+                return None  # o estouro acontece no residual, na mesma leitura
+            valor = ajustar_int64(valor)
+        self.consumidas += 1
+        if aviso:
+            # O aviso é impresso como uma linha comum
+            aviso_texto = StringLiteral(aviso)
+            aviso_texto.tipo = 'string'
+            self.emitir(Escrita([aviso_texto]))
+        return valor
+
+    def visitar_escrita(self, no: Escrita):
+        self.emitir(self.escrita_residual(no))
+        if self.falhou:
+            self.encerrado = True
+
+    def visitar_bloco(self, no: Bloco):
+        for comando in no.comandos:
+            self.executar(comando)
+
+    def visitar_se(self, no: Se):
+        condicao = self.dobrar_comando(no.condicao)
+        if _eh_constante(condicao):
+            if valor_logico(condicao.valor):
+                self.executar(no.comando_entao)
+            elif no.comando_senao:
+                self.executar(no.comando_senao)
+            return
+        self.residualizar(no)
+
+    def visitar_enquanto(self, no: Enquanto):
+        inicio_residuo = len(self.residuo)
+        while not self.encerrado:
+            condicao = self.dobrar_comando(no.condicao)
+            if not _eh_constante(condicao):
+                break
+            if not valor_logico(condicao.valor):
+                return
+            if self.passos > self.limite_passos or \
+                    len(self.residuo) - inicio_residuo > self.limite_desenrolar:
+                break
+            self.executar(no.comando)
+        if not self.encerrado:
+            # Condição desconhecida ou desenrolamento longo demais: o restante do laço vai para o residual
+            self.residualizar(no)
+
+    def residualizar(self, no: Comando):
+        """Emite um 'se'/'enquanto' a partir do estado atual"""
+        self.materializar(variaveis_atribuidas(no), no)
+        # Só a condição certamente executa; um erro dentro dos ramos não encerra nada
+        self.dobrar_comando(no.condicao)
+        falhou = self.falhou
+        self.emitir(self.residual(no) or self.nada(no))
+        if falhou:
+            self.encerrado = True
+
+    # Comandos que talvez executem (ramos de condição desconhecida): só são reescritos
+
+    def residual(self, comando: Comando) -> Optional[Comando]:
+        """Comando reescrito com as constantes conhecidas (None se não sobrar nada)"""
+        if isinstance(comando, Atribuicao):
+            return Atribuicao(comando.variavel, self.dobrar(comando.expressao),
+                              comando.linha, comando.coluna)
+        if isinstance(comando, Leitura):
+            self.entrada_estatica = False
+            return Leitura(list(comando.variaveis), comando.linha, comando.coluna)
+        if isinstance(comando, Escrita):
+            return self.escrita_residual(comando)
+        if isinstance(comando, Bloco):
+            comandos = [residual for residual in map(self.residual, comando.comandos)
+                        if residual is not None]
+            if not comandos:
+                return None
+            return comandos[0] if len(comandos) == 1 else Bloco(comandos, comando.linha, comando.coluna)
+        if isinstance(comando, Se):
+            condicao = self.dobrar(comando.condicao)
+            if _eh_constante(condicao):
+                escolhido = comando.comando_entao if valor_logico(condicao.valor) else comando.comando_senao
+                return self.residual(escolhido) if escolhido else None
+            senao = self.residual(comando.comando_senao) if comando.comando_senao else None
+            return Se(condicao, self.residual(comando.comando_entao) or self.nada(comando), senao,
+                      comando.linha, comando.coluna)
+        if isinstance(comando, Enquanto):
+            condicao = self.dobrar(comando.condicao)
+            if _eh_constante(condicao) and not valor_logico(condicao.valor):
+                return None
+            return Enquanto(condicao, self.residual(comando.comando) or self.nada(comando),
+                            comando.linha, comando.coluna)
+        raise TypeError(f"Comando desconhecido: {type(comando).__name__}")
+
+    def escrita_residual(self, no: Escrita) -> Escrita:
+        """'escrever' com as partes constantes já formatadas e juntas"""
+        partes: List[Expressao] = []
+        texto: List[str] = []
+        for expressao in map(self.dobrar, no.expressoes):
+            if _eh_constante(expressao):
+                texto.append(self.calculadora.texto_escrita(Escrita([expressao])))
+                continue
+            if texto:
+                partes.append(StringLiteral("".join(texto), no.linha, no.coluna))
+                texto = []
+            partes.append(expressao)
+        if texto or not partes:
+            partes.append(StringLiteral("".join(texto), no.linha, no.coluna))
+        for parte in partes:
+            if type(parte) is StringLiteral:
+                parte.tipo = 'string'
+        return Escrita(partes, no.linha, no.coluna)
+
+    # Expressões
+
+    def calcular(self, no: Expressao, operacao: Expressao) -> Expressao:
+        try:
+            return _constante(operacao.aceitar(self.calculadora), no)
+        except RuntimeError:
+            self.falhou = True
+            return operacao
+
+    def visitar_expressao_binaria(self, no: ExpressaoBinaria) -> Expressao:
+        esquerda = self.dobrar(no.esquerda)
+        direita = self.dobrar(no.direita)
+        operacao = ExpressaoBinaria(esquerda, no.operador, direita, no.linha, no.coluna)
+        operacao.tipo = no.tipo
+        if _eh_constante(esquerda) and _eh_constante(direita):
+            return self.calcular(no, operacao)
+        return operacao
+
+    def visitar_expressao_unaria(self, no: ExpressaoUnaria) -> Expressao:
+        operando = self.dobrar(no.expressao)
+        operacao = ExpressaoUnaria(no.operador, operando, no.linha, no.coluna)
+        operacao.tipo = no.tipo
+        if _eh_constante(operando):
+            return self.calcular(no, operacao)
+        return operacao
+
+    def visitar_variavel(self, no: Variavel) -> Expressao:
+        if no.nome in self.conhecidas:
+            return _constante(self.conhecidas[no.nome], no)
+        return no
+
+    def visitar_numero(self, no: Numero) -> Expressao:
+        return no
+
+    def visitar_string(self, no: StringLiteral) -> Expressao:
+        return no
+
+def especializar_programa(programa: Programa, entradas: Sequence[str] = (),
+                          **opcoes) -> ResultadoEspecializacao:
+    """Função auxiliar: especializa um programa verificado (veja AvaliadorParcial)"""
+    return AvaliadorParcial(entradas, **opcoes).especializar(programa)
+
+def entrada_com_prefixo(prefixo: Sequence[str], entrada):
+    """Fonte de 'ler' que devolve primeiro os valores do prefixo (sem prompt) e depois recorre a entrada"""
+    pendentes = list(reversed(prefixo))
+
+    def ler(prompt: str = "") -> str:
+        if pendentes:
+            return pendentes.pop()
+        return entrada(prompt)
+    return ler
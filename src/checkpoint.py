@@ -0,0 +1,308 @@
+import hashlib
+import marshal
+import os
+import time
+import zlib
+from collections import deque
+from typing import Dict, Any, List, Callable, Optional, TextIO
+
+from ast_nodes import *
+from interpreter import Interpretador, valor_logico
+from simbolos import nomes_variaveis, simbolo
+
+# Cabeçalho do arquivo de checkpoint (formato + versão)
+MAGICO = b"FCKP1"
+
+class CheckpointError(Exception):
+    def __init__(self, mensagem: str):
+        self.mensagem = mensagem
+        super().__init__(f"Erro de checkpoint: {mensagem}")
+
+class EstadoCheckpoint:
+    """Fotografia do estado de execução em uma fronteira de comando"""
+
+    def __init__(self, assinatura: str, caminho: List[int], variaveis: Dict[str, Any],
+                 entradas_consumidas: int, bytes_escritos: int, comandos_executados: int):
+        self.assinatura = assinatura
+        # Índices percorridos em Programa/Bloco, ramo de Se (0/1) e iteração de Enquanto
+        self.caminho = caminho
+        # Valores por nome: ids de símbolos valem apenas no processo que os criou
+        self.variaveis = variaveis
+        self.entradas_consumidas = entradas_consumidas
+        self.bytes_escritos = bytes_escritos
+        self.comandos_executados = comandos_executados
+
+def assinatura_codigo(codigo: str) -> str:
+    """Identifica o código-fonte para evitar retomar um checkpoint de outro programa"""
+    return hashlib.sha256(codigo.encode('utf-8')).hexdigest()[:16]
+
+def salvar_checkpoint(arquivo: str, estado: EstadoCheckpoint):
+    """Grava o checkpoint de forma atômica (arquivo temporário + rename)"""
+    dados = marshal.dumps({
+        'assinatura': estado.assinatura,
+        'caminho': estado.caminho,
+        'variaveis': estado.variaveis,
+        'entradas': estado.entradas_consumidas,
+        'bytes': estado.bytes_escritos,
+        'executados': estado.comandos_executados,
+    })
+    temporario = arquivo + ".tmp"
+    with open(temporario, 'wb') as destino:
+        destino.write(MAGICO + zlib.compress(dados, 1))
+    os.replace(temporario, arquivo)
+
+def carregar_checkpoint(arquivo: str) -> EstadoCheckpoint:
+    try:
+        with open(arquivo, 'rb') as origem:
+            conteudo = origem.read()
+    except OSError as e:
+        raise CheckpointError(f"não foi possível ler '{arquivo}': {e}")
+
+    if not conteudo.startswith(MAGICO):
+        raise CheckpointError(f"'{arquivo}' não é um checkpoint válido")
+
+    try:
+        dados = marshal.loads(zlib.decompress(conteudo[len(MAGICO):]))
+    except (zlib.error, ValueError, EOFError, TypeError):
+        raise CheckpointError(f"'{arquivo}' está corrompido")
+
+    return EstadoCheckpoint(dados['assinatura'], dados['caminho'], dados['variaveis'],
+                            dados['entradas'], dados['bytes'], dados['executados'])
+
+class _EntradaContada:
+    """Envolve a fonte de entrada contando os valores consumidos"""
+
+    def __init__(self, entrada: Callable[[str], str]):
+        self.entrada = entrada
+        self.consumidas = 0
+
+    def __call__(self, prompt: str = "") -> str:
+        valor = self.entrada(prompt)
+        self.consumidas += 1
+        return valor
+
+class _SaidaContada:
+    """Envolve o destino de saída contando os bytes (UTF-8) produzidos"""
+
+    def __init__(self, destino: TextIO):
+        self.destino = destino
+        self.escritos = 0
+
+    def write(self, texto: str):
+        self.escritos += len(texto.encode('utf-8'))
+        return self.destino.write(texto)
+
+    def flush(self):
+        self.destino.flush()
+
+def _percorrer_regiao(no: NoAST, prefixo: List[int], segmentos: Dict[Enquanto, Optional[List[int]]],
+                      pesos: Dict[Enquanto, int]) -> int:
+    """Registra o trecho de caminho até cada Enquanto da região e retorna quantos comandos ela tem.
+
+    A região de um corpo de laço vai até os Enquanto aninhados (exclusive os corpos,
+    que têm sua própria região); o trecho de caminho de um Enquanto é relativo ao
+    laço que o contém. Um nó repetido (árvores compartilhadas) com trechos
+    diferentes fica com None: ninguém abaixo dele grava checkpoints.
+    """
+    tipo = type(no)
+    if tipo is Bloco:
+        return 1 + sum(_percorrer_regiao(comando, prefixo + [indice], segmentos, pesos)
+                       for indice, comando in enumerate(no.comandos))
+    if tipo is Se:
+        quantidade = 1 + _percorrer_regiao(no.comando_entao, prefixo + [0], segmentos, pesos)
+        if no.comando_senao is not None:
+            quantidade += _percorrer_regiao(no.comando_senao, prefixo + [1], segmentos, pesos)
+        return quantidade
+    if tipo is Enquanto:
+        if no not in segmentos:
+            segmentos[no] = prefixo
+            pesos[no] = _percorrer_regiao(no.comando, [], segmentos, pesos)
+        elif segmentos[no] != prefixo:
+            segmentos[no] = None
+    return 1
+
+class InterpretadorComCheckpoint(Interpretador):
+    """Interpretador que grava checkpoints periódicos e sabe retomar a partir deles.
+
+    A posição é o caminho de índices desde o Programa (comando de Programa/Bloco,
+    ramo de Se e iteração de Enquanto). Os checkpoints só são considerados no início
+    de cada iteração de um laço, onde variáveis e contadores de entrada/saída estão
+    consistentes: os comandos são contados em lote (a cada iteração, os comandos do
+    corpo fora dos laços aninhados), e o caminho é montado apenas ao gravar, a
+    partir dos trechos pré-calculados de cada laço e das iterações dos laços ativos.
+    Blocos, Se e os demais comandos executam como no Interpretador.
+    """
+
+    # Intervalo (em comandos) entre consultas ao relógio quando há intervalo de tempo
+    VERIFICAR_RELOGIO_A_CADA = 1024
+
+    def __init__(self, arquivo: str, assinatura: str = "",
+                 intervalo_comandos: Optional[int] = 100000,
+                 intervalo_segundos: Optional[float] = 30.0,
+                 entrada: Optional[Callable[[str], str]] = None,
+                 saida: Optional[TextIO] = None, limite_iteracoes: Optional[int] = 1000):
+        super().__init__(limite_iteracoes=limite_iteracoes)
+        self.entrada = _EntradaContada(entrada if entrada is not None else input)
+        self.saida = _SaidaContada(saida if saida is not None else self.saida)
+
+        self.arquivo = arquivo
+        self.assinatura = assinatura
+        self.intervalo_comandos = intervalo_comandos
+        self.intervalo_segundos = intervalo_segundos
+        self.checkpoints_gravados = 0
+
+        self.comandos_executados = 0
+        # Laço -> trecho do caminho desde o laço que o contém (ou o Programa)
+        self._segmentos: Dict[Enquanto, Optional[List[int]]] = {}
+        # Laço -> comandos contados a cada iteração
+        self._pesos: Dict[Enquanto, int] = {}
+        # [trecho, iteração] de cada laço em execução, do mais externo ao mais interno
+        self._lacos: List[list] = []
+        self._estado_retomada: Optional[EstadoCheckpoint] = None
+        self._agendar(time.monotonic())
+
+    def _agendar(self, agora: float):
+        """Calcula quando o próximo checkpoint deve ser considerado"""
+        infinito = float('inf')
+        if self.intervalo_comandos:
+            self._proximo_por_contagem = self.comandos_executados + self.intervalo_comandos
+        else:
+            self._proximo_por_contagem = infinito
+
+        if self.intervalo_segundos:
+            self._proximo_por_tempo = agora + self.intervalo_segundos
+            self._passo_verificacao = self.VERIFICAR_RELOGIO_A_CADA
+            if self.intervalo_comandos:
+                self._passo_verificacao = min(self._passo_verificacao, self.intervalo_comandos)
+            self._proxima_verificacao = self.comandos_executados + self._passo_verificacao
+        else:
+            self._proximo_por_tempo = infinito
+            self._passo_verificacao = 0
+            self._proxima_verificacao = self._proximo_por_contagem
+
+    def retomar(self, estado: EstadoCheckpoint):
+        """Prepara a próxima execução para continuar do ponto gravado"""
+        if self.assinatura and estado.assinatura != self.assinatura:
+            raise CheckpointError("o checkpoint pertence a outro programa")
+        self._estado_retomada = estado
+
+    def caminho_atual(self) -> Optional[List[int]]:
+        """Caminho até a iteração do laço mais interno em execução (None se ambíguo)"""
+        caminho: List[int] = []
+        for segmento, iteracao in self._lacos:
+            if segmento is None:
+                return None
+            caminho.extend(segmento)
+            caminho.append(iteracao)
+        return caminho
+
+    def estado_atual(self) -> EstadoCheckpoint:
+        return EstadoCheckpoint(self.assinatura, self.caminho_atual() or [],
+                                nomes_variaveis(self.ambiente.variaveis), self.entrada.consumidas,
+                                self.saida.escritos, self.comandos_executados)
+
+    def gravar_checkpoint(self):
+        self.saida.flush()
+        salvar_checkpoint(self.arquivo, self.estado_atual())
+        self.checkpoints_gravados += 1
+        self._agendar(time.monotonic())
+
+    def interpretar(self, programa: Programa):
+        sucesso = super().interpretar(programa)
+        # Um programa concluído não deve ser retomado depois
+        if sucesso and os.path.exists(self.arquivo):
+            os.remove(self.arquivo)
+        return sucesso
+
+    def _verificar_checkpoint(self):
+        """Chamado no início de uma iteração a cada poucos comandos; grava se algum intervalo venceu"""
+        if ((self.comandos_executados >= self._proximo_por_contagem or
+                time.monotonic() >= self._proximo_por_tempo) and self.caminho_atual() is not None):
+            self.gravar_checkpoint()
+        else:
+            self._proxima_verificacao = self.comandos_executados + (
+                self._passo_verificacao or self.intervalo_comandos)
+
+    def visitar_programa(self, no: Programa):
+        for declaracao in no.declaracoes:
+            declaracao.aceitar(self)
+
+        self._segmentos.clear()
+        self._pesos.clear()
+        fora_dos_lacos = sum(_percorrer_regiao(comando, [indice], self._segmentos, self._pesos)
+                             for indice, comando in enumerate(no.comandos))
+
+        estado = self._estado_retomada
+        if estado is None:
+            self.comandos_executados += fora_dos_lacos
+            for comando in no.comandos:
+                comando.aceitar(self)
+            return
+
+        self._estado_retomada = None
+        self.ambiente.variaveis.update((simbolo(nome), valor)
+                                       for nome, valor in estado.variaveis.items())
+        self.entrada.consumidas = estado.entradas_consumidas
+        self.saida.escritos = estado.bytes_escritos
+        self.comandos_executados = estado.comandos_executados
+        self._agendar(time.monotonic())
+        self._continuar(no, deque(estado.caminho))
+
+    def _continuar(self, no: NoAST, passos: deque):
+        """Executa o restante de no a partir da posição dada pelos passos do caminho"""
+        if isinstance(no, (Programa, Bloco)):
+            comandos = no.comandos
+            inicio = passos.popleft() if passos else 0
+            if passos:
+                self._continuar(comandos[inicio], passos)
+                inicio += 1
+            for indice in range(inicio, len(comandos)):
+                comandos[indice].aceitar(self)
+        elif isinstance(no, Se):
+            comando = no.comando_entao if passos.popleft() == 0 else no.comando_senao
+            if passos:
+                self._continuar(comando, passos)
+            elif comando is not None:
+                comando.aceitar(self)
+        elif isinstance(no, Enquanto):
+            self._executar_laco(no, passos.popleft(), passos)
+        else:
+            no.aceitar(self)
+
+    def visitar_enquanto(self, no: Enquanto):
+        self._executar_laco(no, 0, None)
+
+    def _executar_laco(self, no: Enquanto, iteracao: int, passos: Optional[deque]):
+        """Executa o laço; com passos, retoma dentro da iteração (a condição já foi avaliada)"""
+        quadro = [self._segmentos.get(no), iteracao]
+        lacos = self._lacos
+        lacos.append(quadro)
+        peso = self._pesos.get(no, 1)
+        if passos is not None:
+            if passos:
+                self._continuar(no.comando, passos)
+            else:
+                no.comando.aceitar(self)
+            if self.limite_iteracoes is not None and iteracao > self.limite_iteracoes:
+                self.confirmar_continuacao(iteracao, no)
+
+        while valor_logico(no.condicao.aceitar(self)):
+            iteracao += 1
+            quadro[1] = iteracao
+            self.comandos_executados += peso
+            if self.comandos_executados >= self._proxima_verificacao:
+                self._verificar_checkpoint()
+            no.comando.aceitar(self)
+
+            if self.limite_iteracoes is not None and iteracao > self.limite_iteracoes:
+                self.confirmar_continuacao(iteracao, no)
+        lacos.pop()
+
+def pular_entradas(entrada: Callable[[str], str], quantidade: int) -> Callable[[str], str]:
+    """Descarta as entradas já consumidas antes do checkpoint (mesma entrada reenviada)"""
+    for _ in range(quantidade):
+        try:
+            entrada("")
+        except EOFError:
+            break
+    return entrada
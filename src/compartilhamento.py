@@ -0,0 +1,402 @@
+"""Árvores com compartilhamento de subárvores idênticas (hash-consing).
+
+Comandos e expressões estruturalmente iguais (mesma classe, operador, valores,
+variáveis e filhos) são construídos uma única vez e reaproveitados: em programas
+gerados, `contador := contador + 1` repetido mil vezes vira um único nó. Posições
+não fazem parte da estrutura. Em um nó compartilhado, linha e coluna são as da
+primeira ocorrência. A posição de cada ocorrência fica em uma tabela lateral
+(localizacoes.py), indexada pela ordem da ocorrência na pós-ordem da árvore sem
+compartilhamento. Só contam comandos e expressões.
+
+Cada nó único recebe um hash estrutural estável (o mesmo entre processos e
+execuções), que serve como chave de cache e de deduplicação. Análises que
+dependem apenas da estrutura podem ser memorizadas por nó único, como faz
+AnalisadorCompartilhado. Perfis e estatísticas por nó somam as ocorrências de um
+mesmo nó.
+"""
+
+from __future__ import annotations
+
+import copy
+import weakref
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ast_nodes import *
+from localizacoes import CodificadorLocalizacoes, TabelaLocalizacoes
+from parser import Parser
+from semantic import AnalisadorSemantico, SemanticError
+
+# Atributos que formam a estrutura de cada classe, na ordem dos atributos
+ESTRUTURA: Dict[type, Tuple[str, ...]] = {
+    Programa: ('nome', 'declaracoes', 'comandos'),
+    Declaracao: ('variaveis', 'tipo'),
+    Atribuicao: ('variavel', 'expressao'),
+    Leitura: ('variaveis',),
+    Escrita: ('expressoes',),
+    Bloco: ('comandos',),
+    Se: ('condicao', 'comando_entao', 'comando_senao'),
+    Enquanto: ('condicao', 'comando'),
+    ExpressaoBinaria: ('esquerda', 'operador', 'direita'),
+    ExpressaoUnaria: ('operador', 'expressao'),
+    Variavel: ('nome',),
+    Numero: ('valor',),
+    StringLiteral: ('valor',),
+}
+# Atributos da estrutura que são filhos (nó, None ou lista de nós)
+FILHOS: Dict[type, Tuple[str, ...]] = {
+    classe: tuple(nome for nome in atributos
+                  if nome in ('declaracoes', 'expressao', 'expressoes', 'comandos', 'condicao', 'comando_entao',
+                              'comando_senao', 'comando', 'esquerda', 'direita'))
+    for classe, atributos in ESTRUTURA.items()
+}
+
+_tabelas: 'weakref.WeakKeyDictionary[Programa, TabelaCompartilhamento]' = weakref.WeakKeyDictionary()
+
+def tabela_de(programa: Programa) -> Optional['TabelaCompartilhamento']:
+    """Tabela de compartilhamento do programa (None se a árvore não é compartilhada)"""
+    return _tabelas.get(programa)
+
+def _filhos(no: NoAST) -> List[NoAST]:
+    """Filhos na ordem dos atributos (a mesma da pós-ordem das ocorrências)"""
+    filhos = []
+    for nome in FILHOS[type(no)]:
+        valor = getattr(no, nome)
+        if type(valor) is list:
+            filhos.extend(valor)
+        elif valor is not None:
+            filhos.append(valor)
+    return filhos
+
+def _substituir_filhos(no: NoAST, filhos: List[NoAST]):
+    """Troca os filhos do nó (mesma ordem de _filhos) pelos nós de `filhos`"""
+    atributos = vars(no)
+    proximo = 0
+    for nome in FILHOS[type(no)]:
+        valor = atributos[nome]
+        if type(valor) is list:
+            atributos[nome] = filhos[proximo:proximo + len(valor)]
+            proximo += len(valor)
+        elif valor is not None:
+            atributos[nome] = filhos[proximo]
+            proximo += 1
+
+def _chave(no: NoAST) -> tuple:
+    """Estrutura do nó com os filhos já únicos (comparados por identidade)"""
+    partes = [type(no)]
+    for nome in ESTRUTURA[type(no)]:
+        valor = getattr(no, nome)
+        partes.append(tuple(valor) if type(valor) is list else valor)
+    return tuple(partes)
+
+def _hash_no(no: NoAST, hashes: Dict[NoAST, bytes]) -> bytes:
+    """Hash estável do nó; os dos filhos vêm de `hashes`"""
+    def parte(valor) -> bytes:
+        if isinstance(valor, NoAST):
+            return b'n' + hashes[valor]
+        if isinstance(valor, Simbolo):
+            return b'v' + str(valor).encode('utf-8')
+        if isinstance(valor, int):
+            return b'i' + str(valor).encode('ascii')
+        if isinstance(valor, str):
+            return b's' + valor.encode('utf-8')
+        if isinstance(valor, list):
+            return b'[' + b'\0'.join(parte(item) for item in valor) + b']'
+        return b'-' if valor is None else b'r' + repr(valor).encode('utf-8')
+
+    resumo = blake2b(type(no).__name__.encode('ascii'), digest_size=8)
+    for nome in ESTRUTURA[type(no)]:
+        resumo.update(b'\0' + nome.encode('ascii') + b'=' + parte(getattr(no, nome)))
+    return resumo.digest()
+
+def hash_estrutural(raiz: NoAST) -> str:
+    """Hash estrutural estável (hexadecimal) de qualquer subárvore, compartilhada ou não"""
+    hashes: Dict[NoAST, bytes] = {}
+    pendentes = [(raiz, False)]
+    while pendentes:
+        no, expandido = pendentes.pop()
+        if no in hashes:
+            continue
+        if expandido:
+            hashes[no] = _hash_no(no, hashes)
+        else:
+            pendentes.append((no, True))
+            pendentes.extend((filho, False) for filho in reversed(_filhos(no)))
+    return hashes[raiz].hex()
+
+class TabelaCompartilhamento:
+    """Nós únicos, com hash estrutural e tamanho, e posições de todas as ocorrências"""
+
+    def __init__(self):
+        # estrutura -> nó único; a ordem de inserção põe os filhos antes dos pais
+        self._unicos: Dict[tuple, NoAST] = {}
+        self._hashes: Dict[NoAST, bytes] = {}
+        # Ocorrências na subárvore sem compartilhamento (o próprio nó incluído)
+        self._tamanhos: Dict[NoAST, int] = {}
+        self._posicoes = CodificadorLocalizacoes()
+
+    def __len__(self) -> int:
+        """Quantidade de nós únicos"""
+        return len(self._unicos)
+
+    @property
+    def ocorrencias_totais(self) -> int:
+        """Quantidade de ocorrências (nós da árvore sem compartilhamento)"""
+        return self._posicoes.quantidade
+
+    def __contains__(self, no: NoAST) -> bool:
+        return no in self._hashes
+
+    def __repr__(self) -> str:
+        return f"TabelaCompartilhamento({len(self)} nós únicos, {self.ocorrencias_totais} ocorrências)"
+
+    def internar(self, raiz: NoAST) -> NoAST:
+        """Versão única da subárvore, registrando as posições dos nós ainda não internados.
+
+        Os nós novos são percorridos em pós-ordem; filhos que já são únicos foram
+        registrados quando foram internados.
+        """
+        resultados: List[NoAST] = []
+        # (nó, filhos); filhos None enquanto o nó não foi expandido
+        pendentes: list = [(raiz, None)]
+        while pendentes:
+            no, filhos = pendentes.pop()
+            if no in self._hashes:
+                resultados.append(no)
+            elif filhos is None:
+                filhos = _filhos(no)
+                pendentes.append((no, filhos))
+                pendentes.extend((filho, None) for filho in reversed(filhos))
+            else:
+                if filhos:
+                    _substituir_filhos(no, resultados[-len(filhos):])
+                    del resultados[-len(filhos):]
+                resultados.append(self._registrar(no))
+        return resultados[0]
+
+    def _registrar(self, no: NoAST) -> NoAST:
+        self._posicoes.adicionar(no.linha, no.coluna)
+        chave = _chave(no)
+        unico = self._unicos.get(chave)
+        if unico is None:
+            unico = self._unicos[chave] = no
+            self._hashes[no] = _hash_no(no, self._hashes)
+            self._tamanhos[no] = 1 + sum(self._tamanhos[filho] for filho in _filhos(no))
+        return unico
+
+    def hash(self, no: NoAST) -> str:
+        """Hash estrutural estável de um nó único (hexadecimal)"""
+        return self._hashes[no].hex()
+
+    def tamanho(self, no: NoAST) -> int:
+        """Nós da subárvore do nó único se cada ocorrência fosse uma cópia"""
+        return self._tamanhos[no]
+
+    def localizacoes(self) -> TabelaLocalizacoes:
+        """Posições de todas as ocorrências, na pós-ordem da árvore sem compartilhamento"""
+        return self._posicoes.tabela()
+
+    def ocorrencias(self, programa: Programa, nos: Iterable[NoAST]) -> Dict[NoAST, List[int]]:
+        """Índices das ocorrências de cada nó único, em ordem.
+
+        Subárvores que não contêm nenhum dos nós são puladas pelo tamanho, então o
+        custo acompanha as ocorrências dos nós pedidos, não o programa inteiro.
+        """
+        indices: Dict[NoAST, List[int]] = {no: [] for no in nos}
+        # Nós únicos cuja subárvore contém algum dos pedidos (filhos antes dos pais)
+        contem = set(indices)
+        for no in self._unicos.values():
+            if no not in contem and any(filho in contem for filho in _filhos(no)):
+                contem.add(no)
+
+        proximo = 0
+        pendentes = [(comando, False) for comando in reversed(programa.comandos)]
+        while pendentes:
+            no, expandido = pendentes.pop()
+            if expandido:
+                if no in indices:
+                    indices[no].append(proximo)
+                proximo += 1
+            elif no in contem:
+                pendentes.append((no, True))
+                pendentes.extend((filho, False) for filho in reversed(_filhos(no)))
+            else:
+                proximo += self._tamanhos[no]
+        return indices
+
+    def posicoes(self, programa: Programa, no: NoAST) -> List[Tuple[int, int]]:
+        """(linha, coluna) de cada ocorrência do nó único"""
+        indices = self.ocorrencias(programa, [no])[no]
+        return [posicao for _, posicao in self.localizar(indices)]
+
+    def localizar(self, indices: Iterable[int]) -> List[Tuple[int, Tuple[int, int]]]:
+        """(índice, (linha, coluna)) das ocorrências, ordenadas, decodificando a tabela uma vez"""
+        pedidos = sorted(indices)
+        resultado = []
+        proximo = 0
+        for inicio, quantidade, linha, coluna in self.localizacoes().entradas():
+            while proximo < len(pedidos) and pedidos[proximo] < inicio + quantidade:
+                resultado.append((pedidos[proximo], (linha, coluna)))
+                proximo += 1
+            if proximo == len(pedidos):
+                break
+        return resultado
+
+class ParserCompartilhado(Parser):
+    """Parser que constrói a árvore já compartilhada.
+
+    Cada comando e cada expressão completa é internado assim que termina de ser
+    reconhecido. As cópias repetidas viram lixo na hora, e a memória usada pelo
+    parser acompanha a dos nós únicos.
+    """
+
+    def __init__(self, codigo: str, tokens=None, tabela: Optional[TabelaCompartilhamento] = None):
+        super().__init__(codigo, tokens)
+        self.tabela = tabela if tabela is not None else TabelaCompartilhamento()
+        self._profundidade_expressao = 0
+
+    def parse(self) -> Programa:
+        programa = super().parse()
+        _tabelas[programa] = self.tabela
+        return programa
+
+    def comando(self) -> Comando:
+        return self.tabela.internar(super().comando())
+
+    def expressao(self) -> Expressao:
+        # Expressões entre parênteses são internadas junto com a expressão que as contém,
+        # para que as ocorrências sejam registradas em pós-ordem
+        self._profundidade_expressao += 1
+        try:
+            expressao = super().expressao()
+        finally:
+            self._profundidade_expressao -= 1
+        if self._profundidade_expressao:
+            return expressao
+        return self.tabela.internar(expressao)
+
+def compartilhar(programa: Programa) -> TabelaCompartilhamento:
+    """Compartilha as subárvores de um programa já construído (ex.: pelo ParserTabela)"""
+    tabela = _tabelas.get(programa)
+    if tabela is None:
+        tabela = TabelaCompartilhamento()
+        programa.comandos = [tabela.internar(comando) for comando in programa.comandos]
+        _tabelas[programa] = tabela
+    return tabela
+
+def expandir(programa: Programa) -> Programa:
+    """Cópia sem compartilhamento, com a posição de cada ocorrência (ex.: para exportar a AST)"""
+    tabela = _tabelas.get(programa)
+    if tabela is None:
+        return programa
+    posicoes = iter(tabela.localizacoes().decodificar())
+    resultados: List[NoAST] = []
+    pendentes = [(comando, False) for comando in reversed(programa.comandos)]
+    while pendentes:
+        no, expandido = pendentes.pop()
+        if not expandido:
+            pendentes.append((no, True))
+            pendentes.extend((filho, False) for filho in reversed(_filhos(no)))
+            continue
+        copia = copy.copy(no)
+        quantidade = len(_filhos(no))
+        if quantidade:
+            _substituir_filhos(copia, resultados[-quantidade:])
+            del resultados[-quantidade:]
+        copia.linha, copia.coluna = next(posicoes)
+        resultados.append(copia)
+    copia_programa = copy.copy(programa)
+    copia_programa.comandos = resultados
+    return copia_programa
+
+class AnalisadorCompartilhado(AnalisadorSemantico):
+    """Análise semântica que visita cada nó único uma vez.
+
+    A análise de um comando ou expressão depende só da estrutura, porque as
+    declarações são globais. Quando a visita chega de novo a um nó já analisado,
+    os erros da primeira visita à sua subárvore são repetidos nesta ocorrência,
+    na mesma ordem em que o AnalisadorSemantico os registraria.
+    """
+
+    def analisar(self, programa: Programa) -> list[SemanticError]:
+        self._tabela = _tabelas.get(programa)
+        # nó -> (início da subárvore na primeira visita, faixa de _emitidos registrada nela)
+        self._analisados: Dict[NoAST, Tuple[int, int, int]] = {}
+        # (índice da ocorrência dona ou None, erro), na ordem da visita
+        self._emitidos: List[Tuple[Optional[int], SemanticError]] = []
+        self._registrados = 0
+        # [nó, início da subárvore, filhos, inícios dos filhos, próximo filho a procurar]
+        self._visitando: List[list] = [[programa, 0, programa.comandos, None, 0]]
+        erros = super().analisar(programa)
+        if self._tabela is None or not erros:
+            return erros
+
+        self._atribuir_erros(None)
+        posicoes = dict(self._tabela.localizar(indice for indice, _ in self._emitidos if indice is not None))
+        self.erros = [erro if indice is None else SemanticError(erro.mensagem, *posicoes[indice])
+                      for indice, erro in self._emitidos]
+        return self.erros
+
+    def _atribuir_erros(self, dono: Optional[int]):
+        """Erros ainda não emitidos são da ocorrência em visita quando foram registrados"""
+        self._emitidos.extend((dono, erro) for erro in self.erros[self._registrados:])
+        self._registrados = len(self.erros)
+
+    def _inicio_ocorrencia(self, no: NoAST) -> int:
+        """Início, na pós-ordem, da subárvore desta ocorrência de `no` (filho do nó em visita)"""
+        quadro = self._visitando[-1]
+        _, inicio, filhos, inicios, proximo = quadro
+        if inicios is None:
+            inicios = quadro[3] = []
+            for filho in filhos:
+                inicios.append(inicio)
+                inicio += self._tabela.tamanho(filho)
+        # Os filhos são visitados na ordem de _filhos, alguns podem ser pulados
+        # (o alvo de uma atribuição), então a busca continua de onde parou
+        for posicao in range(proximo, len(filhos)):
+            if filhos[posicao] is no:
+                quadro[4] = posicao + 1
+                return inicios[posicao]
+        raise ValueError(f"{type(no).__name__} visitado fora do nó em visita")
+
+    def _dono_atual(self) -> Optional[int]:
+        if len(self._visitando) == 1:
+            return None
+        no, inicio = self._visitando[-1][:2]
+        return inicio + self._tabela.tamanho(no) - 1
+
+def _memorizar(visitar):
+    def visitar_uma_vez(self, no):
+        if self._tabela is None:
+            return visitar(self, no)
+        self._atribuir_erros(self._dono_atual())
+        inicio = self._inicio_ocorrencia(no)
+        anterior = self._analisados.get(no)
+        if anterior is not None:
+            inicio_anterior, de, ate = anterior
+            self._emitidos.extend((indice - inicio_anterior + inicio, erro)
+                                  for indice, erro in self._emitidos[de:ate])
+            return None
+        de = len(self._emitidos)
+        self._visitando.append([no, inicio, _filhos(no), None, 0])
+        try:
+            return visitar(self, no)
+        finally:
+            self._atribuir_erros(self._dono_atual())
+            self._visitando.pop()
+            self._analisados[no] = (inicio, de, len(self._emitidos))
+    visitar_uma_vez.__name__ = visitar.__name__
+    return visitar_uma_vez
+
+for _nome in ('visitar_atribuicao', 'visitar_leitura', 'visitar_escrita', 'visitar_bloco',
+              'visitar_se', 'visitar_enquanto', 'visitar_expressao_binaria',
+              'visitar_expressao_unaria', 'visitar_variavel', 'visitar_numero', 'visitar_string'):
+    setattr(AnalisadorCompartilhado, _nome, _memorizar(getattr(AnalisadorSemantico, _nome)))
+
+# Nomes em inglês
+SharingTable = TabelaCompartilhamento
+HashConsingParser = ParserCompartilhado
+SharedSemanticAnalyzer = AnalisadorCompartilhado
+share = compartilhar
+expand = expandir
+structural_hash = hash_estrutural
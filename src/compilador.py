@@ -0,0 +1,186 @@
+import io
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Union
+
+from lexer import Lexer, LexerError
+from parser import Parser, ParserError
+from semantic import analisar_semantica
+from ast_nodes import Enquanto, Programa
+from interpreter import Interpretador, RuntimeError, classe_para_modo
+from inteiros import MODO_ILIMITADO
+from estatisticas import EstatisticasExecucao, InterpretadorEstatisticas
+from simbolos import nomes_variaveis
+
+class ErroCompilacao(Exception):
+    """Falha na análise léxica, sintática ou semântica; `erros` traz as exceções originais"""
+
+    def __init__(self, erros: List[Exception]):
+        self.erros = erros
+        self.mensagem = "; ".join(str(erro) for erro in erros)
+        super().__init__(f"Erro de compilação: {self.mensagem}")
+
+class LimiteExcedido(RuntimeError):
+    """Laço passou do limite de iterações de ProgramaCompilado.executar"""
+
+class _InterpretadorEmbutido(Interpretador):
+    """Sem interação com o terminal: avisos vão para a saída e laços longos viram erro"""
+
+    def avisar(self, mensagem: str):
+        self.saida.write(mensagem + "\n")
+
+    def confirmar_continuacao(self, iteracao: int, no: Optional[Enquanto] = None):
+        raise LimiteExcedido(f"Laço excedeu o limite de {self.limite_iteracoes} iterações",
+                             no.linha if no else 0, no.coluna if no else 0)
+
+class _InterpretadorEmbutidoEstatisticas(InterpretadorEstatisticas, _InterpretadorEmbutido):
+    pass
+
+class ResultadoExecucao:
+    __slots__ = ('sucesso', 'saida', 'variaveis', 'erro', 'estatisticas')
+
+    def __init__(self, sucesso: bool, saida: Optional[str], variaveis: Dict[str, Any],
+                 erro: Optional[RuntimeError], estatisticas: Optional[EstatisticasExecucao] = None):
+        self.sucesso = sucesso
+        # Texto escrito pelo programa (None quando um destino foi passado a executar)
+        self.saida = saida
+        self.variaveis = variaveis
+        self.erro = erro
+        # Contadores da execução (apenas com executar(..., estatisticas=True))
+        self.estatisticas = estatisticas
+
+    def __repr__(self) -> str:
+        return f"ResultadoExecucao(sucesso={self.sucesso}, erro={self.erro!r})"
+
+    # Nomes em inglês
+    @property
+    def success(self) -> bool:
+        return self.sucesso
+
+    @property
+    def output(self) -> Optional[str]:
+        return self.saida
+
+    @property
+    def variables(self) -> Dict[str, Any]:
+        return self.variaveis
+
+    @property
+    def error(self) -> Optional[RuntimeError]:
+        return self.erro
+
+    @property
+    def statistics(self) -> Optional[EstatisticasExecucao]:
+        return self.estatisticas
+
+_FIM = object()
+
+def _fonte_entradas(entradas: Union[Iterable[Any], Callable[[str], str], None]) -> Callable[[str], str]:
+    if callable(entradas):
+        return entradas
+    valores = iter(entradas if entradas is not None else ())
+
+    def entrada(prompt: str = "") -> str:
+        valor = next(valores, _FIM)
+        if valor is _FIM:
+            raise EOFError()
+        return str(valor)
+    return entrada
+
+class ProgramaCompilado:
+    """Programa verificado uma única vez e executável muitas vezes.
+
+    A AST não é alterada pela execução; cada chamada de executar usa um
+    interpretador e um ambiente novos, copiados do estado inicial já pronto,
+    então chamadas repetidas e concorrentes (em threads diferentes) são seguras.
+    """
+
+    def __init__(self, ast: Programa, codigo: str):
+        self.ast = ast
+        self.codigo = codigo
+        self.modo_inteiro = ast.modo_inteiro
+        self._classe = classe_para_modo(_InterpretadorEmbutido, ast.modo_inteiro)
+        self._classe_estatisticas = classe_para_modo(_InterpretadorEmbutidoEstatisticas,
+                                                     ast.modo_inteiro)
+        # Estado inicial: todas as variáveis declaradas valendo 0
+        self._variaveis_iniciais = {variavel: 0 for declaracao in ast.declaracoes
+                                    for variavel in declaracao.variaveis}
+        self._custo = None
+
+    @property
+    def nome(self) -> str:
+        return self.ast.nome
+
+    def executar(self, entradas: Union[Iterable[Any], Callable[[str], str], None] = None,
+                 saida: Optional[TextIO] = None,
+                 limite_iteracoes: Optional[int] = None,
+                 estatisticas: bool = False) -> ResultadoExecucao:
+        """Executa o programa.
+
+        entradas: valores para 'ler', em ordem (ou uma função com a assinatura de input);
+        ao acabarem, a leitura recebe 0 como no fim da entrada padrão.
+        saida: destino de 'escrever' (objeto com write); sem ele, o texto volta no resultado.
+        limite_iteracoes: iterações permitidas por laço (None = sem limite); ao passar
+        dele a execução termina com LimiteExcedido em vez de pedir confirmação.
+        estatisticas: conta comandos por tipo, iterações, leituras e escritas
+        (veja estatisticas.py) e as devolve em ResultadoExecucao.estatisticas.
+        """
+        destino = saida if saida is not None else io.StringIO()
+        classe = self._classe_estatisticas if estatisticas else self._classe
+        interpretador = classe(
+            entrada=_fonte_entradas(entradas), saida=destino, limite_iteracoes=limite_iteracoes)
+        variaveis = interpretador.ambiente.variaveis = dict(self._variaveis_iniciais)
+
+        erro = None
+        try:
+            if estatisticas:
+                interpretador.executar_comandos(self.ast, self.ast.comandos)
+            else:
+                for comando in self.ast.comandos:
+                    comando.aceitar(interpretador)
+        except RuntimeError as e:
+            erro = e
+
+        texto = destino.getvalue() if saida is None else None
+        return ResultadoExecucao(erro is None, texto, nomes_variaveis(variaveis), erro,
+                                 interpretador.estatisticas() if estatisticas else None)
+
+    def custo(self) -> 'EstimativaCusto':
+        """Limites estáticos de comandos, iterações e tamanho dos inteiros em função
+        das entradas (veja custo.py), calculados na primeira chamada"""
+        if self._custo is None:
+            from custo import estimar_custo
+            self._custo = estimar_custo(self.ast)
+        return self._custo
+
+    # Nomes em inglês
+    run = executar
+    cost = custo
+
+def compilar(codigo: str, modo_inteiro: str = MODO_ILIMITADO,
+             compartilhar: bool = False) -> ProgramaCompilado:
+    """Análise léxica, sintática e semântica uma única vez; levanta ErroCompilacao
+
+    Com compartilhar=True, subárvores idênticas são construídas uma vez (compartilhamento.py).
+    """
+    classe_parser = Parser
+    if compartilhar:
+        from compartilhamento import ParserCompartilhado as classe_parser
+    try:
+        ast = classe_parser(codigo, Lexer(codigo).tokenizar()).parse()
+    except (LexerError, ParserError) as e:
+        raise ErroCompilacao([e]) from None
+    if compartilhar:
+        # Em árvores compartilhadas, cada nó único é analisado uma vez
+        from compartilhamento import AnalisadorCompartilhado
+        erros = AnalisadorCompartilhado(modo_inteiro).analisar(ast)
+    else:
+        erros = analisar_semantica(ast, modo_inteiro)
+    if erros:
+        raise ErroCompilacao(erros)
+    return ProgramaCompilado(ast, codigo)
+
+# Nomes em inglês da API
+compile_program = compilar
+CompiledProgram = ProgramaCompilado
+CompilationError = ErroCompilacao
+ExecutionResult = ResultadoExecucao
+LimitExceeded = LimiteExcedido
@@ -0,0 +1,962 @@
+"""Estimativa estática do custo de um programa verificado, antes de executá-lo.
+
+Deduz limites superiores simbólicos, em função dos valores lidos por 'ler', para:
+
+- as iterações de cada 'enquanto' com variável de indução reconhecível: uma única
+  atribuição por volta (i := i + c, i := i - c, i := i * k ou i := i / k, com c e k
+  constantes) e condição comparando i com um limite que o laço não altera, como
+  em 'enquanto i <= numero faca ... i := i + 1'; laços aninhados multiplicam os limites;
+- os comandos executados e os bytes escritos, nas mesmas contagens de estatisticas.py;
+- o tamanho em bits dos inteiros calculados, incluindo o crescimento por
+  multiplicações e somas repetidas dentro de laços.
+
+EstimativaCusto guarda as fórmulas e as avalia para entradas concretas, de modo que
+quem agenda execuções preveja tempo e memória e recuse ou encaminhe programas caros
+antes de começar (veja PoolTrabalhadores(limite_comandos=...)). Um limite nunca é
+menor que o custo real, mas pode não existir: laços fora dos padrões, leituras dentro
+de laços e fórmulas grandes demais ficam sem limite conhecido (None).
+"""
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ast_nodes import *
+from inteiros import (INT64_MAX, INT64_MIN, MODO_ILIMITADO, MODO_INT64, MODO_INT64_TRAP,
+                      ajustar_int64, cabe_em_int64, formatar_valor, inteiro_de_texto)
+
+# Fórmulas com mais nós que isto são descartadas (viram None)
+TAMANHO_MAXIMO = 4096
+# Expoente máximo de 2^x na avaliação; acima dele o valor satura
+EXPOENTE_MAXIMO = 1 << 16
+# Inteiros vivos além das variáveis (operandos e resultado de uma operação)
+TEMPORARIOS = 3
+
+_PRECEDENCIA = {'+': 1, '-': 1, '*': 2, '/': 2}
+
+class _Indefinido(Exception):
+    """Fórmula sem valor para estas entradas"""
+
+class Formula:
+    """Expressão simbólica imutável sobre os valores lidos (crie com as funções abaixo).
+
+    Operadores: '#' (constante), 'ler' (valor lido), '+', '-', '*', '/' (divisão
+    inteira para baixo), 'max', 'min', 'bits' (bit_length do valor absoluto),
+    'raiz' (raiz quadrada inteira, 0 para negativos), '2^', 'int64' (o valor, se os limites dados couberem em 64 bits) e
+    'comandos' (total de comandos executados, conhecido só na avaliação).
+    """
+
+    __slots__ = ('operador', 'operandos', 'tamanho', '_hash')
+
+    def __init__(self, operador: str, operandos: tuple, tamanho: int = 1):
+        self.operador = operador
+        self.operandos = operandos
+        self.tamanho = tamanho
+        self._hash = hash((operador, operandos))
+
+    def __eq__(self, outra) -> bool:
+        return (isinstance(outra, Formula) and self._hash == outra._hash
+                and self.operador == outra.operador and self.operandos == outra.operandos)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    @property
+    def constante(self) -> Optional[int]:
+        return self.operandos[0] if self.operador == '#' else None
+
+    def avaliar(self, valores: Sequence[int], total: Optional[int] = None) -> Optional[int]:
+        """Valor para os valores lidos, em ordem (os que faltam valem 0); None se indefinido"""
+        try:
+            return self._avaliar(valores, total)
+        except _Indefinido:
+            return None
+
+    def _avaliar(self, valores: Sequence[int], total: Optional[int]) -> int:
+        operador = self.operador
+        if operador == '#':
+            return self.operandos[0]
+        if operador == 'ler':
+            indice = self.operandos[0]
+            return valores[indice] if indice < len(valores) else 0
+        if operador == 'comandos':
+            if total is None:
+                raise _Indefinido()
+            return total
+        argumentos = [operando._avaliar(valores, total) for operando in self.operandos]
+        if operador == '+':
+            return argumentos[0] + argumentos[1]
+        if operador == '-':
+            return argumentos[0] - argumentos[1]
+        if operador == '*':
+            return argumentos[0] * argumentos[1]
+        if operador == '/':
+            return argumentos[0] // argumentos[1]
+        if operador == 'max':
+            return max(argumentos)
+        if operador == 'min':
+            return min(argumentos)
+        if operador == 'bits':
+            return abs(argumentos[0]).bit_length()
+        if operador == 'raiz':
+            return math.isqrt(max(argumentos[0], 0))
+        if operador == '2^':
+            return 1 << min(max(argumentos[0], 0), EXPOENTE_MAXIMO)
+        # 'int64'
+        valor, minimo, maximo = argumentos
+        if minimo < INT64_MIN or maximo > INT64_MAX:
+            raise _Indefinido()
+        return valor
+
+    def __str__(self) -> str:
+        operador = self.operador
+        if operador == '#':
+            return str(self.operandos[0])
+        if operador == 'ler':
+            return self.operandos[1]
+        if operador == 'comandos':
+            return 'comandos'
+        if operador == 'int64':
+            return f"int64({self.operandos[0]})"
+        if operador == '2^':
+            return f"2^{_entre_parenteses(self.operandos[0], 3)}"
+        if operador not in _PRECEDENCIA:
+            return f"{operador}({', '.join(str(operando) for operando in self.operandos)})"
+        esquerda, direita = self.operandos
+        precedencia = _PRECEDENCIA[operador]
+        if operador == '+' and direita.constante is not None and direita.constante < 0:
+            return f"{_entre_parenteses(esquerda, precedencia)} - {-direita.constante}"
+        associa = direita.operador == operador and operador in '+*'
+        return (f"{_entre_parenteses(esquerda, precedencia)} {operador} "
+                f"{_entre_parenteses(direita, precedencia if associa else precedencia + 1)}")
+
+    def __repr__(self) -> str:
+        return f"Formula({self})"
+
+def _entre_parenteses(formula: Formula, precedencia: int) -> str:
+    texto = str(formula)
+    if _PRECEDENCIA.get(formula.operador, 3) < precedencia or (
+            formula.constante is not None and formula.constante < 0 and precedencia > 1):
+        return f"({texto})"
+    return texto
+
+def _composta(operador: str, *operandos: Optional[Formula]) -> Optional[Formula]:
+    if any(operando is None for operando in operandos):
+        return None
+    tamanho = 1 + sum(operando.tamanho for operando in operandos)
+    if tamanho > TAMANHO_MAXIMO:
+        return None
+    return Formula(operador, operandos, tamanho)
+
+def constante(valor: int) -> Formula:
+    return Formula('#', (valor,))
+
+def entrada(indice: int, nome: str) -> Formula:
+    """Valor do indice-ésimo 'ler' executado, mostrado como nome"""
+    return Formula('ler', (indice, nome))
+
+ZERO = constante(0)
+UM = constante(1)
+TOTAL_COMANDOS = Formula('comandos', ())
+
+def _base_e_deslocamento(formula: Formula) -> Tuple[Formula, int]:
+    """formula = base + deslocamento constante"""
+    if formula.constante is not None:
+        return ZERO, formula.constante
+    if formula.operador == '+' and formula.operandos[1].constante is not None:
+        return formula.operandos[0], formula.operandos[1].constante
+    return formula, 0
+
+def soma(a: Optional[Formula], b: Optional[Formula]) -> Optional[Formula]:
+    if a is None or b is None:
+        return None
+    if a.constante is not None:
+        if b.constante is not None:
+            return constante(a.constante + b.constante)
+        a, b = b, a
+    if b.constante is not None:
+        if b.constante == 0:
+            return a
+        base, deslocamento = _base_e_deslocamento(a)
+        if deslocamento:
+            return soma(base, constante(deslocamento + b.constante))
+        return _composta('+', a, b)
+    # (x + 1) + (y + 2) = (x + y) + 3
+    base_a, deslocamento_a = _base_e_deslocamento(a)
+    base_b, deslocamento_b = _base_e_deslocamento(b)
+    if deslocamento_a or deslocamento_b:
+        return soma(_composta('+', base_a, base_b), constante(deslocamento_a + deslocamento_b))
+    return _composta('+', a, b)
+
+def subtracao(a: Optional[Formula], b: Optional[Formula]) -> Optional[Formula]:
+    if a is None or b is None:
+        return None
+    if b.constante is not None:
+        return soma(a, constante(-b.constante))
+    if a == b:
+        return ZERO
+    return _composta('-', a, b)
+
+def produto(a: Optional[Formula], b: Optional[Formula]) -> Optional[Formula]:
+    if a is None or b is None:
+        return None
+    if b.constante is not None:
+        a, b = b, a
+    if a.constante is not None:
+        if b.constante is not None:
+            return constante(a.constante * b.constante)
+        if a.constante == 0:
+            return ZERO
+        if a.constante == 1:
+            return b
+    return _composta('*', a, b)
+
+def divisao(a: Optional[Formula], divisor: int) -> Optional[Formula]:
+    """Divisão inteira para baixo por uma constante positiva"""
+    if a is None:
+        return None
+    if divisor == 1:
+        return a
+    if a.constante is not None:
+        return constante(a.constante // divisor)
+    return _composta('/', a, constante(divisor))
+
+def _piso(formula: Formula) -> Optional[int]:
+    """Limite inferior constante da fórmula, se evidente"""
+    operador = formula.operador
+    if operador == '#':
+        return formula.operandos[0]
+    if operador == 'ler':
+        return None
+    if operador in ('bits', 'comandos', 'raiz'):
+        return 0
+    if operador == '2^':
+        return 1
+    if operador == 'int64':
+        return _piso(formula.operandos[0])
+    pisos = [_piso(operando) for operando in formula.operandos]
+    if operador == 'max':
+        conhecidos = [piso for piso in pisos if piso is not None]
+        return max(conhecidos) if conhecidos else None
+    if None in pisos:
+        return None
+    if operador == 'min':
+        return min(pisos)
+    if operador == '+':
+        return pisos[0] + pisos[1]
+    if operador == '*' and min(pisos) >= 0:
+        return pisos[0] * pisos[1]
+    if operador == '/':
+        return pisos[0] // pisos[1]
+    return None
+
+def _extremo(operador: str, escolher, a: Optional[Formula], b: Optional[Formula]) -> Optional[Formula]:
+    if a is None or b is None:
+        return None
+    operandos: List[Formula] = []
+    for formula in (a, b):
+        for operando in (formula.operandos if formula.operador == operador else (formula,)):
+            base, deslocamento = _base_e_deslocamento(operando)
+            for indice, outro in enumerate(operandos):
+                base_outro, deslocamento_outro = _base_e_deslocamento(outro)
+                if base_outro == base:
+                    # max(x + 1, x + 3) = x + 3 (constantes têm base 0)
+                    operandos[indice] = soma(base, constante(escolher(deslocamento, deslocamento_outro)))
+                    break
+            else:
+                operandos.append(operando)
+    if operador == 'max' and len(operandos) > 1:
+        for indice, operando in enumerate(operandos):
+            if operando.constante is not None:
+                # max(x, c) = x quando x >= c evidentemente
+                if any(_piso(outro) is not None and _piso(outro) >= operando.constante
+                       for outro in operandos if outro is not operando):
+                    del operandos[indice]
+                break
+    if len(operandos) == 1:
+        return operandos[0]
+    return _composta(operador, *operandos)
+
+def maior(a: Optional[Formula], b: Optional[Formula]) -> Optional[Formula]:
+    return _extremo('max', max, a, b)
+
+def menor(a: Optional[Formula], b: Optional[Formula]) -> Optional[Formula]:
+    return _extremo('min', min, a, b)
+
+def tamanho_em_bits(a: Optional[Formula]) -> Optional[Formula]:
+    if a is not None and a.constante is not None:
+        return constante(abs(a.constante).bit_length())
+    return _composta('bits', a)
+
+def raiz_quadrada(a: Optional[Formula]) -> Optional[Formula]:
+    if a is not None and a.constante is not None:
+        return constante(math.isqrt(max(a.constante, 0)))
+    return _composta('raiz', a)
+
+def potencia_de_2(a: Optional[Formula]) -> Optional[Formula]:
+    if a is not None and a.constante is not None and a.constante <= 64:
+        return constante(1 << max(a.constante, 0))
+    return _composta('2^', a)
+
+def sem_estouro(valor: Optional[Formula], minimo: Optional[Formula],
+                maximo: Optional[Formula]) -> Optional[Formula]:
+    """valor, desde que [minimo, maximo] caiba em 64 bits (senão, indefinido)"""
+    if minimo is not None and maximo is not None and minimo.constante is not None \
+            and maximo.constante is not None:
+        return valor if INT64_MIN <= minimo.constante and maximo.constante <= INT64_MAX else None
+    return _composta('int64', valor, minimo, maximo)
+
+def _digitos(bits: Optional[Formula]) -> Optional[Formula]:
+    """Caracteres do decimal de um inteiro com até `bits` bits, com o sinal (1234/4096 > log10 2)"""
+    return soma(divisao(produto(constante(1234), bits), 4096), constante(2))
+
+def _bytes_inteiro(bits: int) -> int:
+    """Tamanho aproximado de um int do CPython (dígitos de 30 bits)"""
+    return 28 + 4 * max(0, (bits - 1) // 30)
+
+class _Valor:
+    """Faixa [minimo, maximo] de um inteiro e limite do seu tamanho em bits (None = desconhecido)"""
+
+    __slots__ = ('minimo', 'maximo', 'bits')
+
+    def __init__(self, minimo: Optional[Formula], maximo: Optional[Formula], bits: Optional[Formula]):
+        self.minimo = minimo
+        self.maximo = maximo
+        self.bits = bits
+
+    @property
+    def exato(self) -> Optional[int]:
+        if self.minimo is not None and self.minimo.constante is not None and self.minimo == self.maximo:
+            return self.minimo.constante
+        return None
+
+def _valor_exato(valor: int) -> _Valor:
+    formula = constante(valor)
+    return _Valor(formula, formula, constante(abs(valor).bit_length()))
+
+_ZERO = _valor_exato(0)
+_BOOLEANO = _Valor(ZERO, UM, UM)
+_INVERSO = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}
+_RELACIONAIS = frozenset(('=', '<>', '<', '<=', '>', '>='))
+
+def _calcular(operador: str, a: int, b: int) -> Optional[int]:
+    if operador == '+':
+        return a + b
+    if operador == '-':
+        return a - b
+    if operador == '*':
+        return a * b
+    if operador == '/':
+        return None if b == 0 else a // b
+    return int({'=': a == b, '<>': a != b, '<': a < b, '<=': a <= b,
+                '>': a > b, '>=': a >= b}[operador])
+
+def _variaveis(expressao: Expressao, encontradas: Optional[Set[Simbolo]] = None) -> Set[Simbolo]:
+    if encontradas is None:
+        encontradas = set()
+    if type(expressao) is Variavel:
+        encontradas.add(expressao.nome)
+    elif type(expressao) is ExpressaoBinaria:
+        _variaveis(expressao.esquerda, encontradas)
+        _variaveis(expressao.direita, encontradas)
+    elif type(expressao) is ExpressaoUnaria:
+        _variaveis(expressao.expressao, encontradas)
+    return encontradas
+
+def _atribuicoes(comando: Comando) -> Dict[Simbolo, List[Tuple[Comando, bool]]]:
+    """Comandos que alteram cada variável dentro de comando, e se estão em um laço interno"""
+    atribuicoes: Dict[Simbolo, List[Tuple[Comando, bool]]] = {}
+    pendentes = [(comando, False)]
+    while pendentes:
+        comando, aninhado = pendentes.pop()
+        if isinstance(comando, Atribuicao):
+            atribuicoes.setdefault(comando.variavel, []).append((comando, aninhado))
+        elif isinstance(comando, Leitura):
+            for variavel in comando.variaveis:
+                atribuicoes.setdefault(variavel, []).append((comando, aninhado))
+        elif isinstance(comando, Bloco):
+            pendentes.extend((filho, aninhado) for filho in comando.comandos)
+        elif isinstance(comando, Se):
+            pendentes.append((comando.comando_entao, aninhado))
+            if comando.comando_senao:
+                pendentes.append((comando.comando_senao, aninhado))
+        elif isinstance(comando, Enquanto):
+            pendentes.append((comando.comando, True))
+    return atribuicoes
+
+def _eh_variavel(expressao: Expressao, variavel: Simbolo) -> bool:
+    return type(expressao) is Variavel and expressao.nome == variavel
+
+def _passo(variavel: Simbolo, expressao: Expressao) -> Optional[Tuple[str, Expressao]]:
+    """(operação, fator) de 'variavel := variavel op fator' (ou 'fator op variavel' se comutativa)"""
+    if type(expressao) is not ExpressaoBinaria or expressao.operador not in _PRECEDENCIA:
+        return None
+    if _eh_variavel(expressao.esquerda, variavel):
+        fator = expressao.direita
+    elif expressao.operador in '+*' and _eh_variavel(expressao.direita, variavel):
+        fator = expressao.esquerda
+    else:
+        return None
+    if variavel in _variaveis(fator):
+        return None
+    return expressao.operador, fator
+
+class CustoPrevisto:
+    """Estimativa avaliada para entradas concretas (None = sem limite conhecido)"""
+
+    __slots__ = ('comandos', 'iteracoes_por_laco', 'bits_maximo', 'bytes_escritos', 'memoria_bytes')
+
+    def __init__(self, comandos: Optional[int], iteracoes_por_laco: Dict[Tuple[int, int], Optional[int]],
+                 bits_maximo: Optional[int], bytes_escritos: Optional[int], memoria_bytes: Optional[int]):
+        self.comandos = comandos
+        self.iteracoes_por_laco = iteracoes_por_laco
+        self.bits_maximo = bits_maximo
+        self.bytes_escritos = bytes_escritos
+        # Inteiros vivos ao mesmo tempo (variáveis e temporários), todos do maior tamanho
+        self.memoria_bytes = memoria_bytes
+
+    def __repr__(self) -> str:
+        return (f"CustoPrevisto(comandos={self.comandos}, bits_maximo={self.bits_maximo}, "
+                f"memoria_bytes={self.memoria_bytes})")
+
+    def __str__(self) -> str:
+        def texto(valor):
+            return "sem limite conhecido" if valor is None else str(valor)
+        linhas = [f"Custo previsto (limites superiores)",
+                  f"  comandos executados: {texto(self.comandos)}"]
+        for (linha, coluna), iteracoes in sorted(self.iteracoes_por_laco.items()):
+            linhas.append(f"  laço {linha}:{coluna}: {texto(iteracoes)} iterações")
+        linhas.append(f"  bits do maior inteiro: {texto(self.bits_maximo)}")
+        linhas.append(f"  bytes escritos: {texto(self.bytes_escritos)}")
+        linhas.append(f"  memória dos inteiros: {texto(self.memoria_bytes)} bytes")
+        return "\n".join(linhas)
+
+    def como_dict(self) -> dict:
+        return {
+            'comandos_executados': self.comandos,
+            'iteracoes_por_laco': {f"{linha}:{coluna}": quantidade for (linha, coluna), quantidade
+                                   in sorted(self.iteracoes_por_laco.items())},
+            'bits_maximo': self.bits_maximo,
+            'bytes_escritos': self.bytes_escritos,
+            'memoria_bytes': self.memoria_bytes,
+        }
+
+class EstimativaCusto:
+    """Limites superiores simbólicos do custo de um programa (None = sem limite conhecido)"""
+
+    def __init__(self, entradas: List[str], comandos: Optional[Formula],
+                 iteracoes_por_laco: Dict[Tuple[int, int], Optional[Formula]],
+                 bits_maximo: Optional[Formula], bytes_escritos: Optional[Formula],
+                 variaveis: int, modo_inteiro: str = MODO_ILIMITADO):
+        # Nomes dos valores lidos que aparecem nas fórmulas, na ordem de leitura
+        self.entradas = entradas
+        self.comandos = comandos
+        # Iterações por laço, pela posição (linha, coluna) do 'enquanto', como em estatisticas.py
+        self.iteracoes_por_laco = iteracoes_por_laco
+        self.bits_maximo = bits_maximo
+        self.bytes_escritos = bytes_escritos
+        self.variaveis = variaveis
+        self.modo_inteiro = modo_inteiro
+
+    def _valores(self, entradas: Optional[Iterable[Any]]) -> List[int]:
+        """Converte as entradas como 'ler' faria (valor inválido = 0)"""
+        valores = []
+        for valor in list(entradas or ())[:len(self.entradas)]:
+            try:
+                valor = valor if type(valor) is int else inteiro_de_texto(str(valor))
+            except ValueError:
+                valor = 0
+            if self.modo_inteiro != MODO_ILIMITADO:
+                valor = ajustar_int64(valor)
+            valores.append(valor)
+        return valores
+
+    def avaliar(self, entradas: Optional[Iterable[Any]] = None) -> CustoPrevisto:
+        """Limites para os valores que 'ler' receberá, em ordem (os que faltarem valem 0)"""
+        valores = self._valores(entradas)
+
+        def avaliar(formula: Optional[Formula], total: Optional[int] = None) -> Optional[int]:
+            return None if formula is None else formula.avaliar(valores, total)
+
+        comandos = avaliar(self.comandos)
+        bits = avaliar(self.bits_maximo, comandos)
+        memoria = None if bits is None else (self.variaveis + TEMPORARIOS) * _bytes_inteiro(bits)
+        return CustoPrevisto(comandos,
+                             {posicao: avaliar(formula) for posicao, formula in self.iteracoes_por_laco.items()},
+                             bits, avaliar(self.bytes_escritos, comandos), memoria)
+
+    def __str__(self) -> str:
+        def texto(formula):
+            return "sem limite conhecido" if formula is None else str(formula)
+        linhas = [f"Custo estimado (limites superiores; entradas: {', '.join(self.entradas) or 'nenhuma'})",
+                  f"  comandos executados: {texto(self.comandos)}"]
+        for (linha, coluna), iteracoes in sorted(self.iteracoes_por_laco.items()):
+            linhas.append(f"  laço {linha}:{coluna}: {texto(iteracoes)} iterações")
+        linhas.append(f"  bits do maior inteiro: {texto(self.bits_maximo)}")
+        linhas.append(f"  bytes escritos: {texto(self.bytes_escritos)}")
+        return "\n".join(linhas)
+
+    # Nome em inglês
+    evaluate = avaliar
+
+class AnalisadorCusto(VisitorAST):
+    """Interpretação abstrata: faixas simbólicas das variáveis e custo de cada comando.
+
+    Comandos devolvem (comandos executados, bytes escritos) e expressões, _Valor.
+    O corpo de um laço é analisado uma vez, com as variáveis que ele altera
+    alargadas para valer em qualquer volta.
+    """
+
+    def __init__(self, modo_inteiro: str = MODO_ILIMITADO):
+        self.modo_inteiro = modo_inteiro
+        self.valores: Dict[Simbolo, _Valor] = {}
+        # Índice do próximo valor lido (None depois de leituras em laços ou em um só ramo)
+        self.proxima_entrada: Optional[int] = 0
+        self.entradas: List[str] = []
+        self._leituras: Dict[str, int] = {}
+        # Quantas vezes o comando atual executa (produto dos laços em volta)
+        self.multiplicador: Optional[Formula] = UM
+        self.iteracoes: Dict[Tuple[int, int], Optional[Formula]] = {}
+        self.bits_maximo: Optional[Formula] = ZERO
+        self._registrar = True
+
+    def registrar_bits(self, bits: Optional[Formula]):
+        if self._registrar:
+            self.bits_maximo = maior(self.bits_maximo, bits)
+
+    def _valor(self, minimo: Optional[Formula], maximo: Optional[Formula], bits: Optional[Formula]) -> _Valor:
+        """Com 64 bits, todo valor que existe cabe no intervalo e tem no máximo 64 bits"""
+        if self.modo_inteiro != MODO_ILIMITADO:
+            limite = constante(64)
+            bits = limite if bits is None else menor(bits, limite)
+            minimo = constante(INT64_MIN) if minimo is None else minimo
+            maximo = constante(INT64_MAX) if maximo is None else maximo
+        return _Valor(minimo, maximo, bits)
+
+    def _faixa(self, minimo: Optional[Formula], maximo: Optional[Formula], bits: Optional[Formula]) -> _Valor:
+        """Resultado de uma operação; com wraparound a faixa só vale se não houver estouro"""
+        if self.modo_inteiro == MODO_INT64:
+            minimo, maximo = sem_estouro(minimo, minimo, maximo), sem_estouro(maximo, minimo, maximo)
+        return self._valor(minimo, maximo, bits)
+
+    def _valor_de_faixa(self, minimo: Optional[Formula], maximo: Optional[Formula]) -> _Valor:
+        return self._valor(minimo, maximo, maior(tamanho_em_bits(minimo), tamanho_em_bits(maximo)))
+
+    def _avaliar_em(self, expressao: Expressao, valores: Dict[Simbolo, _Valor]) -> _Valor:
+        """Valor de uma expressão em outro estado, sem registrar tamanhos"""
+        atuais, registrar = self.valores, self._registrar
+        self.valores, self._registrar = valores, False
+        try:
+            return expressao.aceitar(self)
+        finally:
+            self.valores, self._registrar = atuais, registrar
+
+    def _sequencia(self, comandos: List[Comando]) -> Tuple[Optional[Formula], Optional[Formula]]:
+        total = escritos = ZERO
+        for comando in comandos:
+            custo, bytes_escritos = comando.aceitar(self)
+            total = soma(total, custo)
+            escritos = soma(escritos, bytes_escritos)
+        return total, escritos
+
+    def _unir(self, outros: Dict[Simbolo, _Valor], proxima_entrada: Optional[int]):
+        """Estado que vale depois de qualquer um dos dois caminhos"""
+        for variavel, valor in outros.items():
+            atual = self.valores[variavel]
+            if atual is not valor:
+                self.valores[variavel] = self._valor(menor(atual.minimo, valor.minimo),
+                                                     maior(atual.maximo, valor.maximo),
+                                                     maior(atual.bits, valor.bits))
+        if self.proxima_entrada != proxima_entrada:
+            self.proxima_entrada = None
+
+    def visitar_programa(self, no: Programa):
+        for declaracao in no.declaracoes:
+            declaracao.aceitar(self)
+        return self._sequencia(no.comandos)
+
+    def visitar_declaracao(self, no: Declaracao):
+        for variavel in no.variaveis:
+            self.valores[variavel] = _ZERO
+
+    def visitar_atribuicao(self, no: Atribuicao):
+        valor = no.expressao.aceitar(self)
+        self.valores[no.variavel] = valor
+        self.registrar_bits(valor.bits)
+        return UM, ZERO
+
+    def visitar_leitura(self, no: Leitura):
+        for variavel in no.variaveis:
+            if self.proxima_entrada is None:
+                valor = self._valor(None, None, None)
+            else:
+                nome = str(variavel)
+                vezes = self._leituras[nome] = self._leituras.get(nome, 0) + 1
+                if vezes > 1:
+                    nome = f"{nome}#{vezes}"
+                lido = entrada(self.proxima_entrada, nome)
+                self.entradas.append(nome)
+                self.proxima_entrada += 1
+                valor = _Valor(lido, lido, tamanho_em_bits(lido))
+            self.valores[variavel] = valor
+            self.registrar_bits(valor.bits)
+        return UM, ZERO
+
+    def visitar_escrita(self, no: Escrita):
+        escritos = UM  # quebra de linha
+        for expressao in no.expressoes:
+            if type(expressao) is StringLiteral:
+                escritos = soma(escritos, constante(len(expressao.valor.encode('utf-8'))))
+                continue
+            valor = expressao.aceitar(self)
+            exato = valor.exato
+            escritos = soma(escritos, _digitos(valor.bits) if exato is None
+                            else constante(len(formatar_valor(exato))))
+        return UM, escritos
+
+    def visitar_bloco(self, no: Bloco):
+        custo, escritos = self._sequencia(no.comandos)
+        return soma(UM, custo), escritos
+
+    def visitar_se(self, no: Se):
+        exato = no.condicao.aceitar(self).exato
+        if exato is not None:
+            ramo = no.comando_entao if exato else no.comando_senao
+            if ramo is None:
+                return UM, ZERO
+            custo, escritos = ramo.aceitar(self)
+            return soma(UM, custo), escritos
+
+        antes, proxima_entrada = self.valores, self.proxima_entrada
+        self.valores = dict(antes)
+        custo_entao, escritos_entao = no.comando_entao.aceitar(self)
+        valores_entao, proxima_entao = self.valores, self.proxima_entrada
+        self.valores, self.proxima_entrada = antes, proxima_entrada
+        custo_senao = escritos_senao = ZERO
+        if no.comando_senao:
+            custo_senao, escritos_senao = no.comando_senao.aceitar(self)
+        self._unir(valores_entao, proxima_entao)
+        return soma(UM, maior(custo_entao, custo_senao)), maior(escritos_entao, escritos_senao)
+
+    def visitar_enquanto(self, no: Enquanto):
+        atribuicoes = _atribuicoes(no.comando)
+        inducao = self._inducao(no, atribuicoes)
+        variavel = iteracoes = None
+        antes = self.valores
+
+        # Estado na entrada de qualquer volta
+        corpo = dict(antes)
+        for alterada in atribuicoes:
+            corpo[alterada] = self._valor(None, None, None)
+        if inducao is not None:
+            variavel, iteracoes, dentro, depois = inducao
+            corpo[variavel] = dentro
+        self._crescimento_no_laco(atribuicoes, variavel, iteracoes, antes, corpo)
+        if any(type(comando) is Leitura for lista in atribuicoes.values() for comando, _ in lista):
+            self.proxima_entrada = None
+
+        multiplicador = self.multiplicador
+        self.multiplicador = produto(multiplicador, iteracoes)
+        posicao = (no.linha, no.coluna)
+        self.iteracoes[posicao] = soma(self.iteracoes.get(posicao, ZERO), self.multiplicador)
+        self.valores = corpo
+        no.condicao.aceitar(self)
+        custo, escritos = no.comando.aceitar(self)
+        self.multiplicador = multiplicador
+
+        # Depois do laço: o estado anterior (nenhuma volta) ou o fim de uma volta qualquer
+        final, self.valores = self.valores, dict(antes)
+        self._unir({alterada: final[alterada] for alterada in atribuicoes if alterada != variavel},
+                   self.proxima_entrada)
+        if variavel is not None:
+            self.valores[variavel] = depois
+        return soma(UM, produto(iteracoes, custo)), produto(iteracoes, escritos)
+
+    def _inducao(self, no: Enquanto, atribuicoes: Dict[Simbolo, List[Tuple[Comando, bool]]]):
+        """(variável, iterações, faixa dentro do laço, faixa depois) de um laço com indução reconhecida"""
+        condicao = no.condicao
+        if type(condicao) is not ExpressaoBinaria or condicao.operador not in _INVERSO:
+            return None
+        topo = no.comando.comandos if type(no.comando) is Bloco else [no.comando]
+        for lado, limite, operador in ((condicao.esquerda, condicao.direita, condicao.operador),
+                                       (condicao.direita, condicao.esquerda, _INVERSO[condicao.operador])):
+            # 'enquanto d * d <= n', como na busca de divisores
+            quadrado = (type(lado) is ExpressaoBinaria and lado.operador == '*'
+                        and type(lado.esquerda) is Variavel and _eh_variavel(lado.direita, lado.esquerda.nome))
+            if quadrado:
+                lado = lado.esquerda
+            if type(lado) is not Variavel or len(atribuicoes.get(lado.nome, ())) != 1:
+                continue
+            comando = atribuicoes[lado.nome][0][0]
+            # Uma única atribuição, executada exatamente uma vez por volta
+            if type(comando) is not Atribuicao or not any(comando is outro for outro in topo):
+                continue
+            passo = _passo(lado.nome, comando.expressao)
+            if passo is None or not atribuicoes.keys().isdisjoint(_variaveis(limite) | _variaveis(passo[1])):
+                continue
+            fator = self._avaliar_em(passo[1], self.valores).exato
+            if fator is None:
+                continue
+            limites = self._limites(operador, passo[0], fator, self.valores[lado.nome],
+                                    self._avaliar_em(limite, self.valores), quadrado)
+            if limites is not None:
+                return (lado.nome,) + limites
+        return None
+
+    def _limites(self, operador: str, operacao: str, fator: int, inicial: _Valor, limite: _Valor,
+                 quadrado: bool = False):
+        """Iterações e faixas da variável de indução 'v operador limite' (ou 'v * v operador limite'),
+        com v := v operacao fator"""
+        if quadrado and (operacao != '+' or fator <= 0 or operador not in ('<', '<=')
+                         or inicial.minimo is None or inicial.minimo.constante is None
+                         or inicial.minimo.constante < 0):
+            # v * v só cresce junto com v a partir de v >= 0
+            return None
+        if operacao in '+-':
+            passo = fator if operacao == '+' else -fator
+            if passo > 0 and operador in ('<', '<='):
+                teto = limite.maximo if operador == '<=' else soma(limite.maximo, constante(-1))
+                if quadrado:
+                    teto = raiz_quadrada(teto)
+                iteracoes = soma(divisao(subtracao(teto, inicial.minimo), passo), UM)
+                final = soma(teto, constante(passo))
+                dentro, depois = (inicial.minimo, final), (inicial.minimo, maior(inicial.maximo, final))
+            elif passo < 0 and operador in ('>', '>='):
+                piso = limite.minimo if operador == '>=' else soma(limite.minimo, UM)
+                iteracoes = soma(divisao(subtracao(inicial.maximo, piso), -passo), UM)
+                final = soma(piso, constante(passo))
+                dentro, depois = (final, inicial.maximo), (menor(inicial.minimo, final), inicial.maximo)
+            else:
+                return None
+            iteracoes = maior(ZERO, iteracoes)
+        elif operacao == '*':
+            # v0 >= 1 e fator >= 2: na volta i, v >= 2^i
+            if fator < 2 or operador not in ('<', '<=') or inicial.minimo is None \
+                    or inicial.minimo.constante is None or inicial.minimo.constante < 1:
+                return None
+            iteracoes = tamanho_em_bits(maior(ZERO, limite.maximo))
+            final = produto(limite.maximo, constante(fator))
+            dentro, depois = (inicial.minimo, final), (inicial.minimo, maior(inicial.maximo, final))
+        elif operacao == '/':
+            # limite >= 0 (> 0 com '>='): cada volta ao menos divide por 2 um v >= 1
+            piso = 0 if operador == '>' else 1
+            if fator < 2 or operador not in ('>', '>=') or limite.minimo is None \
+                    or limite.minimo.constante is None or limite.minimo.constante < piso:
+                return None
+            iteracoes = tamanho_em_bits(maior(ZERO, inicial.maximo))
+            final = ZERO
+            dentro, depois = (ZERO, inicial.maximo), (menor(inicial.minimo, ZERO), inicial.maximo)
+        else:
+            return None
+        if self.modo_inteiro == MODO_INT64:
+            # Se o passo estourar, a variável volta ao outro extremo e o laço pode não terminar
+            if quadrado:
+                final = produto(final, final)
+            iteracoes = sem_estouro(iteracoes, final, final)
+        return iteracoes, self._valor_de_faixa(*dentro), self._valor_de_faixa(*depois)
+
+    def _crescimento_no_laco(self, atribuicoes: Dict[Simbolo, List[Tuple[Comando, bool]]],
+                             variavel: Optional[Simbolo], iteracoes: Optional[Formula],
+                             antes: Dict[Simbolo, _Valor], corpo: Dict[Simbolo, _Valor]):
+        """Limita os bits das variáveis alteradas pelo laço, em qualquer volta (altera corpo)"""
+        pendentes = [alterada for alterada in atribuicoes if alterada != variavel]
+        resolvida = True
+        while resolvida and pendentes:
+            resolvida = False
+            for alterada in list(pendentes):
+                bits = self._crescimento(alterada, atribuicoes[alterada], iteracoes,
+                                         antes[alterada].bits, corpo)
+                if bits is not None:
+                    corpo[alterada] = self._valor(None, None, bits)
+                    pendentes.remove(alterada)
+                    resolvida = True
+        if pendentes:
+            self._crescimento_conjunto(pendentes, atribuicoes, iteracoes, antes, corpo)
+
+    def _crescimento_conjunto(self, pendentes: List[Simbolo],
+                              atribuicoes: Dict[Simbolo, List[Tuple[Comando, bool]]],
+                              iteracoes: Optional[Formula], antes: Dict[Simbolo, _Valor],
+                              corpo: Dict[Simbolo, _Valor]):
+        """Variáveis que dependem umas das outras (t := a + b; a := b; b := t).
+
+        Se todas as atribuições a elas são lineares, cada execução aumenta o maior
+        tamanho entre elas no máximo pelo crescimento da sua expressão.
+        """
+        grupo = set(pendentes)
+        bits = ZERO
+        crescimento_total = crescimento_maximo = 0
+        aninhado = iteracoes is None
+        for variavel in pendentes:
+            bits = maior(bits, antes[variavel].bits)
+            for comando, em_laco_interno in atribuicoes[variavel]:
+                if type(comando) is Leitura:
+                    return
+                linear = self._crescimento_linear(comando.expressao, grupo, corpo)
+                if linear is None:
+                    return
+                crescimento, bits_externos = linear
+                bits = maior(bits, bits_externos)
+                crescimento_total += crescimento
+                crescimento_maximo = max(crescimento_maximo, crescimento)
+                aninhado = aninhado or em_laco_interno
+        if aninhado:
+            bits = soma(bits, produto(TOTAL_COMANDOS, constante(crescimento_maximo)))
+        else:
+            bits = soma(bits, produto(iteracoes, constante(crescimento_total)))
+        if bits is not None:
+            for variavel in pendentes:
+                corpo[variavel] = self._valor(None, None, bits)
+
+    def _crescimento_linear(self, expressao: Expressao, grupo: Set[Simbolo],
+                            corpo: Dict[Simbolo, _Valor]) -> Optional[Tuple[int, Optional[Formula]]]:
+        """(bits a mais que o maior operando, bits dos operandos fora do grupo) de uma expressão linear"""
+        tipo = type(expressao)
+        if tipo is Numero:
+            return 0, constante(abs(expressao.valor).bit_length())
+        if tipo is Variavel:
+            return 0, ZERO if expressao.nome in grupo else corpo[expressao.nome].bits
+        if tipo is ExpressaoUnaria:
+            return self._crescimento_linear(expressao.expressao, grupo, corpo)
+        if tipo is not ExpressaoBinaria:
+            return None
+        esquerda = self._crescimento_linear(expressao.esquerda, grupo, corpo)
+        direita = self._crescimento_linear(expressao.direita, grupo, corpo)
+        if esquerda is None or direita is None:
+            return None
+        externos = maior(esquerda[1], direita[1])
+        operador = expressao.operador
+        if operador in '+-':
+            return max(esquerda[0], direita[0]) + 1, externos
+        if operador == '/':
+            return esquerda[0], externos
+        if operador == '*':
+            # Só multiplicação por constante
+            for lado, outro in ((expressao.esquerda, direita), (expressao.direita, esquerda)):
+                fator = self._avaliar_em(lado, corpo).exato
+                if fator is not None:
+                    return outro[0] + abs(fator).bit_length(), externos
+            return None
+        return 0, maior(externos, UM)
+
+    def _crescimento(self, variavel: Simbolo, atribuicoes: List[Tuple[Comando, bool]],
+                     iteracoes: Optional[Formula], bits: Optional[Formula],
+                     corpo: Dict[Simbolo, _Valor]) -> Optional[Formula]:
+        if any(type(comando) is Leitura for comando, _ in atribuicoes):
+            return None
+        if all(variavel not in _variaveis(comando.expressao) for comando, _ in atribuicoes):
+            for comando, _ in atribuicoes:
+                bits = maior(bits, self._avaliar_em(comando.expressao, corpo).bits)
+            return bits
+        if len(atribuicoes) != 1:
+            return None
+        comando, aninhado = atribuicoes[0]
+        # Cada volta aplica a atribuição uma vez; num laço interno, no máximo uma vez por comando executado
+        vezes = TOTAL_COMANDOS if aninhado or iteracoes is None else iteracoes
+        expressao = comando.expressao
+        if type(expressao) is not ExpressaoBinaria:
+            return None
+        operador = expressao.operador
+        if _eh_variavel(expressao.esquerda, variavel) and _eh_variavel(expressao.direita, variavel):
+            if operador == '*':
+                return produto(bits, potencia_de_2(vezes))
+            return soma(bits, vezes) if operador == '+' else maior(bits, UM)
+        passo = _passo(variavel, expressao)
+        if passo is None and operador == '-' and _eh_variavel(expressao.direita, variavel) \
+                and variavel not in _variaveis(expressao.esquerda):
+            passo = ('-', expressao.esquerda)
+        if passo is None:
+            return None
+        bits_fator = self._avaliar_em(passo[1], corpo).bits
+        if operador == '*':
+            return soma(bits, produto(vezes, bits_fator))
+        if operador in '+-':
+            # |v| <= |v0| + vezes * |fator|
+            return soma(maior(bits, soma(bits_fator, tamanho_em_bits(vezes))), UM)
+        if _eh_variavel(expressao.esquerda, variavel):
+            return bits  # v / fator não cresce
+        return maior(bits, bits_fator)
+
+    def visitar_expressao_binaria(self, no: ExpressaoBinaria):
+        a = no.esquerda.aceitar(self)
+        b = no.direita.aceitar(self)
+        operador = no.operador
+        x, y = a.exato, b.exato
+        if x is not None and y is not None:
+            valor = _calcular(operador, x, y)
+            if valor is None or (self.modo_inteiro == MODO_INT64_TRAP and not cabe_em_int64(valor)):
+                # Erro de execução: nada depois disto executa
+                return self._valor(None, None, None)
+            resultado = _valor_exato(ajustar_int64(valor) if self.modo_inteiro == MODO_INT64 else valor)
+        elif operador in _RELACIONAIS:
+            resultado = _BOOLEANO
+        elif operador == '+':
+            resultado = self._faixa(soma(a.minimo, b.minimo), soma(a.maximo, b.maximo),
+                                    soma(maior(a.bits, b.bits), UM))
+        elif operador == '-':
+            resultado = self._faixa(subtracao(a.minimo, b.maximo), subtracao(a.maximo, b.minimo),
+                                    soma(maior(a.bits, b.bits), UM))
+        elif operador == '*':
+            resultado = self._produto(a, b, x if x is not None else y,
+                                      b if x is not None else a)
+        elif operador == '/':
+            resultado = self._divisao(a, y)
+        else:
+            resultado = self._valor(None, None, None)
+        self.registrar_bits(resultado.bits)
+        return resultado
+
+    def _produto(self, a: _Valor, b: _Valor, fator: Optional[int], outro: _Valor) -> _Valor:
+        bits = soma(a.bits, b.bits)
+        if fator is not None:
+            k = constante(fator)
+            extremos = (produto(k, outro.minimo), produto(k, outro.maximo))
+            if fator < 0:
+                extremos = extremos[::-1]
+            return self._faixa(*extremos, bits)
+        produtos = [produto(p, q) for p in (a.minimo, a.maximo) for q in (b.minimo, b.maximo)]
+        return self._faixa(menor(menor(produtos[0], produtos[1]), menor(produtos[2], produtos[3])),
+                           maior(maior(produtos[0], produtos[1]), maior(produtos[2], produtos[3])), bits)
+
+    def _divisao(self, a: _Valor, divisor: Optional[int]) -> _Valor:
+        # Com |divisor| >= 1, |a / divisor| <= |a|
+        if divisor is None:
+            modulo = maior(a.maximo, subtracao(ZERO, a.minimo))
+            return self._faixa(subtracao(ZERO, modulo), modulo, a.bits)
+        if divisor == 0:
+            return self._valor(None, None, None)
+        if divisor > 0:
+            return self._faixa(divisao(a.minimo, divisor), divisao(a.maximo, divisor), a.bits)
+        return self._faixa(divisao(subtracao(ZERO, a.maximo), -divisor),
+                           divisao(subtracao(ZERO, a.minimo), -divisor), a.bits)
+
+    def visitar_expressao_unaria(self, no: ExpressaoUnaria):
+        valor = no.expressao.aceitar(self)
+        exato = valor.exato
+        if exato is not None:
+            if self.modo_inteiro == MODO_INT64_TRAP and not cabe_em_int64(-exato):
+                return self._valor(None, None, None)
+            resultado = _valor_exato(ajustar_int64(-exato) if self.modo_inteiro == MODO_INT64 else -exato)
+        else:
+            resultado = self._faixa(subtracao(ZERO, valor.maximo), subtracao(ZERO, valor.minimo), valor.bits)
+        self.registrar_bits(resultado.bits)
+        return resultado
+
+    def visitar_variavel(self, no: Variavel):
+        return self.valores.get(no.nome, _ZERO)
+
+    def visitar_numero(self, no: Numero):
+        return _valor_exato(no.valor)
+
+    def visitar_string(self, no: StringLiteral):
+        return self._valor(None, None, None)
+
+def estimar_custo(programa: Programa) -> EstimativaCusto:
+    """Estimativa de custo de um Programa já verificado pela análise semântica"""
+    modo_inteiro = programa.modo_inteiro or MODO_ILIMITADO
+    analisador = AnalisadorCusto(modo_inteiro)
+    comandos, escritos = programa.aceitar(analisador)
+    return EstimativaCusto(analisador.entradas, comandos, analisador.iteracoes,
+                           analisador.bits_maximo, escritos, len(analisador.valores), modo_inteiro)
+
+# Nomes em inglês da API
+estimate_cost = estimar_custo
+CostEstimate = EstimativaCusto
+PredictedCost = CustoPrevisto
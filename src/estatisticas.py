@@ -0,0 +1,245 @@
+import os
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ast_nodes import *
+from interpreter import Interpretador, valor_logico
+from inteiros import escrever_em_partes
+
+# Tipos de comando contados, na ordem dos contadores do interpretador
+TIPOS_COMANDO = ('atribuicao', 'ler', 'escrever', 'bloco', 'se', 'enquanto')
+_INDICE_TIPO = {Atribuicao: 0, Leitura: 1, Escrita: 2, Bloco: 3, Se: 4, Enquanto: 5}
+# Contador extra (após os tipos): valores obtidos por 'ler'
+_VALORES_LIDOS = len(TIPOS_COMANDO)
+
+def contagem_comandos(comandos: Iterable[NoAST]) -> Tuple[Tuple[int, int], ...]:
+    """(contador, quantidade) não nulos de uma sequência de comandos executada inteira"""
+    contagem = [0] * (_VALORES_LIDOS + 1)
+    for comando in comandos:
+        contagem[_INDICE_TIPO[type(comando)]] += 1
+        if isinstance(comando, Leitura):
+            contagem[_VALORES_LIDOS] += len(comando.variaveis)
+    return tuple((indice, quantidade) for indice, quantidade in enumerate(contagem) if quantidade)
+
+def _somar_comando(contadores: List[int], comando: NoAST, vezes: int = 1):
+    contadores[_INDICE_TIPO[type(comando)]] += vezes
+    if type(comando) is Leitura:
+        contadores[_VALORES_LIDOS] += len(comando.variaveis) * vezes
+
+class EstatisticasExecucao:
+    """Contadores agregados de uma execução"""
+
+    def __init__(self, comandos: Dict[str, int], iteracoes_por_laco: Dict[Tuple[int, int], int],
+                 valores_lidos: int, bytes_escritos: int, bits_maximo: int):
+        self.comandos = comandos
+        # Iterações por laço, identificado pela posição (linha, coluna) do 'enquanto'
+        self.iteracoes_por_laco = iteracoes_por_laco
+        self.valores_lidos = valores_lidos
+        self.bytes_escritos = bytes_escritos  # UTF-8, incluindo as quebras de linha
+        self.bits_maximo = bits_maximo        # maior int.bit_length() atribuído ou lido
+
+    @property
+    def total_comandos(self) -> int:
+        return sum(self.comandos.values())
+
+    @property
+    def iteracoes(self) -> int:
+        return sum(self.iteracoes_por_laco.values())
+
+    @property
+    def leituras(self) -> int:
+        return self.comandos['ler']
+
+    @property
+    def escritas(self) -> int:
+        return self.comandos['escrever']
+
+    def __repr__(self) -> str:
+        return (f"EstatisticasExecucao({self.total_comandos} comandos, "
+                f"{self.iteracoes} iterações, {self.bytes_escritos} bytes escritos)")
+
+    def como_dict(self) -> dict:
+        return {
+            'comandos': dict(self.comandos),
+            'comandos_executados': self.total_comandos,
+            'iteracoes': self.iteracoes,
+            'iteracoes_por_laco': {f"{linha}:{coluna}": quantidade for (linha, coluna), quantidade
+                                   in sorted(self.iteracoes_por_laco.items())},
+            'leituras': self.leituras,
+            'valores_lidos': self.valores_lidos,
+            'escritas': self.escritas,
+            'bytes_escritos': self.bytes_escritos,
+            'bits_maximo': self.bits_maximo,
+        }
+
+class InterpretadorEstatisticas(Interpretador):
+    """Interpretador que conta comandos, iterações, leituras e escritas.
+
+    As contagens são feitas em lote: ao entrar em um bloco (ou no programa) soma-se
+    a contagem pré-calculada dos seus comandos, e cada laço soma suas iterações ao
+    terminar; apenas os bytes escritos e o tamanho dos inteiros são vistos um a um.
+    """
+
+    def __init__(self, entrada=None, saida=None, limite_iteracoes: Optional[int] = 1000):
+        super().__init__(entrada=entrada, saida=saida, limite_iteracoes=limite_iteracoes)
+        self.contadores: List[int] = [0] * (_VALORES_LIDOS + 1)
+        self.iteracoes_por_laco: Dict[Enquanto, int] = {}
+        self.bytes_escritos = 0
+        self.bits_maximo = 0
+        self._contagens: Dict[NoAST, Tuple[Tuple[int, int], ...]] = {}
+
+    def estatisticas(self) -> EstatisticasExecucao:
+        iteracoes: Dict[Tuple[int, int], int] = {}
+        for laco, quantidade in self.iteracoes_por_laco.items():
+            posicao = (laco.linha, laco.coluna)
+            iteracoes[posicao] = iteracoes.get(posicao, 0) + quantidade
+        return EstatisticasExecucao(dict(zip(TIPOS_COMANDO, self.contadores)), iteracoes,
+                                    self.contadores[_VALORES_LIDOS], self.bytes_escritos,
+                                    self.bits_maximo)
+
+    def executar_comandos(self, no: NoAST, comandos: List[NoAST]):
+        """Executa a sequência de comandos de no (Programa ou Bloco) contando-a de uma vez"""
+        contagem = self._contagens.get(no)
+        if contagem is None:
+            contagem = self._contagens[no] = contagem_comandos(comandos)
+        contadores = self.contadores
+        for indice, quantidade in contagem:
+            contadores[indice] += quantidade
+
+        executados = 0
+        try:
+            for comando in comandos:
+                comando.aceitar(self)
+                executados += 1
+        except BaseException:
+            # Comandos depois do que falhou não chegaram a executar
+            for indice, quantidade in contagem_comandos(comandos[executados + 1:]):
+                contadores[indice] -= quantidade
+            raise
+
+    def visitar_programa(self, no: Programa):
+        for declaracao in no.declaracoes:
+            declaracao.aceitar(self)
+        self.executar_comandos(no, no.comandos)
+
+    def visitar_bloco(self, no: Bloco):
+        self.executar_comandos(no, no.comandos)
+
+    def visitar_se(self, no: Se):
+        comando = no.comando_entao if valor_logico(no.condicao.aceitar(self)) else no.comando_senao
+        if comando is not None:
+            _somar_comando(self.contadores, comando)
+            comando.aceitar(self)
+
+    def visitar_enquanto(self, no: Enquanto):
+        iteracoes = 0
+        try:
+            while valor_logico(no.condicao.aceitar(self)):
+                iteracoes += 1
+                no.comando.aceitar(self)
+
+                # Proteção contra loop infinito
+                if self.limite_iteracoes is not None and iteracoes > self.limite_iteracoes:
+                    self.confirmar_continuacao(iteracoes, no)
+        finally:
+            if iteracoes:
+                _somar_comando(self.contadores, no.comando, iteracoes)
+                self.iteracoes_por_laco[no] = self.iteracoes_por_laco.get(no, 0) + iteracoes
+
+    def visitar_atribuicao(self, no: Atribuicao):
+        valor = no.expressao.aceitar(self)
+        self.ambiente.atribuir(no.variavel, valor, no.linha, no.coluna)
+        bits = valor.bit_length()
+        if bits > self.bits_maximo:
+            self.bits_maximo = bits
+
+    def visitar_leitura(self, no: Leitura):
+        super().visitar_leitura(no)
+        variaveis = self.ambiente.variaveis
+        for variavel in no.variaveis:
+            bits = variaveis[variavel].bit_length()
+            if bits > self.bits_maximo:
+                self.bits_maximo = bits
+
+    def visitar_escrita(self, no: Escrita):
+        texto = self.texto_escrita(no) + "\n"
+        self.bytes_escritos += len(texto) if texto.isascii() else len(texto.encode('utf-8'))
+        escrever_em_partes(self.saida, texto)
+
+# Formato de texto do Prometheus (0.0.4) e OpenMetrics 1.0: os contadores diferem
+# apenas no nome da família em '# TYPE' (com ou sem o sufixo _total)
+
+def _escapar_rotulo(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _rotulos(rotulos: Mapping[str, object]) -> str:
+    if not rotulos:
+        return ""
+    return "{" + ",".join(f'{nome}="{_escapar_rotulo(valor)}"'
+                          for nome, valor in rotulos.items()) + "}"
+
+def formatar_prometheus(estatisticas: Optional[EstatisticasExecucao],
+                        fases_ns: Optional[Mapping[str, int]] = None,
+                        sucesso: Optional[bool] = None,
+                        rotulos: Optional[Mapping[str, object]] = None,
+                        openmetrics: bool = False,
+                        prefixo: str = "fortall") -> str:
+    """Métricas no formato de texto do Prometheus (ou OpenMetrics), terminadas por '# EOF'.
+
+    estatisticas None (programa não executado) omite os contadores de execução;
+    fases_ns são os tempos de MedidorFases.fases. rotulos são acrescentados a todas as amostras (ex.: {'arquivo': caminho}), o
+    que permite vários arquivos no mesmo diretório do textfile collector.
+    """
+    comuns = dict(rotulos or {})
+    linhas: List[str] = []
+
+    def metrica(nome: str, tipo: str, ajuda: str, amostras: Iterable[Tuple[Mapping[str, object], object]]):
+        completo = f"{prefixo}_{nome}"
+        familia = completo[:-len("_total")] if openmetrics and tipo == 'counter' else completo
+        linhas.append(f"# HELP {familia} {ajuda}")
+        linhas.append(f"# TYPE {familia} {tipo}")
+        for rotulos_amostra, valor in amostras:
+            linhas.append(f"{completo}{_rotulos({**comuns, **rotulos_amostra})} {valor}")
+
+    if sucesso is not None:
+        metrica("execucao_sucesso", 'gauge', "1 se a última compilação/execução terminou sem erros.",
+                [({}, int(sucesso))])
+    metrica("execucao_fim_timestamp_segundos", 'gauge', "Momento (Unix) em que as métricas foram geradas.",
+            [({}, f"{time.time():.3f}")])
+
+    if fases_ns:
+        metrica("fase_duracao_segundos", 'gauge', "Duração de cada fase da última execução.",
+                [({'fase': fase}, f"{duracao / 1e9:.9f}") for fase, duracao in fases_ns.items()])
+
+    if estatisticas is not None:
+        metrica("comandos_executados_total", 'counter', "Comandos executados, por tipo.",
+                [({'tipo': tipo}, quantidade) for tipo, quantidade in estatisticas.comandos.items()])
+        metrica("iteracoes_total", 'counter', "Iterações de laços 'enquanto'.",
+                [({}, estatisticas.iteracoes)])
+        metrica("laco_iteracoes_total", 'counter', "Iterações por laço (posição do 'enquanto').",
+                [({'linha': linha, 'coluna': coluna}, quantidade) for (linha, coluna), quantidade
+                 in sorted(estatisticas.iteracoes_por_laco.items())])
+        metrica("leituras_total", 'counter', "Comandos 'ler' executados.",
+                [({}, estatisticas.leituras)])
+        metrica("valores_lidos_total", 'counter', "Valores obtidos por 'ler'.",
+                [({}, estatisticas.valores_lidos)])
+        metrica("escritas_total", 'counter', "Comandos 'escrever' executados.",
+                [({}, estatisticas.escritas)])
+        metrica("bytes_escritos_total", 'counter', "Bytes (UTF-8) escritos por 'escrever'.",
+                [({}, estatisticas.bytes_escritos)])
+        metrica("inteiro_bits_maximo", 'gauge', "Maior tamanho em bits de um inteiro atribuído ou lido.",
+                [({}, estatisticas.bits_maximo)])
+
+    linhas.append("# EOF")
+    return "\n".join(linhas) + "\n"
+
+def gravar_prometheus(arquivo: str, estatisticas: Optional[EstatisticasExecucao], **opcoes) -> None:
+    """Grava as métricas de forma atômica (arquivo temporário + rename).
+
+    O temporário não termina em '.prom', então o textfile collector do node
+    exporter nunca lê um arquivo pela metade.
+    """
+    temporario = arquivo + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as destino:
+        destino.write(formatar_prometheus(estatisticas, **opcoes))
+    os.replace(temporario, arquivo)
@@ -0,0 +1,269 @@
+import json
+import sys
+from json.encoder import encode_basestring
+from typing import Callable, List, Optional, TextIO
+
+from ast_nodes import *
+from inteiros import formatar_valor
+from simbolos import Simbolo
+
+# Formatos aceitos por --ast-format
+FORMATOS = ('text', 'json', 'dot', 'fortall')
+
+class _Escritor:
+    """Acumula pedaços de texto e os escreve no destino em blocos"""
+
+    __slots__ = ('saida', 'partes', 'limite')
+
+    def __init__(self, saida: TextIO, limite: int = 4096):
+        self.saida = saida
+        self.partes: List[str] = []
+        self.limite = limite
+
+    def escrever(self, texto: str):
+        self.partes.append(texto)
+        if len(self.partes) >= self.limite:
+            self.descarregar()
+
+    def descarregar(self):
+        if self.partes:
+            self.saida.write("".join(self.partes))
+            self.partes = []
+
+def _contem_nos(valor) -> bool:
+    # Listas da AST são homogêneas: ou só nós ou só nomes
+    return type(valor) is list and bool(valor) and isinstance(valor[0], NoAST)
+
+def _valor_json(valor) -> str:
+    """Valores simples dos nós sem passar por json.dumps (chamado milhões de vezes)"""
+    if valor is None:
+        return 'null'
+    if type(valor) is Simbolo:
+        return encode_basestring(str(valor))
+    if valor is True or valor is False:
+        return 'true' if valor else 'false'
+    if isinstance(valor, int):
+        return formatar_valor(valor)
+    if isinstance(valor, str):
+        return encode_basestring(valor)
+    if isinstance(valor, list) and all(isinstance(item, (str, Simbolo)) for item in valor):
+        return '[' + ', '.join(encode_basestring(str(item)) for item in valor) + ']'
+    return json.dumps(valor, ensure_ascii=False, default=str)
+
+def exportar_json(raiz: NoAST, saida: TextIO):
+    """Escreve a AST como JSON: {"no": "Classe", atributos...}, filhos aninhados"""
+    escritor = _Escritor(saida)
+    chaves: 'dict[str, str]' = {}
+    # Pilha de pendências: texto pronto ou nó ainda não escrito
+    pendentes: list = [raiz]
+    while pendentes:
+        item = pendentes.pop()
+        if type(item) is str:
+            escritor.escrever(item)
+            continue
+        restante: list = ['{"no": "' + type(item).__name__ + '"']
+        for nome, valor in vars(item).items():
+            chave = chaves.get(nome)
+            if chave is None:
+                chave = chaves[nome] = ', ' + encode_basestring(nome) + ': '
+            if isinstance(valor, NoAST):
+                restante += [chave, valor]
+            elif _contem_nos(valor):
+                restante.append(chave + '[')
+                for indice, filho in enumerate(valor):
+                    if indice:
+                        restante.append(', ')
+                    restante.append(filho)
+                restante.append(']')
+            else:
+                restante.append(chave + _valor_json(valor))
+        restante.append('}')
+        pendentes.extend(reversed(restante))
+    escritor.escrever('\n')
+    escritor.descarregar()
+
+def _rotulo_dot(no: NoAST) -> str:
+    linhas = [type(no).__name__]
+    for nome, valor in vars(no).items():
+        if nome in ('linha', 'coluna') or valor is None or isinstance(valor, NoAST) or _contem_nos(valor):
+            continue
+        if isinstance(valor, list):
+            valor = ", ".join(map(str, valor))
+        elif type(valor) is int:
+            valor = formatar_valor(valor)
+        linhas.append(f"{nome}: {valor}")
+    linhas.append(f"@{no.linha}:{no.coluna}")
+    texto = "\n".join(linhas)
+    return texto.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def exportar_dot(raiz: NoAST, saida: TextIO):
+    """Escreve a AST no formato DOT do Graphviz, com as arestas rotuladas pelo atributo"""
+    escritor = _Escritor(saida)
+    escritor.escrever('digraph AST {\n  node [shape=box, fontname="monospace"];\n')
+    proximo = 0
+    # (nó, id do pai, rótulo da aresta)
+    pendentes: list = [(raiz, None, None)]
+    while pendentes:
+        no, pai, aresta = pendentes.pop()
+        atual = proximo
+        proximo += 1
+        escritor.escrever(f'  n{atual} [label="{_rotulo_dot(no)}"];\n')
+        if pai is not None:
+            escritor.escrever(f'  n{pai} -> n{atual} [label="{aresta}"];\n')
+        filhos = []
+        for nome, valor in vars(no).items():
+            if isinstance(valor, NoAST):
+                filhos.append((valor, atual, nome))
+            elif _contem_nos(valor):
+                filhos.extend((filho, atual, f"{nome}[{indice}]")
+                              for indice, filho in enumerate(valor) if isinstance(filho, NoAST))
+        pendentes.extend(reversed(filhos))
+    escritor.escrever('}\n')
+    escritor.descarregar()
+
+def exportar_texto(raiz: NoAST, saida: TextIO):
+    """Escreve a árvore como no terminal (--ast), sem os cabeçalhos"""
+    impressor = ImpressorArvore(saida)
+    raiz.aceitar(impressor)
+    impressor.descarregar()
+
+_ESCAPES_STRING = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\t': '\\t'})
+
+def _termina_em_se_sem_senao(comando: Comando) -> bool:
+    while True:
+        if isinstance(comando, Enquanto):
+            comando = comando.comando
+        elif isinstance(comando, Se):
+            if not comando.comando_senao:
+                return True
+            comando = comando.comando_senao
+        else:
+            return False
+
+class ImpressorFonte(VisitorAST):
+    """Reescreve a AST como código Fortall (ex.: programas residuais da avaliação parcial).
+
+    Subexpressões binárias ficam entre parênteses, então a precedência original
+    não precisa ser reconstruída; o texto reanalisado produz a mesma árvore.
+    """
+
+    INDENTACAO = "    "
+
+    def __init__(self, saida: TextIO):
+        self.escritor = _Escritor(saida)
+        self.nivel = 0
+
+    def linha(self, texto: str):
+        self.escritor.escrever(self.INDENTACAO * self.nivel + texto + "\n")
+
+    def comandos(self, comandos: List[Comando]):
+        self.nivel += 1
+        for indice, comando in enumerate(comandos):
+            comando.aceitar(self)
+            if indice < len(comandos) - 1:
+                self.escritor.escrever(";\n")
+            else:
+                self.escritor.escrever("\n")
+        self.nivel -= 1
+
+    def comando_aninhado(self, comando: Comando):
+        # Blocos ficam no nível do 'se'/'enquanto'; os demais comandos, um nível abaixo
+        if isinstance(comando, Bloco):
+            comando.aceitar(self)
+        else:
+            self.nivel += 1
+            comando.aceitar(self)
+            self.nivel -= 1
+
+    def visitar_programa(self, no: Programa):
+        self.linha(f"programa {no.nome};")
+        if no.declaracoes:
+            self.linha("var")
+            self.nivel += 1
+            for declaracao in no.declaracoes:
+                declaracao.aceitar(self)
+            self.nivel -= 1
+        self.linha("inicio")
+        self.comandos(no.comandos)
+        self.linha("fim.")
+        self.escritor.descarregar()
+
+    def visitar_declaracao(self, no: Declaracao):
+        self.linha(f"{', '.join(map(str, no.variaveis))}: {no.tipo};")
+
+    # Comandos são escritos sem o ';' e a quebra de linha finais (postos por comandos())
+    def visitar_atribuicao(self, no: Atribuicao):
+        self.escritor.escrever(f"{self.INDENTACAO * self.nivel}{no.variavel} := {no.expressao.aceitar(self)}")
+
+    def visitar_leitura(self, no: Leitura):
+        self.escritor.escrever(f"{self.INDENTACAO * self.nivel}ler({', '.join(map(str, no.variaveis))})")
+
+    def visitar_escrita(self, no: Escrita):
+        argumentos = ', '.join(expressao.aceitar(self) for expressao in no.expressoes)
+        self.escritor.escrever(f"{self.INDENTACAO * self.nivel}escrever({argumentos})")
+
+    def visitar_bloco(self, no: Bloco):
+        self.linha("inicio")
+        self.comandos(no.comandos)
+        self.escritor.escrever(self.INDENTACAO * self.nivel + "fim")
+
+    def visitar_se(self, no: Se):
+        self.linha(f"se {no.condicao.aceitar(self)} entao")
+        if no.comando_senao and _termina_em_se_sem_senao(no.comando_entao):
+            # Sem o bloco, o 'senao' seria associado ao 'se' interno
+            self.comando_aninhado(Bloco([no.comando_entao], no.comando_entao.linha, no.comando_entao.coluna))
+        else:
+            self.comando_aninhado(no.comando_entao)
+        if no.comando_senao:
+            self.escritor.escrever("\n")
+            self.linha("senao")
+            self.comando_aninhado(no.comando_senao)
+
+    def visitar_enquanto(self, no: Enquanto):
+        self.linha(f"enquanto {no.condicao.aceitar(self)} faca")
+        self.comando_aninhado(no.comando)
+
+    def operando(self, no: Expressao) -> str:
+        texto = no.aceitar(self)
+        if isinstance(no, (ExpressaoBinaria, ExpressaoUnaria)) or \
+                (isinstance(no, Numero) and no.valor < 0):
+            return f"({texto})"
+        return texto
+
+    def visitar_expressao_binaria(self, no: ExpressaoBinaria) -> str:
+        return f"{self.operando(no.esquerda)} {no.operador} {self.operando(no.direita)}"
+
+    def visitar_expressao_unaria(self, no: ExpressaoUnaria) -> str:
+        return f"{no.operador}{self.operando(no.expressao)}"
+
+    def visitar_variavel(self, no: Variavel) -> str:
+        return str(no.nome)
+
+    def visitar_numero(self, no: Numero) -> str:
+        return formatar_valor(no.valor)
+
+    def visitar_string(self, no: StringLiteral) -> str:
+        return '"' + no.valor.translate(_ESCAPES_STRING) + '"'
+
+def exportar_fonte(raiz: NoAST, saida: TextIO):
+    """Escreve a AST como código Fortall"""
+    raiz.aceitar(ImpressorFonte(saida))
+
+EXPORTADORES: 'dict[str, Callable[[NoAST, TextIO], None]]' = {
+    'text': exportar_texto,
+    'json': exportar_json,
+    'dot': exportar_dot,
+    'fortall': exportar_fonte,
+}
+
+def exportar_ast(raiz: NoAST, formato: str, caminho: Optional[str] = None):
+    """Exporta a AST no formato pedido para o arquivo `caminho` (None ou '-' = saída padrão)"""
+    if formato not in EXPORTADORES:
+        raise ValueError(f"Formato de AST desconhecido: '{formato}' (use {', '.join(FORMATOS)})")
+    exportador = EXPORTADORES[formato]
+    if caminho is None or caminho == '-':
+        exportador(raiz, sys.stdout)
+        sys.stdout.flush()
+        return
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        exportador(raiz, arquivo)
@@ -0,0 +1,70 @@
+"""Cliente leve do fortalld: mesma linha de comando de main.py.
+
+Envia os argumentos ao servidor pelo socket Unix e repassa saída, erros e
+leituras; sem servidor ativo, compila no próprio processo. Importa apenas
+módulos da biblioteca padrão que já são carregados na inicialização do Python.
+
+Uso:
+    python src/fortall.py programa.txt -e
+"""
+import json
+import os
+import socket
+import sys
+
+def caminho_socket() -> str:
+    """Socket do fortalld: $FORTALLD_SOCKET ou um arquivo por usuário em /tmp"""
+    return os.environ.get("FORTALLD_SOCKET") or f"/tmp/fortalld-{os.getuid()}.sock"
+
+def enviar(arquivo, mensagem: dict):
+    arquivo.write(json.dumps(mensagem, ensure_ascii=False).encode("utf-8") + b"\n")
+    arquivo.flush()
+
+def conectar(caminho: str = None) -> socket.socket:
+    conexao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conexao.connect(caminho or caminho_socket())
+    except OSError:
+        conexao.close()
+        raise
+    return conexao
+
+def executar_remoto(conexao: socket.socket, argv: list) -> int:
+    """Atende um pedido no servidor até a mensagem final; retorna o código de saída"""
+    arquivo = conexao.makefile("rwb")
+    enviar(arquivo, {"argv": argv, "cwd": os.getcwd(), "tty": sys.stdin.isatty()})
+    for linha in arquivo:
+        mensagem = json.loads(linha)
+        tipo = mensagem["tipo"]
+        if tipo == "saida":
+            sys.stdout.write(mensagem["texto"])
+        elif tipo == "erro":
+            sys.stdout.flush()
+            sys.stderr.write(mensagem["texto"])
+        elif tipo == "ler":
+            sys.stdout.flush()
+            enviar(arquivo, {"linha": sys.stdin.readline()})
+        elif tipo == "fim":
+            sys.stdout.flush()
+            return mensagem["codigo_saida"]
+    print("Conexão com o fortalld encerrada antes do fim", file=sys.stderr)
+    return 1
+
+def main(argv: list = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        conexao = conectar()
+    except OSError:
+        # Sem servidor: compila localmente com o main.py
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from main import main as compilar
+        return compilar(argv)
+    with conexao:
+        return executar_remoto(conexao, argv)
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\nOperação interrompida pelo usuário")
+        sys.exit(1)
@@ -0,0 +1,339 @@
+"""Servidor persistente do compilador Fortall (fortalld).
+
+Mantém os módulos do compilador carregados e um cache de ASTs verificadas, e
+atende pedidos de verificação e execução por um socket Unix. O protocolo é de
+linhas JSON:
+
+    cliente -> {"argv": [...], "cwd": "...", "tty": false,
+                "codigo": "...", "entrada": "..."}      # codigo/entrada opcionais
+    servidor -> {"tipo": "saida" | "erro", "texto": "..."}
+    servidor -> {"tipo": "ler"}            cliente -> {"linha": "..."}  ("" = fim)
+    servidor -> {"tipo": "fim", "codigo_saida": 0}
+
+argv usa as mesmas opções de main.py. Com "codigo", o programa vem no pedido e
+o arquivo de argv serve apenas como nome; com "entrada", as leituras consomem o
+texto enviado em vez de pedir linhas ao cliente.
+
+Uso:
+    python src/fortalld.py                  # inicia o servidor
+    python src/fortalld.py --parar          # encerra o servidor
+    python src/fortall.py programa.txt -e   # cliente
+"""
+import argparse
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fortall import caminho_socket, conectar, enviar
+from simbolos import LIMITE_SIMBOLOS, quantidade_simbolos, reiniciar_simbolos
+
+# Tempo máximo que a saída fica acumulada antes de ser enviada ao cliente
+INTERVALO_ENVIO = 0.05
+TAMANHO_ENVIO = 1 << 13
+
+# Argumentos que são caminhos relativos ao diretório do cliente
+ARGUMENTOS_CAMINHO = ('arquivo', 'checkpoint', 'resume', 'flamegraph', 'timings', 'mem_report',
+                      'stats_file', 'ast_output', 'residual')
+
+class ClienteDesconectado(BaseException):
+    """Interrompe o pedido quando o cliente fecha a conexão (não é capturada como Exception)"""
+
+class CacheAST:
+    """ASTs verificadas por (código, semântica de inteiros), descartando as menos recentes"""
+
+    def __init__(self, capacidade: int = 64):
+        self.capacidade = capacidade
+        self.itens = OrderedDict()
+        self.trava = threading.Lock()
+
+    def get(self, chave):
+        with self.trava:
+            ast = self.itens.get(chave)
+            if ast is not None:
+                self.itens.move_to_end(chave)
+            return ast
+
+    def limpar(self):
+        with self.trava:
+            self.itens.clear()
+
+    def __setitem__(self, chave, ast):
+        with self.trava:
+            self.itens[chave] = ast
+            self.itens.move_to_end(chave)
+            while len(self.itens) > self.capacidade:
+                self.itens.popitem(last=False)
+
+class _Conexao:
+    def __init__(self, leitura, escrita):
+        self.leitura = leitura
+        self.escrita = escrita
+        self.aberta = True
+
+    def enviar(self, mensagem: dict):
+        if not self.aberta:
+            raise ClienteDesconectado()
+        try:
+            enviar(self.escrita, mensagem)
+        except OSError:
+            self.aberta = False
+            raise ClienteDesconectado()
+
+    def receber(self) -> Optional[dict]:
+        try:
+            linha = self.leitura.readline()
+        except OSError:
+            linha = b""
+        if not linha:
+            self.aberta = False
+            return None
+        return json.loads(linha)
+
+class _SaidaCliente(io.TextIOBase):
+    """Fluxo de texto enviado ao cliente em blocos"""
+
+    def __init__(self, conexao: _Conexao, tipo: str, tty: bool,
+                 anterior: Optional['_SaidaCliente'] = None):
+        self.conexao = conexao
+        self.tipo = tipo
+        self.tty = tty
+        # Fluxo esvaziado antes deste para preservar a ordem (stdout antes de stderr)
+        self.anterior = anterior
+        self.partes = []
+        self.tamanho = 0
+        self.ultimo_envio = time.monotonic()
+
+    def write(self, texto: str) -> int:
+        self.partes.append(texto)
+        self.tamanho += len(texto)
+        if (self.anterior is not None or self.tamanho >= TAMANHO_ENVIO or
+                time.monotonic() - self.ultimo_envio >= INTERVALO_ENVIO):
+            self.flush()
+        return len(texto)
+
+    def flush(self):
+        if self.anterior is not None:
+            self.anterior.flush()
+        if self.partes:
+            texto = "".join(self.partes)
+            self.partes = []
+            self.tamanho = 0
+            self.conexao.enviar({"tipo": self.tipo, "texto": texto})
+        self.ultimo_envio = time.monotonic()
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def writable(self) -> bool:
+        return True
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+class _EntradaCliente(io.TextIOBase):
+    """Leituras pedidas ao cliente linha a linha (ou tiradas do texto enviado no pedido)"""
+
+    def __init__(self, conexao: _Conexao, saida: _SaidaCliente, tty: bool,
+                 texto: Optional[str] = None):
+        self.conexao = conexao
+        self.saida = saida
+        self.tty = tty
+        self.texto = io.StringIO(texto) if texto is not None else None
+
+    def readline(self, limite: int = -1) -> str:
+        if self.texto is not None:
+            return self.texto.readline()
+        # O prompt precisa chegar ao cliente antes do pedido de leitura
+        self.saida.flush()
+        self.conexao.enviar({"tipo": "ler"})
+        resposta = self.conexao.receber()
+        if resposta is None:
+            raise ClienteDesconectado()
+        return resposta.get("linha") or ""
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def readable(self) -> bool:
+        return True
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+class _FluxoPorThread:
+    """Substituto de sys.stdout/stderr/stdin que encaminha para o fluxo da thread atual"""
+
+    def __init__(self, padrao):
+        self._padrao = padrao
+        self._local = threading.local()
+
+    def definir(self, fluxo):
+        self._local.fluxo = fluxo
+
+    def __getattr__(self, nome):
+        return getattr(getattr(self._local, 'fluxo', None) or self._padrao, nome)
+
+def aquecer():
+    """Carrega os módulos do compilador e compila um programa pequeno uma vez"""
+    import main
+    import checkpoint, ganchos, profiler, tempos, memoria  # noqa: F401
+    from lexer import Lexer
+    from parser import Parser
+    from semantic import analisar_semantica
+    codigo = 'programa aquecimento; var x : inteiro; inicio x := 1; escrever("", x) fim.'
+    analisar_semantica(Parser(codigo, Lexer(codigo).tokenizar()).parse())
+    return main
+
+def _resolver_caminhos(args: argparse.Namespace, diretorio: Optional[str]):
+    if not diretorio:
+        return
+    for nome in ARGUMENTOS_CAMINHO:
+        valor = getattr(args, nome, None)
+        # '-' é a saída padrão do cliente
+        if isinstance(valor, str) and valor != '-':
+            setattr(args, nome, os.path.join(diretorio, valor))
+
+def executar_pedido(pedido: dict, cache: CacheAST) -> int:
+    """Executa um pedido com os fluxos da thread já redirecionados; retorna o código de saída"""
+    import main
+    parser = main.criar_parser_argumentos()
+    parser.prog = "fortall"
+    try:
+        args = parser.parse_args(pedido.get("argv", []))
+        if getattr(args, 'watch', False):
+            # O modo de observação não termina e prenderia uma thread do servidor
+            parser.error("--watch não é aceito pelo fortalld; use python src/main.py --watch")
+        _resolver_caminhos(args, pedido.get("cwd"))
+        opcoes = main.opcoes_de_argumentos(parser, args)
+        if pedido.get("codigo") is not None:
+            opcoes['codigo'] = pedido["codigo"]
+        return main.executar_argumentos(args, opcoes, cache)
+    except SystemExit as e:
+        # argparse encerra com --help e com argumentos inválidos
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except KeyboardInterrupt:
+        print("\nOperação interrompida pelo usuário")
+        return 1
+
+class _Atendente(socketserver.StreamRequestHandler):
+    def handle(self):
+        conexao = _Conexao(self.rfile, self.wfile)
+        pedido = conexao.receber()
+        if pedido is None:
+            return
+        if pedido.get("comando") == "parar":
+            conexao.enviar({"tipo": "fim", "codigo_saida": 0})
+            threading.Thread(target=self.server.shutdown).start()
+            return
+
+        tty = bool(pedido.get("tty"))
+        saida = _SaidaCliente(conexao, "saida", tty)
+        erro = _SaidaCliente(conexao, "erro", tty, anterior=saida)
+        entrada = _EntradaCliente(conexao, saida, tty, pedido.get("entrada"))
+        fluxos = (sys.stdout, sys.stderr, sys.stdin)
+        for proxy, fluxo in zip(fluxos, (saida, erro, entrada)):
+            proxy.definir(fluxo)
+        self.server.iniciar_pedido()
+        try:
+            codigo_saida = executar_pedido(pedido, self.server.cache)
+            saida.flush()
+            conexao.enviar({"tipo": "fim", "codigo_saida": codigo_saida})
+        except ClienteDesconectado:
+            pass
+        finally:
+            self.server.terminar_pedido()
+            for proxy in fluxos:
+                proxy.definir(None)
+
+class ServidorFortall(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, caminho: str, capacidade_cache: int = 64):
+        self.cache = CacheAST(capacidade_cache)
+        self.pedidos_ativos = 0
+        self.trava_pedidos = threading.Lock()
+        super().__init__(caminho, _Atendente)
+
+    def iniciar_pedido(self):
+        with self.trava_pedidos:
+            # Sem pedido em andamento, só o cache guarda símbolos: a tabela pode recomeçar
+            if self.pedidos_ativos == 0 and quantidade_simbolos() > LIMITE_SIMBOLOS:
+                self.cache.limpar()
+                reiniciar_simbolos()
+            self.pedidos_ativos += 1
+
+    def terminar_pedido(self):
+        with self.trava_pedidos:
+            self.pedidos_ativos -= 1
+
+def servir(caminho: str, capacidade_cache: int = 64):
+    """Inicia o servidor no socket (removendo um socket antigo sem servidor)"""
+    if os.path.exists(caminho):
+        try:
+            conectar(caminho).close()
+        except OSError:
+            os.unlink(caminho)
+        else:
+            raise RuntimeError(f"já existe um fortalld em '{caminho}'")
+
+    aquecer()
+    if not isinstance(sys.stdout, _FluxoPorThread):
+        sys.stdout = _FluxoPorThread(sys.stdout)
+        sys.stderr = _FluxoPorThread(sys.stderr)
+        sys.stdin = _FluxoPorThread(sys.stdin)
+
+    antiga = os.umask(0o177)
+    try:
+        servidor = ServidorFortall(caminho, capacidade_cache)
+    finally:
+        os.umask(antiga)
+    print(f"fortalld ouvindo em {caminho}")
+    try:
+        servidor.serve_forever()
+    finally:
+        servidor.server_close()
+        os.unlink(caminho)
+
+def parar(caminho: str) -> bool:
+    try:
+        conexao = conectar(caminho)
+    except OSError:
+        return False
+    with conexao:
+        arquivo = conexao.makefile("rwb")
+        enviar(arquivo, {"comando": "parar"})
+        arquivo.readline()
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor persistente do compilador Fortall')
+    parser.add_argument('--socket', default=caminho_socket(),
+                        help='Caminho do socket Unix (padrão: $FORTALLD_SOCKET ou /tmp/fortalld-UID.sock)')
+    parser.add_argument('--cache', type=int, default=64, help='ASTs mantidas em cache')
+    parser.add_argument('--parar', action='store_true', help='Encerrar o servidor em execução')
+    args = parser.parse_args()
+
+    if args.parar:
+        if not parar(args.socket):
+            print(f"Nenhum fortalld em '{args.socket}'")
+            return 1
+        return 0
+    try:
+        servir(args.socket, args.cache)
+    except RuntimeError as e:
+        print(f"Erro: {e}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+from typing import Dict, List, Tuple, Callable, Optional, TextIO, FrozenSet, Type
+
+from ast_nodes import *
+from interpreter import Interpretador, RuntimeError, valor_logico, classe_para_modo
+from inteiros import escrever_em_partes
+from simbolos import nome_simbolo
+
+# Eventos disponíveis e assinatura esperada dos ganchos:
+#   comando_inicio(no)              antes de cada comando (atribuição, ler, escrever, bloco, se, enquanto)
+#   comando_fim(no)                 depois de cada comando concluído
+#   atribuicao(nome, valor, no)     variável alterada por ':=' ou por 'ler'
+#   leitura(nome, valor, no)        valor obtido por 'ler'
+#   escrita(texto, no)              linha produzida por 'escrever' (sem o '\n')
+#   iteracao(no, numero)            início de cada iteração de um 'enquanto'
+#   erro(erro)                      erro de execução, antes de interromper o programa
+EVENTOS = ('comando_inicio', 'comando_fim', 'atribuicao', 'leitura', 'escrita', 'iteracao', 'erro')
+
+COMANDOS = ('visitar_atribuicao', 'visitar_leitura', 'visitar_escrita',
+            'visitar_bloco', 'visitar_se', 'visitar_enquanto')
+
+class Ganchos:
+    """Registro de ganchos por tipo de evento.
+
+    O interpretador é montado apenas com os pontos de instrumentação dos eventos
+    que têm ganchos registrados; eventos sem ganchos não custam nada.
+    """
+
+    def __init__(self):
+        self._registrados: Dict[str, List[Callable]] = {evento: [] for evento in EVENTOS}
+
+    def registrar(self, evento: str, gancho: Callable) -> Callable:
+        if evento not in self._registrados:
+            raise ValueError(f"Evento desconhecido: '{evento}'")
+        self._registrados[evento].append(gancho)
+        return gancho
+
+    def remover(self, evento: str, gancho: Callable):
+        self._registrados[evento].remove(gancho)
+
+    def ao(self, evento: str):
+        """Decorador equivalente a registrar(evento, funcao)"""
+        return lambda gancho: self.registrar(evento, gancho)
+
+    def ativos(self) -> FrozenSet[str]:
+        return frozenset(evento for evento, lista in self._registrados.items() if lista)
+
+    def criar_interpretador(self, entrada: Optional[Callable[[str], str]] = None,
+                            saida: Optional[TextIO] = None,
+                            limite_iteracoes: Optional[int] = 1000,
+                            modo_inteiro: Optional[str] = None) -> Interpretador:
+        """Cria um interpretador especializado para os ganchos registrados agora"""
+        classe = classe_para_modo(classe_interpretador(self.ativos()), modo_inteiro)
+        interpretador = classe(entrada=entrada, saida=saida, limite_iteracoes=limite_iteracoes)
+        # Cópias imutáveis: registrar depois não afeta um interpretador já criado
+        for evento in EVENTOS:
+            setattr(interpretador, f"_ganchos_{evento}", tuple(self._registrados[evento]))
+        return interpretador
+
+# Uma classe base de instrumentação por evento, combinadas via herança cooperativa
+
+class _InicioComando(Interpretador):
+    pass
+
+class _FimComando(Interpretador):
+    pass
+
+def _envolver_inicio(nome: str):
+    def visitar(self, no):
+        for gancho in self._ganchos_comando_inicio:
+            gancho(no)
+        return getattr(super(_InicioComando, self), nome)(no)
+    visitar.__name__ = nome
+    return visitar
+
+def _envolver_fim(nome: str):
+    def visitar(self, no):
+        resultado = getattr(super(_FimComando, self), nome)(no)
+        for gancho in self._ganchos_comando_fim:
+            gancho(no)
+        return resultado
+    visitar.__name__ = nome
+    return visitar
+
+for _nome in COMANDOS:
+    setattr(_InicioComando, _nome, _envolver_inicio(_nome))
+    setattr(_FimComando, _nome, _envolver_fim(_nome))
+
+class _Atribuicao(Interpretador):
+    def visitar_atribuicao(self, no: Atribuicao):
+        valor = no.expressao.aceitar(self)
+        self.ambiente.atribuir(no.variavel, valor, no.linha, no.coluna)
+        for gancho in self._ganchos_atribuicao:
+            gancho(nome_simbolo(no.variavel), valor, no)
+
+    def visitar_leitura(self, no: Leitura):
+        super().visitar_leitura(no)
+        for variavel in no.variaveis:
+            valor = self.ambiente.variaveis[variavel]
+            for gancho in self._ganchos_atribuicao:
+                gancho(nome_simbolo(variavel), valor, no)
+
+class _Leitura(Interpretador):
+    def visitar_leitura(self, no: Leitura):
+        super().visitar_leitura(no)
+        for variavel in no.variaveis:
+            valor = self.ambiente.variaveis[variavel]
+            for gancho in self._ganchos_leitura:
+                gancho(nome_simbolo(variavel), valor, no)
+
+class _Escrita(Interpretador):
+    def visitar_escrita(self, no: Escrita):
+        texto = self.texto_escrita(no)
+        for gancho in self._ganchos_escrita:
+            gancho(texto, no)
+        escrever_em_partes(self.saida, texto + "\n")
+
+class _Iteracao(Interpretador):
+    def visitar_enquanto(self, no: Enquanto):
+        iteracao = 0
+
+        while True:
+            iteracao += 1
+
+            if not valor_logico(no.condicao.aceitar(self)):
+                break
+
+            for gancho in self._ganchos_iteracao:
+                gancho(no, iteracao)
+
+            no.comando.aceitar(self)
+
+            if self.limite_iteracoes is not None and iteracao > self.limite_iteracoes:
+                self.confirmar_continuacao(iteracao, no)
+
+class _Erro(Interpretador):
+    def visitar_programa(self, no: Programa):
+        try:
+            super().visitar_programa(no)
+        except RuntimeError as e:
+            for gancho in self._ganchos_erro:
+                gancho(e)
+            raise
+
+# Ordem no MRO: os ganchos de início/fim de comando envolvem os demais
+_CLASSES_EVENTO: Tuple[Tuple[str, type], ...] = (
+    ('erro', _Erro),
+    ('comando_inicio', _InicioComando),
+    ('comando_fim', _FimComando),
+    ('atribuicao', _Atribuicao),
+    ('leitura', _Leitura),
+    ('escrita', _Escrita),
+    ('iteracao', _Iteracao),
+)
+
+_cache_classes: Dict[FrozenSet[str], Type[Interpretador]] = {}
+
+def classe_interpretador(eventos: FrozenSet[str]) -> Type[Interpretador]:
+    """Classe de interpretador com instrumentação somente para os eventos dados"""
+    if not eventos:
+        return Interpretador
+
+    classe = _cache_classes.get(eventos)
+    if classe is None:
+        bases = tuple(base for evento, base in _CLASSES_EVENTO if evento in eventos)
+        nome = "Interpretador_" + "_".join(evento for evento, _ in _CLASSES_EVENTO
+                                           if evento in eventos)
+        classe = type(nome, bases, {'__module__': __name__})
+        _cache_classes[eventos] = classe
+    return classe
@@ -0,0 +1,518 @@
+"""Gerador de parser LL(1) a partir de gramatica.txt.
+
+Lê as regras em EBNF, converte {…}, […] e (…|…) em não terminais auxiliares,
+calcula FIRST/FOLLOW, relata conflitos LL(1) e gera as tabelas usadas por
+parser_tabela.ParserTabela (módulo tabelas_gramatica.py).
+
+Uso: python src/gramatica.py [gramatica.txt] [--tabelas src/tabelas_gramatica.py] [--verificar]
+"""
+import hashlib
+import os
+import re
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+
+from lexer import TokenType, TEXTOS_TOKEN
+
+ARQUIVO_GRAMATICA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'gramatica.txt')
+ARQUIVO_TABELAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tabelas_gramatica.py')
+
+# Cadeia vazia (em FIRST) e fim da entrada (em FOLLOW)
+EPSILON = ''
+FIM = '$'
+
+# Terminais da gramática -> tipo de token do léxico: textos literais ("inicio", ":=")
+# e classes de token em maiúsculas (ID, NUMERO, STRING)
+TERMINAIS: Dict[str, int] = {texto: tipo for tipo, texto in TEXTOS_TOKEN.items()
+                             if tipo not in (TokenType.IDENTIFICADOR, TokenType.NUMERO,
+                                             TokenType.STRING, TokenType.EOF)}
+TERMINAIS.update({'ID': TokenType.IDENTIFICADOR, 'IDENTIFICADOR': TokenType.IDENTIFICADOR,
+                  'NUMERO': TokenType.NUMERO, 'STRING': TokenType.STRING, FIM: TokenType.EOF})
+
+def eh_nao_terminal(simbolo: str) -> bool:
+    """'<nome>' é não terminal; '<', '<=' e '<>' são terminais"""
+    return len(simbolo) > 2 and simbolo[0] == '<' and simbolo[-1] == '>' and '<' not in simbolo[1:-1]
+
+class ErroGramatica(Exception):
+    def __init__(self, mensagem: str, linha: int = 0, coluna: int = 0):
+        self.mensagem = mensagem
+        self.linha = linha
+        self.coluna = coluna
+        super().__init__(f"Erro na gramática, linha {linha}, coluna {coluna}: {mensagem}"
+                         if linha else f"Erro na gramática: {mensagem}")
+
+class Producao:
+    """nome ::= simbolos (não terminais entre '<' e '>', terminais pelo texto)"""
+    __slots__ = ('indice', 'nome', 'simbolos')
+
+    def __init__(self, indice: int, nome: str, simbolos: Tuple[str, ...]):
+        self.indice = indice
+        self.nome = nome
+        self.simbolos = simbolos
+
+    def __repr__(self) -> str:
+        return f"{self.nome} ::= {' '.join(self.simbolos) or 'ε'}"
+
+class Conflito:
+    """Dois lados de um não terminal escolhidos pelo mesmo terminal"""
+    __slots__ = ('nome', 'terminal', 'producoes', 'resolvido')
+
+    def __init__(self, nome: str, terminal: str, producoes: Tuple[int, int], resolvido: bool):
+        self.nome = nome
+        self.terminal = terminal
+        self.producoes = producoes
+        # FIRST/FOLLOW com uma alternativa vazia: resolvido em favor de consumir o
+        # terminal (o 'senao' pertence ao 'se' mais próximo); FIRST/FIRST não tem solução
+        self.resolvido = resolvido
+
+    def __repr__(self) -> str:
+        situacao = "resolvido consumindo o terminal" if self.resolvido else "não resolvido"
+        return f"Conflito em {self.nome} com {self.terminal!r}: produções {self.producoes} ({situacao})"
+
+# Leitura do EBNF
+
+_INICIO_REGRA = re.compile(r'^(<[^<>\s]+>|[A-Z_]+)[ \t]*::=', re.MULTILINE)
+_SIMBOLO_EBNF = re.compile(r'''\s*(?:("(?:[^"\\]|\\.)*"|'[^']*')|(<[^<>\s]+>)|([A-Z_]+)|([|{}\[\]()]))''')
+
+class _Regra:
+    __slots__ = ('nome', 'corpo', 'linha', 'coluna')
+
+    def __init__(self, nome: str, corpo: str, linha: int, coluna: int):
+        self.nome = nome
+        self.corpo = corpo
+        self.linha = linha
+        self.coluna = coluna
+
+def _regras(texto: str) -> Dict[str, _Regra]:
+    inicios = list(_INICIO_REGRA.finditer(texto))
+    regras: Dict[str, _Regra] = {}
+    for atual, proxima in zip(inicios, inicios[1:] + [None]):
+        fim = proxima.start() if proxima else len(texto)
+        linha = texto.count('\n', 0, atual.end()) + 1
+        coluna = atual.end() - texto.rfind('\n', 0, atual.end())
+        nome = atual.group(1)
+        if nome in regras:
+            raise ErroGramatica(f"regra {nome} definida mais de uma vez", linha, 1)
+        regras[nome] = _Regra(nome, texto[atual.end():fim], linha, coluna)
+    return regras
+
+def _posicao(regra: _Regra, deslocamento: int) -> Tuple[int, int]:
+    antes = regra.corpo[:deslocamento]
+    quebras = antes.count('\n')
+    if quebras == 0:
+        return regra.linha, regra.coluna + deslocamento
+    return regra.linha + quebras, deslocamento - antes.rfind('\n')
+
+class Gramatica:
+    """Gramática LL(1) em BNF, com os auxiliares criados a partir do EBNF.
+
+    Só as regras alcançáveis a partir da inicial são lidas: as definições léxicas
+    no fim de gramatica.txt (STRING, NUMERO, ID) documentam o léxico e são ignoradas.
+    """
+
+    def __init__(self, texto: str, inicial: Optional[str] = None):
+        self.texto = texto
+        self.producoes: List[Producao] = []
+        self.alternativas: Dict[str, List[int]] = {}
+        # Auxiliar -> 'repeticao' ({…}), 'opcional' ([…]) ou 'grupo' ((…|…))
+        self.auxiliares: Dict[str, str] = {}
+        self.nao_terminais: List[str] = []
+
+        regras = _regras(texto)
+        sintaticas = [nome for nome in regras if eh_nao_terminal(nome)]
+        if not sintaticas:
+            raise ErroGramatica("nenhuma regra sintática encontrada")
+        self.inicial = inicial or sintaticas[0]
+
+        pendentes = [self.inicial]
+        while pendentes:
+            nome = pendentes.pop(0)
+            if nome in self.alternativas:
+                continue
+            regra = regras.get(nome)
+            if regra is None:
+                raise ErroGramatica(f"não terminal {nome} usado mas não definido")
+            for simbolo in self._ler_regra(regra):
+                if eh_nao_terminal(simbolo) and simbolo not in self.alternativas:
+                    pendentes.append(simbolo)
+
+        self.primeiros = self._calcular_primeiros()
+        self.seguidores = self._calcular_seguidores()
+
+    @classmethod
+    def de_arquivo(cls, caminho: str = ARQUIVO_GRAMATICA) -> 'Gramatica':
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            return cls(arquivo.read())
+
+    @property
+    def assinatura(self) -> str:
+        return hashlib.sha256(self.texto.encode('utf-8')).hexdigest()[:16]
+
+    # Conversão do EBNF
+
+    def _ler_regra(self, regra: _Regra) -> List[str]:
+        """Lê o corpo da regra, registra suas produções e retorna os não terminais citados"""
+        simbolos = []
+        posicao = 0
+        corpo = regra.corpo
+        while corpo[posicao:].strip():
+            encontrado = _SIMBOLO_EBNF.match(corpo, posicao)
+            if encontrado is None:
+                inicio = len(corpo) - len(corpo[posicao:].lstrip())
+                raise ErroGramatica(f"símbolo inválido em {regra.nome}: {corpo[inicio:].split()[0]!r}",
+                                    *_posicao(regra, inicio))
+            literal, nao_terminal, classe, pontuacao = encontrado.groups()
+            inicio = encontrado.start(encontrado.lastindex)
+            if literal is not None:
+                texto = literal[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+                if texto not in TERMINAIS:
+                    raise ErroGramatica(f"terminal {literal} não é reconhecido pelo léxico",
+                                        *_posicao(regra, inicio))
+                simbolos.append((texto, inicio, False))
+            elif classe is not None:
+                if classe not in TERMINAIS:
+                    raise ErroGramatica(f"classe de token {classe} não é reconhecida pelo léxico",
+                                        *_posicao(regra, inicio))
+                simbolos.append((classe, inicio, False))
+            elif nao_terminal is not None:
+                simbolos.append((nao_terminal, inicio, False))
+            else:
+                simbolos.append((pontuacao, inicio, True))
+            posicao = encontrado.end()
+
+        self._contador = 0
+        alternativas, resto = self._alternativas(regra, simbolos, 0)
+        if resto < len(simbolos):
+            raise ErroGramatica(f"{simbolos[resto][0]!r} inesperado em {regra.nome}",
+                                *_posicao(regra, simbolos[resto][1]))
+        self._registrar(regra.nome, alternativas)
+        return [simbolo for simbolo, _, pontuacao in simbolos
+                if not pontuacao and eh_nao_terminal(simbolo)]
+
+    def _alternativas(self, regra: _Regra, simbolos, posicao: int):
+        alternativas = [[]]
+        while posicao < len(simbolos):
+            simbolo, inicio, pontuacao = simbolos[posicao]
+            if not pontuacao:
+                alternativas[-1].append(simbolo)
+                posicao += 1
+                continue
+            if simbolo in (')', ']', '}'):
+                break
+            posicao += 1
+            if simbolo == '|':
+                alternativas.append([])
+            else:
+                internas, posicao = self._alternativas(regra, simbolos, posicao)
+                fechamento = {'(': ')', '[': ']', '{': '}'}[simbolo]
+                if posicao >= len(simbolos) or simbolos[posicao][0::2] != (fechamento, True):
+                    raise ErroGramatica(f"'{simbolo}' sem '{fechamento}' em {regra.nome}",
+                                        *_posicao(regra, inicio))
+                posicao += 1
+                self._contador += 1
+                auxiliar = f"{regra.nome[:-1]}.{self._contador}>"
+                tipo = {'(': 'grupo', '[': 'opcional', '{': 'repeticao'}[simbolo]
+                self.auxiliares[auxiliar] = tipo
+                if tipo == 'repeticao':
+                    internas = [alternativa + [auxiliar] for alternativa in internas] + [[]]
+                elif tipo == 'opcional':
+                    internas = internas + [[]]
+                self._registrar(auxiliar, internas)
+                alternativas[-1].append(auxiliar)
+        return alternativas, posicao
+
+    def _registrar(self, nome: str, alternativas: List[List[str]]):
+        self.nao_terminais.append(nome)
+        self.alternativas[nome] = []
+        for simbolos in alternativas:
+            producao = Producao(len(self.producoes), nome, tuple(simbolos))
+            self.producoes.append(producao)
+            self.alternativas[nome].append(producao.indice)
+
+    # FIRST e FOLLOW
+
+    def primeiros_de(self, simbolos, primeiros=None) -> Set[str]:
+        """FIRST de uma sequência de símbolos (com EPSILON se ela pode ser vazia)"""
+        primeiros = primeiros if primeiros is not None else self.primeiros
+        resultado: Set[str] = set()
+        for simbolo in simbolos:
+            if not eh_nao_terminal(simbolo):
+                resultado.add(simbolo)
+                return resultado
+            resultado |= primeiros[simbolo] - {EPSILON}
+            if EPSILON not in primeiros[simbolo]:
+                return resultado
+        resultado.add(EPSILON)
+        return resultado
+
+    def _calcular_primeiros(self) -> Dict[str, Set[str]]:
+        primeiros: Dict[str, Set[str]] = {nome: set() for nome in self.nao_terminais}
+        mudou = True
+        while mudou:
+            mudou = False
+            for producao in self.producoes:
+                novos = self.primeiros_de(producao.simbolos, primeiros)
+                if not novos <= primeiros[producao.nome]:
+                    primeiros[producao.nome] |= novos
+                    mudou = True
+        return primeiros
+
+    def _calcular_seguidores(self) -> Dict[str, Set[str]]:
+        seguidores: Dict[str, Set[str]] = {nome: set() for nome in self.nao_terminais}
+        seguidores[self.inicial].add(FIM)
+        mudou = True
+        while mudou:
+            mudou = False
+            for producao in self.producoes:
+                for posicao, simbolo in enumerate(producao.simbolos):
+                    if not eh_nao_terminal(simbolo):
+                        continue
+                    resto = self.primeiros_de(producao.simbolos[posicao + 1:])
+                    novos = resto - {EPSILON}
+                    if EPSILON in resto:
+                        novos |= seguidores[producao.nome]
+                    if not novos <= seguidores[simbolo]:
+                        seguidores[simbolo] |= novos
+                        mudou = True
+        return seguidores
+
+    # Tabela LL(1)
+
+    def tabela(self) -> Tuple[Dict[str, Dict[str, int]], List[Conflito]]:
+        """Produção escolhida para cada (não terminal, terminal) e os conflitos encontrados"""
+        tabela: Dict[str, Dict[str, int]] = {nome: {} for nome in self.nao_terminais}
+        conflitos: List[Conflito] = []
+        for nome in self.nao_terminais:
+            linha = tabela[nome]
+            for indice in self.alternativas[nome]:
+                primeiros = self.primeiros_de(self.producoes[indice].simbolos)
+                terminais = primeiros - {EPSILON}
+                if EPSILON in primeiros:
+                    terminais |= self.seguidores[nome]
+                for terminal in sorted(terminais):
+                    anterior = linha.get(terminal)
+                    if anterior is None:
+                        linha[terminal] = indice
+                        continue
+                    # Uma alternativa vazia perde para a que consome o terminal
+                    vazia_anterior = not self.producoes[anterior].simbolos
+                    vazia_atual = not self.producoes[indice].simbolos
+                    resolvido = vazia_anterior != vazia_atual
+                    if vazia_anterior and not vazia_atual:
+                        linha[terminal] = indice
+                    conflitos.append(Conflito(nome, terminal, (anterior, indice), resolvido))
+        return tabela, conflitos
+
+    def relatorio(self) -> str:
+        """Produções, FIRST, FOLLOW e conflitos em texto"""
+        linhas = [f"Gramática ({len(self.nao_terminais)} não terminais, "
+                  f"{len(self.producoes)} produções, inicial {self.inicial})", ""]
+        for producao in self.producoes:
+            linhas.append(f"  {producao.indice:3}. {producao!r}")
+        largura = max(len(nome) for nome in self.nao_terminais)
+        linhas.append("")
+        linhas.append(f"  {'não terminal':<{largura}}  FIRST | FOLLOW")
+        for nome in self.nao_terminais:
+            primeiros = " ".join(sorted(simbolo or 'ε' for simbolo in self.primeiros[nome]))
+            seguidores = " ".join(sorted(self.seguidores[nome]))
+            linhas.append(f"  {nome:<{largura}}  {primeiros} | {seguidores}")
+        _, conflitos = self.tabela()
+        linhas.append("")
+        linhas.append(f"Conflitos LL(1): {len(conflitos)}")
+        for conflito in conflitos:
+            linhas.append(f"  {conflito!r}")
+        return "\n".join(linhas)
+
+    def gerar_tabelas(self) -> str:
+        """Código do módulo tabelas_gramatica.py; levanta ErroGramatica se não for LL(1)"""
+        tabela, conflitos = self.tabela()
+        nao_resolvidos = [conflito for conflito in conflitos if not conflito.resolvido]
+        if nao_resolvidos:
+            raise ErroGramatica("a gramática não é LL(1): " + "; ".join(map(repr, nao_resolvidos)))
+
+        linhas = [
+            "# Gerado por gramatica.py a partir de gramatica.txt; não edite.",
+            "# Para regenerar: python src/gramatica.py --tabelas src/tabelas_gramatica.py",
+            "",
+            f"ASSINATURA = {self.assinatura!r}",
+            f"INICIAL = {self.inicial!r}",
+            "",
+            "# Não terminais, na ordem dos índices usados em PRODUCOES e TABELA",
+            "NAO_TERMINAIS = (",
+        ]
+        linhas += [f"    {nome!r},  # {indice}" for indice, nome in enumerate(self.nao_terminais)]
+        linhas += [
+            ")",
+            "",
+            "# Auxiliares criados a partir do EBNF: 'repeticao', 'opcional' ou 'grupo'",
+            "AUXILIARES = {",
+        ]
+        linhas += [f"    {nome!r}: {tipo!r}," for nome, tipo in self.auxiliares.items()]
+        linhas += [
+            "}",
+            "",
+            "# (índice do não terminal, símbolos): terminais pelo tipo de token (int),",
+            "# não terminais pelo nome",
+            "PRODUCOES = (",
+        ]
+        for producao in self.producoes:
+            simbolos = tuple(simbolo if eh_nao_terminal(simbolo) else TERMINAIS[simbolo]
+                             for simbolo in producao.simbolos)
+            linhas.append(f"    ({self.nao_terminais.index(producao.nome)}, {simbolos!r}),"
+                          f"  # {producao.indice}: {producao!r}")
+        linhas += [
+            ")",
+            "",
+            "# TABELA[não terminal] = {tipo de token: produção}",
+            "TABELA = (",
+        ]
+        for nome in self.nao_terminais:
+            entradas = ", ".join(f"{TERMINAIS[terminal]}: {indice}"
+                                 for terminal, indice in sorted(tabela[nome].items(),
+                                                                key=lambda item: TERMINAIS[item[0]]))
+            linhas.append(f"    {{{entradas}}},  # {nome}")
+        linhas += [")", ""]
+        return "\n".join(linhas)
+
+# Lexemas usados no lugar das classes de token ao gerar programas da gramática
+LEXEMAS = {'ID': ('a', 'b', 'x1'), 'IDENTIFICADOR': ('a', 'b', 'x1'),
+           'NUMERO': ('0', '7', '42'), 'STRING': ('"s"', '"a b"')}
+
+def _custos(gramatica: Gramatica) -> Dict[str, float]:
+    """Menor quantidade de tokens derivável de cada não terminal"""
+    custos = {nome: float('inf') for nome in gramatica.nao_terminais}
+    mudou = True
+    while mudou:
+        mudou = False
+        for producao in gramatica.producoes:
+            custo = sum(custos[simbolo] if eh_nao_terminal(simbolo) else 1
+                        for simbolo in producao.simbolos)
+            if custo < custos[producao.nome]:
+                custos[producao.nome] = custo
+                mudou = True
+    return custos
+
+def gerar_frases(gramatica: Gramatica, quantidade: int, semente: int = 0,
+                 profundidade: int = 12) -> List[List[str]]:
+    """Programas (listas de lexemas) derivados aleatoriamente a partir da inicial.
+
+    Abaixo da profundidade dada, cada não terminal usa a produção mais curta, o
+    que garante o fim das derivações.
+    """
+    import random
+    aleatorio = random.Random(semente)
+    custos = _custos(gramatica)
+
+    def custo(producao: Producao) -> float:
+        return sum(custos[simbolo] if eh_nao_terminal(simbolo) else 1 for simbolo in producao.simbolos)
+
+    def derivar(simbolo: str, nivel: int, saida: List[str]):
+        if not eh_nao_terminal(simbolo):
+            lexemas = LEXEMAS.get(simbolo)
+            saida.append(aleatorio.choice(lexemas) if lexemas else simbolo)
+            return
+        producoes = [gramatica.producoes[indice] for indice in gramatica.alternativas[simbolo]]
+        producao = (aleatorio.choice(producoes) if nivel < profundidade
+                    else min(producoes, key=custo))
+        for filho in producao.simbolos:
+            derivar(filho, nivel + 1, saida)
+
+    frases = []
+    for _ in range(quantidade):
+        frase: List[str] = []
+        derivar(gramatica.inicial, 0, frase)
+        frases.append(frase)
+    return frases
+
+def comparar_parsers(gramatica: Gramatica, quantidade: int = 300, semente: int = 0) -> List[str]:
+    """Diferenças entre o Parser escrito à mão e o ParserTabela.
+
+    Cada programa gerado da gramática é analisado como está, sem um token e com
+    um token trocado por outro terminal; os dois parsers devem aceitar as mesmas
+    entradas com a mesma AST (JSON, com posições) e rejeitar as demais com a mesma
+    mensagem e posição.
+    """
+    import io
+    import random
+    from exportar_ast import exportar_json
+    from lexer import Lexer, LexerError
+    from parser import Parser, ParserError
+    from parser_tabela import ParserTabela
+
+    def resultado(classe, codigo: str, tokens) -> tuple:
+        try:
+            saida = io.StringIO()
+            exportar_json(classe(codigo, list(tokens)).parse(), saida)
+            return ('aceito', saida.getvalue())
+        except ParserError as e:
+            return ('erro', e.mensagem, e.token.linha, e.token.coluna)
+
+    aleatorio = random.Random(semente)
+    terminais = sorted(set(TERMINAIS) - {FIM, 'IDENTIFICADOR'})
+    diferencas = []
+    for frase in gerar_frases(gramatica, quantidade, semente):
+        posicao = aleatorio.randrange(len(frase))
+        troca = aleatorio.choice(terminais)
+        variantes = [frase, frase[:posicao] + frase[posicao + 1:],
+                     frase[:posicao] + [aleatorio.choice(LEXEMAS.get(troca, (troca,)))]
+                     + frase[posicao + 1:]]
+        for variante in variantes:
+            codigo = " ".join(variante)
+            try:
+                tokens = Lexer(codigo).tokenizar()
+            except LexerError:
+                continue
+            esperado = resultado(Parser, codigo, tokens)
+            obtido = resultado(ParserTabela, codigo, tokens)
+            if variante is frase and esperado[0] != 'aceito':
+                diferencas.append(f"Parser rejeita um programa da gramática: {codigo!r} ({esperado[1]})")
+            elif obtido != esperado:
+                diferencas.append(f"Parser e ParserTabela diferem em {codigo!r}: "
+                                  f"{esperado[:2]} x {obtido[:2]}")
+    return diferencas
+
+def tabelas_atualizadas(gramatica: Gramatica) -> bool:
+    """As tabelas geradas correspondem ao conteúdo atual da gramática?"""
+    import tabelas_gramatica
+    return tabelas_gramatica.ASSINATURA == gramatica.assinatura
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description='Gerador de parser LL(1) a partir da gramática Fortall')
+    parser.add_argument('gramatica', nargs='?', default=ARQUIVO_GRAMATICA,
+                        help='Arquivo da gramática (padrão: gramatica.txt)')
+    parser.add_argument('--tabelas', metavar='ARQUIVO', nargs='?', const=ARQUIVO_TABELAS,
+                        help='Gravar as tabelas do parser em ARQUIVO (padrão: src/tabelas_gramatica.py)')
+    parser.add_argument('--verificar', action='store_true',
+                        help='Falhar se src/tabelas_gramatica.py estiver desatualizado ou se '
+                             'o Parser divergir da gramática')
+    args = parser.parse_args(argv)
+
+    try:
+        gramatica = Gramatica.de_arquivo(args.gramatica)
+        print(gramatica.relatorio())
+        if args.tabelas:
+            codigo = gramatica.gerar_tabelas()
+            with open(args.tabelas, 'w', encoding='utf-8') as arquivo:
+                arquivo.write(codigo)
+            print(f"\nTabelas gravadas em {args.tabelas}")
+    except (ErroGramatica, OSError) as e:
+        print(f"Erro: {e}")
+        return 1
+
+    if args.verificar:
+        if not tabelas_atualizadas(gramatica):
+            print("\nsrc/tabelas_gramatica.py está desatualizado em relação à gramática")
+            return 1
+        # As tabelas batem com a gramática; o Parser escrito à mão também deve
+        diferencas = comparar_parsers(gramatica)
+        if diferencas:
+            print(f"\nParser diverge da gramática em {len(diferencas)} casos:")
+            for diferenca in diferencas[:10]:
+                print(f"   {diferenca}")
+            return 1
+        print("\nParser e ParserTabela concordam nos programas gerados da gramática")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# Semânticas de inteiro registradas pela análise semântica no Programa
+MODO_ILIMITADO = "ilimitado"     # inteiros de precisão arbitrária (padrão)
+MODO_INT64 = "int64"             # 64 bits com complemento de dois (wraparound)
+MODO_INT64_TRAP = "int64_trap"   # 64 bits com erro de execução no estouro
+MODOS_INTEIRO = (MODO_ILIMITADO, MODO_INT64, MODO_INT64_TRAP)
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+# Acima deste valor absoluto str() deixa de ser barato (e, a partir do Python 3.11,
+# falha com mais de 4300 dígitos); usa-se a conversão por divisão e conquista
+LIMITE_STR = 10 ** 1000
+
+# Tamanho das partes escritas no destino para números enormes
+TAMANHO_PARTE = 1 << 16
+
+# Abaixo deste número de bits Decimal(int) converte diretamente
+_BITS_FOLHA = 1024
+
+def ajustar_int64(valor: int) -> int:
+    """Reduz um inteiro ao intervalo de 64 bits com sinal (complemento de dois)"""
+    return ((valor - INT64_MIN) & 0xFFFFFFFFFFFFFFFF) + INT64_MIN
+
+def cabe_em_int64(valor: int) -> bool:
+    return INT64_MIN <= valor <= INT64_MAX
+
+def decimal_grande(valor: int) -> str:
+    """Representação decimal de um inteiro de qualquer tamanho em tempo subquadrático.
+
+    Divide o número em metades binárias e recombina em aritmética Decimal (cuja
+    multiplicação é rápida para números grandes); converter um Decimal para texto
+    é linear e não tem o limite de dígitos de str(int).
+    """
+    import decimal  # só é necessário para números enormes
+    negativo = valor < 0
+    if negativo:
+        valor = -valor
+
+    potencias = {}
+
+    def potencia_de_dois(bits: int) -> decimal.Decimal:
+        resultado = potencias.get(bits)
+        if resultado is None:
+            resultado = potencias[bits] = decimal.Decimal(2) ** bits
+        return resultado
+
+    def converter(numero: int, bits: int) -> decimal.Decimal:
+        if bits <= _BITS_FOLHA:
+            return decimal.Decimal(numero)
+        metade = bits >> 1
+        alto = numero >> metade
+        baixo = numero - (alto << metade)
+        return converter(baixo, metade) + converter(alto, bits - metade) * potencia_de_dois(metade)
+
+    with decimal.localcontext() as contexto:
+        contexto.prec = decimal.MAX_PREC
+        contexto.Emax = decimal.MAX_EMAX
+        contexto.Emin = decimal.MIN_EMIN
+        contexto.traps[decimal.Inexact] = True
+        texto = str(converter(valor, valor.bit_length()))
+
+    return "-" + texto if negativo else texto
+
+def formatar_valor(valor) -> str:
+    """Texto de um valor para 'escrever', sem limite de dígitos para inteiros"""
+    if type(valor) is int and (valor > LIMITE_STR or valor < -LIMITE_STR):
+        return decimal_grande(valor)
+    return str(valor)
+
+def inteiro_de_texto(texto: str) -> int:
+    """int(texto) sem o limite de dígitos do Python 3.11+ (divisão e conquista)"""
+    texto = texto.strip()
+    if len(texto) <= 1000:
+        return int(texto)
+    negativo = texto.startswith("-")
+    if texto[0] in "+-":
+        texto = texto[1:]
+    if not texto.isdigit():
+        raise ValueError(f"literal inválido para inteiro: '{texto[:20]}...'")
+
+    potencias = {}
+
+    def converter(digitos: str) -> int:
+        if len(digitos) <= 1000:
+            return int(digitos)
+        metade = len(digitos) // 2
+        expoente = len(digitos) - metade
+        potencia = potencias.get(expoente)
+        if potencia is None:
+            potencia = potencias[expoente] = 10 ** expoente
+        return converter(digitos[:metade]) * potencia + converter(digitos[metade:])
+
+    valor = converter(texto)
+    return -valor if negativo else valor
+
+def escrever_em_partes(saida, texto: str):
+    """Escreve textos muito longos no destino (objeto com write) em partes de tamanho limitado"""
+    if len(texto) <= TAMANHO_PARTE:
+        saida.write(texto)
+        return
+    for inicio in range(0, len(texto), TAMANHO_PARTE):
+        saida.write(texto[inicio:inicio + TAMANHO_PARTE])
@@ -1,5 +1,8 @@
-from typing import Dict, Any, List
+import sys
+from typing import Dict, Any, List, Callable, Optional, TextIO, Tuple
 from ast_nodes import *
+from inteiros import (MODO_ILIMITADO, MODO_INT64_TRAP, INT64_MIN, INT64_MAX,
+                      ajustar_int64, escrever_em_partes, formatar_valor, inteiro_de_texto)
 
 class RuntimeError(Exception):
     def __init__(self, mensagem: str, linha: int, coluna: int):
@@ -9,29 +12,41 @@ class RuntimeError(Exception):
         super().__init__(f"Erro de execução na linha {linha}, coluna {coluna}: {mensagem}")
 
 class Ambiente:
-    """Ambiente de execução para armazenar valores de variáveis"""
+    """Ambiente de execução para armazenar valores de variáveis (chave: símbolo da variável)"""
     
     def __init__(self):
-        self.variaveis: Dict[str, Any] = {}
+        self.variaveis: Dict[Simbolo, Any] = {}
     
-    def definir(self, nome: str, valor: Any):
+    def definir(self, nome: Simbolo, valor: Any):
         self.variaveis[nome] = valor
     
-    def obter(self, nome: str, linha: int, coluna: int) -> Any:
+    def obter(self, nome: Simbolo, linha: int, coluna: int) -> Any:
         if nome not in self.variaveis:
             raise RuntimeError(f"Variável '{nome}' não definida", linha, coluna)
         return self.variaveis[nome]
     
-    def atribuir(self, nome: str, valor: Any, linha: int, coluna: int):
+    def atribuir(self, nome: Simbolo, valor: Any, linha: int, coluna: int):
         if nome not in self.variaveis:
             raise RuntimeError(f"Variável '{nome}' não declarada", linha, coluna)
         self.variaveis[nome] = valor
 
+def valor_logico(condicao: Any) -> bool:
+    """Converte o valor de uma condição para booleano (0 = falso, != 0 = verdadeiro)"""
+    if isinstance(condicao, (int, float)):
+        return condicao != 0
+    return bool(condicao)
+
 class Interpretador(VisitorAST):
     """Interpretador que executa a árvore sintática"""
     
-    def __init__(self):
+    def __init__(self, entrada: Optional[Callable[[str], str]] = None,
+                 saida: Optional[TextIO] = None, limite_iteracoes: Optional[int] = 1000):
         self.ambiente = Ambiente()
+        # Fonte dos valores de 'ler' (mesma assinatura de input) e destino de 'escrever'
+        self.entrada = entrada if entrada is not None else input
+        self.saida = saida if saida is not None else sys.stdout
+        # Iterações de um laço antes de pedir confirmação (None desativa)
+        self.limite_iteracoes = limite_iteracoes
         
     def interpretar(self, programa: Programa):
         """Executa o programa"""
@@ -69,28 +84,44 @@ class Interpretador(VisitorAST):
     def visitar_leitura(self, no: Leitura):
         for variavel in no.variaveis:
             try:
-                entrada = input(f"Digite o valor para {variavel}: ")
-                try:
-                    valor = int(entrada)
-                except ValueError:
-                    print(f"Valor inválido. Atribuindo 0 para {variavel}")
-                    valor = 0
-                
-                self.ambiente.atribuir(variavel, valor, no.linha, no.coluna)
-                
+                entrada = self.entrada(f"Digite o valor para {variavel}: ")
             except EOFError:
-                print(f"\nEntrada terminada. Atribuindo 0 para {variavel}")
-                self.ambiente.atribuir(variavel, 0, no.linha, no.coluna)
+                entrada = None
+            aviso = self.atribuir_leitura(variavel, entrada, no)
+            if aviso:
+                self.avisar(aviso)
     
-    def visitar_escrita(self, no: Escrita):
+    def avisar(self, mensagem: str):
+        """Mensagens do interpretador ao usuário (valor inválido, fim da entrada)"""
+        print(mensagem)
+    
+    def valor_leitura(self, variavel: Simbolo, entrada: Optional[str]) -> Tuple[int, Optional[str]]:
+        """Valor de 'ler' para o texto lido (None = fim da entrada) e o aviso a mostrar, se houver"""
+        if entrada is None:
+            return 0, f"\nEntrada terminada. Atribuindo 0 para {variavel}"
+        try:
+            return inteiro_de_texto(entrada), None
+        except ValueError:
+            return 0, f"Valor inválido. Atribuindo 0 para {variavel}"
+    
+    def atribuir_leitura(self, variavel: Simbolo, entrada: Optional[str], no: Leitura) -> Optional[str]:
+        """Atribui o valor lido (None = fim da entrada); retorna o aviso a mostrar, se houver"""
+        valor, aviso = self.valor_leitura(variavel, entrada)
+        self.ambiente.atribuir(variavel, valor, no.linha, no.coluna)
+        return aviso
+    
+    def texto_escrita(self, no: Escrita) -> str:
+        """Texto de um comando 'escrever' (sem a quebra de linha)"""
         valores = []
         
         for expressao in no.expressoes:
             valor = expressao.aceitar(self)
-            valores.append(str(valor))
+            valores.append(formatar_valor(valor))
         
-        output = "".join(valores)
-        print(output)
+        return "".join(valores)
+    
+    def visitar_escrita(self, no: Escrita):
+        escrever_em_partes(self.saida, self.texto_escrita(no) + "\n")
     
     def visitar_bloco(self, no: Bloco):
         for comando in no.comandos:
@@ -99,13 +130,7 @@ class Interpretador(VisitorAST):
     def visitar_se(self, no: Se):
         condicao = no.condicao.aceitar(self)
         
-        # Converter condição para booleano (0 = falso, != 0 = verdadeiro)
-        if isinstance(condicao, (int, float)):
-            condicao_bool = condicao != 0
-        else:
-            condicao_bool = bool(condicao)
-        
-        if condicao_bool:
+        if valor_logico(condicao):
             no.comando_entao.aceitar(self)
         elif no.comando_senao:
             no.comando_senao.aceitar(self)
@@ -118,22 +143,20 @@ class Interpretador(VisitorAST):
             
             condicao = no.condicao.aceitar(self)
             
-            # Converter condição para booleano
-            if isinstance(condicao, (int, float)):
-                condicao_bool = condicao != 0
-            else:
-                condicao_bool = bool(condicao)
-            
-            if not condicao_bool:
+            if not valor_logico(condicao):
                 break
             
             no.comando.aceitar(self)
             
             # Proteção contra loop infinito
-            if iteracao > 1000:
-                resposta = input(f"\nLoop executou {iteracao} vezes. Continuar? (s/n): ")
-                if resposta.lower() != 's':
-                    raise KeyboardInterrupt()
+            if self.limite_iteracoes is not None and iteracao > self.limite_iteracoes:
+                self.confirmar_continuacao(iteracao, no)
+    
+    def confirmar_continuacao(self, iteracao: int, no: Optional[Enquanto] = None):
+        """Pergunta se um laço longo deve continuar"""
+        resposta = self.entrada(f"\nLoop executou {iteracao} vezes. Continuar? (s/n): ")
+        if resposta.lower() != 's':
+            raise KeyboardInterrupt()
     
     def visitar_expressao_binaria(self, no: ExpressaoBinaria):
         esquerda = no.esquerda.aceitar(self)
@@ -190,6 +213,55 @@ class Interpretador(VisitorAST):
     def visitar_string(self, no: StringLiteral):
         return no.valor
 
+class SemanticaInt64(Interpretador):
+    """Aritmética de inteiros de 64 bits com sinal (misturada a qualquer interpretador).
+    
+    Os valores são calculados normalmente e então reduzidos ao intervalo de 64 bits
+    (modo 'int64') ou rejeitados com erro de execução (modo 'int64_trap').
+    """
+    
+    estourar = False
+    
+    def _restringir(self, valor: int, no: NoAST) -> int:
+        if self.estourar:
+            raise RuntimeError("Estouro de inteiro de 64 bits", no.linha, no.coluna)
+        return ajustar_int64(valor)
+    
+    def visitar_expressao_binaria(self, no: ExpressaoBinaria):
+        resultado = super().visitar_expressao_binaria(no)
+        if INT64_MIN <= resultado <= INT64_MAX:
+            return resultado
+        return self._restringir(resultado, no)
+    
+    def visitar_expressao_unaria(self, no: ExpressaoUnaria):
+        resultado = super().visitar_expressao_unaria(no)
+        if INT64_MIN <= resultado <= INT64_MAX:
+            return resultado
+        return self._restringir(resultado, no)
+    
+    def atribuir_leitura(self, variavel: Simbolo, entrada: Optional[str], no: Leitura) -> Optional[str]:
+        aviso = super().atribuir_leitura(variavel, entrada, no)
+        valor = self.ambiente.variaveis[variavel]
+        if not INT64_MIN <= valor <= INT64_MAX:
+            self.ambiente.variaveis[variavel] = self._restringir(valor, no)
+        return aviso
+
+_classes_por_modo: Dict[tuple, type] = {}
+
+def classe_para_modo(classe: type, modo_inteiro: Optional[str]) -> type:
+    """Classe de interpretador com a semântica de inteiros registrada no Programa"""
+    if not modo_inteiro or modo_inteiro == MODO_ILIMITADO:
+        return classe
+    
+    chave = (classe, modo_inteiro)
+    combinada = _classes_por_modo.get(chave)
+    if combinada is None:
+        combinada = type(f"{classe.__name__}_{modo_inteiro}", (SemanticaInt64, classe),
+                         {'estourar': modo_inteiro == MODO_INT64_TRAP,
+                          '__module__': classe.__module__})
+        _classes_por_modo[chave] = combinada
+    return combinada
+
 def executar_programa(codigo: str) -> bool:
     """Função principal para executar um programa Fortall"""
     from parser import Parser
@@ -214,7 +286,7 @@ def executar_programa(codigo: str) -> bool:
             return False
         
         # 3. Execução
-        interpretador = Interpretador()
+        interpretador = classe_para_modo(Interpretador, ast.modo_inteiro)()
         sucesso = interpretador.interpretar(ast)
         
         return sucesso
@@ -1,56 +1,106 @@
-import re
-from enum import Enum
-from dataclasses import dataclass
-from typing import List, Optional
+from __future__ import annotations
 
-class TokenType(Enum):
+from simbolos import Simbolo, simbolo
+
+class TokenType:
+    """Tipos de token como constantes inteiras (comparação e hash baratos no léxico e no parser)"""
     # Palavras reservadas
-    PROGRAMA = "programa"
-    VAR = "var"
-    INICIO = "inicio"
-    FIM = "fim"
-    INTEIRO = "inteiro"
-    SE = "se"
-    ENTAO = "entao"
-    SENAO = "senao"
-    ENQUANTO = "enquanto"
-    FACA = "faca"
-    LER = "ler"
-    ESCREVER = "escrever"
+    PROGRAMA = 0
+    VAR = 1
+    INICIO = 2
+    FIM = 3
+    INTEIRO = 4
+    SE = 5
+    ENTAO = 6
+    SENAO = 7
+    ENQUANTO = 8
+    FACA = 9
+    LER = 10
+    ESCREVER = 11
     
     # Operadores
-    MAIS = "+"
-    MENOS = "-"
-    MULTIPLICACAO = "*"
-    DIVISAO = "/"
-    ATRIBUICAO = ":="
-    IGUAL = "="
-    DIFERENTE = "<>"
-    MENOR = "<"
-    MENOR_IGUAL = "<="
-    MAIOR = ">"
-    MAIOR_IGUAL = ">="
+    MAIS = 12
+    MENOS = 13
+    MULTIPLICACAO = 14
+    DIVISAO = 15
+    ATRIBUICAO = 16
+    IGUAL = 17
+    DIFERENTE = 18
+    MENOR = 19
+    MENOR_IGUAL = 20
+    MAIOR = 21
+    MAIOR_IGUAL = 22
     
     # Delimitadores
-    PONTO_VIRGULA = ";"
-    PONTO = "."
-    VIRGULA = ","
-    DOIS_PONTOS = ":"
-    PARENTESE_ESQ = "("
-    PARENTESE_DIR = ")"
+    PONTO_VIRGULA = 23
+    PONTO = 24
+    VIRGULA = 25
+    DOIS_PONTOS = 26
+    PARENTESE_ESQ = 27
+    PARENTESE_DIR = 28
     
     # Literais
-    IDENTIFICADOR = "IDENTIFICADOR"
-    NUMERO = "NUMERO"
-    STRING = "STRING"
-    EOF = "EOF"
+    IDENTIFICADOR = 29
+    NUMERO = 30
+    STRING = 31
+    EOF = 32
+
+# Nome e texto de cada tipo de token (mensagens de erro e depuração)
+NOMES_TOKEN = {valor: nome for nome, valor in vars(TokenType).items() if nome.isupper()}
+TEXTOS_TOKEN = {
+    TokenType.PROGRAMA: "programa",
+    TokenType.VAR: "var",
+    TokenType.INICIO: "inicio",
+    TokenType.FIM: "fim",
+    TokenType.INTEIRO: "inteiro",
+    TokenType.SE: "se",
+    TokenType.ENTAO: "entao",
+    TokenType.SENAO: "senao",
+    TokenType.ENQUANTO: "enquanto",
+    TokenType.FACA: "faca",
+    TokenType.LER: "ler",
+    TokenType.ESCREVER: "escrever",
+    TokenType.MAIS: "+",
+    TokenType.MENOS: "-",
+    TokenType.MULTIPLICACAO: "*",
+    TokenType.DIVISAO: "/",
+    TokenType.ATRIBUICAO: ":=",
+    TokenType.IGUAL: "=",
+    TokenType.DIFERENTE: "<>",
+    TokenType.MENOR: "<",
+    TokenType.MENOR_IGUAL: "<=",
+    TokenType.MAIOR: ">",
+    TokenType.MAIOR_IGUAL: ">=",
+    TokenType.PONTO_VIRGULA: ";",
+    TokenType.PONTO: ".",
+    TokenType.VIRGULA: ",",
+    TokenType.DOIS_PONTOS: ":",
+    TokenType.PARENTESE_ESQ: "(",
+    TokenType.PARENTESE_DIR: ")",
+    TokenType.IDENTIFICADOR: "IDENTIFICADOR",
+    TokenType.NUMERO: "NUMERO",
+    TokenType.STRING: "STRING",
+    TokenType.EOF: "EOF"
+}
 
-@dataclass
 class Token:
-    tipo: TokenType
-    valor: str
-    linha: int
-    coluna: int
+    __slots__ = ('tipo', 'valor', 'linha', 'coluna')
+
+    def __init__(self, tipo: int, valor: str | Simbolo, linha: int, coluna: int):
+        self.tipo = tipo
+        self.valor = valor
+        self.linha = linha
+        self.coluna = coluna
+
+    def __repr__(self) -> str:
+        return (f"Token(tipo=TokenType.{NOMES_TOKEN[self.tipo]}, valor={self.valor!r}, "
+                f"linha={self.linha}, coluna={self.coluna})")
+
+    def __eq__(self, outro) -> bool:
+        if not isinstance(outro, Token):
+            return NotImplemented
+        return (self.tipo, self.valor, self.linha, self.coluna) == \
+               (outro.tipo, outro.valor, outro.linha, outro.coluna)
 
 class LexerError(Exception):
     def __init__(self, mensagem: str, linha: int, coluna: int):
@@ -60,10 +110,11 @@ class LexerError(Exception):
         super().__init__(f"Erro léxico na linha {linha}, coluna {coluna}: {mensagem}")
 
 class Lexer:
-    def __init__(self, codigo: str):
+    def __init__(self, codigo: str, linha: int = 1):
         self.codigo = codigo
         self.posicao = 0
-        self.linha = 1
+        # Linha do primeiro caractere (trechos de um arquivo maior começam depois da linha 1)
+        self.linha = linha
         self.coluna = 1
         
         self.palavras_reservadas = {
@@ -104,12 +155,12 @@ class Lexer:
             ")": TokenType.PARENTESE_DIR
         }
     
-    def char_atual(self) -> Optional[str]:
+    def char_atual(self) -> str | None:
         if self.posicao >= len(self.codigo):
             return None
         return self.codigo[self.posicao]
     
-    def proximo_char(self) -> Optional[str]:
+    def proximo_char(self) -> str | None:
         if self.posicao + 1 >= len(self.codigo):
             return None
         return self.codigo[self.posicao + 1]
@@ -211,7 +262,10 @@ class Lexer:
         # Identificadores e palavras reservadas
         if char.isalpha() or char == '_':
             valor = self.ler_identificador()
-            tipo = self.palavras_reservadas.get(valor.lower(), TokenType.IDENTIFICADOR)
+            tipo = self.palavras_reservadas.get(valor.lower())
+            if tipo is None:
+                # Identificadores viajam como símbolos internados (id inteiro)
+                return Token(TokenType.IDENTIFICADOR, simbolo(valor), linha_atual, coluna_atual)
             return Token(tipo, valor, linha_atual, coluna_atual)
         
         # Operadores de dois caracteres
@@ -230,7 +284,7 @@ class Lexer:
         
         raise LexerError(f"Caractere inválido: '{char}'", linha_atual, coluna_atual)
     
-    def tokenizar(self) -> List[Token]:
+    def tokenizar(self) -> list[Token]:
         tokens = []
         while True:
             token = self.proximo_token()
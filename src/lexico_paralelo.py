@@ -0,0 +1,173 @@
+import mmap
+import os
+import re
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from lexer import Lexer, LexerError, Token, TokenType
+from simbolos import simbolo
+
+# Trechos menores que isso não compensam o custo de um processo
+TAMANHO_MINIMO_TRECHO = 1 << 20
+# Trechos por processo: trechos menores equilibram melhor a carga entre os processos
+TRECHOS_POR_PROCESSO = 4
+
+# Início de uma região em que '\n' não separa tokens; fora delas, todo '\n' separa
+_INICIO_REGIAO = re.compile(rb'"|/\*')
+_FIM_STRING = re.compile(rb'[\\"]')
+
+def _fim_regiao(dados, inicio: int) -> int:
+    """Posição logo após a string ou comentário que começa em inicio (-1 se não fechar)"""
+    if dados[inicio] == 0x22:  # '"'
+        posicao = inicio + 1
+        while True:
+            encontrado = _FIM_STRING.search(dados, posicao)
+            if encontrado is None:
+                return -1
+            if dados[encontrado.start()] == 0x22:
+                return encontrado.end()
+            posicao = encontrado.start() + 2  # '\' e o caractere escapado
+    fim = dados.find(b'*/', inicio + 2)
+    return -1 if fim < 0 else fim + 2
+
+def pontos_de_divisao(dados, partes: int) -> List[int]:
+    """Posições (logo após um '\\n' fora de comentários e strings) que dividem dados em até partes trechos.
+
+    Cada candidato é o primeiro '\\n' depois de uma fração do tamanho; a pré-varredura
+    salta de região em região (aspas, '/*' e seus fechamentos, com bytes.find e re)
+    para confirmar que o candidato está fora delas, ou o move para depois da região.
+    """
+    tamanho = len(dados)
+    pontos: List[int] = []
+    posicao = 0  # sempre fora de regiões
+    for parte in range(1, partes):
+        candidato = dados.find(b'\n', max(tamanho * parte // partes, posicao))
+        while candidato >= 0:
+            regiao = _INICIO_REGIAO.search(dados, posicao, candidato)
+            if regiao is None:
+                break
+            posicao = _fim_regiao(dados, regiao.start())
+            if posicao < 0:
+                return pontos  # o resto do arquivo está em uma região não fechada
+            if posicao > candidato:
+                candidato = dados.find(b'\n', posicao)
+        if candidato < 0 or candidato + 1 >= tamanho:
+            break
+        posicao = candidato + 1
+        pontos.append(posicao)
+    return pontos
+
+def _quebras_de_linha(dados: bytes) -> int:
+    """Linhas terminadas no trecho, como contadas após a leitura em modo texto ('\\r\\n' e '\\r' viram '\\n')"""
+    return dados.count(b'\n') + dados.count(b'\r') - dados.count(b'\r\n')
+
+def _decodificar(dados: bytes) -> str:
+    return dados.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+def _tokenizar_trecho(caminho: str, inicio: int, fim: int, linha: int):
+    """Tokeniza um trecho do arquivo (executado nos processos auxiliares).
+
+    Retorna tipos, linhas e colunas em vetores, e os valores como índices em uma
+    tabela dos valores distintos do trecho (identificadores pelo nome, marcados em
+    `identificadores`, pois os ids dos símbolos valem só no processo), ou a
+    mensagem e posição do erro.
+    """
+    texto = ""
+    if fim > inicio:
+        with open(caminho, 'rb') as arquivo, \
+                mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+            texto = _decodificar(dados[inicio:fim])
+    try:
+        tokens = Lexer(texto, linha).tokenizar()
+    except LexerError as e:
+        return None, (e.mensagem, e.linha, e.coluna)
+    identificador = TokenType.IDENTIFICADOR
+    distintos: Dict[Tuple[bool, str], int] = {}
+    indices = array('L', [distintos.setdefault((token.tipo == identificador, str(token.valor)),
+                                               len(distintos)) for token in tokens])
+    return (bytes(token.tipo for token in tokens),
+            indices,
+            array('L', [token.linha for token in tokens]),
+            array('L', [token.coluna for token in tokens]),
+            [valor for _, valor in distintos],
+            bytes(eh_identificador for eh_identificador, _ in distintos)), None
+
+class SequenciaTokens(Sequence):
+    """Tokens dos trechos guardados em vetores; cada Token é criado ao ser acessado.
+
+    O processo principal só concatena os vetores (sem os EOF intermediários),
+    interna cada nome distinto de um trecho uma vez e troca os índices pelos
+    valores com map, sem criar um objeto Token por token.
+    """
+
+    def __init__(self):
+        self.tipos = bytearray()
+        self.valores: list = []
+        self.linhas = array('L')
+        self.colunas = array('L')
+
+    def acrescentar(self, tipos: bytes, indices: array, linhas: array, colunas: array,
+                    distintos: List[str], identificadores: bytes):
+        if self.tipos:
+            # EOF do trecho anterior
+            del self.tipos[-1], self.valores[-1], self.linhas[-1], self.colunas[-1]
+        tabela = [simbolo(valor) if eh_identificador else valor
+                  for valor, eh_identificador in zip(distintos, identificadores)]
+        self.tipos += tipos
+        self.valores.extend(map(tabela.__getitem__, indices))
+        self.linhas += linhas
+        self.colunas += colunas
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    def __getitem__(self, indice: int) -> Token:
+        return Token(self.tipos[indice], self.valores[indice], self.linhas[indice], self.colunas[indice])
+
+def _juntar(resultados, tokens: SequenciaTokens):
+    """Acrescenta os tokens de cada trecho, em ordem, sem os EOF intermediários"""
+    for vetores, erro in resultados:
+        if erro is not None:
+            raise LexerError(*erro)
+        tokens.acrescentar(*vetores)
+
+def trechos_do_arquivo(caminho: str, partes: int) -> List[Tuple[int, int, int]]:
+    """(início, fim, linha inicial) de cada trecho do arquivo"""
+    with open(caminho, 'rb') as arquivo:
+        if os.fstat(arquivo.fileno()).st_size == 0:
+            return [(0, 0, 1)]
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+            limites = [0] + pontos_de_divisao(dados, partes) + [len(dados)]
+            trechos = []
+            linha = 1
+            for inicio, fim in zip(limites, limites[1:]):
+                trechos.append((inicio, fim, linha))
+                linha += _quebras_de_linha(dados[inicio:fim])
+    return trechos
+
+def tokenizar_arquivo(caminho: str, processos: Optional[int] = None) -> SequenciaTokens:
+    """Tokeniza o arquivo em paralelo; mesmos tokens e erros de Lexer(conteúdo).tokenizar().
+
+    O arquivo é dividido em '\\n' fora de comentários e strings (onde o léxico
+    sequencial está sempre entre tokens), cada processo mapeia o arquivo com mmap e
+    tokeniza seus trechos a partir da linha inicial calculada aqui, e os tokens são
+    reunidos em ordem em uma SequenciaTokens. O primeiro trecho com erro determina o
+    LexerError.
+    """
+    processos = processos or os.cpu_count() or 1
+    partes = min(processos * TRECHOS_POR_PROCESSO,
+                 max(1, os.path.getsize(caminho) // TAMANHO_MINIMO_TRECHO))
+    trechos = trechos_do_arquivo(caminho, partes)
+
+    tokens = SequenciaTokens()
+    if processos == 1 or len(trechos) == 1:
+        _juntar((_tokenizar_trecho(caminho, *trecho) for trecho in trechos), tokens)
+        return tokens
+
+    with ProcessPoolExecutor(min(processos, len(trechos))) as executor:
+        inicios, fins, linhas = zip(*trechos)
+        _juntar(executor.map(_tokenizar_trecho, [caminho] * len(trechos), inicios, fins, linhas),
+                tokens)
+    return tokens
@@ -0,0 +1,162 @@
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ast_nodes import NoAST
+
+# Tabela de localizações no estilo de co_linetable: para cada sequência de índices
+# consecutivos (instruções ou nós) com a mesma posição no fonte, uma entrada com
+#   varint(quantidade de índices), zigzag(Δlinha), zigzag(Δcoluna)
+# relativa à entrada anterior. Valores pequenos ocupam um byte cada.
+
+def _escrever_varint(saida: bytearray, valor: int):
+    while valor >= 0x80:
+        saida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    saida.append(valor)
+
+def _ler_varint(dados: bytes, posicao: int) -> Tuple[int, int]:
+    valor = deslocamento = 0
+    while True:
+        byte = dados[posicao]
+        posicao += 1
+        valor |= (byte & 0x7F) << deslocamento
+        if byte < 0x80:
+            return valor, posicao
+        deslocamento += 7
+
+def _zigzag(valor: int) -> int:
+    return valor << 1 if valor >= 0 else ((-valor) << 1) - 1
+
+def _desfazer_zigzag(valor: int) -> int:
+    return -((valor + 1) >> 1) if valor & 1 else valor >> 1
+
+class CodificadorLocalizacoes:
+    """Monta a tabela à medida que as posições são produzidas (ex.: durante a compilação)"""
+
+    __slots__ = ('saida', 'quantidade', 'atual', 'repeticoes', 'linha_anterior', 'coluna_anterior')
+
+    def __init__(self):
+        self.saida = bytearray()
+        self.quantidade = 0
+        self.atual: Optional[Tuple[int, int]] = None
+        self.repeticoes = 0
+        self.linha_anterior = self.coluna_anterior = 0
+
+    def adicionar(self, linha: int, coluna: int) -> int:
+        """Registra a posição do próximo índice e retorna esse índice"""
+        indice = self.quantidade
+        self.quantidade += 1
+        posicao = (linha, coluna)
+        if posicao == self.atual:
+            self.repeticoes += 1
+            return indice
+        self._fechar_entrada()
+        self.atual = posicao
+        self.repeticoes = 1
+        return indice
+
+    def _escrever_entrada(self, saida: bytearray):
+        linha, coluna = self.atual
+        _escrever_varint(saida, self.repeticoes)
+        _escrever_varint(saida, _zigzag(linha - self.linha_anterior))
+        _escrever_varint(saida, _zigzag(coluna - self.coluna_anterior))
+
+    def _fechar_entrada(self):
+        if self.atual is not None:
+            self._escrever_entrada(self.saida)
+            self.linha_anterior, self.coluna_anterior = self.atual
+
+    def tabela(self) -> 'TabelaLocalizacoes':
+        """Tabela com todos os índices adicionados até agora"""
+        saida = self.saida
+        if self.atual is not None:
+            # A entrada em aberto é codificada em uma cópia: adicionar() pode continuar
+            saida = bytearray(saida)
+            self._escrever_entrada(saida)
+        return TabelaLocalizacoes(bytes(saida), self.quantidade)
+
+def codificar_localizacoes(posicoes: Iterable[Tuple[int, int]]) -> Tuple[bytes, int]:
+    """Codifica (linha, coluna) por índice; retorna os bytes e a quantidade de índices"""
+    codificador = CodificadorLocalizacoes()
+    for linha, coluna in posicoes:
+        codificador.adicionar(linha, coluna)
+    tabela = codificador.tabela()
+    return tabela.dados, tabela.quantidade
+
+class TabelaLocalizacoes:
+    """Posições no fonte de uma sequência de instruções ou nós, compactadas em bytes.
+
+    Nada é decodificado na construção: localizacao() percorre as entradas somente
+    quando um erro precisa da posição ou um relatório pede as linhas.
+    """
+
+    __slots__ = ('dados', 'quantidade')
+
+    def __init__(self, dados: bytes, quantidade: int):
+        self.dados = dados
+        self.quantidade = quantidade
+
+    @classmethod
+    def de_posicoes(cls, posicoes: Iterable[Tuple[int, int]]) -> 'TabelaLocalizacoes':
+        return cls(*codificar_localizacoes(posicoes))
+
+    @classmethod
+    def de_nos(cls, nos: Iterable[NoAST]) -> 'TabelaLocalizacoes':
+        return cls.de_posicoes((no.linha, no.coluna) for no in nos)
+
+    def __len__(self) -> int:
+        return self.quantidade
+
+    def __eq__(self, outra) -> bool:
+        if not isinstance(outra, TabelaLocalizacoes):
+            return NotImplemented
+        return self.dados == outra.dados and self.quantidade == outra.quantidade
+
+    def __repr__(self) -> str:
+        return f"TabelaLocalizacoes({self.quantidade} índices, {len(self.dados)} bytes)"
+
+    def entradas(self) -> Iterator[Tuple[int, int, int, int]]:
+        """(primeiro índice, quantidade, linha, coluna) de cada sequência com a mesma posição"""
+        dados = self.dados
+        posicao = indice = linha = coluna = 0
+        while posicao < len(dados):
+            quantidade, posicao = _ler_varint(dados, posicao)
+            delta, posicao = _ler_varint(dados, posicao)
+            linha += _desfazer_zigzag(delta)
+            delta, posicao = _ler_varint(dados, posicao)
+            coluna += _desfazer_zigzag(delta)
+            yield indice, quantidade, linha, coluna
+            indice += quantidade
+
+    def localizacao(self, indice: int) -> Tuple[int, int]:
+        """(linha, coluna) do índice"""
+        if indice < 0:
+            indice += self.quantidade
+        if not 0 <= indice < self.quantidade:
+            raise IndexError(f"índice {indice} fora da tabela de localizações ({self.quantidade})")
+        for inicio, quantidade, linha, coluna in self.entradas():
+            if indice < inicio + quantidade:
+                return linha, coluna
+        raise AssertionError("tabela de localizações inconsistente")
+
+    def decodificar(self) -> List[Tuple[int, int]]:
+        """Todas as posições, uma por índice (para perfis e depuração)"""
+        posicoes: List[Tuple[int, int]] = []
+        for _, quantidade, linha, coluna in self.entradas():
+            posicoes.extend([(linha, coluna)] * quantidade)
+        return posicoes
+
+def nos_em_preordem(raiz: NoAST) -> List[NoAST]:
+    """Nós da AST em pré-ordem (ordem dos atributos), numerados pelo índice na lista"""
+    nos = []
+    pendentes = [raiz]
+    while pendentes:
+        no = pendentes.pop()
+        nos.append(no)
+        filhos = []
+        for valor in vars(no).values():
+            if isinstance(valor, NoAST):
+                filhos.append(valor)
+            elif isinstance(valor, list):
+                filhos.extend(item for item in valor if isinstance(item, NoAST))
+        pendentes.extend(reversed(filhos))
+    return nos
@@ -1,90 +1,342 @@
+from __future__ import annotations
 import sys
 import os
-import argparse
-from pathlib import Path
 
+# Apenas o necessário para verificar um arquivo (sem typing, argparse, enum ou
+# dataclasses); interpretador, visualização da AST e argparse são importados
+# quando usados (veja bench/importacao.py)
 from lexer import Lexer, LexerError
 from parser import Parser, ParserError
 from semantic import analisar_semantica
-from interpreter import executar_programa, Interpretador
-from ast_nodes import visualizar_ast_grafico
+from tempos import MedidorFases
+from inteiros import MODO_ILIMITADO, MODO_INT64, MODO_INT64_TRAP
 
-def compilar_arquivo(caminho_arquivo: str, opcoes: dict) -> bool:
-    """Compila um arquivo Fortall"""
+def criar_interpretador(codigo: str, opcoes: dict, ganchos=None) -> 'Interpretador':
+    """Escolhe o interpretador conforme as opções de execução"""
+    from interpreter import Interpretador, classe_para_modo
     
-    if not os.path.exists(caminho_arquivo):
-        print(f"Erro: Arquivo '{caminho_arquivo}' não encontrado")
-        return False
+    limite_iteracoes = None if opcoes.get('sem_limite') else 1000
+    modo_inteiro = opcoes.get('modo_inteiro')
+    
+    if opcoes.get('perfil'):
+        from profiler import InterpretadorPerfil
+        return classe_para_modo(InterpretadorPerfil, modo_inteiro)(limite_iteracoes=limite_iteracoes)
+    
+    if opcoes.get('estatisticas'):
+        from estatisticas import InterpretadorEstatisticas
+        return classe_para_modo(InterpretadorEstatisticas, modo_inteiro)(limite_iteracoes=limite_iteracoes)
+    
+    if not (opcoes.get('checkpoint') or opcoes.get('retomar')):
+        if ganchos is not None:
+            return ganchos.criar_interpretador(limite_iteracoes=limite_iteracoes,
+                                               modo_inteiro=modo_inteiro)
+        return classe_para_modo(Interpretador, modo_inteiro)(limite_iteracoes=limite_iteracoes)
+    
+    from checkpoint import (InterpretadorComCheckpoint, assinatura_codigo,
+                            carregar_checkpoint, pular_entradas)
+    
+    arquivo = opcoes.get('checkpoint') or opcoes.get('retomar')
+    entrada = input
+    estado = None
+    if opcoes.get('retomar'):
+        estado = carregar_checkpoint(opcoes['retomar'])
+        # Com entrada redirecionada, assume-se que a mesma entrada foi reenviada
+        if not sys.stdin.isatty():
+            entrada = pular_entradas(input, estado.entradas_consumidas)
+    
+    interpretador = classe_para_modo(InterpretadorComCheckpoint, modo_inteiro)(
+        arquivo, assinatura_codigo(codigo),
+        intervalo_comandos=opcoes.get('checkpoint_comandos'),
+        intervalo_segundos=opcoes.get('checkpoint_segundos'),
+        entrada=entrada, limite_iteracoes=limite_iteracoes)
+    if estado is not None:
+        interpretador.retomar(estado)
+    return interpretador
+
+def emitir_perfil(interpretador: 'Interpretador', codigo: str, opcoes: dict):
+    """Mostra o relatório de perfil e grava as pilhas para flamegraph, se pedido"""
+    from profiler import relatorio_perfil
+    
+    print(relatorio_perfil(interpretador, codigo))
+    
+    if opcoes.get('flamegraph'):
+        with open(opcoes['flamegraph'], 'w', encoding='utf-8') as arquivo:
+            for linha in interpretador.pilhas_colapsadas():
+                arquivo.write(linha + "\n")
+        print(f"Pilhas colapsadas gravadas em '{opcoes['flamegraph']}'")
+
+def compilar_com_relatorio_memoria(codigo: str, opcoes: dict) -> bool:
+    """Executa as fases sob tracemalloc e mostra (e grava em JSON) o relatório de memória"""
+    import json
+    from memoria import compilar_com_relatorio_memoria as medir, formatar_relatorio
     
     try:
-        with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
-            codigo = arquivo.read()
-    except Exception as e:
-        print(f"Erro ao ler arquivo: {e}")
+        relatorio = medir(codigo, executar=bool(opcoes.get('executar')),
+                          modo_inteiro=opcoes.get('modo_inteiro') or MODO_ILIMITADO,
+                          compartilhar=bool(opcoes.get('compartilhar_ast')),
+                          criar_interpretador=lambda: criar_interpretador(codigo, opcoes))
+    except (LexerError, ParserError) as e:
+        print(f"Erro: {e}")
         return False
     
-    if opcoes.get('verbose'):
-        print(f"Compilando arquivo: {caminho_arquivo}")
-        print("=" * 50)
+    for erro in relatorio['erros_semanticos']:
+        print(f"   {erro}")
+    print(formatar_relatorio(relatorio))
+    
+    destino = opcoes['relatorio_memoria']
+    if isinstance(destino, str):
+        with open(destino, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+        print(f"Relatório de memória gravado em '{destino}'")
+    
+    return relatorio['sucesso']
+
+def compilar_em_passagem_unica(caminho_arquivo: str, codigo: str, opcoes: dict,
+                               fases: MedidorFases) -> bool:
+    """Compila em uma única passada (sem tokens nem AST em memória) e executa, se pedido"""
+    from passagem_unica import ExecucaoPassagemUnica, compilar_passagem_unica
     
     try:
-        # Análise Léxica
         if opcoes.get('verbose'):
-            print("1. Análise Léxica...")
-        
-        lexer = Lexer(codigo)
-        tokens = lexer.tokenizar()
+            print("1. Análise e geração de código em uma passada...")
         
-        if opcoes.get('verbose'):
-            print(f"   -> {len([t for t in tokens if t.tipo.name != 'EOF'])} tokens reconhecidos")
+        with fases.fase('passagem_unica'):
+            programa, erros_semanticos = compilar_passagem_unica(
+                codigo, opcoes.get('modo_inteiro') or MODO_ILIMITADO)
         
-        # Análise Sintática
-        if opcoes.get('verbose'):
-            print("2. Análise Sintática...")
-        
-        parser = Parser(codigo)
-        ast = parser.parse()
-        
-        if not ast:
-            print("Erro na análise sintática")
+        if erros_semanticos:
+            print("Erros semânticos encontrados:")
+            for i, erro in enumerate(erros_semanticos, 1):
+                print(f"   {i}. {erro}")
             return False
         
         if opcoes.get('verbose'):
-            print(f"   -> Programa: {ast.nome}")
-            print(f"   -> Declarações: {len(ast.declaracoes)} variáveis")
-            print(f"   -> Comandos: {len(ast.comandos)} instruções")
+            print(f"   -> Programa: {programa.nome}")
+            print(f"   -> Declarações: {len(programa.nomes)} variáveis")
+            print(f"   -> Comandos: {len(programa.comandos)} instruções")
+            print("   -> Nenhum erro semântico detectado")
         
-        # Mostrar AST 
-        if opcoes.get('mostrar_ast'):
-            visualizar_ast_grafico(ast)
+        if opcoes.get('executar'):
+            if opcoes.get('verbose'):
+                print("2. Execução do Programa")
+                print("=" * 30)
+            
+            limite_iteracoes = None if opcoes.get('sem_limite') else 1000
+            execucao = ExecucaoPassagemUnica(limite_iteracoes=limite_iteracoes)
+            with fases.fase('execucao'):
+                sucesso = execucao.interpretar(programa)
+            
+            if opcoes.get('verbose'):
+                print("=" * 30)
+            
+            if sucesso:
+                if opcoes.get('verbose'):
+                    print("Programa executado com sucesso!")
+            else:
+                print("Erro durante execução")
+                return False
         
-        # Análise Semântica
         if opcoes.get('verbose'):
-            print("3. Análise Semântica...")
+            print(f"Compilação de '{caminho_arquivo}' concluída com sucesso!")
         
-        erros_semanticos = analisar_semantica(ast)
+        return True
         
-        if erros_semanticos:
-            print("Erros semânticos encontrados:")
-            for i, erro in enumerate(erros_semanticos, 1):
-                print(f"   {i}. {erro}")
-            return False
+    except LexerError as e:
+        print(f"Erro léxico: {e}")
+        return False
+    except ParserError as e:
+        print(f"Erro sintático: {e}")
+        return False
+    except Exception as e:
+        print(f"Erro: {e}")
+        return False
+
+def compilar_arquivo(caminho_arquivo: str, opcoes: dict,
+                     medidor: MedidorFases | None = None,
+                     cache: dict | None = None) -> bool:
+    """Compila um arquivo Fortall
+    
+    Com um MedidorFases, registra o tempo de cada fase e as contagens de tokens,
+    nós e comandos executados (veja compilar_com_tempos). Com um cache (dicionário
+    mantido pelo chamador, ex.: fortalld), ASTs já verificadas do mesmo código são
+    reaproveitadas sem refazer as análises. opcoes['codigo'], se presente, é usado
+    no lugar do conteúdo do arquivo (o caminho serve apenas como nome).
+    """
+    
+    if opcoes.get('codigo') is None and not os.path.exists(caminho_arquivo):
+        print(f"Erro: Arquivo '{caminho_arquivo}' não encontrado")
+        return False
+    
+    fases = medidor if medidor is not None else MedidorFases()
+    
+    try:
+        with fases.fase('leitura_arquivo'):
+            codigo = opcoes.get('codigo')
+            if codigo is None:
+                with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
+                    codigo = arquivo.read()
+    except Exception as e:
+        print(f"Erro ao ler arquivo: {e}")
+        return False
+    
+    if opcoes.get('relatorio_memoria'):
+        return compilar_com_relatorio_memoria(codigo, opcoes)
+    
+    if opcoes.get('verbose'):
+        print(f"Compilando arquivo: {caminho_arquivo}")
+        print("=" * 50)
+    
+    if opcoes.get('passagem_unica'):
+        return compilar_em_passagem_unica(caminho_arquivo, codigo, opcoes, fases)
+    
+    # AST já verificada para o mesmo código e semântica de inteiros
+    chave = (codigo, opcoes.get('modo_inteiro') or MODO_ILIMITADO)
+    ast = None
+    if cache is not None and medidor is None and not opcoes.get('verbose') \
+            and not opcoes.get('mostrar_ast'):
+        ast = cache.get(chave)
+    
+    try:
+        if ast is None:
+            # Análise Léxica
+            if opcoes.get('verbose'):
+                print("1. Análise Léxica...")
+            
+            with fases.fase('lexico'):
+                if opcoes.get('processos_lexico') is not None and opcoes.get('codigo') is None:
+                    from lexico_paralelo import tokenizar_arquivo
+                    tokens = tokenizar_arquivo(caminho_arquivo, opcoes['processos_lexico'])
+                else:
+                    lexer = Lexer(codigo)
+                    tokens = lexer.tokenizar()
+            fases.tokens = len(tokens) - 1  # sem o EOF
+            
+            if opcoes.get('verbose'):
+                print(f"   -> {fases.tokens} tokens reconhecidos")
+            
+            # Análise Sintática
+            if opcoes.get('verbose'):
+                print("2. Análise Sintática...")
+            
+            with fases.fase('sintatico'):
+                if opcoes.get('parser_tabela'):
+                    from parser_tabela import ParserTabela
+                    parser = ParserTabela(codigo, tokens)
+                elif opcoes.get('compartilhar_ast'):
+                    from compartilhamento import ParserCompartilhado
+                    parser = ParserCompartilhado(codigo, tokens)
+                else:
+                    parser = Parser(codigo, tokens)
+                ast = parser.parse()
+                if opcoes.get('compartilhar_ast') and opcoes.get('parser_tabela'):
+                    from compartilhamento import compartilhar
+                    compartilhar(ast)
+            
+            if not ast:
+                print("Erro na análise sintática")
+                return False
+            
+            if medidor is not None:
+                medidor.ast = ast
+            
+            if opcoes.get('verbose'):
+                print(f"   -> Programa: {ast.nome}")
+                print(f"   -> Declarações: {len(ast.declaracoes)} variáveis")
+                print(f"   -> Comandos: {len(ast.comandos)} instruções")
+                if opcoes.get('compartilhar_ast'):
+                    from compartilhamento import tabela_de
+                    tabela = tabela_de(ast)
+                    print(f"   -> Compartilhamento: {len(tabela)} nós únicos para "
+                          f"{tabela.ocorrencias_totais} ocorrências")
+            
+            # Mostrar AST 
+            if opcoes.get('formato_ast'):
+                from exportar_ast import exportar_ast
+                from compartilhamento import expandir
+                with fases.fase('visualizacao_ast'):
+                    # Cópias expandidas levam a posição de cada ocorrência
+                    exportar_ast(expandir(ast), opcoes['formato_ast'], opcoes.get('saida_ast'))
+            elif opcoes.get('mostrar_ast'):
+                from ast_nodes import visualizar_ast_grafico
+                with fases.fase('visualizacao_ast'):
+                    visualizar_ast_grafico(ast)
+            
+            # Análise Semântica
+            if opcoes.get('verbose'):
+                print("3. Análise Semântica...")
+            
+            with fases.fase('semantico'):
+                if opcoes.get('compartilhar_ast'):
+                    # Em árvores compartilhadas, cada nó único é analisado uma vez
+                    from compartilhamento import AnalisadorCompartilhado
+                    analisador = AnalisadorCompartilhado(opcoes.get('modo_inteiro') or MODO_ILIMITADO)
+                    erros_semanticos = analisador.analisar(ast)
+                else:
+                    erros_semanticos = analisar_semantica(ast, opcoes.get('modo_inteiro') or MODO_ILIMITADO)
+            
+            if erros_semanticos:
+                print("Erros semânticos encontrados:")
+                for i, erro in enumerate(erros_semanticos, 1):
+                    print(f"   {i}. {erro}")
+                return False
+            
+            if opcoes.get('verbose'):
+                print("   -> Nenhum erro semântico detectado")
+            
+            if cache is not None:
+                cache[chave] = ast
         
-        if opcoes.get('verbose'):
-            print("   -> Nenhum erro semântico detectado")
+        # Custo estimado, em função das entradas
+        if opcoes.get('estimar_custo') is not None:
+            from custo import estimar_custo
+            with fases.fase('estimativa_custo'):
+                estimativa = estimar_custo(ast)
+            print(estimativa)
+            if opcoes['estimar_custo']:
+                print(estimativa.avaliar(opcoes['estimar_custo']))
+        
+        # Avaliação parcial com as entradas conhecidas
+        entradas_restantes = None
+        if opcoes.get('entradas_conhecidas') is not None:
+            from avaliador_parcial import especializar_programa
+            with fases.fase('avaliacao_parcial'):
+                especializacao = especializar_programa(ast, opcoes['entradas_conhecidas'])
+            ast = especializacao.programa
+            entradas_restantes = opcoes['entradas_conhecidas'][especializacao.entradas_consumidas:]
+            
+            if opcoes.get('verbose'):
+                print(f"   -> Avaliação parcial: {especializacao.entradas_consumidas} entradas "
+                      f"consumidas, {especializacao.passos_estaticos} comandos executados")
+            
+            if opcoes.get('saida_residual') or not opcoes.get('executar'):
+                from exportar_ast import exportar_ast
+                exportar_ast(ast, 'fortall', opcoes.get('saida_residual'))
         
         # Execução
-        if opcoes.get('executar'):
+        if opcoes.get('executar') or opcoes.get('retomar'):
             if opcoes.get('verbose'):
                 print("4. Execução do Programa")
                 print("=" * 30)
             
-            interpretador = Interpretador()
-            sucesso = interpretador.interpretar(ast)
+            # --timings mede o mesmo interpretador de -e; os comandos executados só
+            # são contados quando as estatísticas são pedidas (--stats-file)
+            interpretador = criar_interpretador(codigo, opcoes)
+            if entradas_restantes:
+                from avaliador_parcial import entrada_com_prefixo
+                interpretador.entrada = entrada_com_prefixo(entradas_restantes, interpretador.entrada)
+            with fases.fase('execucao'):
+                sucesso = interpretador.interpretar(ast)
+            
+            if opcoes.get('estatisticas') and medidor is not None:
+                medidor.estatisticas = interpretador.estatisticas()
+                medidor.comandos_executados = medidor.estatisticas.total_comandos
             
             if opcoes.get('verbose'):
                 print("=" * 30)
             
+            if opcoes.get('perfil'):
+                emitir_perfil(interpretador, codigo, opcoes)
+            
             if sucesso:
                 if opcoes.get('verbose'):
                     print("Programa executado com sucesso!")
@@ -107,8 +359,22 @@ def compilar_arquivo(caminho_arquivo: str, opcoes: dict) -> bool:
         print(f"Erro: {e}")
         return False
 
-def main():
-    """Função principal"""
+def compilar_com_tempos(caminho_arquivo: str, opcoes: dict,
+                        medidor: MedidorFases | None = None) -> dict:
+    """Compila (e executa, se pedido) medindo cada fase; retorna um dicionário para JSON"""
+    medidor = medidor if medidor is not None else MedidorFases()
+    sucesso = compilar_arquivo(caminho_arquivo, opcoes, medidor)
+    resultado = medidor.como_dict(arquivo=caminho_arquivo, sucesso=sucesso)
+    # Comandos só são contados pelo interpretador de estatísticas
+    if opcoes.get('perfil') or opcoes.get('checkpoint') or opcoes.get('retomar') \
+            or opcoes.get('passagem_unica'):
+        resultado['comandos_executados'] = None
+        resultado['comandos_por_segundo'] = None
+    return resultado
+
+def criar_parser_argumentos() -> 'argparse.ArgumentParser':
+    """Argumentos de linha de comando (compartilhados com o fortalld)"""
+    import argparse
     parser = argparse.ArgumentParser(
         description='Compilador Fortall',
         epilog='''
@@ -117,7 +383,22 @@ Exemplos de uso:
   python main.py programa.fortall -e           # Compilar e executar
   python main.py programa.fortall -v           # Modo verboso
   python main.py programa.fortall --ast        # Árvore Sintática
+  python main.py programa.fortall --ast-format dot --ast-output ast.dot  # Exportar AST
   python main.py programa.fortall -e -v --ast  # Tudo junto
+  python main.py programa.fortall -e --checkpoint prog.ckpt  # Execução com checkpoints
+  python main.py programa.fortall --resume prog.ckpt         # Retomar execução
+  python main.py programa.fortall -e --profile               # Perfil de execução
+  python main.py programa.fortall -e --mem-report mem.json   # Memória por fase
+  python main.py programa.fortall -e --timings               # Tempos por fase (JSON)
+  python main.py programa.fortall -e --stats-file fortall.prom  # Métricas para o Prometheus
+  python main.py programa.fortall -e --int64 trap            # Inteiros de 64 bits
+  python main.py programa.fortall --partial-eval 10,3        # Especializar para entradas conhecidas
+  python main.py programa.fortall --cost 1000                # Custo estimado antes de executar
+  python main.py programa.fortall --lex-jobs 8                # Análise léxica em 8 processos
+  python main.py programa.fortall -e --single-pass           # Compilar em uma passada
+  python main.py programa.fortall --parser tabela            # Parser LL(1) gerado da gramática
+  python main.py programa.fortall -e --hash-cons             # Subárvores idênticas construídas uma vez
+  python main.py exemplos/ --watch                           # Recompilar ao salvar
         '''
     )
     
@@ -129,20 +410,188 @@ Exemplos de uso:
                        help='Mostrar detalhes da compilação')
     parser.add_argument('--ast', action='store_true',
                        help='Mostrar árvore sintática')
+    parser.add_argument('--ast-format', choices=['text', 'json', 'dot', 'fortall'],
+                       help='Exportar a árvore sintática em texto, JSON, DOT (Graphviz) ou código Fortall')
+    parser.add_argument('--ast-output', metavar='ARQUIVO',
+                       help='Arquivo da árvore exportada (padrão: saída padrão; implica --ast-format text)')
+    parser.add_argument('--int64', nargs='?', const='wrap', choices=['wrap', 'trap'],
+                       help='Inteiros de 64 bits com sinal: wrap (complemento de dois, padrão) '
+                            'ou trap (erro no estouro)')
+    parser.add_argument('--sem-limite', action='store_true',
+                       help='Não pedir confirmação em laços com mais de 1000 iterações')
+    parser.add_argument('--checkpoint', metavar='ARQUIVO',
+                       help='Gravar checkpoints periódicos da execução em ARQUIVO')
+    parser.add_argument('--checkpoint-comandos', type=int, default=100000, metavar='N',
+                       help='Comandos executados entre checkpoints (0 desativa; padrão: 100000)')
+    parser.add_argument('--checkpoint-segundos', type=float, default=30.0, metavar='S',
+                       help='Segundos entre checkpoints (0 desativa; padrão: 30)')
+    parser.add_argument('--resume', metavar='CHECKPOINT',
+                       help='Retomar a execução a partir de um checkpoint')
+    parser.add_argument('--profile', action='store_true',
+                       help='Medir tempo e contagem de execução por nó, linha e laço')
+    parser.add_argument('--flamegraph', metavar='ARQUIVO',
+                       help='Gravar pilhas colapsadas do perfil em ARQUIVO (implica --profile)')
+    parser.add_argument('--timings', nargs='?', const=True, default=None, metavar='ARQUIVO',
+                       help='Tempos de cada fase em JSON (na saída padrão ou em ARQUIVO)')
+    parser.add_argument('--stats-file', metavar='ARQUIVO',
+                       help='Gravar estatísticas da execução (comandos por tipo, iterações, leituras, '
+                            'escritas, tempos por fase) no formato de texto do Prometheus')
+    parser.add_argument('--mem-report', nargs='?', const=True, default=None, metavar='ARQUIVO',
+                       help='Relatório de memória por fase (tracemalloc); com ARQUIVO, grava também em JSON')
+    parser.add_argument('--partial-eval', metavar='VALORES',
+                       help="Especializar o programa para os primeiros valores de 'ler' (separados "
+                            "por vírgula); sem -e, mostra o programa residual")
+    parser.add_argument('--residual', metavar='ARQUIVO',
+                       help='Gravar o programa residual da avaliação parcial em ARQUIVO')
+    parser.add_argument('--cost', nargs='?', const='', default=None, metavar='VALORES',
+                       help="Mostrar limites estimados de comandos, iterações por laço, bits e bytes "
+                            "escritos em função das entradas; com VALORES (separados por vírgula), "
+                            "também avaliados para eles")
+    parser.add_argument('--lex-jobs', nargs='?', type=int, const=0, default=None, metavar='N',
+                       help='Análise léxica em N processos, dividindo o arquivo em trechos '
+                            '(sem N: um por núcleo)')
+    parser.add_argument('--single-pass', action='store_true',
+                       help='Compilar em uma única passada, gerando código sem montar a árvore sintática')
+    parser.add_argument('--parser', choices=['descendente', 'tabela'], default='descendente',
+                       help='Análise sintática pelo parser descendente recursivo (padrão) ou pelas '
+                            'tabelas LL(1) geradas de gramatica.txt')
+    parser.add_argument('--hash-cons', action='store_true',
+                       help='Construir comandos e expressões idênticos uma única vez (hash-consing), '
+                            'com as posições de cada ocorrência em uma tabela à parte')
+    parser.add_argument('--watch', action='store_true',
+                       help='Observar o arquivo (ou diretório) e recompilar a cada alteração')
+    parser.add_argument('--debounce', type=float, default=0.05, metavar='S',
+                       help='Espera após a última gravação antes de recompilar (padrão: 0.05)')
     
-    args = parser.parse_args()
+    return parser
+
+def opcoes_de_argumentos(parser: 'argparse.ArgumentParser', args: 'argparse.Namespace') -> dict:
+    """Converte os argumentos em opções de compilar_arquivo"""
+    perfil = args.profile or bool(args.flamegraph)
+    if perfil and (args.checkpoint or args.resume):
+        parser.error("--profile não pode ser combinado com --checkpoint/--resume")
+    if args.watch and (args.checkpoint or args.resume or args.timings or args.mem_report
+                       or args.stats_file):
+        parser.error("--watch não pode ser combinado com --checkpoint/--resume/--timings/"
+                     "--mem-report/--stats-file")
+    if args.stats_file and (perfil or args.checkpoint or args.resume or args.mem_report
+                            or args.single_pass):
+        parser.error("--stats-file não pode ser combinado com --profile/--checkpoint/--resume/"
+                     "--mem-report/--single-pass")
+    if args.single_pass and (args.ast or args.ast_format or args.ast_output or perfil
+                             or args.checkpoint or args.resume or args.mem_report
+                             or args.lex_jobs is not None or args.partial_eval is not None
+                             or args.cost is not None or args.parser != 'descendente'
+                             or args.hash_cons):
+        parser.error("--single-pass não pode ser combinado com --ast/--profile/--checkpoint/"
+                     "--resume/--mem-report/--lex-jobs/--partial-eval/--cost/--parser/--hash-cons")
+    if args.hash_cons and perfil:
+        # Tempos e contagens por nó somariam todas as ocorrências na posição da primeira
+        parser.error("--hash-cons não pode ser combinado com --profile")
+    if args.residual and args.partial_eval is None:
+        parser.error("--residual requer --partial-eval")
+    if args.partial_eval is not None and (args.checkpoint or args.resume or args.mem_report):
+        parser.error("--partial-eval não pode ser combinado com --checkpoint/--resume/--mem-report")
     
-    # Opções de compilação
-    opcoes = {
+    return {
         'executar': args.executar,
         'verbose': args.verbose,
-        'mostrar_ast': args.ast,
+        'mostrar_ast': args.ast or bool(args.ast_format or args.ast_output),
+        'formato_ast': args.ast_format or ('text' if args.ast_output else None),
+        'saida_ast': args.ast_output,
+        'sem_limite': args.sem_limite,
+        'checkpoint': args.checkpoint,
+        'checkpoint_comandos': args.checkpoint_comandos,
+        'checkpoint_segundos': args.checkpoint_segundos,
+        'retomar': args.resume,
+        'perfil': perfil,
+        'flamegraph': args.flamegraph,
+        'relatorio_memoria': args.mem_report,
+        'estatisticas': bool(args.stats_file),
+        'passagem_unica': args.single_pass,
+        'parser_tabela': args.parser == 'tabela',
+        'compartilhar_ast': args.hash_cons,
+        'processos_lexico': args.lex_jobs,
+        'entradas_conhecidas': (None if args.partial_eval is None else
+                                [valor.strip() for valor in args.partial_eval.split(',') if valor.strip()]),
+        'saida_residual': args.residual,
+        'estimar_custo': (None if args.cost is None else
+                          [valor.strip() for valor in args.cost.split(',') if valor.strip()]),
+        'modo_inteiro': {None: MODO_ILIMITADO, 'wrap': MODO_INT64,
+                         'trap': MODO_INT64_TRAP}[args.int64],
     }
+
+def executar_argumentos(args: 'argparse.Namespace', opcoes: dict, cache: dict | None = None) -> int:
+    """Compila o arquivo dos argumentos e retorna o código de saída"""
+    if args.watch:
+        from observador import Observador
+        observador = Observador(args.arquivo, lambda caminho, cache_arquivo:
+                                compilar_arquivo(caminho, opcoes, cache=cache_arquivo),
+                                debounce=args.debounce)
+        return observador.executar()
     
-    # Compilar arquivo
-    sucesso = compilar_arquivo(args.arquivo, opcoes)
+    if args.timings or args.stats_file:
+        medidor = MedidorFases()
+        resultado = compilar_com_tempos(args.arquivo, opcoes, medidor)
+        if args.stats_file:
+            from estatisticas import gravar_prometheus
+            gravar_prometheus(args.stats_file, medidor.estatisticas, fases_ns=medidor.fases,
+                              sucesso=resultado['sucesso'], rotulos={'arquivo': args.arquivo})
+        if args.timings:
+            import json
+            documento = json.dumps(resultado, ensure_ascii=False)
+            if isinstance(args.timings, str):
+                with open(args.timings, 'w', encoding='utf-8') as arquivo:
+                    arquivo.write(documento + "\n")
+            else:
+                print(documento)
+        return 0 if resultado['sucesso'] else 1
+    
+    sucesso = compilar_arquivo(args.arquivo, opcoes, cache=cache)
     return 0 if sucesso else 1
 
+# Opções booleanas reconhecidas sem argparse, e os valores padrão das demais
+# (devem acompanhar criar_parser_argumentos)
+OPCOES_SIMPLES = {'-e': 'executar', '--executar': 'executar', '-v': 'verbose',
+                  '--verbose': 'verbose', '--ast': 'ast', '--sem-limite': 'sem_limite'}
+PADROES_ARGUMENTOS = {
+    'executar': False, 'verbose': False, 'ast': False, 'ast_format': None, 'ast_output': None,
+    'int64': None, 'sem_limite': False,
+    'checkpoint': None, 'checkpoint_comandos': 100000, 'checkpoint_segundos': 30.0,
+    'resume': None, 'profile': False, 'flamegraph': None, 'timings': None, 'stats_file': None, 'mem_report': None,
+    'partial_eval': None, 'residual': None, 'cost': None, 'lex_jobs': None, 'single_pass': False, 'parser': 'descendente', 'hash_cons': False, 'watch': False, 'debounce': 0.05,
+}
+
+def argumentos_simples(argv: list):
+    """Interpreta a linha de comando mais comum (arquivo e opções booleanas) sem
+    importar argparse; retorna None quando é preciso o parser completo"""
+    valores = dict(PADROES_ARGUMENTOS)
+    arquivo = None
+    for argumento in argv:
+        if argumento in OPCOES_SIMPLES:
+            valores[OPCOES_SIMPLES[argumento]] = True
+        elif argumento.startswith('-') or arquivo is not None:
+            return None
+        else:
+            arquivo = argumento
+    if arquivo is None:
+        return None
+    from types import SimpleNamespace
+    return SimpleNamespace(arquivo=arquivo, **valores)
+
+def main(argv: list | None = None):
+    """Função principal"""
+    args = argumentos_simples(sys.argv[1:] if argv is None else argv)
+    if args is not None:
+        parser = None  # opções simples não têm combinações inválidas
+    else:
+        parser = criar_parser_argumentos()
+        args = parser.parse_args(argv)
+    opcoes = opcoes_de_argumentos(parser, args)
+    
+    # Compilar arquivo
+    return executar_argumentos(args, opcoes)
+
 if __name__ == "__main__":
     try:
         exit_code = main()
@@ -0,0 +1,196 @@
+import os
+import sys
+import tracemalloc
+from typing import Dict, List, Any, Callable, Optional
+
+from lexer import Lexer
+from parser import Parser
+from semantic import AnalisadorSemantico
+from compartilhamento import AnalisadorCompartilhado, ParserCompartilhado, tabela_de
+from interpreter import Interpretador, classe_para_modo
+from inteiros import MODO_ILIMITADO
+
+# Arquivos do compilador: alocações são atribuídas à linha mais interna deles na pilha
+DIRETORIO_COMPILADOR = os.path.dirname(os.path.abspath(__file__))
+# Módulos que apenas coordenam as fases não recebem alocações
+ARQUIVOS_IGNORADOS = {'main.py', os.path.basename(__file__)}
+
+def medir_objetos(*raizes: Any) -> Dict[str, List[int]]:
+    """Soma sys.getsizeof dos objetos alcançáveis a partir das raízes, por tipo.
+
+    Retorna {tipo: [quantidade, bytes]}; tokens e nós da AST aparecem pelo nome da
+    classe (incluindo o __dict__ da instância), os atributos em __slots__ também são
+    percorridos, e cada objeto é contado uma única vez.
+    """
+    por_tipo: Dict[str, List[int]] = {}
+    vistos = set()
+    pendentes = list(raizes)
+    while pendentes:
+        objeto = pendentes.pop()
+        if id(objeto) in vistos or objeto is None or isinstance(objeto, (bool, type)):
+            continue
+        vistos.add(id(objeto))
+
+        dados = por_tipo.setdefault(type(objeto).__name__, [0, 0])
+        dados[0] += 1
+        dados[1] += sys.getsizeof(objeto)
+
+        if isinstance(objeto, (list, tuple, set)):
+            pendentes.extend(objeto)
+        elif isinstance(objeto, dict):
+            pendentes.extend(objeto.keys())
+            pendentes.extend(objeto.values())
+        elif not callable(objeto):
+            if hasattr(objeto, '__dict__'):
+                atributos = vars(objeto)
+                vistos.add(id(atributos))
+                dados[1] += sys.getsizeof(atributos)
+                pendentes.extend(atributos.values())
+            # Atributos em __slots__ (ex.: Token) não aparecem em vars()
+            for classe in type(objeto).__mro__:
+                nomes = classe.__dict__.get('__slots__', ())
+                for nome in ((nomes,) if isinstance(nomes, str) else nomes):
+                    if nome not in ('__dict__', '__weakref__'):
+                        pendentes.append(getattr(objeto, nome, None))
+    return por_tipo
+
+def _por_linha(antes: tracemalloc.Snapshot, depois: tracemalloc.Snapshot,
+               limite: int) -> List[Dict[str, Any]]:
+    """Alocações retidas por linha do compilador entre dois snapshots"""
+    agregado: Dict[tuple, List[int]] = {}
+    for estatistica in depois.compare_to(antes, 'traceback'):
+        if estatistica.size_diff <= 0:
+            continue
+        chave = None
+        # Quadro mais interno que pertence ao compilador (a pilha vem do mais antigo)
+        for quadro in reversed(estatistica.traceback):
+            if (quadro.filename.startswith(DIRETORIO_COMPILADOR) and
+                    os.path.basename(quadro.filename) not in ARQUIVOS_IGNORADOS):
+                chave = (os.path.basename(quadro.filename), quadro.lineno)
+                break
+        if chave is None:
+            continue
+        dados = agregado.setdefault(chave, [0, 0])
+        dados[0] += estatistica.size_diff
+        dados[1] += estatistica.count_diff
+
+    ordenado = sorted(agregado.items(), key=lambda item: item[1][0], reverse=True)
+    return [{'arquivo': arquivo, 'linha': linha, 'bytes': tamanho, 'blocos': blocos}
+            for (arquivo, linha), (tamanho, blocos) in ordenado[:limite]]
+
+class MedidorMemoria:
+    """Executa as fases do compilador registrando pico e memória retida de cada uma"""
+
+    def __init__(self, limite_linhas: int = 10):
+        self.limite_linhas = limite_linhas
+        self.fases: List[Dict[str, Any]] = []
+
+    def medir(self, nome: str, funcao: Callable[[], Any],
+              retidos: Callable[[Any], tuple]) -> Any:
+        """Executa funcao(); retidos(resultado) indica os objetos que a fase deixa vivos"""
+        atual_antes, _ = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        snapshot_antes = tracemalloc.take_snapshot()
+
+        resultado = funcao()
+
+        atual_depois, pico = tracemalloc.get_traced_memory()
+        snapshot_depois = tracemalloc.take_snapshot()
+        # Os próprios snapshots não entram na medição dos objetos
+        por_tipo = medir_objetos(*retidos(resultado))
+
+        self.fases.append({
+            'fase': nome,
+            'pico_bytes': pico - atual_antes,
+            'retido_bytes': atual_depois - atual_antes,
+            'total_bytes': atual_depois,
+            'por_tipo': {tipo: {'objetos': quantidade, 'bytes': tamanho}
+                         for tipo, (quantidade, tamanho) in
+                         sorted(por_tipo.items(), key=lambda item: item[1][1], reverse=True)},
+            'por_linha': _por_linha(snapshot_antes, snapshot_depois, self.limite_linhas),
+        })
+        return resultado
+
+    def como_dict(self) -> Dict[str, Any]:
+        return {'fases': self.fases}
+
+def _kib(tamanho: int) -> str:
+    return f"{tamanho / 1024:10.1f} KiB"
+
+def formatar_relatorio(relatorio: Dict[str, Any], limite_tipos: int = 8) -> str:
+    saida = ["=" * 60, "                RELATÓRIO DE MEMÓRIA", "=" * 60]
+    for fase in relatorio['fases']:
+        saida.append(f"{fase['fase']}:")
+        saida.append(f"   pico: {_kib(fase['pico_bytes'])}   retido: {_kib(fase['retido_bytes'])}"
+                     f"   total: {_kib(fase['total_bytes'])}")
+        if fase['por_tipo']:
+            saida.append("   objetos retidos por tipo:")
+            for tipo, dados in list(fase['por_tipo'].items())[:limite_tipos]:
+                saida.append(f"      {tipo:<20} {dados['objetos']:>9} {_kib(dados['bytes'])}")
+        if fase['por_linha']:
+            saida.append("   alocações retidas por linha do compilador:")
+            for item in fase['por_linha']:
+                local = f"{item['arquivo']}:{item['linha']}"
+                saida.append(f"      {local:<20} {item['blocos']:>9} {_kib(item['bytes'])}")
+    saida.append("=" * 60)
+    return "\n".join(saida)
+
+def compilar_com_relatorio_memoria(codigo: str, executar: bool = False,
+                                   modo_inteiro: str = MODO_ILIMITADO,
+                                   criar_interpretador: Optional[Callable[[], Interpretador]] = None,
+                                   nframes: int = 10, compartilhar: bool = False) -> Dict[str, Any]:
+    """Compila (e opcionalmente executa) medindo a memória de cada fase.
+
+    Com compartilhar=True, a AST é construída pelo ParserCompartilhado (hash-consing).
+    Erros de compilação são propagados; o relatório parcial fica em erro.relatorio_memoria.
+    """
+    medidor = MedidorMemoria()
+    ja_ativo = tracemalloc.is_tracing()
+    if not ja_ativo:
+        tracemalloc.start(nframes)
+
+    try:
+        tokens = medidor.medir("léxico (Lexer.tokenizar)",
+                               lambda: Lexer(codigo).tokenizar(),
+                               lambda tokens: (tokens,))
+
+        # O parser recebe os tokens da fase léxica: sem eles, tokenizaria o código de novo
+        # e o pico sintático incluiria uma segunda lista de tokens
+        def sintatico():
+            if compartilhar:
+                return ParserCompartilhado(codigo, tokens).parse()
+            return Parser(codigo, tokens).parse()
+
+        ast = medidor.medir("sintático (Parser.parse)", sintatico,
+                            lambda ast: (ast, tabela_de(ast)))
+        # A lista de tokens não é usada pelas fases seguintes
+        del tokens
+
+        analisador = (AnalisadorCompartilhado if compartilhar else AnalisadorSemantico)(modo_inteiro)
+
+        def semantico():
+            return analisador.analisar(ast)
+
+        erros = medidor.medir("semântico (analisar_semantica)", semantico,
+                              lambda erros: (analisador.tabela_simbolos, erros))
+
+        relatorio = medidor.como_dict()
+        relatorio['erros_semanticos'] = [str(erro) for erro in erros]
+        relatorio['sucesso'] = not erros
+
+        if executar and not erros:
+            if criar_interpretador:
+                interpretador = criar_interpretador()
+            else:
+                interpretador = classe_para_modo(Interpretador, modo_inteiro)()
+            sucesso = medidor.medir("execução", lambda: interpretador.interpretar(ast),
+                                    lambda _: (interpretador.ambiente,))
+            relatorio['sucesso'] = sucesso
+        return relatorio
+    except Exception as e:
+        e.relatorio_memoria = medidor.como_dict()
+        raise
+    finally:
+        if not ja_ativo:
+            tracemalloc.stop()
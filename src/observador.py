@@ -0,0 +1,248 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Extensões consideradas programas Fortall ao observar um diretório
+EXTENSOES = ('.txt', '.fortall')
+
+# Eventos do inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+EVENTOS_INOTIFY = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+_CABECALHO = struct.Struct('iIII')
+
+class _Inotify:
+    """Notificações do kernel (Linux) para os diretórios observados.
+
+    Com recursivo=True, diretórios criados ou movidos para dentro passam a ser
+    observados e os arquivos que já estão neles são relatados. Quando a fila do
+    kernel transborda ou um diretório sai da árvore, tudo é revisto: os
+    diretórios de diretorios() são observados de novo e os caminhos de rever()
+    são relatados.
+    """
+
+    def __init__(self, diretorios: Callable[[], Iterable[str]], rever: Callable[[], Iterable[str]],
+                 recursivo: bool = True):
+        nome_libc = ctypes.util.find_library('c') or 'libc.so.6'
+        self.libc = ctypes.CDLL(nome_libc, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        self.listar_diretorios = diretorios
+        self.rever = rever
+        self.recursivo = recursivo
+        self.diretorios: Dict[int, str] = {}
+        for diretorio in diretorios():
+            if self._observar(diretorio) < 0:
+                erro = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(erro, f"inotify_add_watch falhou para '{diretorio}'")
+
+    def _observar(self, diretorio: str) -> int:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(diretorio), EVENTOS_INOTIFY)
+        if wd >= 0:
+            self.diretorios[wd] = diretorio
+        return wd
+
+    def _novo_diretorio(self, diretorio: str, alterados: Set[str]):
+        """Observa o diretório (e os subdiretórios) e relata os arquivos que já estão nele"""
+        for raiz, _, nomes in os.walk(diretorio):
+            # Pode ter sido removido nesse meio tempo; os eventos dirão
+            self._observar(raiz)
+            alterados.update(os.path.join(raiz, nome) for nome in nomes)
+
+    def _esquecer(self, diretorio: str):
+        """Deixa de observar o diretório que saiu da árvore e os seus subdiretórios"""
+        prefixo = os.path.join(diretorio, '')
+        for wd, caminho in list(self.diretorios.items()):
+            if caminho == diretorio or caminho.startswith(prefixo):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.diretorios[wd]
+
+    def esperar(self, tempo: Optional[float]) -> Set[str]:
+        """Caminhos alterados, esperando no máximo `tempo` segundos (None = sem limite)"""
+        prontos, _, _ = select.select([self.fd], [], [], tempo)
+        if not prontos:
+            return set()
+        alterados = set()
+        try:
+            dados = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return alterados
+        rever = False
+        posicao = 0
+        while posicao < len(dados):
+            wd, mascara, _, tamanho = _CABECALHO.unpack_from(dados, posicao)
+            posicao += _CABECALHO.size
+            nome = dados[posicao:posicao + tamanho].rstrip(b'\0')
+            posicao += tamanho
+            if mascara & IN_Q_OVERFLOW:
+                rever = True
+            elif mascara & IN_IGNORED:
+                self.diretorios.pop(wd, None)
+            elif nome and wd in self.diretorios:
+                caminho = os.path.join(self.diretorios[wd], os.fsdecode(nome))
+                if not mascara & IN_ISDIR:
+                    alterados.add(caminho)
+                elif not self.recursivo:
+                    continue
+                elif mascara & (IN_CREATE | IN_MOVED_TO):
+                    self._novo_diretorio(caminho, alterados)
+                elif mascara & IN_MOVED_FROM:
+                    # Os arquivos saíram junto, sem eventos próprios
+                    self._esquecer(caminho)
+                    rever = True
+        if rever:
+            for diretorio in self.listar_diretorios():
+                self._observar(diretorio)
+            alterados.update(self.rever())
+        return alterados
+
+    def fechar(self):
+        os.close(self.fd)
+
+class _Sondagem:
+    """Verificação periódica de mtime e tamanho (quando não há inotify)"""
+
+    def __init__(self, listar: Callable[[], List[str]], intervalo: float = 0.25):
+        self.listar = listar
+        self.intervalo = intervalo
+        self.estados = self._estados()
+
+    def _estados(self) -> Dict[str, Tuple[int, int]]:
+        estados = {}
+        for caminho in self.listar():
+            try:
+                informacao = os.stat(caminho)
+            except OSError:
+                continue
+            estados[caminho] = (informacao.st_mtime_ns, informacao.st_size)
+        return estados
+
+    def esperar(self, tempo: Optional[float]) -> Set[str]:
+        time.sleep(self.intervalo if tempo is None else min(tempo, self.intervalo))
+        atuais = self._estados()
+        alterados = {caminho for caminho, estado in atuais.items()
+                     if self.estados.get(caminho) != estado}
+        alterados.update(caminho for caminho in self.estados if caminho not in atuais)
+        self.estados = atuais
+        return alterados
+
+    def fechar(self):
+        pass
+
+class _CacheArquivo:
+    """AST verificada da versão atual de um arquivo (interface de cache de compilar_arquivo)"""
+
+    __slots__ = ('chave', 'ast')
+
+    def __init__(self):
+        self.chave = None
+        self.ast = None
+
+    def get(self, chave):
+        return self.ast if chave == self.chave else None
+
+    def __setitem__(self, chave, ast):
+        self.chave = chave
+        self.ast = ast
+
+def _nome(caminho: str) -> str:
+    relativo = os.path.relpath(caminho)
+    return caminho if relativo.startswith('..') else relativo
+
+class Observador:
+    """Recompila (e executa, se pedido) os programas de um arquivo ou diretório a cada alteração.
+
+    Rajadas de gravações são agrupadas (debounce) e somente os arquivos alterados são
+    processados; arquivos cujo conteúdo não mudou reaproveitam a AST em cache.
+    """
+
+    def __init__(self, alvo: str, compilar: Callable[[str, _CacheArquivo], bool],
+                 debounce: float = 0.05, sondagem: bool = False):
+        self.alvo = os.path.abspath(alvo)
+        self.compilar = compilar
+        self.debounce = debounce
+        self.caches: Dict[str, _CacheArquivo] = {}
+        self.sondagem = sondagem
+
+    def eh_programa(self, caminho: str) -> bool:
+        if os.path.isdir(self.alvo):
+            return caminho.endswith(EXTENSOES) and not os.path.basename(caminho).startswith('.')
+        return caminho == self.alvo
+
+    def listar(self) -> List[str]:
+        if not os.path.isdir(self.alvo):
+            return [self.alvo] if os.path.exists(self.alvo) else []
+        arquivos = []
+        for raiz, _, nomes in os.walk(self.alvo):
+            arquivos.extend(os.path.join(raiz, nome) for nome in nomes)
+        return sorted(caminho for caminho in arquivos if self.eh_programa(caminho))
+
+    def diretorios(self) -> List[str]:
+        if not os.path.isdir(self.alvo):
+            # O diretório do arquivo é observado: editores costumam substituir o arquivo
+            return [os.path.dirname(self.alvo)]
+        return [raiz for raiz, _, _ in os.walk(self.alvo)]
+
+    def rever(self) -> List[str]:
+        """Programas atuais e os já processados (os removidos são relatados como tal)"""
+        return sorted(set(self.listar()) | set(self.caches))
+
+    def criar_monitor(self):
+        if not self.sondagem and sys.platform.startswith('linux'):
+            try:
+                return _Inotify(self.diretorios, self.rever, os.path.isdir(self.alvo))
+            except (OSError, AttributeError):
+                pass
+        return _Sondagem(self.listar)
+
+    def processar(self, caminho: str):
+        nome = _nome(caminho)
+        if not os.path.exists(caminho):
+            self.caches.pop(caminho, None)
+            print(f"== {nome}: removido", flush=True)
+            return
+        cache = self.caches.setdefault(caminho, _CacheArquivo())
+        inicio = time.perf_counter()
+        sucesso = self.compilar(caminho, cache)
+        duracao = (time.perf_counter() - inicio) * 1000
+        print(f"== {nome}: {'ok' if sucesso else 'com erros'} ({duracao:.1f} ms)", flush=True)
+
+    def executar(self, ciclos: Optional[int] = None) -> int:
+        """Processa todos os programas e depois cada lote de alterações (ciclos=None: sempre)"""
+        monitor = self.criar_monitor()
+        tipo = "inotify" if isinstance(monitor, _Inotify) else "sondagem de mtime"
+        print(f"Observando {_nome(self.alvo)} ({tipo}); Ctrl+C para sair", flush=True)
+        try:
+            for caminho in self.listar():
+                self.processar(caminho)
+            while ciclos is None or ciclos > 0:
+                alterados = {caminho for caminho in monitor.esperar(None) if self.eh_programa(caminho)}
+                if not alterados:
+                    continue
+                # Debounce: espera as gravações pararem antes de recompilar
+                while True:
+                    mais = monitor.esperar(self.debounce)
+                    if not mais:
+                        break
+                    alterados.update(caminho for caminho in mais if self.eh_programa(caminho))
+                for caminho in sorted(alterados):
+                    self.processar(caminho)
+                if ciclos is not None:
+                    ciclos -= 1
+        finally:
+            monitor.fechar()
+        return 0
@@ -1,6 +1,8 @@
-from typing import List, Optional
-from lexer import Lexer, Token, TokenType, LexerError
+from __future__ import annotations
+
+from lexer import Lexer, Token, TokenType, TEXTOS_TOKEN, LexerError
 from ast_nodes import *
+from inteiros import inteiro_de_texto
 
 class ParserError(Exception):
     def __init__(self, mensagem: str, token: Token):
@@ -8,14 +10,23 @@ class ParserError(Exception):
         self.token = token
         super().__init__(f"Erro sintático na linha {token.linha}, coluna {token.coluna}: {mensagem}")
 
+# Conjuntos de tipos testados a cada expressão (evitam montar a tupla de verificar())
+OPERADORES_RELACIONAIS = frozenset((TokenType.IGUAL, TokenType.DIFERENTE, TokenType.MENOR,
+                                    TokenType.MENOR_IGUAL, TokenType.MAIOR, TokenType.MAIOR_IGUAL))
+OPERADORES_ADITIVOS = frozenset((TokenType.MAIS, TokenType.MENOS))
+OPERADORES_MULTIPLICATIVOS = frozenset((TokenType.MULTIPLICACAO, TokenType.DIVISAO))
+
 class Parser:
-    def __init__(self, codigo: str):
+    def __init__(self, codigo: str, tokens: list[Token] | None = None):
         self.lexer = Lexer(codigo)
-        try:
-            self.tokens = self.lexer.tokenizar()
-        except LexerError as e:
-            raise ParserError(f"Erro léxico: {e.mensagem}", 
-                            Token(TokenType.EOF, "", e.linha, e.coluna))
+        if tokens is None:
+            try:
+                tokens = self.lexer.tokenizar()
+            except LexerError as e:
+                raise ParserError(f"Erro léxico: {e.mensagem}", 
+                                Token(TokenType.EOF, "", e.linha, e.coluna))
+        # Tokens já produzidos (ex.: pelo main.py) evitam uma segunda análise léxica
+        self.tokens = tokens
         
         self.posicao = 0
         self.token_atual = self.tokens[0] if self.tokens else None
@@ -28,17 +39,17 @@ class Parser:
             self.posicao += 1
             self.token_atual = self.tokens[self.posicao]
     
-    def verificar(self, *tipos: TokenType) -> bool:
+    def verificar(self, *tipos: int) -> bool:
         return self.token_atual.tipo in tipos
     
-    def consumir(self, tipo: TokenType, mensagem: str = None) -> Token:
+    def consumir(self, tipo: int, mensagem: str = None) -> Token:
         if self.token_atual.tipo == tipo:
             token = self.token_atual
             self.avancar()
             return token
         else:
             if mensagem is None:
-                mensagem = f"Esperado {tipo.value}, encontrado {self.token_atual.valor}"
+                mensagem = f"Esperado {TEXTOS_TOKEN[tipo]}, encontrado {self.token_atual.valor}"
             self.erro(mensagem)
     
     def parse(self) -> Programa:
@@ -66,9 +77,9 @@ class Parser:
         self.consumir(TokenType.FIM, "Esperado 'fim'")
         self.consumir(TokenType.PONTO, "Esperado '.' no final do programa")
         
-        return Programa(nome_token.valor, declaracoes, comandos, linha, coluna)
+        return Programa(str(nome_token.valor), declaracoes, comandos, linha, coluna)
     
-    def declaracoes(self) -> List[Declaracao]:
+    def declaracoes(self) -> list[Declaracao]:
         """declarações ::= 'var' lista_declaracao { lista_declaracao }"""
         declaracoes = []
         self.consumir(TokenType.VAR, "Esperado 'var'")
@@ -107,7 +118,7 @@ class Parser:
         else:
             self.erro("Esperado tipo 'inteiro'")
     
-    def lista_comandos(self) -> List[Comando]:
+    def lista_comandos(self) -> list[Comando]:
         """lista_comandos ::= comando { ';' comando }"""
         comandos = []
         comandos.append(self.comando())
@@ -121,17 +132,18 @@ class Parser:
     
     def comando(self) -> Comando:
         """comando ::= atribuição | leitura | escrita | bloco | condicional | repetição"""
-        if self.verificar(TokenType.IDENTIFICADOR):
+        tipo = self.token_atual.tipo
+        if tipo == TokenType.IDENTIFICADOR:
             return self.atribuicao()
-        elif self.verificar(TokenType.LER):
+        elif tipo == TokenType.LER:
             return self.leitura()
-        elif self.verificar(TokenType.ESCREVER):
+        elif tipo == TokenType.ESCREVER:
             return self.escrita()
-        elif self.verificar(TokenType.INICIO):
+        elif tipo == TokenType.INICIO:
             return self.bloco()
-        elif self.verificar(TokenType.SE):
+        elif tipo == TokenType.SE:
             return self.condicional()
-        elif self.verificar(TokenType.ENQUANTO):
+        elif tipo == TokenType.ENQUANTO:
             return self.repeticao()
         else:
             self.erro("Comando inválido")
@@ -233,8 +245,7 @@ class Parser:
         """expressão_relacional ::= expressão_aritmetica [ operador_relacional expressão_aritmetica ]"""
         expr = self.expressao_aritmetica()
         
-        if self.verificar(TokenType.IGUAL, TokenType.DIFERENTE, TokenType.MENOR,
-                         TokenType.MENOR_IGUAL, TokenType.MAIOR, TokenType.MAIOR_IGUAL):
+        if self.token_atual.tipo in OPERADORES_RELACIONAIS:
             operador = self.token_atual.valor
             linha = self.token_atual.linha
             coluna = self.token_atual.coluna
@@ -248,7 +259,7 @@ class Parser:
         """expressão_aritmética ::= termo { ('+' | '-') termo }"""
         expr = self.termo()
         
-        while self.verificar(TokenType.MAIS, TokenType.MENOS):
+        while self.token_atual.tipo in OPERADORES_ADITIVOS:
             operador = self.token_atual.valor
             linha = self.token_atual.linha
             coluna = self.token_atual.coluna
@@ -262,7 +273,7 @@ class Parser:
         """termo ::= fator { ('*' | '/') fator }"""
         expr = self.fator()
         
-        while self.verificar(TokenType.MULTIPLICACAO, TokenType.DIVISAO):
+        while self.token_atual.tipo in OPERADORES_MULTIPLICATIVOS:
             operador = self.token_atual.valor
             linha = self.token_atual.linha
             coluna = self.token_atual.coluna
@@ -277,27 +288,28 @@ class Parser:
         linha = self.token_atual.linha
         coluna = self.token_atual.coluna
         
-        if self.verificar(TokenType.NUMERO):
-            valor = int(self.token_atual.valor)
+        tipo = self.token_atual.tipo
+        if tipo == TokenType.NUMERO:
+            valor = inteiro_de_texto(self.token_atual.valor)
             self.avancar()
             return Numero(valor, linha, coluna)
         
-        elif self.verificar(TokenType.IDENTIFICADOR):
+        elif tipo == TokenType.IDENTIFICADOR:
             nome = self.token_atual.valor
             self.avancar()
             return Variavel(nome, linha, coluna)
         
-        elif self.verificar(TokenType.STRING):
+        elif tipo == TokenType.STRING:
             valor = self.token_atual.valor
             self.avancar()
             return StringLiteral(valor, linha, coluna)
         
-        elif self.verificar(TokenType.MENOS):
+        elif tipo == TokenType.MENOS:
             self.avancar()
             expr = self.fator()
             return ExpressaoUnaria("-", expr, linha, coluna)
         
-        elif self.verificar(TokenType.PARENTESE_ESQ):
+        elif tipo == TokenType.PARENTESE_ESQ:
             self.avancar()
             expr = self.expressao()
             self.consumir(TokenType.PARENTESE_DIR, "Esperado ')' após expressão")
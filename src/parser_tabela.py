@@ -0,0 +1,332 @@
+"""Parser LL(1) dirigido por tabela (tabelas geradas por gramatica.py a partir de gramatica.txt).
+
+Uma pilha explícita de símbolos substitui a recursão do Parser escrito à mão:
+não terminais são expandidos pela produção da tabela, terminais são comparados
+com o token atual e marcas de redução montam os nós de ast_nodes com os valores
+dos símbolos da produção.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lexer import Token, TokenType, TEXTOS_TOKEN
+from parser import Parser, ParserError
+from ast_nodes import *
+from inteiros import inteiro_de_texto
+import tabelas_gramatica
+
+# Codificação dos símbolos na pilha: terminais pelo tipo de token, não terminais a
+# partir de BASE_NAO_TERMINAIS e marcas de redução negativas (-1 - produção)
+BASE_NAO_TERMINAIS = 64
+_TIPOS_TOKEN = BASE_NAO_TERMINAIS
+
+def _lista(encadeada) -> list:
+    """Valor de uma repetição {…}: pares (item, resto) terminados em None"""
+    itens = []
+    while encadeada is not None:
+        item, encadeada = encadeada
+        itens.append(item)
+    return itens
+
+def _binarias(esquerda: Expressao, repeticao) -> Expressao:
+    """termo { operador termo } associando à esquerda"""
+    while repeticao is not None:
+        (operador, direita), repeticao = repeticao
+        esquerda = ExpressaoBinaria(esquerda, operador.valor, direita, operador.linha, operador.coluna)
+    return esquerda
+
+# Montagem dos nós: uma função por não terminal, chamada com os valores dos
+# símbolos da produção escolhida (tokens para terminais)
+
+def _programa(v):
+    return Programa(str(v[1].valor), v[3] or [], _lista(v[5]), v[0].linha, v[0].coluna)
+
+def _declaracoes(v):
+    return [v[1]] + _lista(v[2])
+
+def _declaracao(v):
+    identificadores = v[0]
+    return Declaracao([token.valor for token in identificadores], v[2],
+                      identificadores[0].linha, identificadores[0].coluna)
+
+def _tipo(v):
+    return v[0].valor
+
+def _lista_ids(v):
+    return [v[0]] + [token for _, token in _lista(v[1])]
+
+def _comandos(v):
+    # comando [ ';' [ comandos ] ]: encadeado como uma repetição (veja _lista)
+    resto = v[1]
+    return v[0], resto[1] if resto is not None else None
+
+def _atribuicao(v):
+    return Atribuicao(v[0].valor, v[2], v[0].linha, v[0].coluna)
+
+def _leitura(v):
+    return Leitura([token.valor for token in v[2]], v[0].linha, v[0].coluna)
+
+def _escrita(v):
+    return Escrita(v[2], v[0].linha, v[0].coluna)
+
+def _se(v):
+    return Se(v[1], v[3], v[4][1] if v[4] is not None else None, v[0].linha, v[0].coluna)
+
+def _enquanto(v):
+    return Enquanto(v[1], v[3], v[0].linha, v[0].coluna)
+
+def _bloco(v):
+    return Bloco(_lista(v[1]), v[0].linha, v[0].coluna)
+
+def _lista_expr(v):
+    return [v[0]] + [expressao for _, expressao in _lista(v[1])]
+
+def _expr_relacional(v):
+    if v[1] is None:
+        return v[0]
+    operador, direita = v[1]
+    return ExpressaoBinaria(v[0], operador.valor, direita, operador.linha, operador.coluna)
+
+def _expressao_binaria(v):
+    return _binarias(v[0], v[1])
+
+def _fator(v):
+    primeiro = v[0]
+    tipo = primeiro.tipo
+    if tipo == TokenType.NUMERO:
+        return Numero(inteiro_de_texto(primeiro.valor), primeiro.linha, primeiro.coluna)
+    if tipo == TokenType.IDENTIFICADOR:
+        return Variavel(primeiro.valor, primeiro.linha, primeiro.coluna)
+    if tipo == TokenType.STRING:
+        return StringLiteral(primeiro.valor, primeiro.linha, primeiro.coluna)
+    if tipo == TokenType.MENOS:
+        return ExpressaoUnaria("-", v[1], primeiro.linha, primeiro.coluna)
+    return v[1]  # '(' expr ')'
+
+ACOES: Dict[str, Callable[[list], object]] = {
+    '<programa>': _programa,
+    '<declaracoes>': _declaracoes,
+    '<declaracao>': _declaracao,
+    '<tipo>': _tipo,
+    '<lista_ids>': _lista_ids,
+    '<comandos>': _comandos,
+    '<atribuicao>': _atribuicao,
+    '<leitura>': _leitura,
+    '<escrita>': _escrita,
+    '<se>': _se,
+    '<enquanto>': _enquanto,
+    '<bloco>': _bloco,
+    '<lista_expr>': _lista_expr,
+    '<expr_relacional>': _expr_relacional,
+    '<expr_arit>': _expressao_binaria,
+    '<termo>': _expressao_binaria,
+    '<fator>': _fator,
+}
+
+# Produções 'X [auxiliar]' cujo valor é o de X quando o auxiliar fica vazio:
+# o parser nem chama a ação nesse caso
+REDUCOES_TRIVIAIS = {'<expr_relacional>', '<expr_arit>', '<termo>'}
+
+# Mensagens do Parser escrito à mão para os não terminais sem produção para o token
+MENSAGENS = {
+    '<comando>': "Comando inválido",
+    '<tipo>': "Esperado tipo 'inteiro'",
+    '<fator>': "Esperado número, identificador, string ou '('",
+}
+
+def _mensagem(nome: str) -> Optional[str]:
+    """Mensagem de erro do não terminal ou do primeiro símbolo de sua única produção"""
+    while nome not in MENSAGENS:
+        producoes = [simbolos for indice, simbolos in tabelas_gramatica.PRODUCOES
+                     if tabelas_gramatica.NAO_TERMINAIS[indice] == nome]
+        if len(producoes) != 1 or not producoes[0] or not isinstance(producoes[0][0], str):
+            return None
+        nome = producoes[0][0]
+    return MENSAGENS[nome]
+
+class _Tabelas:
+    """Tabelas de tabelas_gramatica.py preparadas para o laço do parser.
+
+    As expansões mais à esquerda são encadeadas até um terminal ficar no topo (ID
+    em <expr> empilha de uma vez o que seriam cinco expansões). Se a cadeia termina
+    no terminal do token atual, ele fica fora da sequência em consumir[nt][tipo] e é
+    consumido logo; as demais (alternativas vazias, cadeias interrompidas) ficam em
+    expandir[nt][tipo]. Produções de um só símbolo sem ação não empilham marca de
+    redução: o valor passa direto.
+    """
+
+    def __init__(self):
+        nomes = tabelas_gramatica.NAO_TERMINAIS
+        auxiliares = tabelas_gramatica.AUXILIARES
+        desconhecidas = (set(ACOES) | REDUCOES_TRIVIAIS) - set(nomes)
+        if desconhecidas:
+            raise ImportError(f"Ações para não terminais ausentes da gramática: {sorted(desconhecidas)}")
+        codigo = {nome: BASE_NAO_TERMINAIS + indice for indice, nome in enumerate(nomes)}
+
+        self.inicial = codigo[tabelas_gramatica.INICIAL]
+        self.tamanhos: List[int] = []
+        self.acoes: List[Optional[Callable]] = []
+        self.triviais = set()
+        corpos: List[Tuple[int, ...]] = []
+        for indice, simbolos in tabelas_gramatica.PRODUCOES:
+            nome = nomes[indice]
+            corpo = tuple(codigo[simbolo] if isinstance(simbolo, str) else simbolo
+                          for simbolo in simbolos)
+            acao = ACOES.get(nome)
+            if not simbolos:
+                acao = None  # alternativa vazia: o parser guarda None direto
+            elif acao is None:
+                tipo = auxiliares.get(nome)
+                if tipo == 'repeticao':
+                    acao = _par if len(simbolos) == 2 else _par_lista
+                elif len(simbolos) == 1:
+                    acao = None  # o valor do único símbolo passa direto
+                else:
+                    acao = list
+            self.tamanhos.append(len(simbolos))
+            self.acoes.append(acao)
+            if acao is None:
+                corpos.append(tuple(reversed(corpo)))
+            else:
+                marca = -1 - len(corpos)
+                if nome in REDUCOES_TRIVIAIS:
+                    self.triviais.add(marca)
+                corpos.append((marca,) + tuple(reversed(corpo)))
+
+        tamanhos = self.tamanhos
+        tabela = tabelas_gramatica.TABELA
+        self.esperados: List[Tuple[int, ...]] = [tuple(sorted(linha)) for linha in tabela]
+        self.mensagens: List[Optional[str]] = [_mensagem(nome) for nome in nomes]
+        self.consumir: List[list] = []
+        self.expandir: List[List[Optional[Tuple[int, ...]]]] = []
+        for linha in tabela:
+            consumir: List[Optional[Tuple[Tuple[int, ...], Optional[Callable]]]] = [None] * _TIPOS_TOKEN
+            expandir: List[Optional[Tuple[int, ...]]] = [None] * _TIPOS_TOKEN
+            for tipo, producao in linha.items():
+                sequencia = list(corpos[producao])
+                # Encadeia enquanto o topo for um não terminal com produção não vazia
+                while sequencia and sequencia[-1] >= BASE_NAO_TERMINAIS:
+                    seguinte = tabela[sequencia[-1] - BASE_NAO_TERMINAIS].get(tipo)
+                    if seguinte is None or not corpos[seguinte]:
+                        break
+                    sequencia.pop()
+                    sequencia.extend(corpos[seguinte])
+                if sequencia and sequencia[-1] == tipo:
+                    sequencia.pop()
+                    acao = None
+                    # Produção de um só terminal com ação (ex.: fator ::= ID): o nó é
+                    # montado ao consumir o token, sem marca de redução
+                    if sequencia and sequencia[-1] < 0 and tamanhos[-1 - sequencia[-1]] == 1:
+                        acao = self.acoes[-1 - sequencia.pop()]
+                    consumir[tipo] = (tuple(sequencia), acao)
+                else:
+                    expandir[tipo] = tuple(sequencia)
+            self.consumir.append(consumir)
+            self.expandir.append(expandir)
+
+def _par(v):
+    return v[0], v[1]
+
+def _par_lista(v):
+    return v[:-1], v[-1]
+
+_tabelas: Optional[_Tabelas] = None
+
+class ParserTabela(Parser):
+    """Mesma interface do Parser (tokens prontos ou código), guiado pelas tabelas LL(1).
+
+    Em um erro, o Parser escrito à mão analisa os mesmos tokens para que a mensagem
+    (que depende do contexto, como "Esperado ';' após declaração") e a posição
+    sejam as dele; se ele aceitar a entrada, vale o erro das tabelas.
+    """
+
+    def parse(self) -> Programa:
+        try:
+            return self._parse_tabela()
+        except ParserError as erro_tabela:
+            self.posicao = 0
+            self.token_atual = self.tokens[0]
+            Parser.parse(self)
+            raise erro_tabela
+
+    def _parse_tabela(self) -> Programa:
+        global _tabelas
+        if _tabelas is None:
+            _tabelas = _Tabelas()
+        tabelas = _tabelas
+        consumir = tabelas.consumir
+        expandir = tabelas.expandir
+        tamanhos = tabelas.tamanhos
+        acoes = tabelas.acoes
+        triviais = tabelas.triviais
+
+        tokens = self.tokens
+        ultimo = len(tokens) - 1
+        posicao = 0
+        token = tokens[0]
+        tipo = token.tipo
+        pilha = [tabelas.inicial]
+        valores: list = []
+        empilhar = pilha.extend
+        desempilhar = pilha.pop
+        guardar = valores.append
+
+        while pilha:
+            simbolo = desempilhar()
+            if simbolo >= BASE_NAO_TERMINAIS:
+                linha = simbolo - BASE_NAO_TERMINAIS
+                entrada = consumir[linha][tipo]
+                if entrada is None:
+                    expansao = expandir[linha][tipo]
+                    if expansao is None:
+                        self._erro_nao_terminal(linha, token)
+                    if expansao:
+                        empilhar(expansao)
+                    elif pilha and pilha[-1] in triviais:
+                        # '[…]'/'{…}' vazio no fim de uma produção cujo valor é então o
+                        # do primeiro símbolo (ex.: termo sem '*' ou '/')
+                        desempilhar()
+                    else:
+                        guardar(None)
+                    continue
+                expansao, acao = entrada
+                empilhar(expansao)
+                if acao is not None:
+                    guardar(acao((token,)))
+                    if posicao < ultimo:
+                        posicao += 1
+                        token = tokens[posicao]
+                        tipo = token.tipo
+                    continue
+            elif simbolo >= 0:
+                if simbolo != tipo:
+                    self.posicao = posicao
+                    self.token_atual = token
+                    self.erro(f"Esperado {TEXTOS_TOKEN[simbolo]}, encontrado {token.valor}")
+            else:
+                producao = -1 - simbolo
+                tamanho = tamanhos[producao]
+                argumentos = valores[-tamanho:]
+                del valores[-tamanho:]
+                guardar(acoes[producao](argumentos))
+                continue
+            # Terminal no topo (ou no fim da expansão) igual ao token atual
+            guardar(token)
+            if posicao < ultimo:
+                posicao += 1
+                token = tokens[posicao]
+                tipo = token.tipo
+
+        self.posicao = posicao
+        self.token_atual = token
+        return valores[0]
+
+    def _erro_nao_terminal(self, indice: int, token: Token):
+        self.token_atual = token
+        mensagem = _tabelas.mensagens[indice]
+        if mensagem is None:
+            esperados = [TEXTOS_TOKEN[tipo] for tipo in _tabelas.esperados[indice]]
+            opcoes = ", ".join(esperados[:-1]) + " ou " + esperados[-1] if len(esperados) > 1 \
+                else esperados[0]
+            mensagem = f"Esperado {opcoes}, encontrado {token.valor}"
+        self.erro(mensagem)
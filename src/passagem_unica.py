@@ -0,0 +1,540 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lexer import Lexer, Token, TokenType
+from parser import Parser, OPERADORES_RELACIONAIS, OPERADORES_ADITIVOS, OPERADORES_MULTIPLICATIVOS
+from semantic import SemanticError, TabelaSimbolos
+from interpreter import Interpretador, RuntimeError
+from inteiros import (MODO_ILIMITADO, MODO_INT64_TRAP, MODOS_INTEIRO, INT64_MIN, INT64_MAX,
+                      ajustar_int64, cabe_em_int64, escrever_em_partes, formatar_valor, inteiro_de_texto)
+from localizacoes import CodificadorLocalizacoes, TabelaLocalizacoes
+from simbolos import Simbolo
+
+# Uma expressão compilada é (forma, valor, tipo), com tipo como na análise semântica:
+#   FUNCAO:    valor é uma closure f(valores) -> resultado
+#   VARIAVEL:  valor é o índice da variável na lista de valores
+#   CONSTANTE: valor é o próprio resultado
+# Comandos compilados são closures c(execucao, valores).
+FUNCAO = 'f'
+VARIAVEL = 'v'
+CONSTANTE = 'c'
+Expressao = Tuple[str, object, Optional[str]]
+Comando = Callable[['ExecucaoPassagemUnica', list], None]
+
+_RELACIONAIS = {
+    '=': '1 if {a} == {b} else 0',
+    '<>': '1 if {a} != {b} else 0',
+    '<': '1 if {a} < {b} else 0',
+    '<=': '1 if {a} <= {b} else 0',
+    '>': '1 if {a} > {b} else 0',
+    '>=': '1 if {a} >= {b} else 0',
+}
+_ARITMETICOS = {'+': '{a} + {b}', '-': '{a} - {b}', '*': '{a} * {b}'}
+_OPERANDOS = {FUNCAO: '{n}(v)', VARIAVEL: 'v[{n}]', CONSTANTE: '{n}'}
+
+_fabricas: Dict[tuple, Callable] = {}
+
+def _fabrica(operador: str, formas: Tuple[str, ...], modo_inteiro: str) -> Callable:
+    """Fábrica de closures para um operador e a forma de cada operando.
+
+    As closures são geradas uma vez por combinação (operador, formas, modo), com
+    variáveis e constantes acessadas diretamente em vez de por chamadas, e a
+    verificação de 64 bits apenas nos modos que a exigem.
+    """
+    if operador in _RELACIONAIS:
+        modo_inteiro = MODO_ILIMITADO  # resultado é sempre 0 ou 1
+    chave = (operador, formas, modo_inteiro)
+    fabrica = _fabricas.get(chave)
+    if fabrica is not None:
+        return fabrica
+
+    a = _OPERANDOS[formas[0]].format(n='e')
+    corpo = []
+    if len(formas) == 1:
+        corpo.append(f"r = -{a}")
+    else:
+        b = _OPERANDOS[formas[1]].format(n='d')
+        if operador == '/':
+            corpo += [f"a = {a}", f"b = {b}", "if b == 0:",
+                      "    raise erro('Divisão por zero', i)", "r = a // b"]
+        else:
+            corpo.append("r = " + (_ARITMETICOS.get(operador) or _RELACIONAIS[operador]).format(a=a, b=b))
+    if modo_inteiro != MODO_ILIMITADO:
+        corpo += [f"if {INT64_MIN} <= r <= {INT64_MAX}:", "    return r"]
+        corpo.append("raise erro('Estouro de inteiro de 64 bits', i)" if modo_inteiro == MODO_INT64_TRAP
+                     else "return ajustar_int64(r)")
+    else:
+        corpo.append("return r")
+
+    fonte = ("def fabrica(e, d, i, erro):\n    def f(v):\n" +
+             "".join(f"        {linha}\n" for linha in corpo) + "    return f\n")
+    espaco = {'ajustar_int64': ajustar_int64}
+    exec(compile(fonte, f"<passagem_unica {operador}>", "exec"), espaco)
+    fabrica = _fabricas[chave] = espaco['fabrica']
+    return fabrica
+
+def como_funcao(expressao: Expressao) -> Callable[[list], object]:
+    """Closure que calcula a expressão a partir da lista de valores"""
+    forma, valor, _ = expressao
+    if forma == FUNCAO:
+        return valor
+    if forma == VARIAVEL:
+        return lambda valores: valores[valor]
+    return lambda valores: valor
+
+def _nenhum(execucao: 'ExecucaoPassagemUnica', valores: list):
+    pass
+
+class _Posicao:
+    """Linha e coluna decodificadas da tabela (no lugar do nó, que não existe)"""
+
+    __slots__ = ('linha', 'coluna')
+
+    def __init__(self, linha: int, coluna: int):
+        self.linha = linha
+        self.coluna = coluna
+
+class ProgramaPassagemUnica:
+    """Código gerado pelo CompiladorPassagemUnica: closures, nomes e posições; sem AST"""
+
+    __slots__ = ('nome', 'modo_inteiro', 'comandos', 'nomes', 'localizacoes')
+
+    def __init__(self, modo_inteiro: str):
+        self.nome = ""
+        self.modo_inteiro = modo_inteiro
+        self.comandos: Tuple[Comando, ...] = ()
+        # Nome de cada variável, pelo índice na lista de valores
+        self.nomes: List[Simbolo] = []
+        self.localizacoes = TabelaLocalizacoes(b"", 0)
+
+    def posicao(self, indice: int) -> _Posicao:
+        return _Posicao(*self.localizacoes.localizacao(indice))
+
+    def erro_execucao(self, mensagem: str, indice: int) -> RuntimeError:
+        return RuntimeError(mensagem, *self.localizacoes.localizacao(indice))
+
+    def variaveis(self, valores: list) -> Dict[str, object]:
+        """Valores finais por nome"""
+        return {str(nome): valor for nome, valor in zip(self.nomes, valores)}
+
+class ExecucaoPassagemUnica(Interpretador):
+    """Executa um ProgramaPassagemUnica com as mesmas entradas, saídas e avisos do Interpretador"""
+
+    programa: Optional[ProgramaPassagemUnica] = None
+    valores: list = []
+
+    def interpretar(self, programa: ProgramaPassagemUnica) -> bool:
+        try:
+            self.executar(programa)
+            return True
+        except RuntimeError as e:
+            print(f"Erro de execução: {e}")
+            return False
+        except KeyboardInterrupt:
+            print("\nExecução interrompida pelo usuário")
+            return False
+
+    def executar(self, programa: ProgramaPassagemUnica):
+        """Executa o programa; erros de execução são propagados"""
+        self.programa = programa
+        # Todas as variáveis declaradas começam valendo 0
+        valores = self.valores = [0] * len(programa.nomes)
+        for comando in programa.comandos:
+            comando(self, valores)
+
+    def ler(self, valores: list, indice_variavel: int, indice: int):
+        nome = self.programa.nomes[indice_variavel]
+        try:
+            entrada = self.entrada(f"Digite o valor para {nome}: ")
+        except EOFError:
+            entrada = None
+        valor, aviso = self.valor_leitura(nome, entrada)
+        if self.programa.modo_inteiro != MODO_ILIMITADO and not cabe_em_int64(valor):
+            if self.programa.modo_inteiro == MODO_INT64_TRAP:
+                raise self.programa.erro_execucao("Estouro de inteiro de 64 bits", indice)
+            valor = ajustar_int64(valor)
+        valores[indice_variavel] = valor
+        if aviso:
+            self.avisar(aviso)
+
+class CompiladorPassagemUnica(Parser):
+    """Análise léxica, sintática e semântica em uma única passada, sem montar a AST.
+
+    Os tokens são pedidos ao Lexer um de cada vez e cada construção é verificada
+    (com as mesmas regras e mensagens do AnalisadorSemantico) e convertida em
+    closures assim que termina de ser lida. A memória usada fica proporcional ao
+    código gerado, e não à lista de tokens mais a árvore.
+    """
+
+    def __init__(self, codigo: str, modo_inteiro: str = MODO_ILIMITADO):
+        if modo_inteiro not in MODOS_INTEIRO:
+            raise ValueError(f"Modo de inteiro desconhecido: '{modo_inteiro}'")
+        self.lexer = Lexer(codigo)
+        self.token_atual: Token = self.lexer.proximo_token()
+        self.modo_inteiro = modo_inteiro
+        self.tabela_simbolos = TabelaSimbolos()
+        self.erros: List[SemanticError] = []
+        # Índice de cada variável declarada na lista de valores
+        self.indices: Dict[Simbolo, int] = {}
+        self.codificador = CodificadorLocalizacoes()
+        self.programa_gerado = ProgramaPassagemUnica(modo_inteiro)
+
+    def avancar(self):
+        if self.token_atual.tipo != TokenType.EOF:
+            self.token_atual = self.lexer.proximo_token()
+
+    def erro_semantico(self, mensagem: str, linha: int, coluna: int):
+        self.erros.append(SemanticError(mensagem, linha, coluna))
+
+    def indice_posicao(self, linha: int, coluna: int) -> int:
+        """Índice na tabela de localizações (para erros de execução)"""
+        return self.codificador.adicionar(linha, coluna)
+
+    def parse(self) -> ProgramaPassagemUnica:
+        """Compila o programa; erros semânticos ficam em self.erros"""
+        return self.programa()
+
+    def programa(self) -> ProgramaPassagemUnica:
+        self.consumir(TokenType.PROGRAMA, "Esperado 'programa'")
+        nome_token = self.consumir(TokenType.IDENTIFICADOR, "Esperado nome do programa")
+        self.consumir(TokenType.PONTO_VIRGULA, "Esperado ';' após nome do programa")
+
+        if self.verificar(TokenType.VAR):
+            self.declaracoes()
+
+        self.consumir(TokenType.INICIO, "Esperado 'inicio'")
+        comandos = self.lista_comandos()
+        self.consumir(TokenType.FIM, "Esperado 'fim'")
+        self.consumir(TokenType.PONTO, "Esperado '.' no final do programa")
+
+        programa = self.programa_gerado
+        programa.nome = str(nome_token.valor)
+        programa.comandos = tuple(comandos)
+        programa.localizacoes = self.codificador.tabela()
+        return programa
+
+    def declaracoes(self):
+        self.consumir(TokenType.VAR, "Esperado 'var'")
+        self.declaracao()
+        while self.verificar(TokenType.IDENTIFICADOR):
+            self.declaracao()
+
+    def declaracao(self):
+        linha = self.token_atual.linha
+        coluna = self.token_atual.coluna
+
+        variaveis = [self.consumir(TokenType.IDENTIFICADOR, "Esperado nome da variável").valor]
+        while self.verificar(TokenType.VIRGULA):
+            self.avancar()
+            variaveis.append(self.consumir(TokenType.IDENTIFICADOR, "Esperado nome da variável").valor)
+
+        self.consumir(TokenType.DOIS_PONTOS, "Esperado ':' após lista de variáveis")
+        tipo = self.tipo()
+        self.consumir(TokenType.PONTO_VIRGULA, "Esperado ';' após declaração")
+
+        for variavel in variaveis:
+            try:
+                self.tabela_simbolos.declarar(variavel, tipo, linha, coluna)
+            except SemanticError as e:
+                self.erros.append(e)
+                continue
+            self.indices[variavel] = len(self.programa_gerado.nomes)
+            self.programa_gerado.nomes.append(variavel)
+
+    def lista_comandos(self) -> List[Comando]:
+        comandos = [self.comando()]
+        while self.verificar(TokenType.PONTO_VIRGULA):
+            self.avancar()
+            if not self.verificar(TokenType.FIM):
+                comandos.append(self.comando())
+        return comandos
+
+    def atribuicao(self) -> Comando:
+        linha = self.token_atual.linha
+        coluna = self.token_atual.coluna
+
+        variavel = self.consumir(TokenType.IDENTIFICADOR, "Esperado nome da variável").valor
+        self.consumir(TokenType.ATRIBUICAO, "Esperado ':=' na atribuição")
+
+        erros_antes = len(self.erros)
+        try:
+            tipo_variavel = self.tabela_simbolos.obter_tipo(variavel, linha, coluna)
+        except SemanticError as e:
+            # Como no AnalisadorSemantico, a expressão não é verificada nesse caso
+            self.expressao()
+            del self.erros[erros_antes:]
+            self.erros.append(e)
+            return _nenhum
+
+        forma, valor, tipo = self.expressao()
+        if tipo and tipo != tipo_variavel:
+            self.erro_semantico(f"Tipos incompatíveis: tentando atribuir {tipo} a {tipo_variavel}",
+                                linha, coluna)
+
+        destino = self.indices[variavel]
+        if forma == CONSTANTE:
+            def atribuir(execucao, valores):
+                valores[destino] = valor
+        elif forma == VARIAVEL:
+            def atribuir(execucao, valores):
+                valores[destino] = valores[valor]
+        else:
+            def atribuir(execucao, valores):
+                valores[destino] = valor(valores)
+        return atribuir
+
+    def leitura(self) -> Comando:
+        linha = self.token_atual.linha
+        coluna = self.token_atual.coluna
+
+        self.consumir(TokenType.LER, "Esperado 'ler'")
+        self.consumir(TokenType.PARENTESE_ESQ, "Esperado '(' após 'ler'")
+
+        variaveis = [self.consumir(TokenType.IDENTIFICADOR, "Esperado nome da variável").valor]
+        while self.verificar(TokenType.VIRGULA):
+            self.avancar()
+            variaveis.append(self.consumir(TokenType.IDENTIFICADOR, "Esperado nome da variável").valor)
+
+        self.consumir(TokenType.PARENTESE_DIR, "Esperado ')' após lista de variáveis")
+
+        destinos = []
+        for variavel in variaveis:
+            try:
+                self.tabela_simbolos.obter_tipo(variavel, linha, coluna)
+            except SemanticError as e:
+                self.erros.append(e)
+                continue
+            destinos.append(self.indices[variavel])
+
+        indice = self.indice_posicao(linha, coluna)
+
+        def ler(execucao, valores):
+            for destino in destinos:
+                execucao.ler(valores, destino, indice)
+        return ler
+
+    def escrita(self) -> Comando:
+        self.consumir(TokenType.ESCREVER, "Esperado 'escrever'")
+        self.consumir(TokenType.PARENTESE_ESQ, "Esperado '(' após 'escrever'")
+
+        expressoes = [self.expressao()]
+        while self.verificar(TokenType.VIRGULA):
+            self.avancar()
+            expressoes.append(self.expressao())
+
+        self.consumir(TokenType.PARENTESE_DIR, "Esperado ')' após lista de expressões")
+
+        # Constantes são formatadas agora; as demais partes, a cada execução
+        partes = tuple(formatar_valor(valor) if forma == CONSTANTE else como_funcao((forma, valor, tipo))
+                       for forma, valor, tipo in expressoes)
+        if all(type(parte) is str for parte in partes):
+            texto = "".join(partes) + "\n"
+
+            def escrever(execucao, valores):
+                escrever_em_partes(execucao.saida, texto)
+        elif len(partes) == 1:
+            funcao = partes[0]
+
+            def escrever(execucao, valores):
+                escrever_em_partes(execucao.saida, formatar_valor(funcao(valores)) + "\n")
+        else:
+            def escrever(execucao, valores):
+                escrever_em_partes(execucao.saida, "".join([
+                    parte if type(parte) is str else formatar_valor(parte(valores))
+                    for parte in partes]) + "\n")
+        return escrever
+
+    def bloco(self) -> Comando:
+        self.consumir(TokenType.INICIO, "Esperado 'inicio'")
+        comandos = tuple(self.lista_comandos())
+        self.consumir(TokenType.FIM, "Esperado 'fim'")
+
+        if len(comandos) == 1:
+            return comandos[0]
+
+        def bloco(execucao, valores):
+            for comando in comandos:
+                comando(execucao, valores)
+        return bloco
+
+    def _condicao(self, linha: int, coluna: int) -> Callable[[list], object]:
+        condicao = self.expressao()
+        tipo = condicao[2]
+        if tipo and tipo not in ['inteiro']:
+            self.erro_semantico(f"Condição deve ser do tipo inteiro, encontrado {tipo}", linha, coluna)
+        return como_funcao(condicao)
+
+    def condicional(self) -> Comando:
+        linha = self.token_atual.linha
+        coluna = self.token_atual.coluna
+
+        self.consumir(TokenType.SE, "Esperado 'se'")
+        condicao = self._condicao(linha, coluna)
+        self.consumir(TokenType.ENTAO, "Esperado 'entao' após condição")
+        entao = self.comando()
+
+        senao = None
+        if self.verificar(TokenType.SENAO):
+            self.avancar()
+            senao = self.comando()
+
+        if senao is None:
+            def se(execucao, valores):
+                if condicao(valores):
+                    entao(execucao, valores)
+        else:
+            def se(execucao, valores):
+                if condicao(valores):
+                    entao(execucao, valores)
+                else:
+                    senao(execucao, valores)
+        return se
+
+    def repeticao(self) -> Comando:
+        linha = self.token_atual.linha
+        coluna = self.token_atual.coluna
+
+        self.consumir(TokenType.ENQUANTO, "Esperado 'enquanto'")
+        condicao = self._condicao(linha, coluna)
+        self.consumir(TokenType.FACA, "Esperado 'faca' após condição")
+        corpo = self.comando()
+        indice = self.indice_posicao(linha, coluna)
+
+        def enquanto(execucao, valores):
+            limite = execucao.limite_iteracoes
+            if limite is None:
+                while condicao(valores):
+                    corpo(execucao, valores)
+                return
+
+            iteracao = 0
+            while True:
+                iteracao += 1
+                if not condicao(valores):
+                    break
+                corpo(execucao, valores)
+                # Proteção contra loop infinito
+                if iteracao > limite:
+                    execucao.confirmar_continuacao(iteracao, execucao.programa.posicao(indice))
+        return enquanto
+
+    def _binaria(self, operador: str, esquerda: Expressao, direita: Expressao,
+                 linha: int, coluna: int) -> Expressao:
+        tipo_esq = esquerda[2]
+        tipo_dir = direita[2]
+        tipo = None
+        if operador in _RELACIONAIS:
+            if tipo_esq == tipo_dir:
+                tipo = 'inteiro'  # Resultado é inteiro (0 ou 1)
+            else:
+                self.erro_semantico("Operadores relacionais requerem operandos do mesmo tipo", linha, coluna)
+        elif tipo_esq == 'inteiro' and tipo_dir == 'inteiro':
+            tipo = 'inteiro'
+        else:
+            self.erro_semantico("Operadores aritméticos requerem operandos inteiros", linha, coluna)
+
+        indice = -1
+        if operador == '/' or (operador in _ARITMETICOS and self.modo_inteiro == MODO_INT64_TRAP):
+            indice = self.indice_posicao(linha, coluna)
+        fabrica = _fabrica(operador, (esquerda[0], direita[0]), self.modo_inteiro)
+        return FUNCAO, fabrica(esquerda[1], direita[1], indice, self.programa_gerado.erro_execucao), tipo
+
+    def expressao(self) -> Expressao:
+        return self.expressao_relacional()
+
+    def expressao_relacional(self) -> Expressao:
+        expr = self.expressao_aritmetica()
+
+        if self.token_atual.tipo in OPERADORES_RELACIONAIS:
+            operador = self.token_atual.valor
+            linha = self.token_atual.linha
+            coluna = self.token_atual.coluna
+            self.avancar()
+            direita = self.expressao_aritmetica()
+            expr = self._binaria(operador, expr, direita, linha, coluna)
+
+        return expr
+
+    def expressao_aritmetica(self) -> Expressao:
+        expr = self.termo()
+
+        while self.token_atual.tipo in OPERADORES_ADITIVOS:
+            operador = self.token_atual.valor
+            linha = self.token_atual.linha
+            coluna = self.token_atual.coluna
+            self.avancar()
+            direita = self.termo()
+            expr = self._binaria(operador, expr, direita, linha, coluna)
+
+        return expr
+
+    def termo(self) -> Expressao:
+        expr = self.fator()
+
+        while self.token_atual.tipo in OPERADORES_MULTIPLICATIVOS:
+            operador = self.token_atual.valor
+            linha = self.token_atual.linha
+            coluna = self.token_atual.coluna
+            self.avancar()
+            direita = self.fator()
+            expr = self._binaria(operador, expr, direita, linha, coluna)
+
+        return expr
+
+    def fator(self) -> Expressao:
+        linha = self.token_atual.linha
+        coluna = self.token_atual.coluna
+
+        if self.verificar(TokenType.NUMERO):
+            valor = inteiro_de_texto(self.token_atual.valor)
+            self.avancar()
+            if self.modo_inteiro != MODO_ILIMITADO and not cabe_em_int64(valor):
+                self.erro_semantico(f"Constante {formatar_valor(valor)} não cabe em um inteiro de 64 bits", linha, coluna)
+            return CONSTANTE, valor, 'inteiro'
+
+        elif self.verificar(TokenType.IDENTIFICADOR):
+            nome = self.token_atual.valor
+            self.avancar()
+            try:
+                tipo = self.tabela_simbolos.obter_tipo(nome, linha, coluna)
+            except SemanticError as e:
+                self.erros.append(e)
+                return CONSTANTE, 0, None
+            return VARIAVEL, self.indices[nome], tipo
+
+        elif self.verificar(TokenType.STRING):
+            valor = self.token_atual.valor
+            self.avancar()
+            return CONSTANTE, valor, 'string'
+
+        elif self.verificar(TokenType.MENOS):
+            self.avancar()
+            forma, valor, tipo = self.fator()
+            if tipo != 'inteiro':
+                self.erro_semantico("Operador unário '-' requer operando inteiro", linha, coluna)
+                return CONSTANTE, 0, None
+            if forma == CONSTANTE:
+                valor = -valor
+                if self.modo_inteiro == MODO_ILIMITADO or cabe_em_int64(valor):
+                    return CONSTANTE, valor, tipo
+                if self.modo_inteiro != MODO_INT64_TRAP:
+                    return CONSTANTE, ajustar_int64(valor), tipo
+                valor = -valor
+            indice = self.indice_posicao(linha, coluna) if self.modo_inteiro == MODO_INT64_TRAP else -1
+            fabrica = _fabrica('-', (forma,), self.modo_inteiro)
+            return FUNCAO, fabrica(valor, None, indice, self.programa_gerado.erro_execucao), tipo
+
+        elif self.verificar(TokenType.PARENTESE_ESQ):
+            self.avancar()
+            expr = self.expressao()
+            self.consumir(TokenType.PARENTESE_DIR, "Esperado ')' após expressão")
+            return expr
+
+        else:
+            self.erro("Esperado número, identificador, string ou '('")
+
+def compilar_passagem_unica(codigo: str, modo_inteiro: str = MODO_ILIMITADO
+                            ) -> Tuple[ProgramaPassagemUnica, List[SemanticError]]:
+    """Compila em uma passada; levanta LexerError/ParserError e retorna os erros semânticos"""
+    compilador = CompiladorPassagemUnica(codigo, modo_inteiro)
+    programa = compilador.parse()
+    return programa, compilador.erros
@@ -0,0 +1,164 @@
+from time import perf_counter_ns
+from typing import Dict, List, Tuple, Callable, Optional, TextIO
+
+from ast_nodes import *
+from interpreter import Interpretador
+
+class RegistroNo:
+    """Contadores de um nó da AST durante a execução"""
+    __slots__ = ('contagem', 'tempo_total', 'tempo_proprio')
+
+    def __init__(self):
+        self.contagem = 0
+        self.tempo_total = 0    # ns, incluindo os filhos
+        self.tempo_proprio = 0  # ns, excluindo os filhos
+
+class InterpretadorPerfil(Interpretador):
+    """Interpretador que mede contagem e tempo de cada nó visitado.
+
+    Todos os métodos visitar_* são envolvidos por uma medição (veja _instrumentar
+    abaixo); o Interpretador normal continua sem nenhum custo extra.
+    """
+
+    def __init__(self, entrada: Optional[Callable[[str], str]] = None,
+                 saida: Optional[TextIO] = None, limite_iteracoes: Optional[int] = 1000):
+        super().__init__(entrada=entrada, saida=saida, limite_iteracoes=limite_iteracoes)
+        self.registros: Dict[NoAST, RegistroNo] = {}
+        # Árvore de chamadas: (pilha pai, nó) -> identificador da pilha
+        self.pilhas: Dict[Tuple[int, NoAST], int] = {}
+        self.pais: List[Tuple[int, Optional[NoAST]]] = [(-1, None)]
+        self.tempo_pilha: List[int] = [0]
+        self._pilha_atual = 0
+        self._tempo_filhos: List[int] = [0]
+
+    def pilhas_colapsadas(self) -> List[str]:
+        """Linhas no formato 'quadro;quadro;... valor' (µs) para ferramentas de flamegraph"""
+        linhas = []
+        for ident, tempo in enumerate(self.tempo_pilha):
+            microssegundos = tempo // 1000
+            if ident == 0 or microssegundos == 0:
+                continue
+            quadros = []
+            atual = ident
+            while atual > 0:
+                pai, no = self.pais[atual]
+                quadros.append(rotulo_no(no))
+                atual = pai
+            linhas.append(";".join(reversed(quadros)) + f" {microssegundos}")
+        return linhas
+
+def _instrumentar(nome: str):
+    original = getattr(Interpretador, nome)
+
+    def visitar(self, no):
+        chave = (self._pilha_atual, no)
+        ident = self.pilhas.get(chave)
+        if ident is None:
+            ident = len(self.pais)
+            self.pilhas[chave] = ident
+            self.pais.append(chave)
+            self.tempo_pilha.append(0)
+        anterior = self._pilha_atual
+        self._pilha_atual = ident
+        self._tempo_filhos.append(0)
+
+        inicio = perf_counter_ns()
+        try:
+            return original(self, no)
+        finally:
+            # Também quando um erro de execução interrompe o nó: o relatório emitido
+            # depois do erro inclui os quadros que falharam
+            decorrido = perf_counter_ns() - inicio
+
+            proprio = decorrido - self._tempo_filhos.pop()
+            self._tempo_filhos[-1] += decorrido
+            self._pilha_atual = anterior
+            self.tempo_pilha[ident] += proprio
+
+            registro = self.registros.get(no)
+            if registro is None:
+                registro = self.registros[no] = RegistroNo()
+            registro.contagem += 1
+            registro.tempo_total += decorrido
+            registro.tempo_proprio += proprio
+
+    visitar.__name__ = nome
+    return visitar
+
+for _nome in dir(VisitorAST):
+    if _nome.startswith('visitar_'):
+        setattr(InterpretadorPerfil, _nome, _instrumentar(_nome))
+
+def rotulo_no(no: NoAST) -> str:
+    """Nome curto de um nó para relatórios e quadros de pilha"""
+    if isinstance(no, Programa):
+        detalhe = f" {no.nome}"
+    elif isinstance(no, Atribuicao):
+        detalhe = f" {no.variavel}"
+    elif isinstance(no, Leitura):
+        detalhe = f" {','.join(map(str, no.variaveis))}"
+    elif isinstance(no, (ExpressaoBinaria, ExpressaoUnaria)):
+        detalhe = f" {no.operador}"
+    elif isinstance(no, Variavel):
+        detalhe = f" {no.nome}"
+    elif isinstance(no, Numero):
+        detalhe = f" {no.valor}"
+    else:
+        detalhe = ""
+    return f"{type(no).__name__}{detalhe} @{no.linha}:{no.coluna}"
+
+def _ms(nanossegundos: int) -> str:
+    return f"{nanossegundos / 1e6:10.3f}"
+
+def relatorio_perfil(perfil: InterpretadorPerfil, codigo: str, limite: int = 15) -> str:
+    """Relatório de pontos quentes por linha de código e por laço Enquanto"""
+    linhas_codigo = codigo.splitlines()
+
+    def trecho(linha: int) -> str:
+        if 1 <= linha <= len(linhas_codigo):
+            return linhas_codigo[linha - 1].strip()
+        return ""
+
+    tempo_total = sum(perfil.tempo_pilha) or 1
+
+    # Tempo próprio por linha (sem contagem dupla) e execuções de comandos
+    por_linha: Dict[int, List[int]] = {}
+    for no, registro in perfil.registros.items():
+        dados = por_linha.setdefault(no.linha, [0, 0])
+        dados[1] += registro.tempo_proprio
+        if isinstance(no, Comando):
+            dados[0] = max(dados[0], registro.contagem)
+
+    saida = ["=" * 72, "                    PERFIL DE EXECUÇÃO", "=" * 72]
+    saida.append(f"Tempo total: {tempo_total / 1e6:.3f} ms")
+    saida.append("")
+    saida.append("Linhas mais custosas (tempo próprio):")
+    saida.append(f"{'linha':>6} {'execuções':>10} {'ms':>10} {'%':>6}  código")
+    ordenadas = sorted(por_linha.items(), key=lambda item: item[1][1], reverse=True)
+    for linha, (execucoes, tempo) in ordenadas[:limite]:
+        saida.append(f"{linha:>6} {execucoes:>10} {_ms(tempo)} "
+                     f"{100 * tempo / tempo_total:6.1f}  {trecho(linha)}")
+
+    lacos = [(no, registro) for no, registro in perfil.registros.items()
+             if isinstance(no, Enquanto)]
+    if lacos:
+        saida.append("")
+        saida.append("Laços (tempo total, incluindo o corpo):")
+        saida.append(f"{'linha':>6} {'entradas':>10} {'iterações':>10} {'ms':>10} {'%':>6}  código")
+        lacos.sort(key=lambda item: item[1].tempo_total, reverse=True)
+        for no, registro in lacos:
+            corpo = perfil.registros.get(no.comando)
+            iteracoes = corpo.contagem if corpo else 0
+            saida.append(f"{no.linha:>6} {registro.contagem:>10} {iteracoes:>10} "
+                         f"{_ms(registro.tempo_total)} "
+                         f"{100 * registro.tempo_total / tempo_total:6.1f}  {trecho(no.linha)}")
+
+    saida.append("")
+    saida.append("Nós mais custosos (tempo próprio):")
+    saida.append(f"{'execuções':>10} {'ms próprio':>10} {'ms total':>10}  nó")
+    nos = sorted(perfil.registros.items(), key=lambda item: item[1].tempo_proprio, reverse=True)
+    for no, registro in nos[:limite]:
+        saida.append(f"{registro.contagem:>10} {_ms(registro.tempo_proprio)} "
+                     f"{_ms(registro.tempo_total)}  {rotulo_no(no)}")
+    saida.append("=" * 72)
+    return "\n".join(saida)
@@ -0,0 +1,481 @@
+"""Formato plano e independente de posição para programas verificados.
+
+Um programa é codificado em um único bloco de bytes (código de uma máquina de
+pilha, constantes, nomes e tabela de localizações), com todas as referências
+relativas ao início do bloco. Assim ele pode ser colocado em memória
+compartilhada (multiprocessing.shared_memory) ou em um arquivo mapeado, e cada
+processo o executa direto do buffer: abrir o programa lê apenas o cabeçalho,
+sem copiar nem desserializar nós da AST.
+
+Layout (inteiros na ordem de bytes da máquina que gerou, registrada no cabeçalho):
+
+    cabeçalho   _CABECALHO
+    código      n_instrucoes pares int32 (operação, argumento)
+    constantes  n+1 posições uint32 e os itens: b'i' + inteiro com sinal | b's' + UTF-8
+    nomes       n_variaveis+1 posições uint32 e os nomes em UTF-8 (o último é o do programa)
+    posições    tabela de localizacoes.py, uma entrada por instrução
+"""
+import io
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Union
+
+from ast_nodes import *
+from interpreter import RuntimeError
+from inteiros import (MODO_ILIMITADO, MODO_INT64_TRAP, MODOS_INTEIRO, INT64_MIN, INT64_MAX,
+                      ajustar_int64, escrever_em_partes, formatar_valor, inteiro_de_texto)
+from localizacoes import CodificadorLocalizacoes, TabelaLocalizacoes
+from compilador import LimiteExcedido, ProgramaCompilado, ResultadoExecucao, _fonte_entradas
+
+MAGICO = b'FTLP'
+VERSAO = 1
+# mágico, versão, little-endian, modo, n_instrucoes, n_variaveis, n_lacos, n_constantes,
+# início do código, das constantes, dos nomes e das posições, tamanho das posições
+_CABECALHO = struct.Struct('=4sHBB9I')
+
+# Operações; o argumento é um índice (variável, constante, laço, instrução) ou um valor imediato
+# (numeradas na ordem em que o laço de execução as testa)
+(CARREGAR, CONSTANTE, ARMAZENAR, COMPARAR_SALTAR, SALTAR, CONSTANTE_GRANDE, SALTAR_SE_FALSO,
+ SOMAR, SUBTRAIR, MULTIPLICAR, DIVIDIR, NEGAR,
+ IGUAL, DIFERENTE, MENOR, MENOR_IGUAL, MAIOR, MAIOR_IGUAL,
+ CONTAR_LACO, INICIAR_LACO, ESCREVER, LER, FIM) = range(23)
+# COMPARAR_SALTAR: comparação seguida de salto quando falsa (condição de se/enquanto);
+# argumento = destino << 3 | (operação de comparação - IGUAL)
+
+_BINARIAS = {'+': SOMAR, '-': SUBTRAIR, '*': MULTIPLICAR, '/': DIVIDIR, '=': IGUAL,
+             '<>': DIFERENTE, '<': MENOR, '<=': MENOR_IGUAL, '>': MAIOR, '>=': MAIOR_IGUAL}
+_OPERADORES = {operacao: operador for operador, operacao in _BINARIAS.items()}
+_OPERADORES[NEGAR] = '-'
+_CODIGO_MODO = {modo: indice for indice, modo in enumerate(MODOS_INTEIRO)}
+_IMEDIATO_MIN = -(1 << 31)
+_IMEDIATO_MAX = (1 << 31) - 1
+
+class ErroProgramaPlano(Exception):
+    """Buffer que não contém um programa plano válido para esta máquina"""
+
+class _Montador(VisitorAST):
+    """Gera as instruções de uma AST verificada, registrando a posição de cada uma"""
+
+    def __init__(self, programa: Programa):
+        self.codigo = array('i')
+        self.posicoes = CodificadorLocalizacoes()
+        self.constantes: List[bytes] = []
+        self._indice_constante: Dict[Any, int] = {}
+        self.variaveis: Dict[Simbolo, int] = {}
+        self.lacos = 0
+        for declaracao in programa.declaracoes:
+            declaracao.aceitar(self)
+
+    def emitir(self, operacao: int, argumento: int, no: NoAST) -> int:
+        """Acrescenta uma instrução e retorna seu índice"""
+        self.codigo.append(operacao)
+        self.codigo.append(argumento)
+        return self.posicoes.adicionar(no.linha, no.coluna)
+
+    @property
+    def proxima(self) -> int:
+        return len(self.codigo) // 2
+
+    def constante(self, valor) -> int:
+        chave = (type(valor), valor)
+        indice = self._indice_constante.get(chave)
+        if indice is None:
+            if isinstance(valor, str):
+                dados = b's' + valor.encode('utf-8')
+            else:
+                dados = b'i' + valor.to_bytes((valor.bit_length() + 8) // 8, 'little', signed=True)
+            indice = self._indice_constante[chave] = len(self.constantes)
+            self.constantes.append(dados)
+        return indice
+
+    def visitar_programa(self, no: Programa):
+        for comando in no.comandos:
+            comando.aceitar(self)
+        self.emitir(FIM, 0, no)
+
+    def visitar_declaracao(self, no: Declaracao):
+        for variavel in no.variaveis:
+            self.variaveis.setdefault(variavel, len(self.variaveis))
+
+    def visitar_atribuicao(self, no: Atribuicao):
+        no.expressao.aceitar(self)
+        self.emitir(ARMAZENAR, self.variaveis[no.variavel], no)
+
+    def visitar_leitura(self, no: Leitura):
+        for variavel in no.variaveis:
+            self.emitir(LER, self.variaveis[variavel], no)
+
+    def visitar_escrita(self, no: Escrita):
+        for expressao in no.expressoes:
+            expressao.aceitar(self)
+        self.emitir(ESCREVER, len(no.expressoes), no)
+
+    def visitar_bloco(self, no: Bloco):
+        for comando in no.comandos:
+            comando.aceitar(self)
+
+    def condicao(self, condicao: Expressao, no: NoAST) -> int:
+        """Avalia a condição e salta se falsa; retorna a instrução do salto (a corrigir)"""
+        operacao = _BINARIAS.get(condicao.operador) if isinstance(condicao, ExpressaoBinaria) else None
+        if operacao is None or operacao < IGUAL:
+            condicao.aceitar(self)
+            return self.emitir(SALTAR_SE_FALSO, 0, no)
+        condicao.esquerda.aceitar(self)
+        condicao.direita.aceitar(self)
+        return self.emitir(COMPARAR_SALTAR, operacao - IGUAL, condicao)
+
+    def corrigir_salto(self, instrucao: int, destino: int):
+        if self.codigo[2 * instrucao] == COMPARAR_SALTAR:
+            self.codigo[2 * instrucao + 1] |= destino << 3
+        else:
+            self.codigo[2 * instrucao + 1] = destino
+
+    def visitar_se(self, no: Se):
+        salto_senao = self.condicao(no.condicao, no)
+        no.comando_entao.aceitar(self)
+        if no.comando_senao is None:
+            self.corrigir_salto(salto_senao, self.proxima)
+            return
+        salto_fim = self.emitir(SALTAR, 0, no)
+        self.corrigir_salto(salto_senao, self.proxima)
+        no.comando_senao.aceitar(self)
+        self.corrigir_salto(salto_fim, self.proxima)
+
+    def visitar_enquanto(self, no: Enquanto):
+        laco = self.lacos
+        self.lacos += 1
+        self.emitir(INICIAR_LACO, laco, no)
+        inicio = self.proxima
+        salto_fim = self.condicao(no.condicao, no)
+        no.comando.aceitar(self)
+        self.emitir(CONTAR_LACO, laco, no)
+        self.emitir(SALTAR, inicio, no)
+        self.corrigir_salto(salto_fim, self.proxima)
+
+    def visitar_expressao_binaria(self, no: ExpressaoBinaria):
+        no.esquerda.aceitar(self)
+        no.direita.aceitar(self)
+        self.emitir(_BINARIAS[no.operador], 0, no)
+
+    def visitar_expressao_unaria(self, no: ExpressaoUnaria):
+        no.expressao.aceitar(self)
+        self.emitir(NEGAR, 0, no)
+
+    def visitar_variavel(self, no: Variavel):
+        self.emitir(CARREGAR, self.variaveis[no.nome], no)
+
+    def visitar_numero(self, no: Numero):
+        if _IMEDIATO_MIN <= no.valor <= _IMEDIATO_MAX:
+            self.emitir(CONSTANTE, no.valor, no)
+        else:
+            self.emitir(CONSTANTE_GRANDE, self.constante(no.valor), no)
+
+    def visitar_string(self, no: StringLiteral):
+        self.emitir(CONSTANTE_GRANDE, self.constante(no.valor), no)
+
+def _alinhar(saida: bytearray):
+    saida.extend(bytes(-len(saida) % 8))
+
+def _tabela_itens(saida: bytearray, itens: List[bytes]) -> int:
+    """Grava posições uint32 (relativas ao início do buffer) seguidas dos itens; retorna o início"""
+    _alinhar(saida)
+    inicio = len(saida)
+    posicao = inicio + 4 * (len(itens) + 1)
+    posicoes = array('I', [posicao])
+    for item in itens:
+        posicao += len(item)
+        posicoes.append(posicao)
+    saida.extend(posicoes.tobytes())
+    for item in itens:
+        saida.extend(item)
+    return inicio
+
+def codificar_programa(programa: Union[Programa, ProgramaCompilado]) -> bytes:
+    """Imagem plana de uma AST já verificada (ou de um ProgramaCompilado)"""
+    if isinstance(programa, ProgramaCompilado):
+        programa = programa.ast
+    montador = _Montador(programa)
+    programa.aceitar(montador)
+    tabela = montador.posicoes.tabela()
+
+    saida = bytearray(_CABECALHO.size)
+    _alinhar(saida)
+    inicio_codigo = len(saida)
+    saida.extend(montador.codigo.tobytes())
+    inicio_constantes = _tabela_itens(saida, montador.constantes)
+    nomes = [str(variavel).encode('utf-8') for variavel in montador.variaveis]
+    inicio_nomes = _tabela_itens(saida, nomes + [programa.nome.encode('utf-8')])
+    inicio_posicoes = len(saida)
+    saida.extend(tabela.dados)
+
+    _CABECALHO.pack_into(saida, 0, MAGICO, VERSAO, sys.byteorder == 'little',
+                         _CODIGO_MODO[programa.modo_inteiro or MODO_ILIMITADO],
+                         len(montador.codigo) // 2, len(montador.variaveis), montador.lacos,
+                         len(montador.constantes), inicio_codigo, inicio_constantes, inicio_nomes,
+                         inicio_posicoes, len(tabela.dados))
+    return bytes(saida)
+
+class ProgramaPlano:
+    """Programa executado direto de um buffer (bytes, mmap ou memória compartilhada).
+
+    A construção valida o cabeçalho e cria visões (memoryview) das seções; nada
+    é copiado. Constantes grandes e nomes são decodificados quando usados. Como
+    ProgramaCompilado, executar usa estado novo a cada chamada.
+    """
+
+    def __init__(self, buffer, dono: Any = None):
+        dados = memoryview(buffer)
+        if dados.format != 'B' or dados.ndim != 1:
+            dados = dados.cast('B')
+        if len(dados) < _CABECALHO.size:
+            raise ErroProgramaPlano("Buffer menor que o cabeçalho do programa")
+        (magico, versao, little_endian, modo, self.instrucoes, self.quantidade_variaveis, self.lacos,
+         self.quantidade_constantes, inicio_codigo, inicio_constantes, inicio_nomes, inicio_posicoes,
+         tamanho_posicoes) = _CABECALHO.unpack_from(dados, 0)
+        if magico != MAGICO or versao != VERSAO:
+            raise ErroProgramaPlano("Buffer não contém um programa plano compatível")
+        if bool(little_endian) != (sys.byteorder == 'little'):
+            raise ErroProgramaPlano("Programa plano gerado em uma máquina com outra ordem de bytes")
+        if inicio_posicoes + tamanho_posicoes > len(dados):
+            raise ErroProgramaPlano("Programa plano truncado")
+
+        self.modo_inteiro = MODOS_INTEIRO[modo]
+        self._dados = dados
+        # Objeto que mantém o buffer mapeado (SharedMemory ou mmap), fechado por liberar()
+        self._dono = dono
+        self._codigo = dados[inicio_codigo:inicio_codigo + 8 * self.instrucoes].cast('i')
+        self._constantes = dados[inicio_constantes:inicio_constantes + 4 * (self.quantidade_constantes + 1)].cast('I')
+        self._nomes = dados[inicio_nomes:inicio_nomes + 4 * (self.quantidade_variaveis + 2)].cast('I')
+        self.localizacoes = TabelaLocalizacoes(dados[inicio_posicoes:inicio_posicoes + tamanho_posicoes],
+                                               self.instrucoes)
+        self._valores_constantes: Dict[int, Any] = {}
+
+    @property
+    def tamanho(self) -> int:
+        return len(self._dados)
+
+    def _item(self, tabela: memoryview, indice: int) -> memoryview:
+        return self._dados[tabela[indice]:tabela[indice + 1]]
+
+    def nome_variavel(self, indice: int) -> str:
+        return str(self._item(self._nomes, indice), 'utf-8')
+
+    @property
+    def nome(self) -> str:
+        return self.nome_variavel(self.quantidade_variaveis)
+
+    def constante(self, indice: int):
+        valor = self._valores_constantes.get(indice)
+        if valor is None:
+            item = self._item(self._constantes, indice)
+            if item[0] == ord('s'):
+                valor = str(item[1:], 'utf-8')
+            else:
+                valor = int.from_bytes(item[1:], 'little', signed=True)
+            self._valores_constantes[indice] = valor
+        return valor
+
+    def _erro(self, mensagem: str, instrucao: int, classe: type = RuntimeError) -> RuntimeError:
+        linha, coluna = self.localizacoes.localizacao(instrucao)
+        return classe(mensagem, linha, coluna)
+
+    def _restringir(self, valor: int, instrucao: int) -> int:
+        if self.modo_inteiro == MODO_INT64_TRAP:
+            raise self._erro("Estouro de inteiro de 64 bits", instrucao)
+        return ajustar_int64(valor)
+
+    def executar(self, entradas: Union[Iterable[Any], Callable[[str], str], None] = None,
+                 saida: Optional[TextIO] = None,
+                 limite_iteracoes: Optional[int] = None) -> ResultadoExecucao:
+        """Executa o programa com a mesma semântica de ProgramaCompilado.executar"""
+        destino = saida if saida is not None else io.StringIO()
+        valores = [0] * self.quantidade_variaveis
+        erro = None
+        try:
+            self._interpretar(valores, _fonte_entradas(entradas), destino, limite_iteracoes)
+        except RuntimeError as e:
+            erro = e
+        texto = destino.getvalue() if saida is None else None
+        variaveis = {self.nome_variavel(indice): valor for indice, valor in enumerate(valores)}
+        return ResultadoExecucao(erro is None, texto, variaveis, erro)
+
+    # Nome em inglês
+    run = executar
+
+    def _interpretar(self, valores: List[Any], entrada: Callable[[str], str], saida: TextIO,
+                     limite_iteracoes: Optional[int]):
+        codigo = self._codigo
+        limitar = self.modo_inteiro != MODO_ILIMITADO
+        constantes = self._valores_constantes
+        iteracoes = [0] * self.lacos
+        pilha: List[Any] = []
+        empilhar = pilha.append
+        desempilhar = pilha.pop
+        contador = 0
+        try:
+            while True:
+                operacao = codigo[contador]
+                argumento = codigo[contador + 1]
+                contador += 2
+                if operacao == CARREGAR:
+                    empilhar(valores[argumento])
+                elif operacao == CONSTANTE:
+                    empilhar(argumento)
+                elif operacao == ARMAZENAR:
+                    valores[argumento] = desempilhar()
+                elif operacao == COMPARAR_SALTAR:
+                    direita = desempilhar()
+                    esquerda = desempilhar()
+                    comparacao = argumento & 7
+                    if comparacao == 2:
+                        verdadeira = esquerda < direita
+                    elif comparacao == 0:
+                        verdadeira = esquerda == direita
+                    elif comparacao == 1:
+                        verdadeira = esquerda != direita
+                    elif comparacao == 3:
+                        verdadeira = esquerda <= direita
+                    elif comparacao == 4:
+                        verdadeira = esquerda > direita
+                    else:
+                        verdadeira = esquerda >= direita
+                    if not verdadeira:
+                        contador = 2 * (argumento >> 3)
+                elif operacao == SALTAR:
+                    contador = 2 * argumento
+                elif operacao == CONSTANTE_GRANDE:
+                    valor = constantes.get(argumento)
+                    empilhar(valor if valor is not None else self.constante(argumento))
+                elif operacao == SALTAR_SE_FALSO:
+                    if not desempilhar():
+                        contador = 2 * argumento
+                elif operacao <= NEGAR:
+                    if operacao == NEGAR:
+                        resultado = -desempilhar()
+                    else:
+                        direita = desempilhar()
+                        esquerda = desempilhar()
+                        if operacao == SOMAR:
+                            resultado = esquerda + direita
+                        elif operacao == SUBTRAIR:
+                            resultado = esquerda - direita
+                        elif operacao == MULTIPLICAR:
+                            resultado = esquerda * direita
+                        else:
+                            if direita == 0:
+                                raise self._erro("Divisão por zero", contador // 2 - 1)
+                            resultado = esquerda // direita
+                    if limitar and not INT64_MIN <= resultado <= INT64_MAX:
+                        resultado = self._restringir(resultado, contador // 2 - 1)
+                    empilhar(resultado)
+                elif operacao <= MAIOR_IGUAL:
+                    direita = desempilhar()
+                    esquerda = desempilhar()
+                    if operacao == MENOR:
+                        empilhar(1 if esquerda < direita else 0)
+                    elif operacao == IGUAL:
+                        empilhar(1 if esquerda == direita else 0)
+                    elif operacao == DIFERENTE:
+                        empilhar(1 if esquerda != direita else 0)
+                    elif operacao == MENOR_IGUAL:
+                        empilhar(1 if esquerda <= direita else 0)
+                    elif operacao == MAIOR:
+                        empilhar(1 if esquerda > direita else 0)
+                    else:
+                        empilhar(1 if esquerda >= direita else 0)
+                elif operacao == CONTAR_LACO:
+                    iteracoes[argumento] += 1
+                    if limite_iteracoes is not None and iteracoes[argumento] > limite_iteracoes:
+                        raise self._erro(f"Laço excedeu o limite de {limite_iteracoes} iterações",
+                                         contador // 2 - 1, LimiteExcedido)
+                elif operacao == INICIAR_LACO:
+                    iteracoes[argumento] = 0
+                elif operacao == ESCREVER:
+                    partes = pilha[-argumento:]
+                    del pilha[-argumento:]
+                    escrever_em_partes(saida, "".join(map(formatar_valor, partes)) + "\n")
+                elif operacao == LER:
+                    self._ler(valores, argumento, entrada, saida, contador // 2 - 1)
+                else:
+                    return
+        except TypeError:
+            instrucao = contador // 2 - 1
+            operacao = codigo[2 * instrucao]
+            if operacao == COMPARAR_SALTAR:
+                operacao = IGUAL + (codigo[2 * instrucao + 1] & 7)
+            operador = _OPERADORES.get(operacao)
+            if operador is None:
+                raise
+            if operacao == NEGAR:
+                raise self._erro("Operador unário '-' requer operando numérico", instrucao)
+            raise self._erro(f"Tipos incompatíveis para operação {operador}", instrucao)
+
+    def _ler(self, valores: List[Any], variavel: int, entrada: Callable[[str], str], saida: TextIO,
+             instrucao: int):
+        nome = self.nome_variavel(variavel)
+        try:
+            texto = entrada(f"Digite o valor para {nome}: ")
+        except EOFError:
+            texto = None
+        if texto is None:
+            valor, aviso = 0, f"\nEntrada terminada. Atribuindo 0 para {nome}"
+        else:
+            try:
+                valor, aviso = inteiro_de_texto(texto), None
+            except ValueError:
+                valor, aviso = 0, f"Valor inválido. Atribuindo 0 para {nome}"
+        valores[variavel] = valor
+        if self.modo_inteiro != MODO_ILIMITADO and not INT64_MIN <= valor <= INT64_MAX:
+            valores[variavel] = self._restringir(valor, instrucao)
+        if aviso:
+            saida.write(aviso + "\n")
+
+    def liberar(self):
+        """Solta as visões do buffer e fecha o mapeamento (SharedMemory ou mmap), se houver"""
+        for visao in (self._codigo, self._constantes, self._nomes, self.localizacoes.dados, self._dados):
+            visao.release()
+        if self._dono is not None:
+            self._dono.close()
+            self._dono = None
+
+    def __enter__(self) -> 'ProgramaPlano':
+        return self
+
+    def __exit__(self, *excecao):
+        self.liberar()
+
+def publicar(imagem: bytes, nome: Optional[str] = None) -> 'shared_memory.SharedMemory':
+    """Copia a imagem para um novo bloco de memória compartilhada (o chamador faz close/unlink)"""
+    from multiprocessing import shared_memory
+    memoria = shared_memory.SharedMemory(name=nome, create=True, size=len(imagem))
+    memoria.buf[:len(imagem)] = imagem
+    return memoria
+
+def anexar(nome: str) -> ProgramaPlano:
+    """Programa publicado por publicar, em qualquer processo, sem cópia.
+
+    Antes do Python 3.13 o anexo é registrado no resource_tracker do processo; processos
+    criados com fork pelo publicador compartilham o dele e não removem o bloco ao terminar.
+    """
+    from multiprocessing import shared_memory
+    try:
+        memoria = shared_memory.SharedMemory(name=nome, track=False)
+    except TypeError:
+        memoria = shared_memory.SharedMemory(name=nome)
+    return ProgramaPlano(memoria.buf, dono=memoria)
+
+def gravar(imagem: bytes, arquivo: str):
+    with open(arquivo, 'wb') as destino:
+        destino.write(imagem)
+
+def mapear(arquivo: str) -> ProgramaPlano:
+    """Programa de um arquivo gravado por gravar, mapeado somente para leitura"""
+    with open(arquivo, 'rb') as origem:
+        mapa = mmap.mmap(origem.fileno(), 0, access=mmap.ACCESS_READ)
+    return ProgramaPlano(mapa, dono=mapa)
+
+# Nomes em inglês da API
+FlatProgram = ProgramaPlano
+encode_program = codificar_programa
@@ -1,5 +1,7 @@
-from typing import Dict, List, Any
+from __future__ import annotations
+
 from ast_nodes import *
+from inteiros import MODO_ILIMITADO, MODOS_INTEIRO, cabe_em_int64, formatar_valor
 
 class SemanticError(Exception):
     def __init__(self, mensagem: str, linha: int, coluna: int):
@@ -9,32 +11,37 @@ class SemanticError(Exception):
         super().__init__(f"Erro semântico na linha {linha}, coluna {coluna}: {mensagem}")
 
 class TabelaSimbolos:
+    """Tipos das variáveis declaradas, indexados pelo símbolo (id internado pelo léxico)"""
+    
     def __init__(self):
-        self.simbolos: Dict[str, str] = {}
+        self.simbolos: dict[Simbolo, str] = {}
     
-    def declarar(self, nome: str, tipo: str, linha: int, coluna: int):
+    def declarar(self, nome: Simbolo, tipo: str, linha: int, coluna: int):
         if nome in self.simbolos:
             raise SemanticError(f"Variável '{nome}' já foi declarada", linha, coluna)
         self.simbolos[nome] = tipo
     
-    def obter_tipo(self, nome: str, linha: int, coluna: int) -> str:
+    def obter_tipo(self, nome: Simbolo, linha: int, coluna: int) -> str:
         if nome not in self.simbolos:
             raise SemanticError(f"Variável '{nome}' não foi declarada", linha, coluna)
         return self.simbolos[nome]
     
-    def existe(self, nome: str) -> bool:
+    def existe(self, nome: Simbolo) -> bool:
         return nome in self.simbolos
 
 class AnalisadorSemantico(VisitorAST):
-    def __init__(self):
+    def __init__(self, modo_inteiro: str = MODO_ILIMITADO):
+        if modo_inteiro not in MODOS_INTEIRO:
+            raise ValueError(f"Modo de inteiro desconhecido: '{modo_inteiro}'")
         self.tabela_simbolos = TabelaSimbolos()
-        self.erros: List[SemanticError] = []
+        self.erros: list[SemanticError] = []
+        self.modo_inteiro = modo_inteiro
     
     def erro(self, mensagem: str, no: NoAST):
         erro = SemanticError(mensagem, no.linha, no.coluna)
         self.erros.append(erro)
     
-    def analisar(self, programa: Programa) -> List[SemanticError]:
+    def analisar(self, programa: Programa) -> list[SemanticError]:
         """Analisa semanticamente o programa e retorna lista de erros"""
         self.erros = []
         try:
@@ -44,6 +51,9 @@ class AnalisadorSemantico(VisitorAST):
         return self.erros
     
     def visitar_programa(self, no: Programa):
+        # Os backends escolhem a aritmética a partir do modo registrado no programa
+        no.modo_inteiro = self.modo_inteiro
+        
         for declaracao in no.declaracoes:
             declaracao.aceitar(self)
         
@@ -143,12 +153,14 @@ class AnalisadorSemantico(VisitorAST):
     
     def visitar_numero(self, no: Numero):
         no.tipo = 'inteiro'
+        if self.modo_inteiro != MODO_ILIMITADO and not cabe_em_int64(no.valor):
+            self.erro(f"Constante {formatar_valor(no.valor)} não cabe em um inteiro de 64 bits", no)
     
     def visitar_string(self, no: StringLiteral):
         no.tipo = 'string'
 
-def analisar_semantica(programa: Programa) -> List[SemanticError]:
+def analisar_semantica(programa: Programa, modo_inteiro: str = MODO_ILIMITADO) -> list[SemanticError]:
     """Função auxiliar para análise semântica"""
-    analisador = AnalisadorSemantico()
+    analisador = AnalisadorSemantico(modo_inteiro)
     erros = analisador.analisar(programa)
     return erros
\ No newline at end of file
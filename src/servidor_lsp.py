@@ -0,0 +1,637 @@
+"""Servidor de linguagem (LSP) do Fortall, por JSON-RPC em stdin/stdout.
+
+O editor inicia o processo uma vez e envia as alterações dos documentos; o
+servidor mantém o texto e a última análise de cada um em memória e publica os
+diagnósticos léxicos, sintáticos e semânticos (textDocument/publishDiagnostics).
+Também responde a textDocument/definition para as variáveis declaradas.
+
+Cada alteração reinicia a espera (debounce); uma análise em andamento é
+cancelada quando chega uma versão mais nova. A análise é incremental: só o
+trecho alterado é analisado de novo pelo léxico até os tokens voltarem a
+coincidir com os anteriores. Só os comandos do programa principal que tocam a
+alteração passam de novo pelo parser, e a análise semântica reaproveita os
+erros dos comandos intactos. Se o orçamento de latência se esgota antes do fim,
+os diagnósticos anteriores são publicados ajustados à alteração, e os novos
+chegam ao final da análise.
+
+Uso:
+    python src/servidor_lsp.py                        # iniciado pelo editor (stdio)
+    python src/servidor_lsp.py --debounce 0.05 --orcamento 0.2
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from ast_nodes import Declaracao
+from inteiros import MODO_ILIMITADO
+from lexer import Lexer, LexerError, Token, TokenType
+from parser import Parser, ParserError
+from semantic import AnalisadorSemantico
+from simbolos import LIMITE_SIMBOLOS, quantidade_simbolos, reiniciar_simbolos
+
+# Espera após a última alteração antes de analisar (segundos)
+ATRASO_ANALISE = 0.05
+# Tempo máximo entre uma alteração e a publicação de diagnósticos para ela (segundos)
+ORCAMENTO_DIAGNOSTICOS = 0.2
+# Tokens produzidos entre verificações de cancelamento e de prazo
+TOKENS_POR_VERIFICACAO = 2048
+
+# Códigos de erro do JSON-RPC e do LSP
+REQUISICAO_INVALIDA = -32600
+METODO_NAO_ENCONTRADO = -32601
+ERRO_INTERNO = -32603
+SERVIDOR_NAO_INICIALIZADO = -32002
+
+SINCRONIZACAO_INCREMENTAL = 2
+SEVERIDADE_ERRO = 1
+
+_PALAVRA = re.compile(r'\w+')
+
+# Diagnóstico ainda em posições do fonte: (linha, coluna, mensagem), ambas a partir de 1
+Diagnostico = Tuple[int, int, str]
+
+def ler_mensagem(entrada: BinaryIO) -> Optional[dict]:
+    """Próxima mensagem (cabeçalhos Content-Length e corpo JSON); None no fim da entrada"""
+    while True:
+        tamanho = None
+        while True:
+            linha = entrada.readline()
+            if not linha:
+                return None
+            linha = linha.strip()
+            if not linha:
+                break
+            nome, _, valor = linha.partition(b':')
+            if nome.strip().lower() == b'content-length':
+                tamanho = int(valor)
+        if tamanho is not None:
+            return json.loads(entrada.read(tamanho).decode('utf-8'))
+
+def escrever_mensagem(saida: BinaryIO, mensagem: dict):
+    corpo = json.dumps(mensagem, ensure_ascii=False).encode('utf-8')
+    saida.write(b'Content-Length: %d\r\n\r\n' % len(corpo) + corpo)
+    saida.flush()
+
+def inicios_de_linha(texto: str) -> List[int]:
+    """Posição do primeiro caractere de cada linha"""
+    inicios = [0]
+    posicao = texto.find('\n')
+    while posicao >= 0:
+        inicios.append(posicao + 1)
+        posicao = texto.find('\n', posicao + 1)
+    return inicios
+
+def _unidades_utf16(texto: str) -> int:
+    return len(texto) if texto.isascii() else len(texto.encode('utf-16-le')) // 2
+
+def _linha_texto(texto: str, inicios: List[int], indice: int) -> Tuple[int, str]:
+    inicio = inicios[indice]
+    fim = inicios[indice + 1] - 1 if indice + 1 < len(inicios) else len(texto)
+    return inicio, texto[inicio:fim]
+
+def deslocamento_lsp(texto: str, inicios: List[int], posicao: dict) -> int:
+    """Posição no texto de uma Position do LSP (linha a partir de 0, coluna em UTF-16)"""
+    indice = posicao['line']
+    if indice >= len(inicios):
+        return len(texto)
+    inicio, linha = _linha_texto(texto, inicios, max(indice, 0))
+    unidades = max(posicao['character'], 0)
+    if linha.isascii():
+        return inicio + min(unidades, len(linha))
+    for coluna, caractere in enumerate(linha):
+        unidades -= 2 if ord(caractere) > 0xFFFF else 1
+        if unidades < 0:
+            return inicio + coluna
+    return inicio + len(linha)
+
+def faixa_lsp(texto: str, inicios: List[int], linha: int, coluna: int) -> dict:
+    """Range do LSP da palavra que começa em (linha, coluna), ou de um caractere"""
+    indice = min(max(linha, 1), len(inicios)) - 1
+    _, conteudo = _linha_texto(texto, inicios, indice)
+    coluna = min(max(coluna, 1), len(conteudo) + 1) - 1
+    palavra = _PALAVRA.match(conteudo, coluna)
+    fim = palavra.end() if palavra else min(coluna + 1, len(conteudo))
+    inicio_utf16 = _unidades_utf16(conteudo[:coluna])
+    return {'start': {'line': indice, 'character': inicio_utf16},
+            'end': {'line': indice, 'character': inicio_utf16 + _unidades_utf16(conteudo[coluna:fim])}}
+
+class AnaliseCancelada(Exception):
+    """O documento mudou (ou foi fechado) durante a análise"""
+
+class EstadoAnalise:
+    """Resultado da última análise concluída de um documento, base da próxima.
+
+    tokens é None após um erro léxico; comandos é None após um erro sintático.
+    Cada comando do programa principal é (primeiro token, token após o comando,
+    nó, erros semânticos, desvio). As linhas dos nós reaproveitados continuam as da
+    análise em que foram criados (só o tipo é refeito pela análise semântica), e o
+    desvio é o que falta somar a elas.
+    """
+
+    def __init__(self, texto: str, inicios: List[int]):
+        self.texto = texto
+        self.inicios = inicios
+        self.tokens: Optional[List[Token]] = None
+        self.declaracoes: List[Declaracao] = []
+        self.comandos: Optional[List[tuple]] = None
+        self.declaradas: tuple = ()
+        self.diagnosticos: List[Diagnostico] = []
+        # Símbolo -> (linha, coluna) do nome na declaração
+        self.definicoes: Dict = {}
+
+    def token_em(self, linha: int, coluna: int) -> Optional[Token]:
+        """Token que contém a posição (linha, coluna), se houver"""
+        if not self.tokens:
+            return None
+        indice = bisect_right(self.tokens, (linha, coluna), key=lambda token: (token.linha, token.coluna)) - 1
+        if indice < 0:
+            return None
+        token = self.tokens[indice]
+        if token.linha != linha or coluna >= token.coluna + len(str(token.valor)):
+            return None
+        return token
+
+class _ParserDocumento(Parser):
+    """Parser que registra o intervalo de tokens de cada comando do programa principal.
+
+    Em uma nova análise, reaproveita os comandos anteriores a partir do primeiro
+    que começa depois da alteração, no mesmo ponto da sequência de tokens.
+    """
+
+    def __init__(self, codigo: str, tokens: List[Token], verificar: Callable[[], None]):
+        super().__init__(codigo, tokens)
+        self.verificar_andamento = verificar
+        self.comandos: List[tuple] = []
+        self._nivel = 0
+        self.anteriores: Optional[List[tuple]] = None
+        # Quantos comandos no fim da lista são os anteriores, ainda sem os deslocamentos
+        self.reaproveitados = 0
+        # Tokens a partir de `limite` são os anteriores deslocados de `deslocamento` posições
+        self.limite = len(tokens)
+        self.deslocamento = 0
+
+    def ir_para(self, posicao: int):
+        self.posicao = posicao
+        self.token_atual = self.tokens[posicao]
+
+    def comando(self):
+        self.verificar_andamento()
+        return super().comando()
+
+    def bloco(self):
+        self._nivel += 1
+        try:
+            return super().bloco()
+        finally:
+            self._nivel -= 1
+
+    def lista_comandos(self):
+        if self._nivel:
+            return super().lista_comandos()
+        self._lista_principal()
+        return [comando[2] for comando in self.comandos]
+
+    def _registrar_comando(self):
+        inicio = self.posicao
+        no = self.comando()
+        self.comandos.append((inicio, self.posicao, no, None, 0))
+
+    def _lista_principal(self) -> bool:
+        """lista_comandos do programa principal; True se o restante foi reaproveitado"""
+        self._registrar_comando()
+        while self.verificar(TokenType.PONTO_VIRGULA):
+            self.avancar()
+            if not self.verificar(TokenType.FIM):
+                if self._ressincronizar():
+                    return True
+                self._registrar_comando()
+        return False
+
+    def _ressincronizar(self) -> bool:
+        if self.anteriores is None or self.posicao < self.limite:
+            return False
+        antigo = self.posicao - self.deslocamento
+        indice = bisect_left(self.anteriores, antigo, key=lambda comando: comando[0])
+        if indice == len(self.anteriores) or self.anteriores[indice][0] != antigo:
+            return False
+        self.comandos.extend(self.anteriores[indice:])
+        self.reaproveitados = len(self.anteriores) - indice
+        return True
+
+    def reanalisar(self, primeiro: int):
+        """Analisa de novo a partir do comando `primeiro` dos anteriores"""
+        self.comandos = list(self.anteriores[:primeiro])
+        self.ir_para(self.anteriores[primeiro][0])
+        if not self._lista_principal():
+            self.consumir(TokenType.FIM, "Esperado 'fim'")
+            self.consumir(TokenType.PONTO, "Esperado '.' no final do programa")
+
+class AnaliseIncremental:
+    """Análise de uma nova versão do texto a partir do estado da versão anterior"""
+
+    def __init__(self, anterior: Optional[EstadoAnalise], texto: str,
+                 verificar: Callable[[], None] = lambda: None):
+        self.anterior = anterior
+        self.texto = texto
+        self.verificar = verificar
+        self.inicios = inicios_de_linha(texto)
+        # Linhas alteradas: primeira, última antes e última depois da alteração
+        self.edicao: Optional[Tuple[int, int, int]] = None
+
+    def diagnosticos_provisorios(self) -> List[Diagnostico]:
+        """Diagnósticos anteriores, sem os das linhas alteradas e com as seguintes deslocadas"""
+        if self.edicao is None:
+            return self.anterior.diagnosticos
+        primeira, ultima_antes, ultima_depois = self.edicao
+        delta = ultima_depois - ultima_antes
+        provisorios = []
+        for linha, coluna, mensagem in self.anterior.diagnosticos:
+            if linha < primeira:
+                provisorios.append((linha, coluna, mensagem))
+            elif linha > ultima_antes:
+                provisorios.append((linha + delta, coluna, mensagem))
+        return provisorios
+
+    def _regiao_alterada(self) -> Tuple[int, int]:
+        """Tamanhos do prefixo e do sufixo comuns ao texto anterior (comparações de fatias em C)"""
+        antigo, novo = self.anterior.texto, self.texto
+        limite = min(len(antigo), len(novo))
+        baixo, alto = 0, limite
+        while baixo < alto:
+            meio = (baixo + alto + 1) // 2
+            if antigo[:meio] == novo[:meio]:
+                baixo = meio
+            else:
+                alto = meio - 1
+        prefixo = baixo
+        baixo, alto = 0, limite - prefixo
+        while baixo < alto:
+            meio = (baixo + alto + 1) // 2
+            if antigo[len(antigo) - meio:] == novo[len(novo) - meio:]:
+                baixo = meio
+            else:
+                alto = meio - 1
+        return prefixo, baixo
+
+    def executar(self) -> EstadoAnalise:
+        anterior = self.anterior
+        estado = EstadoAnalise(self.texto, self.inicios)
+        if anterior is not None and anterior.texto == self.texto:
+            return anterior
+
+        retomada = None
+        if anterior is not None:
+            prefixo, sufixo = self._regiao_alterada()
+            primeira = bisect_right(anterior.inicios, prefixo)
+            self.edicao = (primeira, bisect_right(anterior.inicios, len(anterior.texto) - sufixo),
+                           bisect_right(self.inicios, len(self.texto) - sufixo))
+        try:
+            if anterior is not None and anterior.tokens is not None:
+                tokens, retomada, limite, deslocamento = self._relexar()
+            else:
+                tokens = self._tokenizar()
+        except LexerError as e:
+            estado.diagnosticos = [(e.linha, e.coluna, f"Erro léxico: {e.mensagem}")]
+            if anterior is not None:
+                estado.definicoes = anterior.definicoes
+            return estado
+        estado.tokens = tokens
+        estado.definicoes = self._definicoes(tokens)
+
+        parser = _ParserDocumento(self.texto, tokens, self.verificar)
+        try:
+            if (retomada is not None and anterior.comandos is not None
+                    and retomada >= anterior.comandos[0][0]):
+                parser.anteriores = anterior.comandos
+                parser.limite = limite
+                parser.deslocamento = deslocamento
+                # Primeiro comando cujo último token ou separador pode ter mudado
+                primeiro = bisect_left(anterior.comandos, retomada - 1, key=lambda comando: comando[1])
+                parser.reanalisar(min(primeiro, len(anterior.comandos) - 1))
+                estado.declaracoes = anterior.declaracoes
+            else:
+                estado.declaracoes = parser.programa().declaracoes
+        except ParserError as e:
+            estado.diagnosticos = [(e.token.linha, e.token.coluna, e.mensagem)]
+            return estado
+
+        analisador = AnalisadorSemantico(MODO_ILIMITADO)
+        for declaracao in estado.declaracoes:
+            declaracao.aceitar(analisador)
+        diagnosticos = [(erro.linha, erro.coluna, erro.mensagem) for erro in analisador.erros]
+        estado.declaradas = tuple(sorted(analisador.tabela_simbolos.simbolos.items()))
+        reaproveitar = anterior is not None and anterior.declaradas == estado.declaradas
+        delta = self.edicao[2] - self.edicao[1] if self.edicao else 0
+        primeiro_reaproveitado = len(parser.comandos) - parser.reaproveitados
+        comandos = []
+        for indice, (inicio, fim, no, erros, desvio) in enumerate(parser.comandos):
+            if indice >= primeiro_reaproveitado:
+                inicio += parser.deslocamento
+                fim += parser.deslocamento
+                desvio += delta
+                if erros is not None and delta:
+                    erros = [(linha + delta, coluna, mensagem) for linha, coluna, mensagem in erros]
+            if erros is None or not reaproveitar:
+                self.verificar()
+                analisador.erros = []
+                no.aceitar(analisador)
+                erros = [(erro.linha + desvio, erro.coluna, erro.mensagem) for erro in analisador.erros]
+            comandos.append((inicio, fim, no, erros, desvio))
+        self.verificar()
+        estado.comandos = comandos
+        for comando in comandos:
+            diagnosticos.extend(comando[3])
+        estado.diagnosticos = diagnosticos
+        return estado
+
+    def _tokenizar(self) -> List[Token]:
+        lexer = Lexer(self.texto)
+        tokens = []
+        while True:
+            token = lexer.proximo_token()
+            tokens.append(token)
+            if token.tipo == TokenType.EOF:
+                return tokens
+            if len(tokens) % TOKENS_POR_VERIFICACAO == 0:
+                self.verificar()
+
+    def _relexar(self) -> Tuple[List[Token], int, int, int]:
+        """Tokens do novo texto, retomando no último token antes das linhas alteradas.
+
+        Termina quando um token depois da alteração coincide com um anterior na
+        posição correspondente: dali em diante o texto é o mesmo, então os tokens
+        também são. Retorna os tokens, o índice da retomada, o índice a partir do
+        qual os tokens são os anteriores e o deslocamento dos seus índices.
+        """
+        antigos = self.anterior.tokens
+        primeira, ultima_antes, ultima_depois = self.edicao
+        delta = ultima_depois - ultima_antes
+        retomada = bisect_left(antigos, primeira, key=lambda token: token.linha) - 1
+        lexer = Lexer(self.texto)
+        if retomada >= 0:
+            token = antigos[retomada]
+            lexer.posicao = self.inicios[token.linha - 1] + token.coluna - 1
+            lexer.linha, lexer.coluna = token.linha, token.coluna
+        else:
+            retomada = 0
+        tokens = antigos[:retomada]
+        seguinte = bisect_left(antigos, ultima_antes + 1, key=lambda token: token.linha)
+        while True:
+            token = lexer.proximo_token()
+            if token.linha > ultima_depois:
+                alvo = (token.linha - delta, token.coluna)
+                while seguinte < len(antigos) and (antigos[seguinte].linha, antigos[seguinte].coluna) < alvo:
+                    seguinte += 1
+                if seguinte < len(antigos) and (antigos[seguinte].linha, antigos[seguinte].coluna) == alvo:
+                    limite = len(tokens)
+                    if delta:
+                        tokens.extend(Token(antigo.tipo, antigo.valor, antigo.linha + delta, antigo.coluna)
+                                      for antigo in antigos[seguinte:])
+                    else:
+                        tokens.extend(antigos[seguinte:])
+                    return tokens, retomada, limite, len(tokens) - len(antigos)
+            tokens.append(token)
+            if token.tipo == TokenType.EOF:
+                return tokens, retomada, len(tokens), len(tokens) - len(antigos)
+            if len(tokens) % TOKENS_POR_VERIFICACAO == 0:
+                self.verificar()
+
+    @staticmethod
+    def _definicoes(tokens: List[Token]) -> Dict:
+        """Posição de cada variável na seção 'var' (índice para ir à definição)"""
+        definicoes = {}
+        indice = 0
+        while tokens[indice].tipo not in (TokenType.VAR, TokenType.INICIO, TokenType.EOF):
+            indice += 1
+        for token in tokens[indice:]:
+            if token.tipo in (TokenType.INICIO, TokenType.EOF):
+                break
+            if token.tipo == TokenType.IDENTIFICADOR:
+                definicoes.setdefault(token.valor, (token.linha, token.coluna))
+        return definicoes
+
+class Documento:
+    def __init__(self, uri: str, texto: str, versao: Optional[int]):
+        self.uri = uri
+        self.texto = texto
+        self.versao = versao
+        self.alterado_em = time.monotonic()
+        self.estado: Optional[EstadoAnalise] = None
+        self.aberto = True
+
+class ServidorLSP:
+    """Atende as mensagens do editor; as análises rodam em uma thread à parte"""
+
+    def __init__(self, entrada: BinaryIO, saida: BinaryIO,
+                 debounce: float = ATRASO_ANALISE, orcamento: float = ORCAMENTO_DIAGNOSTICOS):
+        self.entrada = entrada
+        self.saida = saida
+        self.debounce = debounce
+        self.orcamento = orcamento
+        self.documentos: Dict[str, Documento] = {}
+        self.pendentes: Dict[str, Documento] = {}
+        self.condicao = threading.Condition()
+        self.trava_saida = threading.Lock()
+        self.inicializado = False
+        self.desligado = False
+        self.encerrando = False
+
+    def enviar(self, mensagem: dict):
+        mensagem['jsonrpc'] = '2.0'
+        with self.trava_saida:
+            escrever_mensagem(self.saida, mensagem)
+
+    def publicar(self, uri: str, versao: Optional[int], texto: str, inicios: List[int],
+                 diagnosticos: List[Diagnostico]):
+        self.enviar({'method': 'textDocument/publishDiagnostics', 'params': {
+            'uri': uri, 'version': versao,
+            'diagnostics': [{'range': faixa_lsp(texto, inicios, linha, coluna),
+                             'severity': SEVERIDADE_ERRO, 'source': 'fortall', 'message': mensagem}
+                            for linha, coluna, mensagem in diagnosticos]}})
+
+    # Análises
+
+    def _agendar(self, documento: Documento):
+        with self.condicao:
+            documento.alterado_em = time.monotonic()
+            self.pendentes[documento.uri] = documento
+            self.condicao.notify()
+
+    def _trabalhar(self):
+        while True:
+            with self.condicao:
+                while not self.pendentes and not self.encerrando:
+                    self.condicao.wait()
+                if self.encerrando:
+                    return
+                # Debounce: o documento alterado há mais tempo, quando parar de mudar
+                documento = min(self.pendentes.values(), key=lambda documento: documento.alterado_em)
+                espera = documento.alterado_em + self.debounce - time.monotonic()
+                if espera > 0:
+                    self.condicao.wait(espera)
+                    continue
+                del self.pendentes[documento.uri]
+                if quantidade_simbolos() > LIMITE_SIMBOLOS:
+                    # Só as análises guardadas usam símbolos: todas recomeçam do zero
+                    for aberto in self.documentos.values():
+                        aberto.estado = None
+                        if aberto is not documento:
+                            self.pendentes[aberto.uri] = aberto
+                    reiniciar_simbolos()
+                texto, versao, prazo = documento.texto, documento.versao, documento.alterado_em + self.orcamento
+            try:
+                self._analisar(documento, texto, versao, prazo)
+            except AnaliseCancelada:
+                pass
+            except Exception as e:
+                print(f"Erro na análise de {documento.uri}: {e}", file=sys.stderr)
+
+    def _analisar(self, documento: Documento, texto: str, versao: Optional[int], prazo: float):
+        provisorio_publicado = False
+
+        def verificar():
+            nonlocal provisorio_publicado
+            if documento.versao != versao or not documento.aberto:
+                raise AnaliseCancelada()
+            if not provisorio_publicado and analise.anterior is not None and time.monotonic() > prazo:
+                provisorio_publicado = True
+                self.publicar(documento.uri, versao, texto, analise.inicios,
+                              analise.diagnosticos_provisorios())
+
+        analise = AnaliseIncremental(documento.estado, texto, verificar)
+        estado = analise.executar()
+        with self.condicao:
+            # O estado vale para o próprio texto mesmo que já exista uma versão mais nova
+            documento.estado = estado
+            atual = documento.versao == versao and documento.aberto
+        if atual:
+            self.publicar(documento.uri, versao, texto, estado.inicios, estado.diagnosticos)
+
+    # Mensagens
+
+    def _abrir(self, parametros: dict):
+        item = parametros['textDocument']
+        documento = self.documentos[item['uri']] = Documento(item['uri'], item['text'], item.get('version'))
+        self._agendar(documento)
+
+    def _alterar(self, parametros: dict):
+        documento = self.documentos.get(parametros['textDocument']['uri'])
+        if documento is None:
+            return
+        texto = documento.texto
+        for mudanca in parametros['contentChanges']:
+            if 'range' in mudanca:
+                inicios = inicios_de_linha(texto)
+                inicio = deslocamento_lsp(texto, inicios, mudanca['range']['start'])
+                fim = deslocamento_lsp(texto, inicios, mudanca['range']['end'])
+                texto = texto[:inicio] + mudanca['text'] + texto[fim:]
+            else:
+                texto = mudanca['text']
+        with self.condicao:
+            documento.texto = texto
+            documento.versao = parametros['textDocument'].get('version')
+        self._agendar(documento)
+
+    def _fechar(self, parametros: dict):
+        uri = parametros['textDocument']['uri']
+        with self.condicao:
+            documento = self.documentos.pop(uri, None)
+            self.pendentes.pop(uri, None)
+            if documento is not None:
+                documento.aberto = False
+        self.enviar({'method': 'textDocument/publishDiagnostics',
+                     'params': {'uri': uri, 'diagnostics': []}})
+
+    def _definicao(self, parametros: dict):
+        documento = self.documentos.get(parametros['textDocument']['uri'])
+        estado = documento.estado if documento is not None else None
+        if estado is None or estado.tokens is None:
+            return None
+        posicao = parametros['position']
+        deslocamento = deslocamento_lsp(estado.texto, estado.inicios, posicao)
+        linha = bisect_right(estado.inicios, deslocamento)
+        token = estado.token_em(linha, deslocamento - estado.inicios[linha - 1] + 1)
+        if token is None or token.tipo != TokenType.IDENTIFICADOR or token.valor not in estado.definicoes:
+            return None
+        linha, coluna = estado.definicoes[token.valor]
+        return {'uri': documento.uri, 'range': faixa_lsp(estado.texto, estado.inicios, linha, coluna)}
+
+    def _inicializar(self, parametros: dict):
+        self.inicializado = True
+        return {'capabilities': {'textDocumentSync': {'openClose': True,
+                                                      'change': SINCRONIZACAO_INCREMENTAL},
+                                 'definitionProvider': True},
+                'serverInfo': {'name': 'fortall'}}
+
+    def _desligar(self, parametros):
+        self.desligado = True
+        return None
+
+    def atender(self, mensagem: dict):
+        """Responde a uma requisição ou processa uma notificação"""
+        metodo = mensagem.get('method')
+        identificador = mensagem.get('id')
+        parametros = mensagem.get('params') or {}
+        requisicoes = {'initialize': self._inicializar, 'shutdown': self._desligar,
+                       'textDocument/definition': self._definicao}
+        notificacoes = {'textDocument/didOpen': self._abrir, 'textDocument/didChange': self._alterar,
+                        'textDocument/didClose': self._fechar}
+        if identificador is None:
+            if metodo in notificacoes and self.inicializado:
+                notificacoes[metodo](parametros)
+            return
+        if metodo not in requisicoes:
+            erro = (METODO_NAO_ENCONTRADO, f"Método desconhecido: {metodo}")
+        elif not self.inicializado and metodo != 'initialize':
+            erro = (SERVIDOR_NAO_INICIALIZADO, "Servidor não inicializado")
+        else:
+            try:
+                self.enviar({'id': identificador, 'result': requisicoes[metodo](parametros)})
+                return
+            except Exception as e:
+                erro = (ERRO_INTERNO, str(e))
+        self.enviar({'id': identificador, 'error': {'code': erro[0], 'message': erro[1]}})
+
+    def servir(self) -> int:
+        """Atende até 'exit' ou o fim da entrada; retorna o código de saída do processo"""
+        trabalhador = threading.Thread(target=self._trabalhar, daemon=True)
+        trabalhador.start()
+        try:
+            while True:
+                mensagem = ler_mensagem(self.entrada)
+                if mensagem is None or mensagem.get('method') == 'exit':
+                    break
+                if not isinstance(mensagem, dict):
+                    self.enviar({'id': None, 'error': {'code': REQUISICAO_INVALIDA,
+                                                       'message': "Mensagem inválida"}})
+                    continue
+                self.atender(mensagem)
+        finally:
+            with self.condicao:
+                self.encerrando = True
+                self.condicao.notify()
+            trabalhador.join()
+        return 0 if self.desligado else 1
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor de linguagem (LSP) do Fortall, por stdio')
+    parser.add_argument('--debounce', type=float, default=ATRASO_ANALISE, metavar='S',
+                        help=f'Espera após a última alteração antes de analisar (padrão: {ATRASO_ANALISE})')
+    parser.add_argument('--orcamento', type=float, default=ORCAMENTO_DIAGNOSTICOS, metavar='S',
+                        help='Tempo máximo entre uma alteração e a publicação de diagnósticos '
+                             f'(padrão: {ORCAMENTO_DIAGNOSTICOS})')
+    args = parser.parse_args()
+    servidor = ServidorLSP(sys.stdin.buffer, sys.stdout.buffer, args.debounce, args.orcamento)
+    return servidor.servir()
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# Nomes em inglês
+LanguageServer = ServidorLSP
+IncrementalAnalysis = AnaliseIncremental
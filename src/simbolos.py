@@ -0,0 +1,73 @@
+import sys
+from _thread import allocate_lock
+
+# Nome de cada símbolo, indexado pelo id
+_nomes: dict[int, str] = {}
+_por_nome: dict[str, 'Simbolo'] = {}
+_trava = allocate_lock()
+# Ids não são reaproveitados depois de reiniciar_simbolos
+_proximo_id = 0
+
+# Acima desta quantidade de nomes, os processos de longa duração (fortalld, servidor
+# LSP, trabalhadores) descartam as ASTs guardadas e reiniciam a tabela
+LIMITE_SIMBOLOS = 1 << 16
+
+class Simbolo(int):
+    """Identificador internado: o valor inteiro é o id do símbolo.
+
+    Cada nome tem um único objeto Simbolo no processo, compartilhado por tokens,
+    AST, tabela de símbolos e ambiente de execução, que o usam como chave (hash e
+    comparação de inteiros). O nome só é recuperado por str() nos diagnósticos.
+    """
+
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        return _nomes[self]
+
+    def __format__(self, especificacao: str) -> str:
+        return format(_nomes[self], especificacao)
+
+    def __repr__(self) -> str:
+        return f"Simbolo({_nomes[self]!r})"
+
+    def __reduce__(self):
+        # Ids valem apenas no processo; em pickle/deepcopy o nome é internado de novo
+        return (simbolo, (_nomes[self],))
+
+def simbolo(nome: str) -> Simbolo:
+    """Símbolo do nome, criado com o próximo id na primeira ocorrência"""
+    global _proximo_id
+    existente = _por_nome.get(nome)
+    if existente is not None:
+        return existente
+    with _trava:
+        existente = _por_nome.get(nome)
+        if existente is None:
+            existente = Simbolo(_proximo_id)
+            _proximo_id += 1
+            nome = sys.intern(nome)
+            _nomes[existente] = nome
+            _por_nome[nome] = existente
+        return existente
+
+def quantidade_simbolos() -> int:
+    return len(_nomes)
+
+def reiniciar_simbolos():
+    """Esquece todos os nomes internados.
+
+    Só pode ser chamada quando nenhum símbolo criado antes continua em uso (tokens,
+    ASTs, ambientes). Como os ids não são reaproveitados, um símbolo antigo que
+    escapou falha em str() em vez de passar por outro nome.
+    """
+    with _trava:
+        _nomes.clear()
+        _por_nome.clear()
+
+def nome_simbolo(id_simbolo: int) -> str:
+    return _nomes[id_simbolo]
+
+def nomes_variaveis(variaveis: dict) -> dict:
+    """Cópia de um ambiente (símbolo -> valor) com os nomes como chaves"""
+    return {_nomes[id_simbolo]: valor for id_simbolo, valor in variaveis.items()}
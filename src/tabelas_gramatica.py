@@ -0,0 +1,157 @@
+# Gerado por gramatica.py a partir de gramatica.txt; não edite.
+# Para regenerar: python src/gramatica.py --tabelas src/tabelas_gramatica.py
+
+ASSINATURA = 'e929d818172ec6d4'
+INICIAL = '<programa>'
+
+# Não terminais, na ordem dos índices usados em PRODUCOES e TABELA
+NAO_TERMINAIS = (
+    '<programa.1>',  # 0
+    '<programa>',  # 1
+    '<declaracoes.1>',  # 2
+    '<declaracoes>',  # 3
+    '<comandos.1>',  # 4
+    '<comandos.2>',  # 5
+    '<comandos>',  # 6
+    '<declaracao>',  # 7
+    '<comando>',  # 8
+    '<lista_ids.1>',  # 9
+    '<lista_ids>',  # 10
+    '<tipo>',  # 11
+    '<atribuicao>',  # 12
+    '<leitura>',  # 13
+    '<escrita>',  # 14
+    '<se.1>',  # 15
+    '<se>',  # 16
+    '<enquanto>',  # 17
+    '<bloco>',  # 18
+    '<expr>',  # 19
+    '<lista_expr.1>',  # 20
+    '<lista_expr>',  # 21
+    '<expr_relacional.1>',  # 22
+    '<expr_relacional.2>',  # 23
+    '<expr_relacional>',  # 24
+    '<expr_arit.1>',  # 25
+    '<expr_arit.2>',  # 26
+    '<expr_arit>',  # 27
+    '<termo.1>',  # 28
+    '<termo.2>',  # 29
+    '<termo>',  # 30
+    '<fator>',  # 31
+)
+
+# Auxiliares criados a partir do EBNF: 'repeticao', 'opcional' ou 'grupo'
+AUXILIARES = {
+    '<programa.1>': 'opcional',
+    '<declaracoes.1>': 'repeticao',
+    '<comandos.1>': 'opcional',
+    '<comandos.2>': 'opcional',
+    '<lista_ids.1>': 'repeticao',
+    '<se.1>': 'opcional',
+    '<lista_expr.1>': 'repeticao',
+    '<expr_relacional.1>': 'grupo',
+    '<expr_relacional.2>': 'opcional',
+    '<expr_arit.1>': 'grupo',
+    '<expr_arit.2>': 'repeticao',
+    '<termo.1>': 'grupo',
+    '<termo.2>': 'repeticao',
+}
+
+# (índice do não terminal, símbolos): terminais pelo tipo de token (int),
+# não terminais pelo nome
+PRODUCOES = (
+    (0, ('<declaracoes>',)),  # 0: <programa.1> ::= <declaracoes>
+    (0, ()),  # 1: <programa.1> ::= ε
+    (1, (0, 29, 23, '<programa.1>', 2, '<comandos>', 3, 24)),  # 2: <programa> ::= programa ID ; <programa.1> inicio <comandos> fim .
+    (2, ('<declaracao>', '<declaracoes.1>')),  # 3: <declaracoes.1> ::= <declaracao> <declaracoes.1>
+    (2, ()),  # 4: <declaracoes.1> ::= ε
+    (3, (1, '<declaracao>', '<declaracoes.1>')),  # 5: <declaracoes> ::= var <declaracao> <declaracoes.1>
+    (4, ('<comandos>',)),  # 6: <comandos.1> ::= <comandos>
+    (4, ()),  # 7: <comandos.1> ::= ε
+    (5, (23, '<comandos.1>')),  # 8: <comandos.2> ::= ; <comandos.1>
+    (5, ()),  # 9: <comandos.2> ::= ε
+    (6, ('<comando>', '<comandos.2>')),  # 10: <comandos> ::= <comando> <comandos.2>
+    (7, ('<lista_ids>', 26, '<tipo>', 23)),  # 11: <declaracao> ::= <lista_ids> : <tipo> ;
+    (8, ('<atribuicao>',)),  # 12: <comando> ::= <atribuicao>
+    (8, ('<leitura>',)),  # 13: <comando> ::= <leitura>
+    (8, ('<escrita>',)),  # 14: <comando> ::= <escrita>
+    (8, ('<se>',)),  # 15: <comando> ::= <se>
+    (8, ('<enquanto>',)),  # 16: <comando> ::= <enquanto>
+    (8, ('<bloco>',)),  # 17: <comando> ::= <bloco>
+    (9, (25, 29, '<lista_ids.1>')),  # 18: <lista_ids.1> ::= , ID <lista_ids.1>
+    (9, ()),  # 19: <lista_ids.1> ::= ε
+    (10, (29, '<lista_ids.1>')),  # 20: <lista_ids> ::= ID <lista_ids.1>
+    (11, (4,)),  # 21: <tipo> ::= inteiro
+    (12, (29, 16, '<expr>')),  # 22: <atribuicao> ::= ID := <expr>
+    (13, (10, 27, '<lista_ids>', 28)),  # 23: <leitura> ::= ler ( <lista_ids> )
+    (14, (11, 27, '<lista_expr>', 28)),  # 24: <escrita> ::= escrever ( <lista_expr> )
+    (15, (7, '<comando>')),  # 25: <se.1> ::= senao <comando>
+    (15, ()),  # 26: <se.1> ::= ε
+    (16, (5, '<expr>', 6, '<comando>', '<se.1>')),  # 27: <se> ::= se <expr> entao <comando> <se.1>
+    (17, (8, '<expr>', 9, '<comando>')),  # 28: <enquanto> ::= enquanto <expr> faca <comando>
+    (18, (2, '<comandos>', 3)),  # 29: <bloco> ::= inicio <comandos> fim
+    (19, ('<expr_relacional>',)),  # 30: <expr> ::= <expr_relacional>
+    (20, (25, '<expr>', '<lista_expr.1>')),  # 31: <lista_expr.1> ::= , <expr> <lista_expr.1>
+    (20, ()),  # 32: <lista_expr.1> ::= ε
+    (21, ('<expr>', '<lista_expr.1>')),  # 33: <lista_expr> ::= <expr> <lista_expr.1>
+    (22, (17,)),  # 34: <expr_relacional.1> ::= =
+    (22, (18,)),  # 35: <expr_relacional.1> ::= <>
+    (22, (19,)),  # 36: <expr_relacional.1> ::= <
+    (22, (20,)),  # 37: <expr_relacional.1> ::= <=
+    (22, (21,)),  # 38: <expr_relacional.1> ::= >
+    (22, (22,)),  # 39: <expr_relacional.1> ::= >=
+    (23, ('<expr_relacional.1>', '<expr_arit>')),  # 40: <expr_relacional.2> ::= <expr_relacional.1> <expr_arit>
+    (23, ()),  # 41: <expr_relacional.2> ::= ε
+    (24, ('<expr_arit>', '<expr_relacional.2>')),  # 42: <expr_relacional> ::= <expr_arit> <expr_relacional.2>
+    (25, (12,)),  # 43: <expr_arit.1> ::= +
+    (25, (13,)),  # 44: <expr_arit.1> ::= -
+    (26, ('<expr_arit.1>', '<termo>', '<expr_arit.2>')),  # 45: <expr_arit.2> ::= <expr_arit.1> <termo> <expr_arit.2>
+    (26, ()),  # 46: <expr_arit.2> ::= ε
+    (27, ('<termo>', '<expr_arit.2>')),  # 47: <expr_arit> ::= <termo> <expr_arit.2>
+    (28, (14,)),  # 48: <termo.1> ::= *
+    (28, (15,)),  # 49: <termo.1> ::= /
+    (29, ('<termo.1>', '<fator>', '<termo.2>')),  # 50: <termo.2> ::= <termo.1> <fator> <termo.2>
+    (29, ()),  # 51: <termo.2> ::= ε
+    (30, ('<fator>', '<termo.2>')),  # 52: <termo> ::= <fator> <termo.2>
+    (31, (27, '<expr>', 28)),  # 53: <fator> ::= ( <expr> )
+    (31, (13, '<fator>')),  # 54: <fator> ::= - <fator>
+    (31, (29,)),  # 55: <fator> ::= ID
+    (31, (30,)),  # 56: <fator> ::= NUMERO
+    (31, (31,)),  # 57: <fator> ::= STRING
+)
+
+# TABELA[não terminal] = {tipo de token: produção}
+TABELA = (
+    {1: 0, 2: 1},  # <programa.1>
+    {0: 2},  # <programa>
+    {2: 4, 29: 3},  # <declaracoes.1>
+    {1: 5},  # <declaracoes>
+    {2: 6, 3: 7, 5: 6, 8: 6, 10: 6, 11: 6, 29: 6},  # <comandos.1>
+    {3: 9, 23: 8},  # <comandos.2>
+    {2: 10, 5: 10, 8: 10, 10: 10, 11: 10, 29: 10},  # <comandos>
+    {29: 11},  # <declaracao>
+    {2: 17, 5: 15, 8: 16, 10: 13, 11: 14, 29: 12},  # <comando>
+    {25: 18, 26: 19, 28: 19},  # <lista_ids.1>
+    {29: 20},  # <lista_ids>
+    {4: 21},  # <tipo>
+    {29: 22},  # <atribuicao>
+    {10: 23},  # <leitura>
+    {11: 24},  # <escrita>
+    {3: 26, 7: 25, 23: 26},  # <se.1>
+    {5: 27},  # <se>
+    {8: 28},  # <enquanto>
+    {2: 29},  # <bloco>
+    {13: 30, 27: 30, 29: 30, 30: 30, 31: 30},  # <expr>
+    {25: 31, 28: 32},  # <lista_expr.1>
+    {13: 33, 27: 33, 29: 33, 30: 33, 31: 33},  # <lista_expr>
+    {17: 34, 18: 35, 19: 36, 20: 37, 21: 38, 22: 39},  # <expr_relacional.1>
+    {3: 41, 6: 41, 7: 41, 9: 41, 17: 40, 18: 40, 19: 40, 20: 40, 21: 40, 22: 40, 23: 41, 25: 41, 28: 41},  # <expr_relacional.2>
+    {13: 42, 27: 42, 29: 42, 30: 42, 31: 42},  # <expr_relacional>
+    {12: 43, 13: 44},  # <expr_arit.1>
+    {3: 46, 6: 46, 7: 46, 9: 46, 12: 45, 13: 45, 17: 46, 18: 46, 19: 46, 20: 46, 21: 46, 22: 46, 23: 46, 25: 46, 28: 46},  # <expr_arit.2>
+    {13: 47, 27: 47, 29: 47, 30: 47, 31: 47},  # <expr_arit>
+    {14: 48, 15: 49},  # <termo.1>
+    {3: 51, 6: 51, 7: 51, 9: 51, 12: 51, 13: 51, 14: 50, 15: 50, 17: 51, 18: 51, 19: 51, 20: 51, 21: 51, 22: 51, 23: 51, 25: 51, 28: 51},  # <termo.2>
+    {13: 52, 27: 52, 29: 52, 30: 52, 31: 52},  # <termo>
+    {13: 54, 27: 53, 29: 55, 30: 56, 31: 57},  # <fator>
+)
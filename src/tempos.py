@@ -0,0 +1,70 @@
+from __future__ import annotations
+from time import perf_counter_ns
+
+from ast_nodes import NoAST
+
+def contar_nos(raiz: NoAST) -> int:
+    """Quantidade de nós da AST a partir da raiz"""
+    total = 0
+    pendentes = [raiz]
+    while pendentes:
+        no = pendentes.pop()
+        total += 1
+        for valor in vars(no).values():
+            if isinstance(valor, NoAST):
+                pendentes.append(valor)
+            elif isinstance(valor, list):
+                pendentes.extend(item for item in valor if isinstance(item, NoAST))
+    return total
+
+class _Fase:
+    __slots__ = ('medidor', 'nome', 'inicio')
+
+    def __init__(self, medidor: 'MedidorFases', nome: str):
+        self.medidor = medidor
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = perf_counter_ns()
+        return self
+
+    def __exit__(self, *excecao):
+        decorrido = perf_counter_ns() - self.inicio
+        fases = self.medidor.fases
+        fases[self.nome] = fases.get(self.nome, 0) + decorrido
+        return False
+
+class MedidorFases:
+    """Tempos de cada fase da compilação (perf_counter_ns) e contagens associadas.
+
+    Uso: `with medidor.fase('lexico'): ...`; as contagens são preenchidas por quem
+    executa as fases e o resultado é um dicionário pronto para JSON.
+    """
+
+    def __init__(self):
+        self.fases: dict[str, int] = {}
+        self.tokens: int | None = None
+        self.ast: NoAST | None = None
+        self.comandos_executados: int | None = None
+        # EstatisticasExecucao da execução, quando o interpretador as coleta
+        self.estatisticas = None
+
+    def fase(self, nome: str) -> _Fase:
+        return _Fase(self, nome)
+
+    def como_dict(self, **extras: object) -> dict[str, object]:
+        resultado: dict[str, object] = dict(extras)
+        resultado['fases_ns'] = dict(self.fases)
+        resultado['total_ns'] = sum(self.fases.values())
+        resultado['tokens'] = self.tokens
+        resultado['nos_ast'] = contar_nos(self.ast) if self.ast is not None else None
+        resultado['comandos_executados'] = self.comandos_executados
+
+        lexico = self.fases.get('lexico')
+        resultado['tokens_por_segundo'] = (
+            round(self.tokens * 1e9 / lexico) if self.tokens and lexico else None)
+        execucao = self.fases.get('execucao')
+        resultado['comandos_por_segundo'] = (
+            round(self.comandos_executados * 1e9 / execucao)
+            if self.comandos_executados and execucao else None)
+        return resultado
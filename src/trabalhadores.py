@@ -0,0 +1,568 @@
+"""Pool de processos pré-criados para executar programas não confiáveis.
+
+Os trabalhadores são criados com fork depois que o compilador já foi importado
+e aquecido, então cada execução custa uma troca de mensagens por pipe em vez
+da inicialização de um Python novo. Quem faz o fork é um zigoto: um processo de
+thread única criado junto com o pool, de modo que substituir um trabalhador a
+partir de uma thread de pedido não copia travas seguradas por outras threads.
+Cada trabalhador roda com limites do sistema operacional (resource.setrlimit):
+tempo de CPU por execução, espaço de endereçamento e nenhum arquivo core.
+Trabalhadores que estouram um limite, terminam de forma anormal ou atingem o
+número máximo de execuções são substituídos automaticamente.
+
+Mensagens (marshal, precedidas do tamanho em 4 bytes):
+
+    pai -> trabalhador   (codigo, entradas, modo_inteiro, limite_iteracoes, estatisticas, memoria)
+    trabalhador -> pai   (sucesso, saida, variaveis, erro, estatisticas, reciclar)
+
+Com memoria (nome de um bloco de programa_plano.publicar), o código é ignorado e o
+trabalhador executa o programa plano anexado, sem compilar nem copiar.
+
+Com limite_comandos, o trabalhador avalia a estimativa estática de custo (custo.py)
+para as entradas do pedido e recusa, sem executar, programas cujo pior caso passa
+da cota; programas sem limite conhecido executam normalmente, sob os demais limites.
+
+Somente POSIX (os.fork, o módulo resource e descritores passados por socket Unix).
+"""
+import io
+import marshal
+import os
+import resource
+import select
+import signal
+import socket
+import struct
+import threading
+import time
+from collections import OrderedDict
+from queue import SimpleQueue
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from lexer import LexerError, Token
+from parser import ParserError
+from semantic import SemanticError
+from interpreter import RuntimeError
+from inteiros import MODO_ILIMITADO, MODOS_INTEIRO
+from estatisticas import EstatisticasExecucao
+from compilador import ErroCompilacao, LimiteExcedido, ResultadoExecucao, compilar
+from programa_plano import ErroProgramaPlano, anexar
+from simbolos import LIMITE_SIMBOLOS, quantidade_simbolos, reiniciar_simbolos
+
+_TAMANHO = struct.Struct('!I')
+# Tempo de CPU, além do limite da execução, até o SIGKILL do limite rígido
+MARGEM_CPU = 1
+# Intervalo em que o pai confere o tempo de CPU do trabalhador ocupado
+INTERVALO_VIGIA = 0.25
+# Programas compilados mantidos por trabalhador (o mesmo código costuma se repetir)
+CAPACIDADE_CACHE = 32
+
+_AQUECIMENTO = "programa aquecimento; var x : inteiro; inicio ler(x); x := x * 2 + 1; escrever(x) fim."
+
+class RecursoExcedido(LimiteExcedido):
+    """Execução passou de um limite do trabalhador (CPU, memória ou saída) ou o derrubou.
+
+    O limite vale para a execução inteira, então a mensagem não aponta posição no fonte.
+    """
+
+    def __init__(self, mensagem: str, linha: int = 0, coluna: int = 0):
+        self.mensagem = mensagem
+        self.linha = linha
+        self.coluna = coluna
+        Exception.__init__(self, f"Erro de execução: {mensagem}")
+
+class _TrabalhadorEncerrado(Exception):
+    """Pipe fechado: o trabalhador terminou"""
+
+def _erro_cpu(limite_cpu: float) -> RecursoExcedido:
+    return RecursoExcedido(f"Execução excedeu o limite de {limite_cpu} s de CPU")
+
+# Erros reconstruídos no processo pai a partir de (classe, mensagem, linha, coluna)
+_CLASSES_ERRO = {classe.__name__: classe for classe in
+                 (LexerError, SemanticError, RuntimeError, LimiteExcedido, RecursoExcedido)}
+
+def _codificar_erro(erro: Exception) -> tuple:
+    if isinstance(erro, ParserError):
+        token = erro.token
+        return ('ParserError', erro.mensagem, token.linha, token.coluna, token.tipo, str(token.valor))
+    return (type(erro).__name__, erro.mensagem, erro.linha, erro.coluna)
+
+def _decodificar_erro(codificado: tuple) -> Exception:
+    nome, mensagem, linha, coluna = codificado[:4]
+    if nome == 'ParserError':
+        return ParserError(mensagem, Token(codificado[4], codificado[5], linha, coluna))
+    return _CLASSES_ERRO.get(nome, RuntimeError)(mensagem, linha, coluna)
+
+def _escrever_mensagem(descritor: int, mensagem: tuple):
+    dados = marshal.dumps(mensagem)
+    dados = memoryview(_TAMANHO.pack(len(dados)) + dados)
+    while dados:
+        dados = dados[os.write(descritor, dados):]
+
+def _ler_exato(descritor: int, tamanho: int) -> bytes:
+    partes = []
+    while tamanho:
+        parte = os.read(descritor, min(tamanho, 1 << 20))
+        if not parte:
+            raise _TrabalhadorEncerrado()
+        partes.append(parte)
+        tamanho -= len(parte)
+    return b"".join(partes)
+
+def _ler_mensagem(descritor: int) -> tuple:
+    tamanho, = _TAMANHO.unpack(_ler_exato(descritor, _TAMANHO.size))
+    return marshal.loads(_ler_exato(descritor, tamanho))
+
+class _SaidaLimitada(io.StringIO):
+    """Saída do programa que levanta RecursoExcedido ao passar de limite caracteres"""
+
+    def __init__(self, limite: Optional[int]):
+        super().__init__()
+        self.limite = limite
+        self.tamanho = 0
+
+    def write(self, texto: str) -> int:
+        self.tamanho += len(texto)
+        if self.limite is not None and self.tamanho > self.limite:
+            raise RecursoExcedido(f"Saída excedeu o limite de {self.limite} caracteres")
+        return super().write(texto)
+
+def _tempo_cpu() -> float:
+    uso = resource.getrusage(resource.RUSAGE_SELF)
+    return uso.ru_utime + uso.ru_stime
+
+_TIQUES = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+def _tempo_cpu_processo(pid: int) -> Optional[float]:
+    """Tempo de CPU de outro processo, lido de /proc (None fora do Linux)"""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as arquivo:
+            campos = arquivo.read().rsplit(b')', 1)[1].split()
+    except OSError:
+        return None
+    return (int(campos[11]) + int(campos[12])) / _TIQUES  # utime + stime
+
+def _espaco_enderecamento() -> int:
+    """Bytes mapeados pelo processo atual (0 fora do Linux)"""
+    try:
+        with open('/proc/self/statm') as arquivo:
+            return int(arquivo.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+class _Execucao:
+    """Laço de um trabalhador: lê pedidos, executa e responde até o pipe fechar"""
+
+    def __init__(self, pedidos: int, respostas: int, limite_cpu: Optional[float],
+                 limite_saida: Optional[int], orcamento_cpu: Optional[float],
+                 limite_comandos: Optional[int] = None):
+        self.pedidos = pedidos
+        self.respostas = respostas
+        self.limite_cpu = limite_cpu
+        self.limite_saida = limite_saida
+        self.limite_comandos = limite_comandos
+        # Limite rígido de CPU do processo inteiro: o soft de cada execução fica abaixo dele
+        self.limite_rigido = None if orcamento_cpu is None else int(_tempo_cpu() + orcamento_cpu) + 1
+        self.programas: 'OrderedDict[Tuple[str, str], Any]' = OrderedDict()
+        self.planos: 'OrderedDict[str, Any]' = OrderedDict()
+
+    def limitar(self, limite_memoria: Optional[int]):
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        if limite_memoria is not None:
+            total = _espaco_enderecamento() + limite_memoria
+            resource.setrlimit(resource.RLIMIT_AS, (total, total))
+        if self.limite_rigido is not None:
+            resource.setrlimit(resource.RLIMIT_CPU, (self.limite_rigido, self.limite_rigido))
+            signal.signal(signal.SIGXCPU, self._cpu_excedida)
+
+    def _cpu_excedida(self, sinal, quadro):
+        raise _erro_cpu(self.limite_cpu)
+
+    def _armar_cpu(self):
+        """Limite soft desta execução (o sistema conta segundos inteiros)"""
+        if self.limite_rigido is not None:
+            limite = min(int(_tempo_cpu() + self.limite_cpu + 0.999), self.limite_rigido)
+            resource.setrlimit(resource.RLIMIT_CPU, (limite, self.limite_rigido))
+
+    def orcamento_esgotado(self) -> bool:
+        """O limite rígido não comporta mais uma execução completa"""
+        return (self.limite_rigido is not None and
+                _tempo_cpu() + self.limite_cpu + MARGEM_CPU > self.limite_rigido)
+
+    def _desarmar_cpu(self):
+        if self.limite_rigido is not None:
+            resource.setrlimit(resource.RLIMIT_CPU, (self.limite_rigido, self.limite_rigido))
+
+    def programa(self, codigo: str, modo_inteiro: str):
+        chave = (codigo, modo_inteiro)
+        programa = self.programas.get(chave)
+        if programa is None:
+            programa = self.programas[chave] = compilar(codigo, modo_inteiro)
+            if len(self.programas) > CAPACIDADE_CACHE:
+                self.programas.popitem(last=False)
+        else:
+            self.programas.move_to_end(chave)
+        return programa
+
+    def plano(self, memoria: str):
+        """Programa plano anexado uma única vez por trabalhador (nomes de blocos não se repetem)"""
+        plano = self.planos.get(memoria)
+        if plano is None:
+            plano = self.planos[memoria] = anexar(memoria)
+            if len(self.planos) > CAPACIDADE_CACHE:
+                self.planos.popitem(last=False)[1].liberar()
+        else:
+            self.planos.move_to_end(memoria)
+        return plano
+
+    def cota_excedida(self, programa, entradas: list) -> Optional[RecursoExcedido]:
+        """Erro para um programa cujo custo estimado no pior caso passa de limite_comandos"""
+        if self.limite_comandos is None:
+            return None
+        comandos = programa.custo().avaliar(entradas).comandos
+        if comandos is None or comandos <= self.limite_comandos:
+            return None
+        return RecursoExcedido(f"Custo estimado de {comandos} comandos excede a cota de "
+                               f"{self.limite_comandos} comandos")
+
+    def atender(self, pedido: tuple) -> tuple:
+        codigo, entradas, modo_inteiro, limite_iteracoes, estatisticas, memoria = pedido
+        saida = _SaidaLimitada(self.limite_saida)
+        try:
+            try:
+                if memoria is not None:
+                    resultado = self.plano(memoria).executar(entradas, saida, limite_iteracoes)
+                else:
+                    programa = self.programa(codigo, modo_inteiro)
+                    recusa = self.cota_excedida(programa, entradas)
+                    if recusa is not None:
+                        return (False, "", {}, _codificar_erro(recusa), None, False)
+                    resultado = programa.executar(entradas, saida, limite_iteracoes, estatisticas)
+            finally:
+                self._desarmar_cpu()
+        except ErroCompilacao as e:
+            return (False, None, None, [_codificar_erro(erro) for erro in e.erros], None, False)
+        except (OSError, ErroProgramaPlano) as e:
+            return (False, None, None, ('ErroProgramaPlano', str(e)), None, False)
+        except RuntimeError as e:
+            # Estouro de CPU durante a compilação
+            return (False, saida.getvalue(), {}, _codificar_erro(e), None, False)
+        except MemoryError:
+            erro = RecursoExcedido("Execução excedeu o limite de memória")
+            return (False, "", {}, _codificar_erro(erro), None, True)
+        except RecursionError:
+            erro = RecursoExcedido("Programa aninhado demais (limite de recursão)")
+            return (False, saida.getvalue(), {}, _codificar_erro(erro), None, True)
+
+        # Depois de um limite estourado o heap pode ter crescido muito: um processo novo devolve a memória
+        reciclar = isinstance(resultado.erro, RecursoExcedido)
+        contadores = resultado.estatisticas
+        if contadores is not None:
+            contadores = (contadores.comandos, contadores.iteracoes_por_laco, contadores.valores_lidos,
+                          contadores.bytes_escritos, contadores.bits_maximo)
+        erro = None if resultado.erro is None else _codificar_erro(resultado.erro)
+        return (resultado.sucesso, saida.getvalue(), resultado.variaveis, erro, contadores, reciclar)
+
+    def executar(self):
+        while True:
+            try:
+                pedido = _ler_mensagem(self.pedidos)
+            except _TrabalhadorEncerrado:
+                return
+            self._armar_cpu()
+            resposta = self.atender(pedido)
+            if quantidade_simbolos() > LIMITE_SIMBOLOS:
+                # Os programas em cache são os únicos que ainda guardam símbolos
+                self.programas.clear()
+                reiniciar_simbolos()
+            if self.orcamento_esgotado():
+                resposta = resposta[:-1] + (True,)
+            _escrever_mensagem(self.respostas, resposta)
+            if resposta[-1]:
+                return
+
+class _Trabalhador:
+    __slots__ = ('pid', 'pedidos', 'respostas', 'execucoes')
+
+    def __init__(self, pid: int, pedidos: int, respostas: int):
+        self.pid = pid
+        self.pedidos = pedidos      # escrita do pai
+        self.respostas = respostas  # leitura do pai
+        self.execucoes = 0
+
+def _executar_filho(corpo: Callable[[], None]):
+    """No processo recém-criado com fork: executa corpo e termina sem voltar ao chamador"""
+    codigo_saida = 0
+    try:
+        corpo()
+    except BaseException:
+        codigo_saida = 1
+    finally:
+        os._exit(codigo_saida)
+
+class _Zigoto:
+    """Processo de thread única que cria os trabalhadores com fork e recolhe o status deles.
+
+    Pedidos (mensagens como as dos trabalhadores, pelo socket Unix):
+
+        ('criar', 0)     -> pid (4 bytes) com as pontas do pai dos dois pipes (SCM_RIGHTS)
+        ('esperar', pid) -> (status de waitpid,)
+
+    iniciar(pedidos, respostas) é o corpo de cada trabalhador.
+    """
+
+    def __init__(self, iniciar: Callable[[int, int], None]):
+        self._trava = threading.Lock()
+        self.conexao, filho = socket.socketpair()
+        self.pid: Optional[int] = os.fork()
+        if self.pid == 0:
+            def servir():
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                self.conexao.close()
+                _Zigoto._servir(filho, iniciar)
+            _executar_filho(servir)
+        filho.close()
+
+    @staticmethod
+    def _servir(conexao: socket.socket, iniciar: Callable[[int, int], None]):
+        descritor = conexao.fileno()
+        while True:
+            try:
+                pedido, pid = _ler_mensagem(descritor)
+            except _TrabalhadorEncerrado:
+                return
+            if pedido == 'esperar':
+                _escrever_mensagem(descritor, (os.waitpid(pid, 0)[1],))
+                continue
+            pedidos_leitura, pedidos_escrita = os.pipe()
+            respostas_leitura, respostas_escrita = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                def trabalhar():
+                    conexao.close()
+                    os.close(pedidos_escrita)
+                    os.close(respostas_leitura)
+                    iniciar(pedidos_leitura, respostas_escrita)
+                _executar_filho(trabalhar)
+            os.close(pedidos_leitura)
+            os.close(respostas_escrita)
+            socket.send_fds(conexao, [_TAMANHO.pack(pid)], [pedidos_escrita, respostas_leitura])
+            os.close(pedidos_escrita)
+            os.close(respostas_leitura)
+
+    def criar(self) -> Tuple[int, int, int]:
+        """(pid, escrita dos pedidos, leitura das respostas) de um trabalhador novo"""
+        with self._trava:
+            if self.pid is None:
+                raise ValueError("Pool de trabalhadores fechado")
+            _escrever_mensagem(self.conexao.fileno(), ('criar', 0))
+            dados, descritores, _, _ = socket.recv_fds(self.conexao, _TAMANHO.size, 2)
+        if len(dados) != _TAMANHO.size or len(descritores) != 2:
+            raise OSError("O zigoto do pool de trabalhadores terminou")
+        pid, = _TAMANHO.unpack(dados)
+        return pid, descritores[0], descritores[1]
+
+    def esperar(self, pid: int) -> int:
+        """Status de waitpid de um trabalhador que terminou (ou vai terminar em seguida)"""
+        with self._trava:
+            _escrever_mensagem(self.conexao.fileno(), ('esperar', pid))
+            status, = _ler_mensagem(self.conexao.fileno())
+        return status
+
+    def fechar(self):
+        with self._trava:
+            if self.pid is None:
+                return
+            self.conexao.close()
+            os.waitpid(self.pid, 0)
+            self.pid = None
+
+class PoolTrabalhadores:
+    """Executa programas Fortall em processos isolados e reutilizados.
+
+    processos: trabalhadores mantidos (padrão: um por núcleo).
+    limite_cpu: segundos de CPU por execução, incluindo a compilação (None = sem limite);
+    o sistema conta segundos inteiros, então o limite efetivo pode chegar a limite_cpu + 1.
+    limite_memoria: bytes de espaço de endereçamento que cada trabalhador pode usar
+    além do que já ocupava ao ser criado (None = sem limite).
+    limite_saida: caracteres que um programa pode escrever (None = sem limite).
+    limite_comandos: cota de comandos executados no pior caso estimado antes da execução
+    (custo.py); acima dela o pedido é recusado com RecursoExcedido (None = sem cota).
+    execucoes_por_trabalhador: execuções até o trabalhador ser substituído.
+
+    executar pode ser chamado de várias threads; cada chamada ocupa um trabalhador.
+    Crie o pool antes de iniciar outras threads, pois o zigoto que cria os trabalhadores
+    é criado com fork.
+    """
+
+    def __init__(self, processos: Optional[int] = None, limite_cpu: Optional[float] = 1.0,
+                 limite_memoria: Optional[int] = 256 << 20, limite_saida: Optional[int] = 1 << 20,
+                 execucoes_por_trabalhador: int = 1000, limite_comandos: Optional[int] = None):
+        self.processos = processos or os.cpu_count() or 1
+        self.limite_cpu = limite_cpu
+        self.limite_memoria = limite_memoria
+        self.limite_saida = limite_saida
+        self.limite_comandos = limite_comandos
+        self.execucoes_por_trabalhador = execucoes_por_trabalhador
+        self.recriados = 0
+        self._trava = threading.Lock()
+        self._trabalhadores: Dict[int, _Trabalhador] = {}
+        self._livres: SimpleQueue = SimpleQueue()
+        self._fechado = False
+
+        # Importações tardias e caches do interpretador ficam prontos antes do fork
+        for modo in MODOS_INTEIRO:
+            programa = compilar(_AQUECIMENTO, modo)
+            programa.executar([1], estatisticas=True)
+            programa.custo().avaliar([1])
+        self._zigoto = _Zigoto(self._iniciar)
+        for _ in range(self.processos):
+            self._livres.put(self._criar())
+
+    def _iniciar(self, pedidos: int, respostas: int):
+        """Corpo de um trabalhador, no processo criado pelo zigoto"""
+        orcamento = (None if self.limite_cpu is None else
+                     self.limite_cpu * self.execucoes_por_trabalhador + MARGEM_CPU)
+        execucao = _Execucao(pedidos, respostas, self.limite_cpu, self.limite_saida,
+                             orcamento, self.limite_comandos)
+        execucao.limitar(self.limite_memoria)
+        execucao.executar()
+
+    def _criar(self) -> _Trabalhador:
+        trabalhador = _Trabalhador(*self._zigoto.criar())
+        with self._trava:
+            self._trabalhadores[trabalhador.pid] = trabalhador
+        return trabalhador
+
+    def _encerrar(self, trabalhador: _Trabalhador, matar: bool = False) -> int:
+        """Fecha os pipes e aguarda o processo; retorna o status de waitpid"""
+        os.close(trabalhador.pedidos)
+        os.close(trabalhador.respostas)
+        if matar:
+            try:
+                os.kill(trabalhador.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        status = self._zigoto.esperar(trabalhador.pid)
+        with self._trava:
+            self._trabalhadores.pop(trabalhador.pid, None)
+            ultimo = self._fechado and not self._trabalhadores
+        if ultimo:
+            self._zigoto.fechar()
+        return status
+
+    def _substituir(self, trabalhador: _Trabalhador, matar: bool = False) -> int:
+        status = self._encerrar(trabalhador, matar)
+        self.recriados += 1
+        if not self._fechado:
+            self._livres.put(self._criar())
+        return status
+
+    def _erro_termino(self, status: int) -> RecursoExcedido:
+        if os.WIFSIGNALED(status):
+            sinal = os.WTERMSIG(status)
+            if sinal == signal.SIGXCPU and self.limite_cpu is not None:
+                return _erro_cpu(self.limite_cpu)
+            return RecursoExcedido(f"Trabalhador terminou com o sinal {signal.Signals(sinal).name}")
+        return RecursoExcedido(f"Trabalhador terminou com o código {os.waitstatus_to_exitcode(status)}")
+
+    def _aguardar(self, trabalhador: _Trabalhador) -> bool:
+        """Espera a resposta; False se o trabalhador passou do limite de CPU sem responder.
+
+        O SIGXCPU só interrompe o programa entre instruções do Python, e uma única
+        multiplicação de inteiros enormes pode durar muito mais que o limite, então o
+        pai confere o tempo de CPU do trabalhador (ou, fora do Linux, o tempo decorrido).
+        """
+        if self.limite_cpu is None:
+            return True
+        limite = self.limite_cpu + MARGEM_CPU
+        inicio_cpu = _tempo_cpu_processo(trabalhador.pid)
+        inicio = time.monotonic()
+        while not select.select([trabalhador.respostas], [], [], INTERVALO_VIGIA)[0]:
+            if inicio_cpu is None:
+                usado = time.monotonic() - inicio
+            else:
+                usado = (_tempo_cpu_processo(trabalhador.pid) or inicio_cpu) - inicio_cpu
+            if usado > limite:
+                return False
+        return True
+
+    def executar(self, codigo: str, entradas: Optional[Iterable[Any]] = None,
+                 modo_inteiro: str = MODO_ILIMITADO, limite_iteracoes: Optional[int] = None,
+                 estatisticas: bool = False) -> ResultadoExecucao:
+        """Compila e executa codigo em um trabalhador.
+
+        Os argumentos seguem compilar e ProgramaCompilado.executar (entradas são
+        convertidas para texto). Erros de compilação levantam ErroCompilacao; limites
+        do trabalhador estourados terminam a execução com RecursoExcedido em
+        ResultadoExecucao.erro.
+        """
+        return self._executar_pedido((codigo, [str(valor) for valor in (entradas or ())], modo_inteiro,
+                                      limite_iteracoes, estatisticas, None))
+
+    def executar_plano(self, memoria: str, entradas: Optional[Iterable[Any]] = None,
+                       limite_iteracoes: Optional[int] = None) -> ResultadoExecucao:
+        """Executa o programa plano publicado no bloco de memória compartilhada `memoria`.
+
+        Cada trabalhador anexa o bloco na primeira vez, a um custo que não depende do
+        tamanho do programa; um bloco inexistente ou inválido levanta ErroProgramaPlano.
+        """
+        return self._executar_pedido(("", [str(valor) for valor in (entradas or ())], MODO_ILIMITADO,
+                                      limite_iteracoes, False, memoria))
+
+    def _executar_pedido(self, pedido: tuple) -> ResultadoExecucao:
+        if self._fechado:
+            raise ValueError("Pool de trabalhadores fechado")
+        trabalhador = self._livres.get()
+        try:
+            _escrever_mensagem(trabalhador.pedidos, pedido)
+            if not self._aguardar(trabalhador):
+                self._substituir(trabalhador, matar=True)
+                return ResultadoExecucao(False, "", {}, _erro_cpu(self.limite_cpu))
+            resposta = _ler_mensagem(trabalhador.respostas)
+        except (_TrabalhadorEncerrado, BrokenPipeError):
+            status = self._substituir(trabalhador)
+            return ResultadoExecucao(False, "", {}, self._erro_termino(status))
+        except BaseException:
+            # Ex.: KeyboardInterrupt no meio da troca de mensagens: o estado do pipe é incerto
+            self._substituir(trabalhador, matar=True)
+            raise
+
+        sucesso, saida, variaveis, erro, contadores, reciclar = resposta
+        trabalhador.execucoes += 1
+        if reciclar or trabalhador.execucoes >= self.execucoes_por_trabalhador:
+            self._substituir(trabalhador)
+        elif self._fechado:
+            self._encerrar(trabalhador)
+        else:
+            self._livres.put(trabalhador)
+
+        if variaveis is None:
+            if isinstance(erro, tuple):
+                raise ErroProgramaPlano(erro[1])
+            raise ErroCompilacao([_decodificar_erro(codificado) for codificado in erro])
+        return ResultadoExecucao(sucesso, saida, variaveis,
+                                 None if erro is None else _decodificar_erro(erro),
+                                 None if contadores is None else EstatisticasExecucao(*contadores))
+
+    def fechar(self):
+        """Encerra todos os trabalhadores (os livres terminam ao ver o pipe fechado)"""
+        self._fechado = True
+        while not self._livres.empty():
+            self._encerrar(self._livres.get())
+        with self._trava:
+            ultimo = not self._trabalhadores
+        if ultimo:
+            self._zigoto.fechar()
+
+    def __enter__(self) -> 'PoolTrabalhadores':
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    # Nome em inglês
+    run = executar
+
+# Nomes em inglês da API
+WorkerPool = PoolTrabalhadores
+ResourceLimitExceeded = RecursoExcedido
@@ -0,0 +1,78 @@
+"""A análise das árvores compartilhadas deve dar os mesmos erros, na mesma ordem,
+que o AnalisadorSemantico sobre a árvore comum."""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compartilhamento import AnalisadorCompartilhado, ParserCompartilhado
+from lexer import Lexer
+from parser import Parser
+from semantic import AnalisadorSemantico
+
+def _erros(codigo: str):
+    comum = AnalisadorSemantico().analisar(Parser(codigo, Lexer(codigo).tokenizar()).parse())
+    arvore = ParserCompartilhado(codigo, Lexer(codigo).tokenizar()).parse()
+    compartilhado = AnalisadorCompartilhado().analisar(arvore)
+    return ([(e.mensagem, e.linha, e.coluna) for e in comum],
+            [(e.mensagem, e.linha, e.coluna) for e in compartilhado])
+
+def test_alvo_nao_declarado_nao_repete_erro_da_expressao():
+    codigo = ("programa p;\nvar a : inteiro;\ninicio\n"
+              "  escrever(k);\n  k := k\nfim.")
+    comum, compartilhado = _erros(codigo)
+    assert [(linha, coluna) for _, linha, coluna in comum] == [(4, 12), (5, 3)]
+    assert compartilhado == comum
+
+def _expressao(aleatorio: random.Random, profundidade: int) -> str:
+    if profundidade == 0 or aleatorio.random() < 0.3:
+        return aleatorio.choice(['a', 'b', 'k', 'z', '1', '2', '"s"'])
+    operador = aleatorio.choice(['+', '-', '*', '<', '='])
+    return (f"({_expressao(aleatorio, profundidade - 1)} {operador} "
+            f"{_expressao(aleatorio, profundidade - 1)})")
+
+def _comando(aleatorio: random.Random, profundidade: int) -> str:
+    tipo = aleatorio.randrange(6 if profundidade else 3)
+    if tipo == 0:
+        return f"{aleatorio.choice(['a', 'b', 'k'])} := {_expressao(aleatorio, 2)}"
+    if tipo == 1:
+        return f"escrever({_expressao(aleatorio, 2)}, {_expressao(aleatorio, 1)})"
+    if tipo == 2:
+        return f"ler({aleatorio.choice(['a', 'k'])})"
+    if tipo == 3:
+        return f"se {_expressao(aleatorio, 1)} entao {_comando(aleatorio, profundidade - 1)}"
+    if tipo == 4:
+        return f"enquanto {_expressao(aleatorio, 1)} faca {_comando(aleatorio, profundidade - 1)}"
+    comandos = ';\n'.join(_comando(aleatorio, profundidade - 1) for _ in range(aleatorio.randrange(1, 4)))
+    return f"inicio\n{comandos}\nfim"
+
+def test_programas_aleatorios_com_alvos_nao_declarados():
+    aleatorio = random.Random(49)
+    for _ in range(300):
+        comandos = ';\n'.join(_comando(aleatorio, 2) for _ in range(aleatorio.randrange(1, 8)))
+        codigo = f"programa p;\nvar a, b : inteiro;\ninicio\n{comandos}\nfim."
+        comum, compartilhado = _erros(codigo)
+        assert compartilhado == comum, codigo
+
+def _melhor_tempo(funcao, repeticoes: int = 3) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+def test_comandos_repetidos_escalam_como_a_analise_comum():
+    # Os cinco comandos do laço do fibonacci repetidos: um único Bloco com milhares
+    # de filhos iguais, em que cada ocorrência deve ser localizada em O(1)
+    corpo = ("temp := a + b;\na := b;\nb := temp;\ncontador := contador + 1;\n"
+             "escrever(\"Termo \", contador, \": \", b);\n")
+    codigo = ("programa p;\nvar a, b, temp, contador : inteiro;\ninicio\n"
+              + corpo * 4000 + "a := 0\nfim.")
+    comum = Parser(codigo, Lexer(codigo).tokenizar()).parse()
+    arvore = ParserCompartilhado(codigo, Lexer(codigo).tokenizar()).parse()
+    tempo_comum = _melhor_tempo(lambda: AnalisadorSemantico().analisar(comum))
+    tempo_compartilhado = _melhor_tempo(lambda: AnalisadorCompartilhado().analisar(arvore))
+    assert tempo_compartilhado < 20 * tempo_comum